@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+# analysis/__init__.py
+
+"""
+Análisis reentrante: cada Analyzer tiene su propio lexer, tabla de símbolos,
+parser y buffers de resultado, así que pueden usarse varios a la vez
+(hilos, procesos, análisis en segundo plano del IDE).
+"""
+
+from .analyzer import Analyzer
+from .cache_disco import CacheAnalisis
+
+__all__ = [
+    'Analyzer',
+    'CacheAnalisis'
+]
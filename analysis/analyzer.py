@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+# analysis/analyzer.py
+"""
+Analyzer: fachada sobre lexer, parser, semántico, diagnósticos y código
+intermedio sin estado global. Una instancia NO debe usarse desde dos hilos a
+la vez; para concurrencia se crea una instancia por hilo/tarea.
+"""
+from typing import Dict, List
+
+from lexer.analizador_lexico import ReglasLexicas
+from lexer.token_stream import CacheTokenStreams, TokenStream
+from syntactic.analizador_sintactico import ContextoSintactico, nuevo_parser, analizar_con
+from syntactic.incremental import ParserIncremental
+
+
+class Analyzer:
+    def __init__(self, tam_cache: int = 8, escaner: str = 'ply', disco=None):
+        """
+        escaner: 'ply' (lexer PLY) o 'rapido' (lexer/escaner_rapido.py, mismos
+        tokens y tabla de símbolos, escaneo más rápido).
+        disco: caché persistente de TokenStreams (analysis.cache_disco.CacheAnalisis).
+        """
+        # Lexer propio: reglas con su tabla/errores + caché de streams
+        self.reglas = ReglasLexicas()
+        self.streams = CacheTokenStreams(self.reglas, tam_cache, escaner, disco)
+
+        # Parser propio: copia del global con su contexto
+        self.contexto = ContextoSintactico(self.reglas.tabla)
+        self.parser = nuevo_parser(self.contexto)
+        self.parser_incremental = ParserIncremental(self.parser)
+
+        # Último resultado de cada etapa
+        self.resultado_lexema: List[Dict] = []
+        self.resultado_gramatica: List[str] = self.contexto.resultado
+
+    # =========================
+    # Propiedades
+    # =========================
+    @property
+    def tabla_simbolos(self):
+        return self.reglas.tabla
+
+    def tokens(self, codigo: str) -> TokenStream:
+        """TokenStream de 'codigo' (se tokeniza una vez por versión del fuente)."""
+        return self.streams.obtener(codigo)
+
+    # =========================
+    # Etapas
+    # =========================
+    def lexico(self, codigo: str) -> List[Dict]:
+        """Equivalente a analizador_lexico.prueba(): lexemas + errores léxicos."""
+        stream = self.tokens(codigo)
+        stream.restaurar_tabla(self.tabla_simbolos)
+        self.resultado_lexema = stream.como_lexemas()
+        return self.resultado_lexema
+
+    def almacen(self, codigo: str):
+        """Como lexico(), pero en un TokenStore compacto (sin un dict por token)."""
+        stream = self.tokens(codigo)
+        stream.restaurar_tabla(self.tabla_simbolos)
+        return stream.almacen()
+
+    def sintactico(self, codigo: str, incremental: bool = False) -> List[str]:
+        """
+        Equivalente a analizador_sintactico.prueba_sintactica().
+        Con incremental=True sólo se re-parsean los métodos que cambiaron desde la llamada anterior.
+        """
+        stream = self.tokens(codigo) if codigo.strip() else None
+        if incremental:
+            return list(self.parser_incremental.analizar(codigo, stream))
+        return list(analizar_con(self.parser, codigo, stream))
+
+    def ast(self, codigo: str, incremental: bool = False):
+        """AST (syntactic.ast_java.Programa) de 'codigo'; None si el parseo no pudo construirlo."""
+        self.sintactico(codigo, incremental)
+        return self.contexto.ast
+
+    def semantico(self, codigo: str) -> List[Dict]:
+        from semantics.java_semantics import analyze_semantics
+        return analyze_semantics(codigo, self.tokens(codigo).tokens)
+
+    def diagnosticos(self, codigo: str) -> List[Dict]:
+        from diagnostics.java_diagnostics import diagnose
+        return diagnose(codigo, self.tokens(codigo).tokens)
+
+    def cuadruplos(self, codigo: str):
+        """Generador de cuádruplos nuevo (no compartido) ya aplicado a 'codigo'."""
+        from intermediate_code.generador_cuadruplos import GeneradorCuadruplos
+        generador = GeneradorCuadruplos()
+        generador.generar_desde_codigo(codigo, self.tokens(codigo).tokens)
+        return generador
+
+    def triplos(self, codigo: str):
+        """Generador de triplos nuevo (no compartido) ya aplicado a 'codigo'."""
+        from intermediate_code.generador_triplos import GeneradorTriplos
+        generador = GeneradorTriplos()
+        generador.generar_desde_codigo(codigo, self.tokens(codigo).tokens)
+        return generador
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# analysis/cache_disco.py
+"""
+Caché persistente de análisis, direccionada por contenido.
+
+Cada entrada se guarda en SQLite bajo (hash del fuente, versión del
+compilador, etapa); la versión es un hash de los fuentes del propio
+compilador, así que cambiar el lexer/parser/generadores invalida todo sin
+borrar nada a mano. Etapas guardadas:
+  - 'tokens': TokenStream (tokens, errores léxicos y tabla de símbolos)
+  - 'analisis' / 'ir': resultados de compilador.Pipeline (diagnósticos,
+    símbolos, cuádruplos y triplos)
+  - 'diagnosticos': diagnósticos en vivo del IDE
+
+Los valores se guardan como JSON comprimido (nunca pickle: leer la caché
+no ejecuta código); las tuplas vuelven como listas.
+
+El tamaño total está acotado: al pasarse se desalojan las entradas usadas
+hace más tiempo (LRU). Cualquier falla de la base (bloqueada, corrupta, sin
+permisos) cuenta como fallo de caché: nunca interrumpe un análisis.
+
+Archivo: <directorio_cache()>/analisis.sqlite3 (ver lexer/cache_tablas.py).
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Optional
+
+import ply
+
+from lexer.cache_tablas import directorio_cache
+
+# Paquetes cuyo código determina los resultados
+_PAQUETES = ('lexer', 'syntactic', 'semantics', 'diagnostics', 'intermediate_code', 'analysis', 'compilador')
+
+# Tamaño máximo por defecto (datos comprimidos)
+TAM_MAXIMO = 256 * 1024 * 1024
+
+_version = None
+_lock_version = threading.Lock()
+
+
+def version_compilador() -> str:
+    """Hash de los .py de los paquetes del compilador (y de la versión de PLY)."""
+    global _version
+    with _lock_version:
+        if _version is None:
+            raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            h = hashlib.sha1(ply.__version__.encode())
+            for paquete in _PAQUETES:
+                carpeta = os.path.join(raiz, paquete)
+                if not os.path.isdir(carpeta):
+                    continue
+                for nombre in sorted(os.listdir(carpeta)):
+                    if nombre.endswith('.py'):
+                        h.update(f'\0{paquete}/{nombre}\0'.encode())
+                        with open(os.path.join(carpeta, nombre), 'rb') as archivo:
+                            h.update(archivo.read())
+            _version = h.hexdigest()[:16]
+    return _version
+
+
+class CacheAnalisis:
+    """
+    Caché (fuente, versión, etapa) -> valor JSON en SQLite.
+    Una conexión por hilo; varios procesos pueden compartir el archivo (WAL).
+    Sin directorio de caché privado (ver directorio_cache()) todo acceso es
+    un fallo de caché.
+    """
+
+    def __init__(self, ruta: Optional[str] = None, tam_maximo: int = TAM_MAXIMO,
+                 version: Optional[str] = None):
+        if ruta is None:
+            try:
+                ruta = os.path.join(directorio_cache(), 'analisis.sqlite3')
+            except OSError:
+                ruta = None
+        self.ruta = ruta
+        self.tam_maximo = tam_maximo
+        self.version = version or version_compilador()
+        self.aciertos = 0
+        self.fallos = 0
+        self._local = threading.local()
+
+    # =========================
+    # Conexión
+    # =========================
+    def _conexion(self) -> sqlite3.Connection:
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            if self.ruta is None:
+                raise sqlite3.OperationalError("sin directorio de caché privado")
+            conexion = sqlite3.connect(self.ruta, timeout=30)
+            conexion.execute('PRAGMA journal_mode=WAL')
+            conexion.execute('PRAGMA synchronous=NORMAL')
+            conexion.execute(
+                'CREATE TABLE IF NOT EXISTS entradas ('
+                ' fuente TEXT NOT NULL, version TEXT NOT NULL, etapa TEXT NOT NULL,'
+                ' datos BLOB NOT NULL, tam INTEGER NOT NULL, usado REAL NOT NULL,'
+                ' PRIMARY KEY (fuente, version, etapa))')
+            conexion.execute('CREATE INDEX IF NOT EXISTS entradas_usado ON entradas (usado)')
+            conexion.commit()
+            self._local.conexion = conexion
+        return conexion
+
+    def cerrar(self):
+        """Cierra la conexión de este hilo."""
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is not None:
+            conexion.close()
+            self._local.conexion = None
+
+    # =========================
+    # API
+    # =========================
+    def obtener(self, fuente_hash: str, etapa: str):
+        """Objeto guardado para (fuente_hash, etapa) con esta versión; None si no está."""
+        clave = (fuente_hash, self.version, etapa)
+        try:
+            conexion = self._conexion()
+            fila = conexion.execute(
+                'SELECT datos FROM entradas WHERE fuente=? AND version=? AND etapa=?', clave).fetchone()
+            if fila is None:
+                self.fallos += 1
+                return None
+            valor = json.loads(zlib.decompress(fila[0]))
+            with conexion:
+                conexion.execute('UPDATE entradas SET usado=? WHERE fuente=? AND version=? AND etapa=?',
+                                 (time.time(),) + clave)
+        except (sqlite3.Error, zlib.error, ValueError):
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        return valor
+
+    def guardar(self, fuente_hash: str, etapa: str, valor) -> bool:
+        """Guarda 'valor' (serializable a JSON) y desaloja por LRU si se pasa del tamaño máximo."""
+        try:
+            datos = zlib.compress(json.dumps(valor, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 1)
+        except (TypeError, ValueError):
+            return False
+        if len(datos) > self.tam_maximo:
+            return False
+        try:
+            conexion = self._conexion()
+            with conexion:
+                conexion.execute('INSERT OR REPLACE INTO entradas VALUES (?, ?, ?, ?, ?, ?)',
+                                 (fuente_hash, self.version, etapa, datos, len(datos), time.time()))
+                self._desalojar(conexion)
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _desalojar(self, conexion: sqlite3.Connection):
+        total = conexion.execute('SELECT COALESCE(SUM(tam), 0) FROM entradas').fetchone()[0]
+        if total <= self.tam_maximo:
+            return
+        # Las menos usadas primero, hasta quedar en el 90% del máximo
+        exceso = total - self.tam_maximo * 9 // 10
+        borrar = []
+        for rowid, tam in conexion.execute('SELECT rowid, tam FROM entradas ORDER BY usado'):
+            borrar.append((rowid,))
+            exceso -= tam
+            if exceso <= 0:
+                break
+        conexion.executemany('DELETE FROM entradas WHERE rowid=?', borrar)
+
+    def limpiar(self):
+        try:
+            conexion = self._conexion()
+            with conexion:
+                conexion.execute('DELETE FROM entradas')
+        except sqlite3.Error:
+            pass
+
+    def estadisticas(self) -> Dict:
+        """{entradas, bytes, aciertos, fallos} (aciertos/fallos de esta instancia)."""
+        try:
+            entradas, total = self._conexion().execute(
+                'SELECT COUNT(*), COALESCE(SUM(tam), 0) FROM entradas').fetchone()
+        except sqlite3.Error:
+            entradas = total = 0
+        return {'entradas': entradas, 'bytes': total, 'aciertos': self.aciertos, 'fallos': self.fallos}
+
+    # =========================
+    # TokenStream
+    # =========================
+    def stream(self, fuente_hash: str):
+        """TokenStream guardado de 'fuente_hash' (None si no está)."""
+        estado = self.obtener(fuente_hash, 'tokens')
+        if estado is None:
+            return None
+        # Import local para evitar ciclos (token_stream acepta esta caché)
+        from lexer.token_stream import TokenStream
+        try:
+            return TokenStream.desde_estado(fuente_hash, estado)
+        except (TypeError, ValueError):
+            # Entrada con otra forma: fallo de caché
+            return None
+
+    def guardar_stream(self, stream) -> bool:
+        """Guarda 'stream' con su tabla de símbolos (se recolecta si hacía falta)."""
+        return self.guardar(stream.fuente_hash, 'tokens', stream.como_estado())
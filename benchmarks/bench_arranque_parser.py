@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_arranque_parser.py
+"""
+Tiempo de arranque del parser:
+  - en proceso: yacc.yacc() generando el autómata LALR vs cargando el pickle
+  - proceso nuevo: 'import syntactic.analizador_sintactico' con la caché vacía
+    (arranque en frío) y con la caché ya poblada
+
+Uso:  python benchmarks/bench_arranque_parser.py [repeticiones]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+
+def medir_en_proceso(repeticiones):
+    import ply.yacc as yacc
+    from syntactic import analizador_sintactico as sint
+    from lexer.cache_tablas import firma
+
+    reflect = yacc.ParserReflect(vars(sint), log=yacc.NullLogger())
+    reflect.get_all()
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, f"parsetab_{firma(reflect.signature())}.pickle")
+        opciones = dict(module=sint, errorlog=yacc.NullLogger(), write_tables=False, debug=False)
+        yacc.yacc(picklefile=ruta, **opciones)
+
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            yacc.yacc(**opciones)
+        generar = (time.perf_counter() - t0) / repeticiones * 1000
+
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            yacc.yacc(picklefile=ruta, **opciones)
+        cargar = (time.perf_counter() - t0) / repeticiones * 1000
+
+    print(f"{'yacc.yacc() generando LALR (antes)':<44} {generar:>9.2f} ms")
+    print(f"{'yacc.yacc() cargando tablas cacheadas':<44} {cargar:>9.2f} ms")
+    print(f"  -> {generar / cargar:.1f}x más rápido\n")
+
+
+def importar(entorno):
+    codigo = "import syntactic.analizador_sintactico"
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, env=entorno,
+                   check=True, stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - t0) * 1000
+
+
+def medir_procesos(repeticiones):
+    with tempfile.TemporaryDirectory() as tmp:
+        entorno = dict(os.environ, COMPILADOR_CACHE_DIR=tmp)
+        frio = importar(entorno)
+        calientes = sorted(importar(entorno) for _ in range(repeticiones))
+        caliente = calientes[len(calientes) // 2]
+
+    print(f"{'proceso nuevo, caché vacía':<44} {frio:>9.2f} ms")
+    print(f"{'proceso nuevo, caché poblada (mediana)':<44} {caliente:>9.2f} ms")
+    print(f"  -> {frio - caliente:.1f} ms menos por arranque")
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    medir_en_proceso(repeticiones)
+    medir_procesos(repeticiones)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_cache_disco.py
+"""
+Caché de análisis en disco (analysis/cache_disco.py) sobre un fuente grande:
+  - Pipeline.ir() sin caché, con caché fría (calcula y guarda) y con caché
+    caliente (sólo lee)
+  - TokenStream: tokenizar + recolectar símbolos frente a leerlo de la caché
+El resultado leído de la caché debe ser idéntico al calculado.
+
+Uso:  python benchmarks/bench_cache_disco.py [metodos] [rondas]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analysis.cache_disco import CacheAnalisis  # noqa: E402
+from compilador.pipeline import Pipeline  # noqa: E402
+from lexer.token_stream import CacheTokenStreams  # noqa: E402
+from benchmarks.bench_parser_incremental import generar_fuente  # noqa: E402
+
+
+def mejor(funcion, rondas):
+    t = float('inf')
+    for _ in range(rondas):
+        t0 = time.perf_counter()
+        funcion()
+        t = min(t, time.perf_counter() - t0)
+    return t
+
+
+def firma(stream):
+    return ([(t.type, t.value, t.lineno, t.lexpos) for t in stream.tokens],
+            stream.errores, stream.simbolos, stream.altas, stream.estado_tabla)
+
+
+def main():
+    metodos = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rondas = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    fuente = generar_fuente(metodos)
+
+    with tempfile.TemporaryDirectory() as directorio, contextlib.redirect_stdout(io.StringIO()):
+        cache = CacheAnalisis(os.path.join(directorio, 'analisis.sqlite3'))
+        sin_cache = Pipeline()
+        con_cache = Pipeline(cache=cache)
+
+        esperado = sin_cache.ir(fuente)
+        t_sin = mejor(lambda: sin_cache.ir(fuente), rondas)
+
+        def fria():
+            cache.limpiar()
+            con_cache.ir(fuente)
+        t_fria = mejor(fria, rondas)
+        t_caliente = mejor(lambda: con_cache.ir(fuente), rondas)
+        igual_ir = con_cache.ir(fuente) == esperado
+
+        def tokenizar():
+            streams = CacheTokenStreams()
+            streams.obtener(fuente).simbolos
+        streams_disco = CacheTokenStreams(disco=cache)
+        calculado = streams_disco.obtener(fuente)
+
+        def leer():
+            streams_disco.limpiar()  # fuerza el nivel de disco
+            return streams_disco.obtener(fuente)
+        t_tok = mejor(tokenizar, rondas)
+        t_leer = mejor(leer, rondas)
+        igual_tokens = firma(leer()) == firma(calculado)
+        estadisticas = cache.estadisticas()
+
+    print(f"fuente: {metodos} métodos, {len(fuente) / 1024:,.0f} KiB")
+    print(f"{'ir() sin caché':<32} {t_sin * 1000:>9.1f} ms")
+    print(f"{'ir() caché fría (calc + guardar)':<32} {t_fria * 1000:>9.1f} ms  ({t_fria / t_sin:,.2f}x)")
+    print(f"{'ir() caché caliente':<32} {t_caliente * 1000:>9.1f} ms  ({t_sin / t_caliente:,.1f}x más rápido)")
+    print(f"{'TokenStream tokenizar+símbolos':<32} {t_tok * 1000:>9.1f} ms")
+    print(f"{'TokenStream desde la caché':<32} {t_leer * 1000:>9.1f} ms  ({t_tok / t_leer:,.1f}x)")
+    print(f"resultados idénticos: ir {'sí' if igual_ir else 'NO'}, tokens {'sí' if igual_tokens else 'NO'}")
+    print(f"caché: {estadisticas['entradas']} entradas, {estadisticas['bytes'] / 1024:,.0f} KiB comprimidos")
+
+
+if __name__ == '__main__':
+    main()
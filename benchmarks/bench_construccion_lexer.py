@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_construccion_lexer.py
+"""
+Costo de construir el lexer:
+  - lex.lex() desde las reglas (lo que hacía construir_lexer() antes)
+  - lex.lex(optimize) leyendo la lextab cacheada en disco (arranque en frío)
+  - construir_lexer(): clone() del prototipo (cada análisis)
+
+Uso:  python benchmarks/bench_construccion_lexer.py [repeticiones]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ply.lex as lex  # noqa: E402
+
+from lexer import analizador_lexico as al  # noqa: E402
+from lexer.cache_tablas import firma_reglas_lexicas, cargar_modulo, directorio_cache  # noqa: E402
+
+
+def medir(nombre, fn, repeticiones):
+    fn()  # calentamiento
+    t0 = time.perf_counter()
+    for _ in range(repeticiones):
+        fn()
+    total = time.perf_counter() - t0
+    por_llamada = total / repeticiones * 1e6
+    print(f"{nombre:<42} {por_llamada:>12.1f} µs/llamada")
+    return por_llamada
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    reglas = al.ReglasLexicas()
+
+    al.lexer_prototipo()  # asegura la lextab en caché
+    nombre = f"lextab_{firma_reglas_lexicas(reglas)}"
+    ruta = os.path.join(directorio_cache(), nombre + '.py')
+    lextab = cargar_modulo(ruta, nombre)
+
+    print(f"lextab: {ruta}")
+    print(f"repeticiones: {repeticiones}\n")
+
+    base = medir("lex.lex() desde reglas (antes)",
+                 lambda: lex.lex(module=reglas), repeticiones)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        medir("lex.lex(optimize) generando lextab",
+              lambda: lex.lex(module=reglas, optimize=1, lextab=nombre, outputdir=tmp),
+              max(1, repeticiones // 10))
+
+    frio = medir("lex.lex(optimize) con lextab cacheada",
+                 lambda: lex.lex(module=reglas, optimize=1, lextab=lextab), repeticiones)
+    clon = medir("construir_lexer() (clone del prototipo)",
+                 lambda: al.construir_lexer(reglas), repeticiones)
+
+    print(f"\nclone vs lex.lex(): {base / clon:,.0f}x más rápido")
+    print(f"arranque con lextab vs lex.lex(): {base / frio:,.1f}x más rápido")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_ejecucion_ir.py
+"""
+Chequeo de la máquina virtual del IR:
+
+  1. CASOS y PROGRAMAS (los de test_programs/): salida esperada escrita a
+     mano, ejecutados con el intérprete y con el camino compilado (no
+     necesita el JDK)
+  2. cada programa de test_programs/ (o las rutas dadas) con la máquina
+     virtual del IR y con el JDK embebido: compara la salida de ambos y
+     muestra los tiempos. Si el JDK no está o no arranca (javac -version
+     falla) esta parte se saltea
+
+Código de salida: 0 si todo coincide, 1 si algún caso o algún programa
+difiere o falla (en el IR o en el JDK).
+
+Uso:  python benchmarks/bench_ejecucion_ir.py [ruta...]
+"""
+import os
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from compilador.lote import buscar_fuentes  # noqa: E402
+from compilador.pipeline import Pipeline  # noqa: E402
+from intermediate_code.generador_cuadruplos import GeneradorCuadruplos  # noqa: E402
+from intermediate_code.maquina_compilada import MaquinaCompilada  # noqa: E402
+from intermediate_code.maquina_virtual import ErrorEjecucion, MaquinaVirtual  # noqa: E402
+from runners.jdk import entorno_jdk, localizar_jdk  # noqa: E402
+
+PLANTILLA = "public class Caso {\n    public static void main(String[] args) {\n        %s\n    }\n}\n"
+
+# (nombre, cuerpo de main, salida esperada, fragmento del error esperado o None)
+CASOS = (
+    ('do_switch_print',
+     'int i = 0; System.out.print("a"); do { i = i + 1; } while (i < 3); '
+     'switch (i) { case 1: i = 100; }',
+     '', 'no soporta'),
+    ('else_if',
+     'int x = 5; if (x > 3) { System.out.println(1); } else if (x > 1) { System.out.println(2); }',
+     '', 'else sin llaves'),
+    ('metodos',
+     'int x = Math.max(1, 2); System.out.println(x);',
+     '', 'métodos y llamadas'),
+    ('long',
+     'long big = 100000; big = big * big; System.out.println(big);',
+     '', 'no soporta el tipo long'),
+    ('bucles',
+     'int s = 0; int i = 0; while (i < 5) { for (int j = 0; j < i; j++) { s += j; } i++; } '
+     'if (s > 5) { System.out.println("s=" + s); } else { System.out.println("chico"); }',
+     's=10\n', None),
+    ('enteros',
+     'System.out.println(-7 / 2); System.out.println(-7 % 2); '
+     'int x = 2147483647; x = x + 1; System.out.println(x);',
+     '-3\n-1\n-2147483648\n', None),
+    ('reales',
+     'double d = 1; System.out.println(d); System.out.println(1.0 / 0); System.out.println(0.1 + 0.2);',
+     '1.0\nInfinity\n0.30000000000000004\n', None),
+    ('cadenas',
+     'int a = 3; String s = "7"; System.out.println("a"); System.out.println("" + a + 3); '
+     'System.out.println("1" + 2); System.out.println(s + 1); System.out.println("+");',
+     'a\n33\n12\n71\n+\n', None),
+    ('negacion',
+     'boolean f = false; int a = 1; if (!f) { System.out.println("no"); } '
+     'System.out.println(a < 2 && !(a != 1));',
+     'no\ntrue\n', None),
+    ('division_por_cero',
+     'System.out.println("antes"); int a = 0; int b = (10 / a) * 0; System.out.println("after " + b);',
+     'antes\n', 'ArithmeticException'),
+)
+
+
+# test_programs/ -> salida esperada (la de Java)
+PROGRAMAS = {
+    'expresiones.txt': 'Resultado: -58071 a=7, b=3 suma=10\n',
+    'factorial.txt': 'El factorial de 5 es: 120\n',
+    'imparoPar.txt': 'El número es impar.\n',
+}
+
+
+def _casos():
+    """(nombre, fuente, salida esperada, fragmento del error esperado) de CASOS y PROGRAMAS."""
+    for nombre, cuerpo, esperada, error_esperado in CASOS:
+        yield nombre, PLANTILLA % cuerpo, esperada, error_esperado
+    for nombre, esperada in PROGRAMAS.items():
+        with open(os.path.join(RAIZ, 'test_programs', nombre), encoding='utf-8') as archivo:
+            yield nombre, archivo.read(), esperada, None
+
+
+def _correr_caso(clase, generador):
+    """(salida, error) de ejecutar los cuádruplos de 'generador' en la máquina 'clase'."""
+    try:
+        maquina = clase(generador.cuadruplos, generador.tabla_simbolos, generador.no_soportadas)
+        return maquina.ejecutar(), None
+    except ErrorEjecucion as e:
+        return e.salida, str(e)
+
+
+def chequear_casos() -> int:
+    """Ejecuta CASOS y PROGRAMAS; devuelve cuántas ejecuciones no dieron la salida o el error esperado."""
+    print(f"{'caso':<28} {'intérprete':>11} {'compilada':>11}")
+    distintos = 0
+    for nombre, fuente, esperada, error_esperado in _casos():
+        generador = GeneradorCuadruplos()
+        generador.generar_desde_codigo(fuente)
+        estados = []
+        for clase in (MaquinaVirtual, MaquinaCompilada):
+            salida, error = _correr_caso(clase, generador)
+            if error_esperado is None:
+                bien = error is None and salida == esperada
+            else:
+                bien = error is not None and error_esperado in error and salida == esperada
+            estados.append('ok' if bien else 'DISTINTA')
+            if not bien:
+                distintos += 1
+                print(f"  {clase.__name__}: {salida!r} {error or ''}\n"
+                      f"  esperado: {esperada!r} {error_esperado or ''}")
+        print(f"{nombre:<28} {estados[0]:>11} {estados[1]:>11}")
+    return distintos
+
+
+def _jdk_disponible() -> bool:
+    """True si el JDK embebido está instalado y 'javac -version' corre; si no, avisa por stderr."""
+    rutas = localizar_jdk()
+    if not (rutas['java'] and rutas['javac']):
+        print("JDK embebido no instalado: no se compara con Java", file=sys.stderr)
+        return False
+    try:
+        prueba = subprocess.run([rutas['javac'], '-version'], env=entorno_jdk(rutas),
+                                capture_output=True, text=True, timeout=60)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"El JDK embebido no arranca ({e}): no se compara con Java", file=sys.stderr)
+        return False
+    if prueba.returncode != 0:
+        detalle = (prueba.stderr.strip().splitlines() or [''])[0]
+        print(f"El JDK embebido no arranca ({detalle}): no se compara con Java", file=sys.stderr)
+        return False
+    return True
+
+
+def comparar_con_jdk(rutas) -> int:
+    """Ejecuta cada programa en el IR y en el JDK; devuelve cuántos difieren o fallan."""
+    pipeline = Pipeline()
+    print(f"\n{'programa':<28} {'IR':>9} {'JDK':>9} {'resultado':>10}")
+    distintos = 0
+    for ruta in rutas:
+        with open(ruta, encoding='utf-8') as archivo:
+            codigo = archivo.read()
+        analisis = pipeline.analizar(codigo)
+        ir = pipeline.ejecutar_ir(codigo, analisis)['ejecucion_ir']
+
+        t_jdk = None
+        if ir is None:
+            estado = 'no compila'
+            distintos += 1
+        else:
+            t0 = time.perf_counter()
+            jdk = pipeline.ejecutar(codigo, analisis=analisis)['ejecucion']
+            t_jdk = time.perf_counter() - t0
+            salida_jdk = (jdk['ejecucion'] or {}).get('stdout', '').replace('\r\n', '\n')
+            fallida = next((jdk[etapa] for etapa in ('compilacion', 'ejecucion')
+                            if jdk[etapa] is not None and jdk[etapa]['codigo'] != 0), None)
+            if jdk['error'] is not None or fallida is not None:
+                estado = 'error JDK'
+                distintos += 1
+                detalle = jdk['error'] or (fallida['stderr'].strip().splitlines() or [''])[0]
+                print(f"  JDK: {detalle}")
+            elif ir['error'] is None and salida_jdk == ir['salida']:
+                estado = 'igual'
+            else:
+                estado = 'DISTINTA'
+                distintos += 1
+                print(f"  IR:  {ir['salida']!r} {ir['error'] or ''}\n  JDK: {salida_jdk!r}")
+
+        t_ir = f"{ir['segundos'] * 1000:.1f}ms" if ir else '-'
+        t_jdk = f"{t_jdk * 1000:.0f}ms" if t_jdk is not None else '-'
+        print(f"{os.path.basename(ruta):<28} {t_ir:>9} {t_jdk:>9} {estado:>10}")
+    return distintos
+
+
+def main():
+    distintos = chequear_casos()
+    if _jdk_disponible():
+        distintos += comparar_con_jdk(buscar_fuentes(sys.argv[1:] or [os.path.join(RAIZ, 'test_programs')]))
+    if distintos:
+        print(f"\n{distintos} resultado(s) distinto(s)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_escaner_rapido.py
+"""
+Tokenizar un fuente grande:
+  - tokenizar() con el lexer PLY
+  - tokenizar_rapido() con el escáner escrito a mano (y escanear() solo)
+y, aparte, la recolección de la tabla de símbolos sobre esos tokens (se hace
+sólo cuando alguien pide la tabla).
+
+Se toma el mejor de varias rondas intercaladas. Antes se hace la prueba
+diferencial: ambos TokenStream deben ser idénticos (tokens, errores, símbolos
+y altas) sobre test_programs/ y variantes con ediciones al azar.
+
+Código de salida: 1 si la prueba diferencial o el fuente grande dan algún
+token o error distinto, 0 si no.
+
+Uso:  python benchmarks/bench_escaner_rapido.py [metodos] [rondas]
+"""
+import contextlib
+import glob
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer.analizador_lexico import ReglasLexicas, construir_lexer  # noqa: E402
+from lexer.escaner_rapido import escanear  # noqa: E402
+from lexer.recolector_simbolos import recolectar_simbolos  # noqa: E402
+from lexer.token_stream import tokenizar, tokenizar_rapido  # noqa: E402
+from benchmarks.bench_parser_incremental import generar_fuente  # noqa: E402
+
+
+def firma(stream):
+    return ([(t.type, t.value, t.lineno, t.lexpos) for t in stream.tokens],
+            stream.errores, stream.simbolos, stream.altas, stream.estado_tabla)
+
+
+def variantes(fuentes, por_fuente=200, semilla=0):
+    """Cada fuente con algunas inserciones/borrados al azar (errores léxicos incluidos)."""
+    azar = random.Random(semilla)
+    piezas = list('abz09_ \t\n\r"\'{}()[];,.:?@#$+-*/%<>=!&|^~') + ['//', '/*', '*/', 'int ', 'main', '3.5']
+    for fuente in fuentes:
+        yield fuente
+        for _ in range(por_fuente):
+            texto = list(fuente)
+            for _ in range(azar.randint(1, 6)):
+                i = azar.randrange(len(texto) + 1)
+                if azar.random() < 0.6:
+                    texto.insert(i, azar.choice(piezas))
+                elif texto:
+                    del texto[min(i, len(texto) - 1)]
+            yield ''.join(texto)
+
+
+def diferencias(fuentes, reglas, lexer):
+    """Fuentes para las que PLY y el escáner rápido no producen el mismo TokenStream."""
+    return [f for f in fuentes
+            if firma(tokenizar(f, 'x', reglas, lexer)) != firma(tokenizar_rapido(f, 'x'))]
+
+
+def main():
+    metodos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    rondas = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    fuente = generar_fuente(metodos)
+    reglas = ReglasLexicas()
+    lexer = construir_lexer(reglas)
+
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    programas = [open(ruta, encoding='utf-8').read()
+                 for ruta in sorted(glob.glob(os.path.join(raiz, 'test_programs', '*.txt')))]
+    corpus = list(variantes(programas))
+    with contextlib.redirect_stdout(io.StringIO()):
+        distintos = diferencias(corpus, reglas, lexer)
+
+    casos = {
+        'PLY tokenizar()': lambda: tokenizar(fuente, 'bench', reglas, lexer),
+        'tokenizar_rapido()': lambda: tokenizar_rapido(fuente, 'bench'),
+        'escanear()': lambda: escanear(fuente),
+    }
+    mejores = {nombre: float('inf') for nombre in casos}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(rondas):
+            for nombre, caso in casos.items():
+                t0 = time.perf_counter()
+                caso()
+                mejores[nombre] = min(mejores[nombre], time.perf_counter() - t0)
+        iguales = firma(casos['PLY tokenizar()']()) == firma(casos['tokenizar_rapido()']())
+
+        tokens = tokenizar_rapido(fuente, 'bench').tokens
+        t_simbolos = float('inf')
+        for _ in range(rondas):
+            t0 = time.perf_counter()
+            recolectar_simbolos(tokens)
+            t_simbolos = min(t_simbolos, time.perf_counter() - t0)
+
+    n = len(tokens)
+    base = mejores['PLY tokenizar()']
+    print(f"fuente: {metodos} métodos, {len(fuente) / 1024:,.0f} KiB, {n} tokens")
+    for nombre, t in mejores.items():
+        print(f"{nombre:<28} {t * 1000:>9.2f} ms  {n / t / 1e6:>5.2f} Mtok/s  ({base / t:,.1f}x)")
+    print(f"{'recolectar_simbolos()':<28} {t_simbolos * 1000:>9.2f} ms  (al pedir la tabla)")
+    print(f"TokenStream {'idéntico' if iguales else 'DIFERENTE'}")
+    print(f"prueba diferencial: {len(corpus)} fuentes, {len(distintos)} diferencia(s)")
+    if distintos or not iguales:
+        for f in distintos[:3]:
+            print(f"  distinto: {f[:60]!r}...", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
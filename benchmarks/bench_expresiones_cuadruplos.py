@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_expresiones_cuadruplos.py
+"""
+Cuádruplos de expresiones largas: la pasada lineal con pila de operadores
+(GeneradorCuadruplos._procesar_expresion_completa) frente a la partición
+recursiva anterior (_procesar_expresion_recursiva).
+
+La recursiva re-escanea la lista por cada nivel de precedencia y copia dos
+sublistas en cada operador: crece cuadráticamente y, con miles de términos,
+se pasa del límite de recursión de Python. Antes de medir se comprueba que
+ambas emiten los mismos cuádruplos donde la recursiva llega.
+
+Uso:  python benchmarks/bench_expresiones_cuadruplos.py [terminos_max]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer.escaner_rapido import escanear  # noqa: E402
+from intermediate_code.generador_cuadruplos import GeneradorCuadruplos  # noqa: E402
+
+
+def expresion(terminos):
+    """Suma de 'terminos' términos con productos y paréntesis intercalados."""
+    partes = []
+    for i in range(terminos):
+        if i % 7 == 3:
+            partes.append(f'(a{i} - {i}) * b{i}')
+        elif i % 5 == 1:
+            partes.append(f'a{i} * {i} % 3')
+        else:
+            partes.append(f'a{i}')
+    return ' + '.join(partes)
+
+
+def tokens_de(texto):
+    tokens, _ = escanear(texto)
+    return tokens
+
+
+def generar(tokens, recursiva):
+    generador = GeneradorCuadruplos()
+    metodo = generador._procesar_expresion_recursiva if recursiva else generador._procesar_expresion_completa
+    t0 = time.perf_counter()
+    resultado = metodo(tokens)
+    t = time.perf_counter() - t0
+    return t, resultado, [str(c) for c in generador.cuadruplos]
+
+
+def main():
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    tokens = tokens_de(expresion(200))
+    iguales = generar(tokens, True)[1:] == generar(tokens, False)[1:]
+    print(f"lineal == recursiva (200 términos): {'sí' if iguales else 'NO'}")
+
+    print(f"{'términos':>9} {'tokens':>8} {'recursiva':>12} {'lineal':>12} {'cuádruplos':>11}")
+    terminos = 100
+    while terminos <= maximo:
+        tokens = tokens_de(expresion(terminos))
+        t_l, _, cuadruplos = generar(tokens, False)
+        try:
+            t_r = f"{generar(tokens, True)[0] * 1000:9.1f} ms"
+        except RecursionError:
+            t_r = 'RecursionError'
+        print(f"{terminos:>9} {len(tokens):>8} {t_r:>12} {t_l * 1000:9.1f} ms {len(cuadruplos):>11}")
+        terminos *= 10 if terminos >= 1000 else 2 if terminos < 400 else 2.5
+        terminos = int(terminos)
+
+
+if __name__ == '__main__':
+    main()
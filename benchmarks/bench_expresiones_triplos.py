@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_expresiones_triplos.py
+"""
+Triplos de expresiones: la pasada lineal con pila de operandos
+(GeneradorTriplos._procesar_expresion_optimizada) frente a la partición
+recursiva anterior (_procesar_expresion_recursiva).
+
+  1. Corpus de regresión: cada programa de test_programs/ (expresiones.txt
+     junta precedencias, paréntesis anidados, unarios y concatenaciones) debe
+     dar los mismos triplos y cuádruplos con ambas versiones.
+  2. Escalado con sumas largas (ver bench_expresiones_cuadruplos.py).
+
+Uso:  python benchmarks/bench_expresiones_triplos.py [terminos_max]
+"""
+import glob
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from lexer.escaner_rapido import escanear  # noqa: E402
+from intermediate_code.generador_cuadruplos import GeneradorCuadruplos  # noqa: E402
+from intermediate_code.generador_triplos import GeneradorTriplos  # noqa: E402
+from benchmarks.bench_expresiones_cuadruplos import expresion  # noqa: E402
+
+
+def recursivo(generador):
+    """Generador que usa la partición recursiva en lugar de la pasada lineal."""
+    if isinstance(generador, GeneradorTriplos):
+        generador._procesar_expresion_optimizada = generador._procesar_expresion_recursiva
+    else:
+        generador._procesar_expresion_completa = generador._procesar_expresion_recursiva
+    return generador
+
+
+def salida(clase, codigo, tokens, usar_recursiva):
+    generador = clase()
+    if usar_recursiva:
+        recursivo(generador)
+    return [str(x) for x in generador.generar_desde_codigo(codigo, tokens)]
+
+
+def corpus():
+    """(nombre, triplos iguales, cuádruplos iguales, cantidad de triplos) por programa."""
+    filas = []
+    for ruta in sorted(glob.glob(os.path.join(RAIZ, 'test_programs', '*.txt'))):
+        with open(ruta, encoding='utf-8') as archivo:
+            codigo = archivo.read()
+        tokens, _ = escanear(codigo)
+        triplos = salida(GeneradorTriplos, codigo, tokens, False)
+        filas.append((os.path.basename(ruta),
+                      triplos == salida(GeneradorTriplos, codigo, tokens, True),
+                      salida(GeneradorCuadruplos, codigo, tokens, False)
+                      == salida(GeneradorCuadruplos, codigo, tokens, True),
+                      len(triplos)))
+    return filas
+
+
+def medir(tokens, usar_recursiva):
+    generador = GeneradorTriplos()
+    metodo = generador._procesar_expresion_recursiva if usar_recursiva else generador._procesar_expresion_optimizada
+    t0 = time.perf_counter()
+    metodo(tokens)
+    return time.perf_counter() - t0, len(generador.triplos)
+
+
+def main():
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    for nombre, triplos, cuadruplos, n in corpus():
+        print(f"{nombre:<20} {n:>4} triplos  triplos {'==' if triplos else '!='}  "
+              f"cuádruplos {'==' if cuadruplos else '!='}")
+
+    print(f"\n{'términos':>9} {'tokens':>8} {'recursiva':>14} {'lineal':>12} {'triplos':>8}")
+    for terminos in (100, 200, 400, 1000, 10000, 100000):
+        if terminos > maximo:
+            break
+        tokens, _ = escanear(expresion(terminos))
+        t_l, n = medir(tokens, False)
+        try:
+            t_r = f"{medir(tokens, True)[0] * 1000:9.1f} ms"
+        except RecursionError:
+            t_r = 'RecursionError'
+        print(f"{terminos:>9} {len(tokens):>8} {t_r:>14} {t_l * 1000:9.1f} ms {n:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_flujo_archivo.py
+"""
+Tokenizar un archivo grande en flujo (lexer/flujo_archivo.py) frente a leerlo
+entero y pasarlo por escanear():
+  - tiempo de cada uno
+  - pico de memoria (tracemalloc) consumiendo los tokens uno a uno
+
+El pico del flujo debe quedar acotado (bloque + literal más largo) aunque el
+archivo crezca. Antes se comprueba que ambos dan los mismos tokens sobre un
+archivo chico, con bloques pequeños para forzar cortes en cualquier punto.
+
+Uso:  python benchmarks/bench_flujo_archivo.py [metodos] [bloque_kib]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer.escaner_rapido import escanear  # noqa: E402
+from lexer.flujo_archivo import tokens_archivo  # noqa: E402
+from benchmarks.bench_parser_incremental import generar_fuente  # noqa: E402
+
+
+def firma(tokens):
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in tokens]
+
+
+def firma_completa(codigo):
+    """Tokens de escanear() con los errores intercalados como tokens 'ERROR'."""
+    tokens, errores = escanear(codigo)
+    salida = firma(tokens) + [('ERROR', e['valor'], e['linea'], e['posicion']) for e in errores]
+    return sorted(salida, key=lambda t: t[3])
+
+
+def escribir(directorio, nombre, codigo):
+    ruta = os.path.join(directorio, nombre)
+    with open(ruta, 'w', encoding='utf-8', newline='') as archivo:
+        archivo.write(codigo)
+    return ruta
+
+
+def medir(funcion):
+    """(segundos, pico de memoria en bytes, tokens) de consumir funcion()."""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    n = funcion()
+    t = time.perf_counter() - t0
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return t, pico, n
+
+
+def contar_flujo(ruta, tam_bloque):
+    return lambda: sum(1 for _ in tokens_archivo(ruta, tam_bloque))
+
+
+def contar_entero(ruta):
+    def funcion():
+        with open(ruta, encoding='utf-8', newline='') as archivo:
+            tokens, errores = escanear(archivo.read())
+        return len(tokens) + len(errores)
+    return funcion
+
+
+def main():
+    metodos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    tam_bloque = (int(sys.argv[2]) if len(sys.argv) > 2 else 256) * 1024
+
+    with tempfile.TemporaryDirectory() as directorio:
+        chico = generar_fuente(50) + '/* sin cerrar "ñ\n'
+        ruta = escribir(directorio, 'chico.java', chico)
+        esperado = firma_completa(chico)
+        iguales = all(firma(tokens_archivo(ruta, tam)) == esperado for tam in (16, 17, 64, 1 << 20))
+        print(f"flujo == escanear() (bloques 16/17/64/1M B): {'sí' if iguales else 'NO'}")
+
+        for factor in (1, 4):
+            codigo = generar_fuente(metodos * factor)
+            ruta = escribir(directorio, f'fuente_{factor}.java', codigo)
+            del codigo
+            tamano = os.path.getsize(ruta)
+            t_e, pico_e, n = medir(contar_entero(ruta))
+            t_f, pico_f, _ = medir(contar_flujo(ruta, tam_bloque))
+            print(f"archivo {tamano / 2**20:,.1f} MiB, {n} tokens")
+            print(f"  {'escanear(archivo entero)':<26} {t_e * 1000:>9.1f} ms  pico {pico_e / 2**20:>8.1f} MiB")
+            print(f"  {'tokens_archivo() en flujo':<26} {t_f * 1000:>9.1f} ms  pico {pico_f / 2**20:>8.1f} MiB")
+
+
+if __name__ == '__main__':
+    main()
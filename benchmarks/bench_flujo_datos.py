@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_flujo_datos.py
+"""
+Escalado de los análisis de flujo de datos (intermediate_code/flujo_datos.py)
+sobre métodos generados cada vez más grandes: construcción del CFG, vivas,
+definiciones alcanzantes (+ usos sin definir) y expresiones disponibles.
+
+El tiempo por cuádruplo debe mantenerse aproximadamente constante.
+
+Uso:  python benchmarks/bench_flujo_datos.py [sentencias_max]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intermediate_code.cfg import GrafoFlujo  # noqa: E402
+from intermediate_code.flujo_datos import AnalisisFlujoDatos  # noqa: E402
+from intermediate_code.generador_cuadruplos import GeneradorCuadruplos  # noqa: E402
+
+VARIABLES = [f'v{i}' for i in range(24)]
+
+
+def expresion(aleatorio):
+    a, b, c = (aleatorio.choice(VARIABLES + ['1', '2', '7']) for _ in range(3))
+    return f'{a} {aleatorio.choice("+-*")} {b} {aleatorio.choice("+-*/")} {c}'
+
+
+def sentencias(aleatorio, cantidad, profundidad=0):
+    partes = []
+    while cantidad > 0:
+        r = aleatorio.random()
+        if profundidad < 2 and r < 0.1:
+            n = min(cantidad, aleatorio.randint(2, 8))
+            partes.append(f'if ({expresion(aleatorio)} > 3) {{ {sentencias(aleatorio, n, profundidad + 1)} }} '
+                          f'else {{ {sentencias(aleatorio, 2, profundidad + 1)} }}')
+            cantidad -= n + 2
+        elif profundidad < 2 and r < 0.15:
+            n = min(cantidad, aleatorio.randint(2, 8))
+            partes.append(f'while ({aleatorio.choice(VARIABLES)} < 10) {{ {sentencias(aleatorio, n, profundidad + 1)} }}')
+            cantidad -= n
+        else:
+            partes.append(f'{aleatorio.choice(VARIABLES)} = {expresion(aleatorio)};')
+            cantidad -= 1
+    return ' '.join(partes)
+
+
+def programa(cantidad):
+    aleatorio = random.Random(cantidad)
+    declaraciones = ' '.join(f'int {v} = {i};' for i, v in enumerate(VARIABLES))
+    return ('public class Grande { public static void main(String[] args) { '
+            f'{declaraciones} {sentencias(aleatorio, cantidad)} System.out.println(v0); }} }}')
+
+
+def medir(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - t0, resultado
+
+
+def main():
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 16000
+
+    print(f"{'sentencias':>10} {'cuádruplos':>10} {'bloques':>8} {'nombres':>8} "
+          f"{'cfg':>8} {'vivas':>8} {'alcanz.':>8} {'dispon.':>8} {'µs/cuád.':>9}")
+    cantidad = 1000
+    while cantidad <= maximo:
+        generador = GeneradorCuadruplos()
+        generador.generar_desde_codigo(programa(cantidad))
+        cuadruplos = generador.cuadruplos
+
+        t_cfg, grafo = medir(lambda: GrafoFlujo(cuadruplos))
+        analisis = AnalisisFlujoDatos(grafo, generador.tabla_simbolos)
+        t_vivas, _ = medir(analisis.vivas)
+        t_alc, _ = medir(lambda: (analisis.definiciones_alcanzantes(), analisis.usos_sin_definir()))
+        t_disp, _ = medir(analisis.expresiones_disponibles)
+        total = t_cfg + t_vivas + t_alc + t_disp
+        print(f"{cantidad:>10} {len(cuadruplos):>10} {len(grafo.bloques):>8} {len(analisis.nombres):>8} "
+              f"{t_cfg * 1000:>6.1f}ms {t_vivas * 1000:>6.1f}ms {t_alc * 1000:>6.1f}ms {t_disp * 1000:>6.1f}ms "
+              f"{total / len(cuadruplos) * 1e6:>9.2f}")
+        cantidad *= 2
+
+
+if __name__ == '__main__':
+    main()
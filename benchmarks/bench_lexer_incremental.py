@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_lexer_incremental.py
+"""
+Re-tokenizar tras teclear un carácter en un archivo de ~10k líneas:
+  - tokenizar() completo (lo que hacía el análisis en vivo)
+  - LexerIncremental.actualizar() (sólo las líneas afectadas), mediana de
+    TECLAS caracteres tecleados seguidos en el mismo lugar
+
+Compara el resultado final con tokenizar() del mismo texto.
+
+Uso:  python benchmarks/bench_lexer_incremental.py [lineas]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer.incremental import LexerIncremental  # noqa: E402
+from lexer.token_stream import tokenizar  # noqa: E402
+
+TECLAS = 50
+
+
+def generar_fuente(lineas):
+    cuerpo = [
+        "        int a{n} = {n} * 2 + 1;",
+        "        /* comentario {n}",
+        "           de bloque */",
+        "        String s{n} = \"texto {n}\";",
+        "        if (a{n} > 10) {{ a{n} = a{n} - 1; }}",
+        "        // comentario de línea {n}",
+    ]
+    salida = ["public class Grande {", "    public static void main(String[] args) {"]
+    n = 0
+    while len(salida) < lineas - 2:
+        salida.append(cuerpo[n % len(cuerpo)].format(n=n))
+        n += 1
+    salida += ["    }", "}"]
+    return "\n".join(salida) + "\n"
+
+
+def como_tuplas(tokens):
+    return [(t.type, t.value, t.lineno, t.lexpos) for t in tokens]
+
+
+def main():
+    lineas = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    fuente = generar_fuente(lineas)
+    ediciones = {
+        'inicio': fuente.index('int a0') + 4,
+        'medio': len(fuente) // 2,
+        'final': len(fuente) - 4,
+    }
+
+    silencio = contextlib.redirect_stdout(io.StringIO())
+    with silencio:
+        t0 = time.perf_counter()
+        completo = tokenizar(fuente)
+        t_completo = time.perf_counter() - t0
+
+    print(f"fuente: {lineas} líneas, {len(completo.tokens)} tokens")
+    print(f"{'tokenizar() completo':<34} {t_completo * 1000:>9.2f} ms\n")
+
+    for nombre, pos in ediciones.items():
+        incremental = LexerIncremental()
+        with contextlib.redirect_stdout(io.StringIO()):
+            incremental.actualizar(fuente)
+            editado = fuente
+            tiempos = []
+            for _ in range(TECLAS):
+                editado = editado[:pos] + 'x' + editado[pos:]
+                t0 = time.perf_counter()
+                tokens = incremental.actualizar(editado)
+                tiempos.append(time.perf_counter() - t0)
+            t_inc = sorted(tiempos)[TECLAS // 2]
+
+            esperado = tokenizar(editado)
+        iguales = como_tuplas(tokens) == como_tuplas(esperado.tokens)
+        print(f"{'incremental, edición al ' + nombre:<34} {t_inc * 1000:>9.2f} ms"
+              f"  ({incremental.lineas_relexadas} línea(s) re-tokenizadas,"
+              f" {t_completo / t_inc:,.0f}x, {'idéntico' if iguales else 'DIFERENTE'})")
+
+
+if __name__ == '__main__':
+    main()
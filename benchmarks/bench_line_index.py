@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_line_index.py
+"""
+Convertir offsets de errores a (línea, columna) en un fuente con un error por línea:
+  - rfind/count sobre el texto por cada error (lo que hacían los diagnósticos)
+  - LineIndex (bisect sobre los inicios de línea, construido una vez)
+y el tiempo total de diagnose() sobre ese fuente.
+
+Uso:  python benchmarks/bench_line_index.py [lineas]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from diagnostics.java_diagnostics import diagnose  # noqa: E402
+from lexer.line_index import LineIndex  # noqa: E402
+
+
+def con_rfind(src, offsets):
+    salida = []
+    for idx in offsets:
+        linea = src.count('\n', 0, idx) + 1
+        prev = src.rfind('\n', 0, idx)
+        salida.append((linea, idx + 1 if prev < 0 else idx - prev))
+    return salida
+
+
+def con_indice(src, offsets):
+    indice = LineIndex(src)
+    return [indice.linea_col(idx) for idx in offsets]
+
+
+def main():
+    lineas = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    # Cada línea deja un ')' sin apertura: un error estructural por línea
+    fuente = "\n".join(f"        int a{n} = {n} * 2);" for n in range(lineas)) + "\n"
+    offsets = [i for i, c in enumerate(fuente) if c == ')']
+
+    t0 = time.perf_counter()
+    esperado = con_rfind(fuente, offsets)
+    t_rfind = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    obtenido = con_indice(fuente, offsets)
+    t_indice = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    errores = diagnose(fuente, [])
+    t_diag = time.perf_counter() - t0
+
+    print(f"fuente: {lineas} líneas, {len(offsets)} errores")
+    print(f"{'rfind/count por error':<30} {t_rfind * 1000:>9.2f} ms")
+    print(f"{'LineIndex (incluye construirlo)':<30} {t_indice * 1000:>9.2f} ms"
+          f"  ({t_rfind / t_indice:,.0f}x, {'idéntico' if obtenido == esperado else 'DIFERENTE'})")
+    print(f"{'diagnose() completo':<30} {t_diag * 1000:>9.2f} ms  ({len(errores)} errores)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_lote.py
+"""
+Análisis por lotes (compilador/lote.py) de muchos programas chicos, como los
+de test_programs/, con distinta cantidad de procesos de trabajo:
+  - archivos por segundo y aceleración respecto de 1 proceso
+  - el reporte debe ser el mismo con cualquier cantidad de procesos
+
+La aceleración está limitada por los núcleos de la máquina (os.cpu_count()).
+
+Uso:  python benchmarks/bench_lote.py [archivos] [procesos...]
+"""
+import contextlib
+import glob
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compilador.lote import Reporte, analizar_lote, buscar_fuentes  # noqa: E402
+from benchmarks.bench_escaner_rapido import variantes  # noqa: E402
+
+
+def escribir_programas(directorio, cantidad):
+    """'cantidad' variantes (algunas con errores) de los programas de test_programs/."""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    programas = [open(ruta, encoding='utf-8').read()
+                 for ruta in sorted(glob.glob(os.path.join(raiz, 'test_programs', '*.txt')))]
+    fuentes = list(variantes(programas, por_fuente=cantidad // len(programas) + 1, semilla=7))
+    random.Random(7).shuffle(fuentes)
+    for i, fuente in enumerate(fuentes[:cantidad]):
+        with open(os.path.join(directorio, f'programa_{i:05d}.java'), 'w', encoding='utf-8') as archivo:
+            archivo.write(fuente)
+
+
+def sin_tiempos(reporte):
+    datos = reporte.como_dict()
+    datos['resumen'].pop('segundos')
+    datos['archivos'] = [{k: v for k, v in r.items() if k != 'segundos'} for r in datos['archivos']]
+    return datos
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    nucleos = os.cpu_count() or 1
+    procesos = [int(p) for p in sys.argv[2:]] or sorted({1, 2, nucleos})
+
+    with tempfile.TemporaryDirectory() as directorio:
+        escribir_programas(directorio, cantidad)
+        rutas = buscar_fuentes([directorio])
+
+        reportes = {}
+        for n in procesos:
+            reporte = Reporte()
+            t0 = time.perf_counter()
+            with contextlib.redirect_stderr(io.StringIO()):
+                for resultado in analizar_lote(rutas, n):
+                    reporte.agregar(resultado)
+            reporte.segundos = time.perf_counter() - t0
+            reportes[n] = reporte
+
+    base = reportes[procesos[0]].segundos
+    resumen = reportes[procesos[0]].resumen()
+    print(f"{len(rutas)} archivos ({resumen['ok']} sin errores), {nucleos} núcleo(s)")
+    for n, reporte in reportes.items():
+        print(f"{n:>3} proceso(s) {reporte.segundos:>8.2f} s  {len(rutas) / reporte.segundos:>8.0f} archivos/s"
+              f"  ({base / reporte.segundos:,.2f}x)")
+    iguales = all(sin_tiempos(r) == sin_tiempos(reportes[procesos[0]]) for r in reportes.values())
+    print(f"reporte idéntico con cualquier cantidad de procesos: {'sí' if iguales else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_maquina_virtual.py
+"""
+Intérprete de cuádruplos (MaquinaVirtual, despacho por operador en cada
+instrucción) contra el camino compilado (MaquinaCompilada, el programa
+traducido a Python una sola vez) sobre test_programs/factorial.txt con el
+'for' escalado a N iteraciones. Las dos salidas tienen que coincidir.
+
+Uso:  python benchmarks/bench_maquina_virtual.py [N]
+"""
+import os
+import re
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from intermediate_code.generador_cuadruplos import GeneradorCuadruplos  # noqa: E402
+from intermediate_code.maquina_compilada import MaquinaCompilada  # noqa: E402
+from intermediate_code.maquina_virtual import MaquinaVirtual  # noqa: E402
+
+
+def programa(iteraciones: int) -> str:
+    with open(os.path.join(RAIZ, 'test_programs', 'factorial.txt'), encoding='utf-8') as archivo:
+        fuente = archivo.read()
+    return re.sub(r'int numero = \d+;', f'int numero = {iteraciones};', fuente)
+
+
+def medir(funcion):
+    t0 = time.perf_counter()
+    resultado = funcion()
+    return time.perf_counter() - t0, resultado
+
+
+def main():
+    iteraciones = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    generador = GeneradorCuadruplos()
+    generador.generar_desde_codigo(programa(iteraciones))
+    cuadruplos, variables = generador.cuadruplos, generador.tabla_simbolos
+
+    interprete = MaquinaVirtual(cuadruplos, variables)
+    t_interprete, salida_interprete = medir(lambda: interprete.ejecutar(None))
+    t_carga, compilada = medir(lambda: MaquinaCompilada(cuadruplos, variables))
+    t_compilada, salida_compilada = medir(lambda: compilada.ejecutar(None))
+
+    if salida_interprete != salida_compilada or interprete.pasos != compilada.pasos:
+        print("Las salidas difieren:", repr(salida_interprete), repr(salida_compilada), file=sys.stderr)
+        return 1
+
+    print(f"iteraciones: {iteraciones}  cuádruplos: {len(cuadruplos)}  instrucciones: {interprete.pasos}")
+    print(f"salida: {salida_interprete.strip()}")
+    print(f"{'intérprete':<12} {t_interprete:>8.3f}s  {t_interprete / interprete.pasos * 1e9:>7.1f} ns/instr.")
+    print(f"{'compilada':<12} {t_compilada:>8.3f}s  {t_compilada / compilada.pasos * 1e9:>7.1f} ns/instr."
+          f"  (+{t_carga * 1000:.1f}ms de compilación)")
+    print(f"aceleración: {t_interprete / t_compilada:.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_parser_incremental.py
+"""
+Re-parsear una clase grande tras editar UN método:
+  - prueba_sintactica() completo (lo que hacía el botón Sintáctico)
+  - ParserIncremental.analizar() (sólo el método editado + el esqueleto)
+
+Compara los mensajes y el AST de ambos.
+
+Uso:  python benchmarks/bench_parser_incremental.py [metodos]
+"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer.token_stream import obtener_token_stream  # noqa: E402
+from syntactic.analizador_sintactico import prueba_sintactica, contexto_global  # noqa: E402
+from syntactic.incremental import ParserIncremental  # noqa: E402
+
+
+def generar_fuente(metodos):
+    salida = ["public class Grande {", "    static int total = 0;"]
+    for n in range(metodos):
+        salida += [
+            f"    static int metodo{n}(int x) {{",
+            f"        int a{n} = x * 2 + {n};",
+            f"        while (a{n} > 10) {{ a{n} = a{n} - 3; }}",
+            f"        if (a{n} % 2 == 0) {{ total = total + a{n}; }} else {{ total = total - 1; }}",
+            f"        return a{n};",
+            "    }",
+        ]
+    salida += [
+        "    public static void main(String[] args) {",
+        "        int r = metodo0(5);",
+        "        System.out.println(r);",
+        "    }",
+        "}",
+    ]
+    return "\n".join(salida) + "\n"
+
+
+def main():
+    metodos = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    fuente = generar_fuente(metodos)
+    editado = fuente.replace(f"x * 2 + {metodos // 2};", f"x * 3 + {metodos // 2};")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Tokens ya en caché en ambos casos: se mide sólo el parseo
+        obtener_token_stream(fuente)
+        obtener_token_stream(editado)
+
+        t0 = time.perf_counter()
+        esperado = list(prueba_sintactica(editado))
+        t_completo = time.perf_counter() - t0
+        ast_esperado = contexto_global.ast
+
+        incremental = ParserIncremental()
+        incremental.analizar(fuente)
+        t0 = time.perf_counter()
+        obtenido = list(incremental.analizar(editado))
+        t_inc = time.perf_counter() - t0
+        iguales = obtenido == esperado and contexto_global.ast == ast_esperado
+
+    print(f"fuente: {metodos} métodos, {fuente.count(chr(10))} líneas")
+    print(f"{'prueba_sintactica() completo':<36} {t_completo * 1000:>9.2f} ms")
+    print(f"{'incremental, un método editado':<36} {t_inc * 1000:>9.2f} ms"
+          f"  ({incremental.partes_reparseadas}/{incremental.partes_totales} parte(s) re-parseadas,"
+          f" {t_completo / t_inc:,.1f}x, {'idéntico' if iguales else 'DIFERENTE'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_reutilizacion_temporales.py
+"""
+Temporales antes y después de la reutilización de temporales
+(intermediate_code/reutilizacion_temporales.py) sobre los programas de
+bench_flujo_datos.py, con el espacio que ocuparían en el frame a 8 bytes por
+temporal y el tiempo del pase.
+
+Uso:  python benchmarks/bench_reutilizacion_temporales.py [sentencias_max]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_flujo_datos import programa  # noqa: E402
+from intermediate_code.generador_cuadruplos import GeneradorCuadruplos  # noqa: E402
+from intermediate_code.optimizador import OptimizadorCuadruplos  # noqa: E402
+
+BYTES_POR_TEMPORAL = 8
+
+
+def main():
+    maximo = int(sys.argv[1]) if len(sys.argv) > 1 else 16000
+
+    print(f"{'sentencias':>10} {'cuádruplos':>10} {'temporales':>10} {'slots':>6} "
+          f"{'frame antes':>12} {'frame después':>14} {'pase':>8}")
+    cantidad = 1000
+    while cantidad <= maximo:
+        generador = GeneradorCuadruplos({'reutilizacion_temporales': False})
+        generador.generar_desde_codigo(programa(cantidad))
+        cuadruplos = generador.cuadruplos
+
+        optimizador = OptimizadorCuadruplos({nombre: nombre == 'reutilizacion_temporales'
+                                             for nombre in generador.optimizaciones},
+                                            generador.tabla_simbolos)
+        t0 = time.perf_counter()
+        reutilizados = optimizador.optimizar(cuadruplos)
+        segundos = time.perf_counter() - t0
+
+        antes, despues = optimizador.temporales(cuadruplos), optimizador.temporales(reutilizados)
+        print(f"{cantidad:>10} {len(cuadruplos):>10} {antes:>10} {despues:>6} "
+              f"{antes * BYTES_POR_TEMPORAL:>10} B {despues * BYTES_POR_TEMPORAL:>12} B "
+              f"{segundos * 1000:>6.1f}ms")
+        cantidad *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_token_store.py
+"""
+Memoria por token de un fuente grande:
+  - LexToken de PLY + un dict por token (lo que dejaba prueba())
+  - TokenStore (columnas array + tabla de lexemas internados)
+
+Se mide con tracemalloc lo que retiene cada representación.
+
+Uso:  python benchmarks/bench_token_store.py [metodos]
+"""
+import contextlib
+import gc
+import io
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lexer.token_stream import tokenizar  # noqa: E402
+from lexer.token_store import TokenStore  # noqa: E402
+from benchmarks.bench_parser_incremental import generar_fuente  # noqa: E402
+
+
+def medir(construir):
+    """(objeto, bytes retenidos) de lo que devuelve construir()."""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objeto = construir()
+    gc.collect()
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objeto, despues - antes
+
+
+def main():
+    metodos = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    fuente = generar_fuente(metodos)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        stream, b_lextokens = medir(lambda: tokenizar(fuente))
+    dicts, b_dicts = medir(stream.como_lexemas)
+    store, b_store = medir(lambda: TokenStore.desde_tokens(stream.tokens, stream.errores))
+
+    n = len(store)
+    antes = b_lextokens + b_dicts
+    print(f"fuente: {metodos} métodos, {n} tokens, {len(store.tabla_valores)} lexemas distintos")
+    print(f"{'LexToken (tokenizar)':<28} {b_lextokens / n:>8.1f} B/token")
+    print(f"{'dicts de prueba()':<28} {b_dicts / n:>8.1f} B/token")
+    print(f"{'LexToken + dicts':<28} {antes / n:>8.1f} B/token")
+    print(f"{'TokenStore':<28} {b_store / n:>8.1f} B/token"
+          f"  ({antes / b_store:,.1f}x menos, {'idéntico' if store.como_dicts() == dicts else 'DIFERENTE'})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# benchmarks/bench_trazas.py
+"""
+Costo de las trazas en la generación de cuádruplos de un fuente grande:
+  - categoría 'ir' apagada (por defecto)
+  - categoría 'ir' encendida (eventos al buffer circular)
+  - el print() por cuádruplo que había antes, a un archivo nulo (sin contar
+    la consola: en una terminal real cuesta bastante más)
+
+Uso:  python benchmarks/bench_trazas.py [metodos] [rondas]
+"""
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intermediate_code import generador_cuadruplos  # noqa: E402
+from intermediate_code.generador_cuadruplos import GeneradorCuadruplos  # noqa: E402
+from lexer.token_stream import tokenizar_rapido  # noqa: E402
+from tracing import trazas  # noqa: E402
+from benchmarks.bench_parser_incremental import generar_fuente  # noqa: E402
+
+
+class _TrazaPrint:
+    """Imita el print() por cuádruplo anterior a las trazas."""
+    activo = True
+
+    def __call__(self, mensaje, **campos):
+        print(f"{mensaje}: {campos}")
+
+
+def main():
+    metodos = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    rondas = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    fuente = generar_fuente(metodos)
+    tokens = tokenizar_rapido(fuente).tokens
+    generador = GeneradorCuadruplos()
+    canal = generador_cuadruplos._traza
+
+    def generar():
+        generador.generar_desde_codigo(fuente, tokens)
+
+    casos = {
+        "trazas apagadas": lambda: trazas.desactivar(),
+        "trazas 'ir' encendidas": lambda: trazas.activar('ir'),
+        "print() (antes)": None,
+    }
+    mejores = {nombre: float('inf') for nombre in casos}
+    with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        for _ in range(rondas):
+            for nombre, preparar in casos.items():
+                trazas.limpiar()
+                if preparar is None:
+                    generador_cuadruplos._traza = _TrazaPrint()
+                else:
+                    generador_cuadruplos._traza = canal
+                    preparar()
+                t0 = time.perf_counter()
+                generar()
+                mejores[nombre] = min(mejores[nombre], time.perf_counter() - t0)
+    generador_cuadruplos._traza = canal
+    trazas.limpiar()
+    trazas.activar('ir')
+    generar()
+    eventos = len(trazas.registro())
+    trazas.desactivar()
+
+    base = mejores["trazas apagadas"]
+    print(f"fuente: {metodos} métodos, {len(tokens)} tokens, {len(generador.cuadruplos)} cuádruplos")
+    for nombre, t in mejores.items():
+        print(f"{nombre:<24} {t * 1000:>9.2f} ms  ({t / base:,.2f}x)")
+    print(f"eventos en el buffer: {eventos} (capacidad {trazas.registro().capacidad})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# compilador/__init__.py
+
+"""
+Compilador sin interfaz gráfica: el mismo pipeline del IDE (lexer, parser,
+semántico, código intermedio, JDK) sin importar PyQt5.
+
+    python -m compilador analyze|ir|run archivo.java
+"""
+
+from .pipeline import Pipeline, analizar, ejecutar, generar_ir, texto_plano
+
+__all__ = [
+    'Pipeline',
+    'analizar',
+    'ejecutar',
+    'generar_ir',
+    'texto_plano',
+]
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+# compilador/__main__.py
+"""
+CLI:  python -m compilador analyze|ir|cfg|run|run-ir ARCHIVO [opciones]
+      python -m compilador batch RUTA... [--procesos N] [--etapa analyze|ir|run] [--json F] [--csv F]
+
+Imprime el resultado como JSON en stdout (lo que los módulos escriban por su
+cuenta va a stderr). Código de salida: 0 sin errores, 1 con errores en alguna
+etapa (en batch: en algún archivo), 2 si no se pudo leer el archivo.
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+
+from lexer.token_stream import ESCANERES
+from tracing import trazas
+
+COMANDOS = ('analyze', 'ir', 'cfg', 'run', 'run-ir', 'batch')
+ETAPAS_LOTE = ('analyze', 'ir', 'run')
+
+
+def _argumentos(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m compilador',
+                                     description='Compilador Java sin interfaz gráfica (salida JSON).')
+    parser.add_argument('comando', choices=COMANDOS,
+                        help='analyze: léxico/sintáctico/semántico; ir: + cuádruplos y triplos; '
+                             'cfg: + grafo de flujo de los cuádruplos; '
+                             'run: + compilar y ejecutar con el JDK embebido; '
+                             'run-ir: + ejecutar los cuádruplos en la máquina virtual del IR (sin JDK); '
+                             'batch: reporte de muchos archivos/directorios en paralelo')
+    parser.add_argument('archivos', nargs='+', metavar='archivo',
+                        help="fuente Java ('-' para stdin); en batch, archivos o directorios")
+    parser.add_argument('--escaner', choices=ESCANERES, default='ply', help='lexer a usar (default: ply)')
+    parser.add_argument('--timeout', type=float, default=30.0, help='segundos por etapa del JDK en run')
+    parser.add_argument('--indent', type=int, default=None, help='indentación del JSON')
+    parser.add_argument('--sin-cache', dest='cache', action='store_false',
+                        help='no usar la caché de análisis en disco (analysis/cache_disco.py)')
+    parser.add_argument('--interpretar', action='store_true',
+                        help='en run-ir: usar el intérprete de cuádruplos en lugar del camino compilado')
+    parser.add_argument('--dot', help='en cfg: escribir también el grafo en formato Graphviz en este archivo')
+    parser.add_argument('--trazas', default='',
+                        help="categorías a trazar, separadas por coma ('todas' = todas); "
+                             "se agregan al JSON bajo 'trazas'")
+
+    lote = parser.add_argument_group('batch')
+    lote.add_argument('--procesos', type=int, default=None, help='procesos de trabajo (default: uno por núcleo)')
+    lote.add_argument('--etapa', choices=ETAPAS_LOTE, default='analyze', help='qué correr en cada archivo')
+    lote.add_argument('--json', dest='salida_json', help='escribir el reporte JSON en este archivo')
+    lote.add_argument('--csv', dest='salida_csv', help='escribir el reporte CSV (una fila por archivo)')
+    lote.add_argument('--progreso', action='store_true', help='una línea por archivo en stderr al terminar')
+
+    args = parser.parse_args(argv)
+    if args.comando != 'batch' and len(args.archivos) != 1:
+        parser.error(f"{args.comando} recibe un solo archivo")
+    return args
+
+
+def _leer(ruta: str) -> str:
+    if ruta == '-':
+        return sys.stdin.read()
+    with open(ruta, encoding='utf-8') as archivo:
+        return archivo.read()
+
+
+def _batch(args) -> int:
+    # Import local: sólo batch usa el pool de procesos
+    from compilador.lote import Reporte, analizar_lote, buscar_fuentes
+
+    rutas = buscar_fuentes(args.archivos)
+    reporte = Reporte()
+    t0 = time.perf_counter()
+    for resultado in analizar_lote(rutas, args.procesos, args.escaner, args.etapa, args.timeout,
+                                   cache=args.cache):
+        reporte.agregar(resultado)
+        if args.progreso:
+            estado = 'ok' if resultado['ok'] else f"falla en {resultado['etapa_fallida']}"
+            print(f"[{len(reporte.archivos)}/{len(rutas)}] {resultado['archivo']}: {estado}", file=sys.stderr)
+    reporte.segundos = time.perf_counter() - t0
+
+    datos = reporte.como_dict()
+    if args.salida_csv:
+        with open(args.salida_csv, 'w', encoding='utf-8', newline='') as destino:
+            reporte.escribir_csv(destino)
+    if args.salida_json:
+        with open(args.salida_json, 'w', encoding='utf-8') as destino:
+            json.dump(datos, destino, ensure_ascii=False, indent=args.indent)
+        datos = datos['resumen']  # en stdout sólo el resumen
+    json.dump(datos, sys.stdout, ensure_ascii=False, indent=args.indent)
+    sys.stdout.write('\n')
+    return 0 if reporte.resumen()['ok'] == len(reporte.archivos) else 1
+
+
+def main(argv=None) -> int:
+    args = _argumentos(argv)
+    if args.comando == 'batch':
+        return _batch(args)
+
+    archivo = args.archivos[0]
+    try:
+        codigo = _leer(archivo)
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"No se pudo leer {archivo}: {e}", file=sys.stderr)
+        return 2
+
+    if args.trazas:
+        categorias = [c.strip() for c in args.trazas.split(',') if c.strip()]
+        trazas.activar(*([] if 'todas' in categorias else categorias))
+
+    # Import tardío: construir el parser no debe pasar antes de validar argumentos
+    from analysis.cache_disco import CacheAnalisis
+    from compilador.pipeline import Pipeline
+
+    with contextlib.redirect_stdout(sys.stderr):
+        pipeline = Pipeline(escaner=args.escaner, cache=CacheAnalisis() if args.cache else None)
+        if args.comando == 'analyze':
+            resultado = pipeline.analizar(codigo)
+        elif args.comando == 'ir':
+            resultado = pipeline.ir(codigo)
+        elif args.comando == 'cfg':
+            resultado = pipeline.cfg(codigo)
+        elif args.comando == 'run-ir':
+            resultado = pipeline.ejecutar_ir(codigo, compilada=not args.interpretar)
+        else:
+            resultado = pipeline.ejecutar(codigo, args.timeout)
+
+    if args.comando == 'cfg' and args.dot and resultado["ok"]:
+        from compilador.pipeline import grafo_de_filas
+        with open(args.dot, 'w', encoding='utf-8') as destino:
+            destino.write(grafo_de_filas(resultado["cuadruplos"]).a_dot(dominadores=True))
+
+    resultado = {"archivo": archivo, "comando": args.comando, **resultado}
+    if args.trazas:
+        resultado["trazas"] = [json.loads(linea) for linea in trazas.registro().lineas_json()]
+    json.dump(resultado, sys.stdout, ensure_ascii=False, indent=args.indent, default=str)
+    sys.stdout.write('\n')
+    return 0 if resultado["ok"] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+# compilador/lote.py
+"""
+Análisis por lotes: muchos fuentes repartidos en un ProcessPoolExecutor.
+
+Cada proceso de trabajo crea UN Pipeline al arrancar (lexer, parser y caché
+de tokens calientes) y lo reutiliza para todos los archivos que le tocan; el
+proceso principal recibe resultados compactos (errores por etapa, no tablas
+completas) a medida que terminan y los acumula en un Reporte que se vuelca
+como JSON o CSV.
+"""
+import contextlib
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+# Extensiones que se toman al recorrer un directorio
+EXTENSIONES = ('.java', '.txt')
+
+# Etapas que se reportan, en orden del pipeline
+ETAPAS = ('lectura', 'lexico', 'estructura', 'sintactico', 'semantico', 'ejecucion')
+
+
+def buscar_fuentes(rutas: Iterable[str], extensiones: Sequence[str] = EXTENSIONES) -> List[str]:
+    """Archivos de 'rutas' (los directorios se recorren recursivamente), ordenados."""
+    fuentes = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for raiz, _, nombres in os.walk(ruta):
+                fuentes.extend(os.path.join(raiz, n) for n in nombres if n.endswith(tuple(extensiones)))
+        else:
+            fuentes.append(ruta)
+    return sorted(fuentes)
+
+
+# =========================
+# Proceso de trabajo
+# =========================
+_pipeline = None
+_opciones: Dict = {}
+
+
+def _iniciar_trabajador(escaner: str, comando: str, timeout: float, cache: bool = False):
+    global _pipeline, _opciones
+    # Import local: el proceso principal no necesita el parser
+    from analysis.cache_disco import CacheAnalisis
+    from compilador.pipeline import Pipeline
+
+    with contextlib.redirect_stdout(sys.stderr):
+        _pipeline = Pipeline(escaner=escaner, cache=CacheAnalisis() if cache else None)
+    _opciones = {'comando': comando, 'timeout': timeout}
+
+
+def _resumir(ruta: str, resultado: Dict, segundos: float) -> Dict:
+    """Resultado compacto de un archivo: errores de cada etapa que corrió."""
+    sintactico = resultado.get('sintactico')
+    ejecucion = resultado.get('ejecucion')
+    errores = {
+        'lexico': [f"L{e['linea']}: carácter inválido {e['valor']!r}" for e in resultado['lexico']['errores']],
+        'estructura': [f"L{e['line']}:C{e['col']}: {e['message']}" for e in resultado.get('estructura') or ()],
+        'sintactico': list(sintactico['errores']) if sintactico else [],
+        'semantico': [f"L{e['line']}:C{e['col']}: {e['message']}" for e in resultado.get('semantico') or ()],
+    }
+    if ejecucion is not None:
+        errores['ejecucion'] = _errores_ejecucion(ejecucion)
+    return {
+        'archivo': ruta,
+        'ok': resultado['ok'],
+        'etapa_fallida': resultado['etapa_fallida'],
+        'tokens': resultado['lexico']['tokens'],
+        'advertencias': len(sintactico['advertencias']) if sintactico else 0,
+        'errores': errores,
+        'segundos': round(segundos, 6),
+    }
+
+
+def _errores_ejecucion(ejecucion: Dict) -> List[str]:
+    if ejecucion['error']:
+        return [ejecucion['error']]
+    for etapa in ('compilacion', 'ejecucion'):
+        paso = ejecucion[etapa]
+        if paso is not None and paso['codigo'] != 0:
+            return [f"{etapa}: código {paso['codigo']}: {paso['stderr'].strip()}"]
+    return []
+
+
+def analizar_archivo(ruta: str) -> Dict:
+    """Analiza 'ruta' con el Pipeline del proceso (ver _iniciar_trabajador)."""
+    if _pipeline is None:
+        _iniciar_trabajador('ply', 'analyze', 30.0)
+    t0 = time.perf_counter()
+    try:
+        with open(ruta, encoding='utf-8') as archivo:
+            codigo = archivo.read()
+    except (OSError, UnicodeDecodeError) as e:
+        return {'archivo': ruta, 'ok': False, 'etapa_fallida': 'lectura', 'tokens': 0, 'advertencias': 0,
+                'errores': {'lectura': [str(e)]}, 'segundos': round(time.perf_counter() - t0, 6)}
+
+    comando = _opciones['comando']
+    with contextlib.redirect_stdout(sys.stderr):
+        if comando == 'ir':
+            resultado = _pipeline.ir(codigo)
+        elif comando == 'run':
+            resultado = _pipeline.ejecutar(codigo, _opciones['timeout'])
+        else:
+            resultado = _pipeline.analizar(codigo)
+    return _resumir(ruta, resultado, time.perf_counter() - t0)
+
+
+def analizar_tanda(rutas: Sequence[str]) -> List[Dict]:
+    """analizar_archivo() de varias rutas en un solo viaje al proceso de trabajo."""
+    return [analizar_archivo(ruta) for ruta in rutas]
+
+
+# =========================
+# Reparto
+# =========================
+def analizar_lote(rutas: Sequence[str], procesos: Optional[int] = None, escaner: str = 'ply',
+                  comando: str = 'analyze', timeout: float = 30.0,
+                  tam_tanda: Optional[int] = None, cache: bool = False) -> Iterator[Dict]:
+    """
+    Resultados de analizar_archivo() para cada ruta, en el orden en que
+    terminan. procesos=None usa un proceso por núcleo; procesos=1 analiza en
+    este mismo proceso (sin pool).
+    Las rutas viajan en tandas de 'tam_tanda' (por defecto, unas 8 tandas por
+    proceso y a lo sumo 32 archivos) para no pagar un viaje por archivo chico.
+    Con cache=True cada proceso usa la caché en disco (analysis/cache_disco.py).
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(rutas) <= 1:
+        _iniciar_trabajador(escaner, comando, timeout, cache)
+        for ruta in rutas:
+            yield analizar_archivo(ruta)
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar_trabajador,
+                             initargs=(escaner, comando, timeout, cache)) as pool:
+        tam = tam_tanda or max(1, min(32, len(rutas) // (procesos * 8)))
+        futuros = [pool.submit(analizar_tanda, rutas[i:i + tam]) for i in range(0, len(rutas), tam)]
+        for futuro in as_completed(futuros):
+            yield from futuro.result()
+
+
+# =========================
+# Reporte
+# =========================
+class Reporte:
+    """Acumula los resultados por archivo y los totales por etapa."""
+
+    def __init__(self):
+        self.archivos: List[Dict] = []
+        self.segundos = 0.0
+
+    def agregar(self, resultado: Dict):
+        self.archivos.append(resultado)
+
+    def resumen(self) -> Dict:
+        fallidos_por_etapa = {etapa: 0 for etapa in ETAPAS}
+        errores_por_etapa = {etapa: 0 for etapa in ETAPAS}
+        for r in self.archivos:
+            if r['etapa_fallida']:
+                fallidos_por_etapa[r['etapa_fallida']] += 1
+            for etapa, errores in r['errores'].items():
+                errores_por_etapa[etapa] += len(errores)
+        return {
+            'archivos': len(self.archivos),
+            'ok': sum(1 for r in self.archivos if r['ok']),
+            'fallidos_por_etapa': fallidos_por_etapa,
+            'errores_por_etapa': errores_por_etapa,
+            'segundos': round(self.segundos, 3),
+        }
+
+    def como_dict(self) -> Dict:
+        return {'resumen': self.resumen(),
+                'archivos': sorted(self.archivos, key=lambda r: r['archivo'])}
+
+    def escribir_csv(self, destino: TextIO):
+        """Una fila por archivo: estado, errores por etapa y el primer error."""
+        escritor = csv.writer(destino)
+        escritor.writerow(['archivo', 'ok', 'etapa_fallida', 'tokens', 'advertencias']
+                          + [f'errores_{etapa}' for etapa in ETAPAS] + ['primer_error', 'segundos'])
+        for r in sorted(self.archivos, key=lambda r: r['archivo']):
+            errores = r['errores']
+            primero = next((e for etapa in ETAPAS for e in errores.get(etapa, ())), '')
+            escritor.writerow([r['archivo'], int(r['ok']), r['etapa_fallida'] or '', r['tokens'], r['advertencias']]
+                              + [len(errores.get(etapa, ())) for etapa in ETAPAS] + [primero, r['segundos']])
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+# compilador/pipeline.py
+"""
+Pipeline del compilador sin Qt: lexer -> estructura -> parser -> semántico
+-> cuádruplos/triplos (-> JDK o máquina virtual del IR), con el mismo orden
+y las mismas compuertas que el IDE (una etapa con errores detiene las
+siguientes). Cada resultado es un dict serializable a JSON.
+
+Un Pipeline reutiliza su Analyzer (lexer, parser y caché de tokens ya
+construidos): conviene crear uno y analizar muchos fuentes con él. Con una
+CacheAnalisis, analizar() e ir() de un fuente ya visto (con la misma versión
+del compilador) salen de la caché en disco.
+"""
+import html
+import re
+import time
+from dataclasses import asdict
+from typing import Dict, List, Optional
+
+from analysis.analyzer import Analyzer
+from lexer.token_stream import hash_fuente
+
+_re_etiqueta = re.compile(r'<[^>]+>')
+
+
+def texto_plano(mensaje: str) -> str:
+    """Mensaje del parser sin el HTML con que lo pinta el IDE."""
+    return html.unescape(_re_etiqueta.sub('', mensaje)).strip()
+
+
+def _error_lexico(e: Dict) -> Dict:
+    return {"valor": e["valor"], "linea": e["linea"], "posicion": e["posicion"]}
+
+
+class Pipeline:
+    def __init__(self, escaner: str = 'ply', analizador: Optional[Analyzer] = None, cache=None):
+        self.analizador = analizador or Analyzer(escaner=escaner)
+        self.cache = cache
+
+    def _cacheado(self, codigo: str, etapa: str, calcular):
+        if self.cache is None:
+            return calcular()
+        clave = hash_fuente(codigo)
+        resultado = self.cache.obtener(clave, etapa)
+        if resultado is None:
+            resultado = calcular()
+            self.cache.guardar(clave, etapa, resultado)
+        return resultado
+
+    # =========================
+    # Etapas
+    # =========================
+    def analizar(self, codigo: str) -> Dict:
+        """
+        {ok, etapa_fallida, lexico, estructura, sintactico, semantico, simbolos}.
+        Las etapas que no llegaron a correr quedan en None.
+        """
+        return self._cacheado(codigo, 'analisis', lambda: self._analizar(codigo))
+
+    def _analizar(self, codigo: str) -> Dict:
+        a = self.analizador
+        stream = a.tokens(codigo)
+        resultado = {
+            "ok": False,
+            "etapa_fallida": None,
+            "lexico": {
+                "tokens": len(stream),
+                "errores": [_error_lexico(e) for e in stream.errores],
+            },
+            "estructura": None,
+            "sintactico": None,
+            "semantico": None,
+            "simbolos": {nombre: dict(info) for nombre, info in stream.simbolos.items()},
+        }
+
+        # Pre-chequeo estructural (como ev_sintactico)
+        estructura = a.diagnosticos(codigo)
+        resultado["estructura"] = estructura
+        if estructura:
+            resultado["etapa_fallida"] = "estructura"
+            return resultado
+
+        mensajes = [texto_plano(m) for m in a.sintactico(codigo)]
+        errores = [m for m in mensajes if "Error" in m]
+        resultado["sintactico"] = {
+            "errores": errores,
+            "advertencias": [m for m in mensajes if "Advertencia" in m and "Error" not in m],
+            "mensajes": mensajes,
+        }
+        if errores:
+            resultado["etapa_fallida"] = "sintactico"
+            return resultado
+
+        semantico = a.semantico(codigo)
+        resultado["semantico"] = semantico
+        if semantico:
+            resultado["etapa_fallida"] = "semantico"
+            return resultado
+
+        resultado["ok"] = True
+        return resultado
+
+    def ir(self, codigo: str, analisis: Optional[Dict] = None) -> Dict:
+        """analizar() + {cuadruplos, triplos} (None si el análisis tiene errores)."""
+        resultado = dict(analisis or self.analizar(codigo))
+        resultado["cuadruplos"] = resultado["triplos"] = None
+        if resultado["ok"]:
+            resultado.update(self._cacheado(codigo, 'ir', lambda: self._ir(codigo)))
+        return resultado
+
+    def _ir(self, codigo: str) -> Dict:
+        return {
+            "cuadruplos": _filas(self.analizador.cuadruplos(codigo).cuadruplos),
+            "triplos": _filas(self.analizador.triplos(codigo).triplos),
+        }
+
+    def cfg(self, codigo: str, analisis: Optional[Dict] = None) -> Dict:
+        """ir() + {cfg}: grafo de flujo de los cuádruplos (ver GrafoFlujo.como_dict)."""
+        resultado = self.ir(codigo, analisis)
+        resultado["cfg"] = None
+        if resultado["ok"]:
+            resultado["cfg"] = grafo_de_filas(resultado["cuadruplos"]).como_dict()
+        return resultado
+
+    def ejecutar(self, codigo: str, timeout: float = 30.0, analisis: Optional[Dict] = None) -> Dict:
+        """analizar() + {ejecucion}: compilación y ejecución con el JDK embebido."""
+        # Import local: sólo 'run' necesita el JDK
+        from runners.jdk import compilar_y_ejecutar
+
+        resultado = dict(analisis or self.analizar(codigo))
+        resultado["ejecucion"] = None
+        if resultado["ok"]:
+            ejecucion = compilar_y_ejecutar(codigo, timeout)
+            resultado["ejecucion"] = ejecucion
+            if not _ejecucion_ok(ejecucion):
+                resultado["ok"] = False
+                resultado["etapa_fallida"] = "ejecucion"
+        return resultado
+
+
+    def ejecutar_ir(self, codigo: str, analisis: Optional[Dict] = None,
+                    max_pasos: Optional[int] = None, compilada: bool = True) -> Dict:
+        """
+        analizar() + {ejecucion_ir}: los cuádruplos ejecutados en la máquina
+        virtual del IR (sin JDK). ejecucion_ir = {salida, error, instrucciones,
+        segundos}; error es None si terminó bien. compilada=False usa el
+        intérprete en lugar del camino compilado (misma salida).
+        """
+        # Import local: sólo 'run-ir' necesita la máquina virtual
+        from intermediate_code.maquina_compilada import MaquinaCompilada
+        from intermediate_code.maquina_virtual import MAX_PASOS, ErrorEjecucion, MaquinaVirtual
+
+        resultado = dict(analisis or self.analizar(codigo))
+        resultado["ejecucion_ir"] = None
+        if resultado["ok"]:
+            t0 = time.perf_counter()
+            generador = self.analizador.cuadruplos(codigo)
+            ejecucion = {"salida": "", "error": None, "instrucciones": 0}
+            maquina = None
+            try:
+                clase = MaquinaCompilada if compilada else MaquinaVirtual
+                maquina = clase(generador.cuadruplos, generador.tabla_simbolos, generador.no_soportadas)
+                ejecucion["salida"] = maquina.ejecutar(max_pasos if max_pasos is not None else MAX_PASOS)
+            except ErrorEjecucion as e:
+                ejecucion["salida"], ejecucion["error"] = e.salida, str(e)
+            ejecucion["instrucciones"] = maquina.pasos if maquina is not None else 0
+            ejecucion["segundos"] = time.perf_counter() - t0
+            resultado["ejecucion_ir"] = ejecucion
+            if ejecucion["error"] is not None:
+                resultado["ok"] = False
+                resultado["etapa_fallida"] = "ejecucion_ir"
+        return resultado
+
+
+def _filas(instrucciones) -> List[Dict]:
+    return [asdict(i) for i in instrucciones]
+
+
+def grafo_de_filas(filas: List[Dict]):
+    """GrafoFlujo de los cuádruplos como los devuelve ir() (dicts)."""
+    # Import local: sólo cfg lo necesita
+    from intermediate_code.cfg import GrafoFlujo
+    from intermediate_code.generador_cuadruplos import Cuadruplo
+    return GrafoFlujo([Cuadruplo(**fila) for fila in filas])
+
+
+def _ejecucion_ok(ejecucion: Dict) -> bool:
+    return (ejecucion["error"] is None
+            and all(ejecucion[etapa] is not None and ejecucion[etapa]["codigo"] == 0
+                    for etapa in ("compilacion", "ejecucion")))
+
+
+# =========================
+# Atajos con un Pipeline compartido
+# =========================
+_pipeline: Optional[Pipeline] = None
+
+
+def _compartido() -> Pipeline:
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = Pipeline()
+    return _pipeline
+
+
+def analizar(codigo: str) -> Dict:
+    return _compartido().analizar(codigo)
+
+
+def generar_ir(codigo: str) -> Dict:
+    return _compartido().ir(codigo)
+
+
+def ejecutar(codigo: str, timeout: float = 30.0) -> Dict:
+    return _compartido().ejecutar(codigo, timeout)
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import os
+import time
 
 from PyQt5 import QtGui
 from PyQt5.QtWidgets import QMainWindow, QFileDialog, QTableWidgetItem, QMessageBox, QTextEdit, QPlainTextEdit
@@ -9,16 +10,24 @@ import re
 from view.home import Ui_home
 
 # Analizadores y utilidades (tus archivos existentes)
-from lexer.analizador_lexico import prueba as prueba_lexica, tabla_simbolos
-from syntactic.analizador_sintactico import prueba_sintactica
+from lexer.analizador_lexico import prueba as prueba_lexica, tabla_simbolos, llenar_tabla
+from lexer.line_index import line_index
+from syntactic.incremental import ParserIncremental
 from highlighters.java_highlighter import JavaHighlighter
 
 from diagnostics.java_diagnostics import diagnose as diag_struct
+from diagnostics.live_scheduler import DiagnosticsScheduler, LiveAnalysis
+from analysis.cache_disco import CacheAnalisis
+from lexer.token_stream import usar_cache_disco
 from semantics.java_semantics import analyze_semantics as diag_sem
 from editors.completer import JavaAutoCompleter, JAVA_KEYWORDS
 
 # >>> Runner Java (nuevo)
 from runners.java_runner import JavaRunner
+# Ejecución de los cuádruplos sin JDK
+from intermediate_code.generador_cuadruplos import GeneradorCuadruplos
+from intermediate_code.maquina_compilada import MaquinaCompilada
+from intermediate_code.maquina_virtual import ErrorEjecucion
 
 # >>> Desensamblador / “ensamblador JVM” (nuevo)
 from assembler.bytecode_disassembler import JavaBytecodeDisassembler
@@ -146,7 +155,17 @@ class Main(QMainWindow):
         self.highlighter = JavaHighlighter(self.home.tx_ingreso.document())
 
         self._last_errors = []
-        self.home.tx_ingreso.textChanged.connect(self._run_live_diagnostics)
+        # Caché de análisis en disco: reabrir un archivo ya visto no re-tokeniza
+        # ni recalcula sus diagnósticos
+        self._cache_disco = CacheAnalisis()
+        usar_cache_disco(self._cache_disco)
+        # Diagnósticos en vivo: debounce + hilo de trabajo (lexer incremental adentro)
+        self._diag = DiagnosticsScheduler(self.home.tx_ingreso.toPlainText,
+                                          LiveAnalysis(self._cache_disco), parent=self)
+        self._diag.results.connect(self._on_live_diagnostics)
+        # Parser incremental: sólo re-parsea los métodos que cambiaron
+        self._parser_inc = ParserIncremental()
+        self.home.tx_ingreso.textChanged.connect(self._diag.schedule)
         self.home.tx_ingreso.cursorPositionChanged.connect(self._maybe_show_error_in_status)
         self.home.tx_ingreso.setTabChangesFocus(False)
 
@@ -185,6 +204,8 @@ class Main(QMainWindow):
 
         # Click en Run => compilar/ejecutar (gateado)
         self.home.bt_run.clicked.connect(self._on_run_clicked)
+        # Run (IR) => ejecutar los cuádruplos en la máquina virtual (gateado igual)
+        self.home.bt_run_ir.clicked.connect(self._on_run_ir_clicked)
 
         # --- Assembler / javap (integración completa) ---
         self.asm = JavaBytecodeDisassembler(parent=self)
@@ -238,6 +259,7 @@ class Main(QMainWindow):
             getattr(self.home, 'bt_cuadruplos', None),
             getattr(self.home, 'bt_asm', None),
             getattr(self.home, 'bt_run', None),
+            getattr(self.home, 'bt_run_ir', None),
         ]:
             if btn is not None:
                 btn.setEnabled(can_after_semantic)
@@ -273,6 +295,52 @@ class Main(QMainWindow):
         # Ejecutar (estructura simple)
         self.runner.run_code(code)
 
+    def _on_run_ir_clicked(self):
+        if not (self.sintactico_ok and self.semantico_ok):
+            QMessageBox.information(self, "Falta análisis", "Ejecuta el Análisis Sintáctico y Semántico sin errores antes de RUN (IR).")
+            return
+
+        code = self.home.tx_ingreso.toPlainText().strip()
+        if not code:
+            QMessageBox.warning(self, "Advertencia", "No hay código para ejecutar.")
+            return
+
+        try:
+            self.home.analysisTabs.setCurrentWidget(self.home.outputTab)
+            self.home.tx_output.clear()
+        except Exception:
+            pass
+
+        t0 = time.perf_counter()
+        generador = GeneradorCuadruplos()
+        try:
+            generador.generar_desde_codigo(code)
+            maquina = MaquinaCompilada(generador.cuadruplos, generador.tabla_simbolos, generador.no_soportadas)
+            salida = maquina.ejecutar()
+        except Exception as e:
+            # Corre en el hilo de la GUI: cualquier fallo se informa, no se propaga
+            if isinstance(e, ErrorEjecucion):
+                self._append_output(e.salida)
+            else:
+                e = f"{type(e).__name__}: {e}"
+            self._append_output(f"[ERROR] {e}\n")
+            try:
+                self.home.lb_output_status.setText("Finalizado con errores (IR).")
+            except Exception:
+                pass
+            self.home.estado.showMessage(f"Error en la ejecución del IR: {e}", 5000)
+            return
+
+        ms = (time.perf_counter() - t0) * 1000
+        self._append_output(salida)
+        try:
+            self.home.lb_output_status.setText(f"Finalizado (IR, {ms:.1f} ms).")
+        except Exception:
+            pass
+        self.home.estado.showMessage(
+            f"Ejecutado en la máquina virtual del IR: {len(generador.cuadruplos)} cuádruplos, "
+            f"{maquina.pasos} instrucciones, {ms:.1f} ms", 5000)
+
     def _on_runner_started(self, stage: str):
         # stage: "compile" o "run"
         try:
@@ -538,7 +606,7 @@ class Main(QMainWindow):
         # Análisis sintáctico PLY
         try:
             tabla_simbolos.limpiar()
-            resultados = prueba_sintactica(codigo)
+            resultados = self._parser_inc.analizar(codigo)
 
             html_output = "<html><body style='color:#DCDCDC; font-family: Consolas, monospace;'>"
             for item in resultados:
@@ -723,6 +791,10 @@ class Main(QMainWindow):
         self.home.tb_simbolos.setAlternatingRowColors(False)
 
         simbolos = tabla_simbolos.obtener_todos()  # dict nombre -> info
+        codigo = self.home.tx_ingreso.toPlainText().strip()
+        if not simbolos and codigo:
+            # El análisis léxico ya no llena la tabla: se recolecta al mostrarla
+            simbolos = llenar_tabla(codigo).obtener_todos()
         if not simbolos:
             self.home.estado.showMessage("No hay símbolos definidos en la tabla de símbolos")
             # Ir igualmente a la pestaña de símbolos
@@ -809,19 +881,10 @@ class Main(QMainWindow):
         except Exception:
             edit.setExtraSelections(selections)
 
-    def _run_live_diagnostics(self):
-        code = self.home.tx_ingreso.toPlainText()
-        errs = []
-        try:
-            errs.extend(diag_struct(code))
-        except Exception:
-            pass
-        # Nota: mantenemos semántico en vivo para subrayado, pero el gating
-        # exige ejecutar ev_semantico explícitamente para “aprobar” la etapa.
-        try:
-            errs.extend(diag_sem(code))
-        except Exception:
-            pass
+    def _on_live_diagnostics(self, generation, errs):
+        # Resultado de un texto que ya se editó: llegará otro más nuevo
+        if not self._diag.is_current(generation):
+            return
 
         self._last_errors = errs
         self._apply_diagnostics(errs)
@@ -838,6 +901,11 @@ class Main(QMainWindow):
         else:
             self.home.estado.showMessage("Sin problemas.")
 
+    def closeEvent(self, event):
+        # Detener el hilo de diagnósticos en vivo antes de cerrar
+        self._diag.shutdown()
+        super().closeEvent(event)
+
     def _maybe_show_error_in_status(self):
         edit = self.home.tx_ingreso
         pos = edit.textCursor().position()
@@ -916,28 +984,17 @@ class Main(QMainWindow):
         Si algún error trae 'line', se usa también como respaldo.
         """
         edit = self.home.tx_ingreso
-        doc = edit.document()
+        index = line_index(edit.toPlainText())  # una vez por llamada, no por error
         marked = set()
 
         for e in (self._last_errors or []):
-            # 1) Si hay rango start/length: convertir a bloques
+            # 1) Si hay rango start/length: convertir a líneas (1-based para el gutter)
             start = e.get("start")
             length = e.get("length")
             if isinstance(start, int) and isinstance(length, int) and length > 0:
                 try:
-                    end_pos = max(0, min(start + length, doc.characterCount() - 1))
-                    cur = QtGui.QTextCursor(doc)
-                    cur.setPosition(start)
-                    start_block = doc.findBlock(start)
-                    end_block = doc.findBlock(end_pos)
-
-                    blk = start_block
-                    while blk.isValid():
-                        # blockNumber es 0-based, ponemos 1-based para el gutter
-                        marked.add(blk.blockNumber() + 1)
-                        if blk.position() >= end_block.position():
-                            break
-                        blk = blk.next()
+                    end_pos = max(0, min(start + length, index.largo))
+                    marked.update(range(index.linea(start), index.linea(end_pos) + 1))
                 except Exception:
                     pass
 
@@ -1,22 +1,13 @@
 # -*- coding: utf-8 -*-
 # diagnostics/java_diagnostics.py
-from typing import List, Dict, Tuple, Optional
-from lexer.analizador_lexico import construir_lexer
+from typing import List, Dict, Optional
+from lexer.token_stream import obtener_token_stream
+from lexer.line_index import LineIndex, line_index
 
 def _mk(idx: int, length: int, line: int, col: int, msg: str) -> Dict:
     return {"start": idx, "length": length, "line": line, "col": col, "message": msg}
 
-def _col_from_index(src: str, idx: int) -> int:
-    # columna 1-based
-    prev_nl = src.rfind('\n', 0, idx)
-    if prev_nl < 0:
-        return idx + 1
-    return idx - prev_nl
-
-def _line_from_index(src: str, idx: int) -> int:
-    return src.count('\n', 0, idx) + 1
-
-def _scan_structure(src: str) -> List[Dict]:
+def _scan_structure(src: str, index: Optional[LineIndex] = None) -> List[Dict]:
     """
     Escaneo carácter-a-carácter:
       - desbalance () {} []
@@ -24,10 +15,11 @@ def _scan_structure(src: str) -> List[Dict]:
     Devuelve lista de errores con posiciones.
     """
     errors: List[Dict] = []
+    index = index or line_index(src)
 
-    paren_stack: List[Tuple[int, int]] = []   # (idx, line)
-    brace_stack: List[Tuple[int, int]] = []
-    bracket_stack: List[Tuple[int, int]] = []
+    paren_stack: List[int] = []   # idx de cada apertura
+    brace_stack: List[int] = []
+    bracket_stack: List[int] = []
 
     in_sl_comment = False
     in_ml_comment = False
@@ -104,70 +96,58 @@ def _scan_structure(src: str) -> List[Dict]:
 
         # balanceo de (), {}, []
         if c == '(':
-            paren_stack.append((i, _line_from_index(src, i)))
+            paren_stack.append(i)
         elif c == ')':
             if paren_stack:
                 paren_stack.pop()
             else:
-                line = _line_from_index(src, i)
-                col = _col_from_index(src, i)
+                line, col = index.linea_col(i)
                 errors.append(_mk(i, 1, line, col, "Paréntesis de cierre ')' sin apertura."))
         elif c == '{':
-            brace_stack.append((i, _line_from_index(src, i)))
+            brace_stack.append(i)
         elif c == '}':
             if brace_stack:
                 brace_stack.pop()
             else:
-                line = _line_from_index(src, i)
-                col = _col_from_index(src, i)
+                line, col = index.linea_col(i)
                 errors.append(_mk(i, 1, line, col, "Llave de cierre '}' sin apertura."))
         elif c == '[':
-            bracket_stack.append((i, _line_from_index(src, i)))
+            bracket_stack.append(i)
         elif c == ']':
             if bracket_stack:
                 bracket_stack.pop()
             else:
-                line = _line_from_index(src, i)
-                col = _col_from_index(src, i)
+                line, col = index.linea_col(i)
                 errors.append(_mk(i, 1, line, col, "Corchete de cierre ']' sin apertura."))
 
         i += 1
 
     # fin de archivo: comillas abiertas
     if in_double and double_start_idx >= 0:
-        line = _line_from_index(src, double_start_idx)
-        col = _col_from_index(src, double_start_idx)
+        line, col = index.linea_col(double_start_idx)
         errors.append(_mk(double_start_idx, 1, line, col, 'Cadena no cerrada (falta ").'))
     if in_single and single_start_idx >= 0:
-        line = _line_from_index(src, single_start_idx)
-        col = _col_from_index(src, single_start_idx)
+        line, col = index.linea_col(single_start_idx)
         errors.append(_mk(single_start_idx, 1, line, col, "Carácter no cerrado (falta ')."))
 
     # aperturas sin cierre
-    for idx, _ln in paren_stack:
-        errors.append(_mk(idx, 1, _line_from_index(src, idx), _col_from_index(src, idx), "Paréntesis de apertura '(' sin cierre."))
-    for idx, _ln in brace_stack:
-        errors.append(_mk(idx, 1, _line_from_index(src, idx), _col_from_index(src, idx), "Llave de apertura '{' sin cierre."))
-    for idx, _ln in bracket_stack:
-        errors.append(_mk(idx, 1, _line_from_index(src, idx), _col_from_index(src, idx), "Corchete de apertura '[' sin cierre."))
+    for idx in paren_stack:
+        errors.append(_mk(idx, 1, *index.linea_col(idx), "Paréntesis de apertura '(' sin cierre."))
+    for idx in brace_stack:
+        errors.append(_mk(idx, 1, *index.linea_col(idx), "Llave de apertura '{' sin cierre."))
+    for idx in bracket_stack:
+        errors.append(_mk(idx, 1, *index.linea_col(idx), "Corchete de apertura '[' sin cierre."))
 
     return errors
 
-def _scan_missing_semicolon_sout(src: str) -> List[Dict]:
+def _scan_missing_semicolon_sout(src: str, tokens=None, index: Optional[LineIndex] = None) -> List[Dict]:
     """
     Usa el lexer para detectar patrones:
         System . out . (print|println) ( ... )  [; esperado]
     Si tras el PARDER que cierra no aparece PUNTOCOMA inmediato, marca error en el ')'.
     """
     errors: List[Dict] = []
-    lx = construir_lexer()
-    lx.input(src)
-
-    toks = []
-    while True:
-        t = lx.token()
-        if not t: break
-        toks.append(t)
+    toks = tokens if tokens is not None else obtener_token_stream(src).tokens
 
     i = 0
     n = len(toks)
@@ -198,7 +178,7 @@ def _scan_missing_semicolon_sout(src: str) -> List[Dict]:
                             # error en el ) final
                             idx = toks[j].lexpos
                             line = toks[j].lineno
-                            col = _col_from_index(src, idx)
+                            col = (index or line_index(src)).col(idx)
                             errors.append(_mk(idx, 1, line, col, "Falta ';' después de System.out.print/println(...)."))
                         # avanzar
                         i = j + 1
@@ -207,7 +187,7 @@ def _scan_missing_semicolon_sout(src: str) -> List[Dict]:
 
     return errors
 
-def diagnose(code: str) -> List[Dict]:
+def diagnose(code: str, tokens=None, index: Optional[LineIndex] = None) -> List[Dict]:
     """
     Devuelve una lista de errores con:
       - start, length, line, col, message
@@ -216,6 +196,7 @@ def diagnose(code: str) -> List[Dict]:
       • Falta ';' tras System.out.print/println(...)
     """
     errs: List[Dict] = []
-    errs.extend(_scan_structure(code))
-    errs.extend(_scan_missing_semicolon_sout(code))
+    index = index or line_index(code)
+    errs.extend(_scan_structure(code, index))
+    errs.extend(_scan_missing_semicolon_sout(code, tokens, index))
     return errs
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+# diagnostics/live_scheduler.py
+"""
+Diagnósticos en vivo fuera del hilo de la GUI.
+
+Cada tecla sólo incrementa una "generación" y reinicia un QTimer de un disparo
+(debounce). Cuando el usuario deja de teclear se toma el texto y se deja en un
+único "buzón" que lee un hilo de trabajo; si llega otro texto antes de que el
+hilo lo tome, el anterior se descarta. Al terminar, el resultado se publica con
+la señal 'results' (cola de eventos de Qt) sólo si ninguna edición posterior lo
+dejó obsoleto; el receptor vuelve a comprobarlo con is_current().
+
+Así el costo por tecla no depende del tamaño del archivo ni de lo que tarde
+el análisis semántico.
+"""
+import threading
+from typing import Callable, Dict, List, Optional
+
+from PyQt5 import QtCore
+
+from diagnostics.java_diagnostics import diagnose
+from lexer.incremental import LexerIncremental
+from lexer.line_index import LineIndex
+from lexer.token_stream import hash_fuente
+from semantics.java_semantics import analyze_semantics
+
+
+class LiveAnalysis:
+    """
+    Análisis que corre en el hilo de trabajo: lexer incremental + diagnósticos
+    estructurales + semánticos. Mantiene estado (el lexer) y sólo debe usarse
+    desde UN hilo.
+    Con 'cache' (analysis.cache_disco.CacheAnalisis) un texto ya analizado,
+    p. ej. un archivo que se vuelve a abrir, no se analiza de nuevo.
+    """
+
+    def __init__(self, cache=None):
+        self._lexer = LexerIncremental()
+        self._cache = cache
+
+    def __call__(self, code: str) -> List[Dict]:
+        if self._cache is None:
+            return self._analizar(code)
+        clave = hash_fuente(code)
+        errs = self._cache.obtener(clave, 'diagnosticos')
+        if errs is None:
+            errs = self._analizar(code)
+            self._cache.guardar(clave, 'diagnosticos', errs)
+        return errs
+
+    def _analizar(self, code: str) -> List[Dict]:
+        errs: List[Dict] = []
+        try:
+            toks = self._lexer.actualizar(code)
+        except Exception:
+            self._lexer.limpiar()
+            toks = None
+        index = LineIndex(code)  # uno por versión del texto, compartido por ambos análisis
+        try:
+            errs.extend(diagnose(code, toks, index))
+        except Exception:
+            pass
+        # Nota: mantenemos semántico en vivo para subrayado, pero el gating
+        # exige ejecutar ev_semantico explícitamente para “aprobar” la etapa.
+        try:
+            errs.extend(analyze_semantics(code, toks, index))
+        except Exception:
+            pass
+        return errs
+
+
+class DiagnosticsScheduler(QtCore.QObject):
+
+    # (generación, lista de errores {start, length, line, col, message})
+    results = QtCore.pyqtSignal(int, object)
+
+    DELAY_MS = 250
+
+    def __init__(self, get_text: Callable[[], str],
+                 analyze: Optional[Callable[[str], List[Dict]]] = None,
+                 delay_ms: int = DELAY_MS, parent=None):
+        super().__init__(parent)
+        self._get_text = get_text
+        self._analyze = analyze or LiveAnalysis()
+
+        # Sólo se toca desde el hilo de la GUI; el hilo de trabajo sólo lo lee
+        self._generation = 0
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._dispatch)
+
+        # Buzón de un solo lugar: (generación, texto) más reciente sin tomar
+        self._cond = threading.Condition()
+        self._pending = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name="diagnosticos-en-vivo", daemon=True)
+        self._thread.start()
+
+    # ===============================
+    # API (hilo de la GUI)
+    # ===============================
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def is_current(self, generation: int) -> bool:
+        """True si no hubo ediciones después de la que produjo 'generation'."""
+        return generation == self._generation
+
+    def schedule(self):
+        """Conectar a textChanged: O(1), no lee el texto."""
+        self._generation += 1
+        self._timer.start()
+
+    def shutdown(self, timeout: float = 1.0):
+        self._timer.stop()
+        with self._cond:
+            self._closed = True
+            self._pending = None
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    # ===============================
+    # Internos
+    # ===============================
+    def _dispatch(self):
+        # El texto se lee una vez por ráfaga de teclas, no por tecla
+        item = (self._generation, self._get_text())
+        with self._cond:
+            self._pending = item  # reemplaza cualquier texto que el hilo aún no tomó
+            self._cond.notify()
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                generation, code = self._pending
+                self._pending = None
+
+            if not self.is_current(generation):
+                continue
+            try:
+                errs = self._analyze(code)
+            except Exception:
+                errs = []
+            # Una edición durante el análisis lo deja obsoleto: no se publica
+            if self.is_current(generation):
+                self.results.emit(generation, errs)
@@ -8,12 +8,24 @@ Contiene clases para generar triplos y cuádruplos
 
 from .generador_triplos import GeneradorTriplos, Triplo
 from .generador_cuadruplos import GeneradorCuadruplos, Cuadruplo
+from .optimizador import OptimizadorCuadruplos
+from .cfg import BloqueBasico, GrafoFlujo
+from .flujo_datos import AnalisisFlujoDatos
+from .maquina_virtual import ErrorEjecucion, MaquinaVirtual
+from .maquina_compilada import MaquinaCompilada
 
 __all__ = [
     'GeneradorTriplos',
     'Triplo',
     'GeneradorCuadruplos',
-    'Cuadruplo'
+    'Cuadruplo',
+    'OptimizadorCuadruplos',
+    'BloqueBasico',
+    'GrafoFlujo',
+    'AnalisisFlujoDatos',
+    'MaquinaVirtual',
+    'MaquinaCompilada',
+    'ErrorEjecucion'
 ]
 
 __version__ = '1.0.0'
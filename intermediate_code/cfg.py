@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# intermediate_code/cfg.py
+"""
+Grafo de flujo de control (CFG) sobre los cuádruplos de GeneradorCuadruplos.
+
+Un bloque básico empieza en el primer cuádruplo, en cada LABEL (varias
+etiquetas seguidas caen en el mismo bloque) y después de cada GOTO o
+IF_FALSE. Sucesores del bloque según su último cuádruplo:
+  - GOTO L:        el bloque de L
+  - IF_FALSE c L:  el bloque siguiente (c verdadera) y el de L
+  - cualquier otro: el bloque siguiente, si hay
+
+Los dominadores se calculan con el algoritmo iterativo de Cooper, Harvey y
+Kennedy sobre el orden postorden inverso; los bloques inalcanzables desde la
+entrada no tienen dominador inmediato (None).
+
+Exporta a JSON (como_dict / a_json) y a Graphviz (a_dot).
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+SALTOS = ('GOTO', 'IF_FALSE')
+
+
+@dataclass
+class BloqueBasico:
+    """Cuádruplos [inicio, fin) de la lista original."""
+    id: int
+    inicio: int
+    fin: int
+    cuadruplos: List = field(repr=False)
+    etiquetas: List[str] = field(default_factory=list)
+    sucesores: List[int] = field(default_factory=list)
+    predecesores: List[int] = field(default_factory=list)
+
+    @property
+    def ultimo(self):
+        return self.cuadruplos[-1]
+
+    def __len__(self):
+        return self.fin - self.inicio
+
+
+class GrafoFlujo:
+    def __init__(self, cuadruplos):
+        self.cuadruplos = list(cuadruplos)
+        self.bloques: List[BloqueBasico] = []
+        self.etiquetas: Dict[str, int] = {}   # etiqueta -> id de su bloque
+        self._bloque_de_indice: List[int] = []
+        self._rpo: Optional[List[int]] = None
+        self._idom: Optional[List[Optional[int]]] = None
+        self._construir()
+
+    # =========================
+    # Construcción
+    # =========================
+    def _construir(self):
+        cuadruplos = self.cuadruplos
+        lideres = []
+        for i, cuadruplo in enumerate(cuadruplos):
+            anterior = cuadruplos[i - 1].operador if i else None
+            if (i == 0 or anterior in SALTOS
+                    or (cuadruplo.operador == 'LABEL' and anterior != 'LABEL')):
+                lideres.append(i)
+
+        for numero, inicio in enumerate(lideres):
+            fin = lideres[numero + 1] if numero + 1 < len(lideres) else len(cuadruplos)
+            bloque = BloqueBasico(numero, inicio, fin, cuadruplos[inicio:fin])
+            for cuadruplo in bloque.cuadruplos:
+                if cuadruplo.operador != 'LABEL':
+                    break
+                bloque.etiquetas.append(cuadruplo.resultado)
+                self.etiquetas[cuadruplo.resultado] = numero
+            self.bloques.append(bloque)
+            self._bloque_de_indice.extend([numero] * (fin - inicio))
+
+        for bloque in self.bloques:
+            siguiente = bloque.id + 1 if bloque.id + 1 < len(self.bloques) else None
+            ultimo = bloque.ultimo
+            if ultimo.operador == 'GOTO':
+                destinos = [self.etiquetas.get(ultimo.resultado)]
+            elif ultimo.operador == 'IF_FALSE':
+                destinos = [siguiente, self.etiquetas.get(ultimo.resultado)]
+            else:
+                destinos = [siguiente]
+            for destino in destinos:
+                if destino is not None and destino not in bloque.sucesores:
+                    bloque.sucesores.append(destino)
+                    self.bloques[destino].predecesores.append(bloque.id)
+
+    # =========================
+    # Consultas
+    # =========================
+    @property
+    def entrada(self) -> Optional[BloqueBasico]:
+        return self.bloques[0] if self.bloques else None
+
+    def bloque_de_etiqueta(self, etiqueta: str) -> Optional[BloqueBasico]:
+        numero = self.etiquetas.get(etiqueta)
+        return self.bloques[numero] if numero is not None else None
+
+    def bloque_de(self, indice: int) -> BloqueBasico:
+        """Bloque que contiene el cuádruplo 'indice' (posición en la lista)."""
+        return self.bloques[self._bloque_de_indice[indice]]
+
+    def orden_inverso(self) -> List[int]:
+        """Ids de los bloques alcanzables en postorden inverso desde la entrada."""
+        if self._rpo is None:
+            postorden = []
+            if self.bloques:
+                visitados = [False] * len(self.bloques)
+                visitados[0] = True
+                pila = [(0, iter(self.bloques[0].sucesores))]
+                while pila:
+                    actual, pendientes = pila[-1]
+                    for sucesor in pendientes:
+                        if not visitados[sucesor]:
+                            visitados[sucesor] = True
+                            pila.append((sucesor, iter(self.bloques[sucesor].sucesores)))
+                            break
+                    else:
+                        pila.pop()
+                        postorden.append(actual)
+            self._rpo = postorden[::-1]
+        return self._rpo
+
+    def alcanzables(self) -> List[int]:
+        return sorted(self.orden_inverso())
+
+    @property
+    def idom(self) -> List[Optional[int]]:
+        """Dominador inmediato de cada bloque (la entrada es su propio idom)."""
+        if self._idom is None:
+            self._idom = self._calcular_dominadores()
+        return self._idom
+
+    def _calcular_dominadores(self) -> List[Optional[int]]:
+        idom: List[Optional[int]] = [None] * len(self.bloques)
+        rpo = self.orden_inverso()
+        if not rpo:
+            return idom
+        posicion = {bloque: i for i, bloque in enumerate(rpo)}
+        idom[0] = 0
+
+        def intersectar(a, b):
+            while a != b:
+                while posicion[a] > posicion[b]:
+                    a = idom[a]
+                while posicion[b] > posicion[a]:
+                    b = idom[b]
+            return a
+
+        cambio = True
+        while cambio:
+            cambio = False
+            for bloque in rpo[1:]:
+                nuevo = None
+                for predecesor in self.bloques[bloque].predecesores:
+                    if idom[predecesor] is None:
+                        continue  # inalcanzable o todavía sin procesar
+                    nuevo = predecesor if nuevo is None else intersectar(predecesor, nuevo)
+                if nuevo is not None and idom[bloque] != nuevo:
+                    idom[bloque] = nuevo
+                    cambio = True
+        return idom
+
+    def dominadores(self, bloque: int) -> List[int]:
+        """Bloques que dominan a 'bloque', de él mismo hacia la entrada ([] si es inalcanzable)."""
+        idom = self.idom
+        if idom[bloque] is None:
+            return []
+        cadena = [bloque]
+        while cadena[-1] != 0:
+            cadena.append(idom[cadena[-1]])
+        return cadena
+
+    def domina(self, a: int, b: int) -> bool:
+        return a in self.dominadores(b)
+
+    # =========================
+    # Exportación
+    # =========================
+    def como_dict(self) -> Dict:
+        idom = self.idom
+        return {
+            'entrada': 0 if self.bloques else None,
+            'etiquetas': dict(self.etiquetas),
+            'bloques': [{
+                'id': b.id,
+                'inicio': b.inicio,
+                'fin': b.fin,
+                'etiquetas': list(b.etiquetas),
+                'cuadruplos': [str(c) for c in b.cuadruplos],
+                'sucesores': list(b.sucesores),
+                'predecesores': list(b.predecesores),
+                'idom': idom[b.id],
+            } for b in self.bloques],
+        }
+
+    def a_json(self, indent: Optional[int] = None) -> str:
+        return json.dumps(self.como_dict(), ensure_ascii=False, indent=indent)
+
+    def a_dot(self, dominadores: bool = False) -> str:
+        """Graphviz: un nodo por bloque con sus cuádruplos; con dominadores=True agrega el árbol de dominadores punteado."""
+        lineas = ['digraph cfg {', '  node [shape=box, fontname="monospace"];']
+        for bloque in self.bloques:
+            texto = ''.join(_escapar_dot(str(c)) + '\\l' for c in bloque.cuadruplos)
+            lineas.append(f'  B{bloque.id} [label="B{bloque.id}\\l{texto}"];')
+        for bloque in self.bloques:
+            ultimo = bloque.ultimo
+            for sucesor in bloque.sucesores:
+                atributos = ''
+                if ultimo.operador == 'IF_FALSE':
+                    salto = self.etiquetas.get(ultimo.resultado)
+                    atributos = ' [label="falso"]' if sucesor == salto else ' [label="verdadero"]'
+                lineas.append(f'  B{bloque.id} -> B{sucesor}{atributos};')
+        if dominadores:
+            for bloque, padre in enumerate(self.idom):
+                if padre is not None and padre != bloque:
+                    lineas.append(f'  B{padre} -> B{bloque} [style=dotted, color=gray, constraint=false];')
+        lineas.append('}')
+        return '\n'.join(lineas) + '\n'
+
+
+def _escapar_dot(texto: str) -> str:
+    return texto.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
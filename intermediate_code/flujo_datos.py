@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+# intermediate_code/flujo_datos.py
+"""
+Análisis de flujo de datos sobre el CFG de los cuádruplos (GrafoFlujo).
+
+Los conjuntos son enteros usados como bitsets: cada variable/temporal y cada
+expresión recibe un id al internarse, y el bit 'id' representa su presencia.
+Así unión, intersección y diferencia son |, & y & ~ sobre ints.
+
+Sólo los nombres "globales" entran en los conjuntos entre bloques: los que
+aparecen en más de un bloque o se usan en un bloque antes de asignarse en
+él. El resto (casi todos los temporales) vive y muere dentro de su bloque,
+así que los bitsets no crecen con la cantidad de temporales.
+
+  - vivas():                    nombres globales vivos a la entrada/salida de cada bloque
+  - definiciones_alcanzantes(): asignaciones a nombres globales que alcanzan
+    cada bloque, más una definición "indefinida" por nombre en la entrada
+  - usos_sin_definir():         usos a los que algún camino llega sin asignación previa
+  - expresiones_disponibles():  expresiones 'a op b' sobre nombres globales o
+    constantes ya calculadas en todo camino
+
+Se resuelven iterando sobre los bloques en postorden inverso (o su reverso
+para vivas) hasta el punto fijo; con ese orden bastan pocas vueltas.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from intermediate_code.cfg import GrafoFlujo
+from intermediate_code.optimizador import CONTROL, constante
+
+_NOMBRE = re.compile(r'[A-Za-z_$][\w$]*$')
+
+# Operadores sin expresión 'arg1 op arg2' (para expresiones disponibles)
+_NO_EXPRESION = CONTROL + ('=',)
+
+
+def bits(mascara: int):
+    """Posiciones de los bits encendidos de 'mascara', de menor a mayor."""
+    while mascara:
+        bajo = mascara & -mascara
+        yield bajo.bit_length() - 1
+        mascara ^= bajo
+
+
+class AnalisisFlujoDatos:
+    """
+    Análisis sobre 'grafo'. variables: variable -> tipo (tabla de símbolos del
+    generador); se usa para decidir qué es una variable además de los nombres
+    con forma de identificador.
+    """
+
+    def __init__(self, grafo: GrafoFlujo, variables: Optional[Dict[str, str]] = None):
+        self.grafo = grafo
+        self.variables = variables or {}
+        self.ids: Dict[str, int] = {}
+        self.nombres: List[str] = []
+
+        # Por cuádruplo: ids que usa y id que define (None si no define)
+        self.usos: List[Tuple[int, ...]] = []
+        self.definicion: List[Optional[int]] = []
+        for cuadruplo in grafo.cuadruplos:
+            usos = []
+            if cuadruplo.operador not in ('LABEL', 'GOTO'):
+                for argumento in (cuadruplo.arg1, cuadruplo.arg2):
+                    if self._es_nombre(argumento):
+                        nombre = self.internar(argumento)
+                        if nombre not in usos:
+                            usos.append(nombre)
+            self.usos.append(tuple(usos))
+            definido = None
+            if cuadruplo.operador not in CONTROL and cuadruplo.resultado:
+                definido = self.internar(cuadruplo.resultado)
+            self.definicion.append(definido)
+
+        self._separar_globales()
+
+        # Orden de recorrido: alcanzables en postorden inverso y después el resto
+        alcanzables = grafo.orden_inverso()
+        vistos = set(alcanzables)
+        self.orden = alcanzables + [b.id for b in grafo.bloques if b.id not in vistos]
+        self._vivas = self._alcanzantes = self._disponibles = None
+
+    # =========================
+    # Nombres
+    # =========================
+    def _es_nombre(self, texto: str) -> bool:
+        return bool(texto) and (texto in self.variables
+                                or (constante(texto) is None and _NOMBRE.match(texto) is not None))
+
+    def internar(self, nombre: str) -> int:
+        identificador = self.ids.get(nombre)
+        if identificador is None:
+            identificador = self.ids[nombre] = len(self.nombres)
+            self.nombres.append(nombre)
+        return identificador
+
+    def _separar_globales(self):
+        """self.bit: id de nombre -> posición en los bitsets (sólo nombres globales)."""
+        bloque_de = [-1] * len(self.nombres)
+        es_global = [False] * len(self.nombres)
+        for bloque in self.grafo.bloques:
+            asignados = set()
+            for i in range(bloque.inicio, bloque.fin):
+                for nombre in self.usos[i]:
+                    if nombre not in asignados:
+                        es_global[nombre] = True
+                definido = self.definicion[i]
+                for nombre in self.usos[i] + ((definido,) if definido is not None else ()):
+                    if bloque_de[nombre] == -1:
+                        bloque_de[nombre] = bloque.id
+                    elif bloque_de[nombre] != bloque.id:
+                        es_global[nombre] = True
+                if definido is not None:
+                    asignados.add(definido)
+
+        self.globales: List[int] = [n for n in range(len(self.nombres)) if es_global[n]]
+        self.bit: Dict[int, int] = {nombre: posicion for posicion, nombre in enumerate(self.globales)}
+
+    def es_global(self, nombre: str) -> bool:
+        return self.ids.get(nombre) in self.bit
+
+    def conjunto(self, mascara: int) -> List[str]:
+        """Nombres de un bitset de nombres globales."""
+        return [self.nombres[self.globales[b]] for b in bits(mascara)]
+
+    def _usa_define(self):
+        """Por bloque: (nombres globales usados antes de asignarse, nombres globales asignados)."""
+        usa, define = [], []
+        for bloque in self.grafo.bloques:
+            u = d = 0
+            for i in range(bloque.inicio, bloque.fin):
+                for nombre in self.usos[i]:
+                    b = self.bit.get(nombre)
+                    if b is not None and not d >> b & 1:
+                        u |= 1 << b
+                b = self.bit.get(self.definicion[i])
+                if b is not None:
+                    d |= 1 << b
+            usa.append(u)
+            define.append(d)
+        return usa, define
+
+    # =========================
+    # Vivas (hacia atrás, unión)
+    # =========================
+    def vivas(self) -> Tuple[List[int], List[int]]:
+        """(entrada, salida): bitset de nombres globales vivos por bloque."""
+        if self._vivas is None:
+            usa, define = self._usa_define()
+            n = len(self.grafo.bloques)
+            entrada, salida = [0] * n, [0] * n
+            orden = self.orden[::-1]
+            cambio = True
+            while cambio:
+                cambio = False
+                for b in orden:
+                    out = 0
+                    for sucesor in self.grafo.bloques[b].sucesores:
+                        out |= entrada[sucesor]
+                    salida[b] = out
+                    nuevo = usa[b] | (out & ~define[b])
+                    if nuevo != entrada[b]:
+                        entrada[b] = nuevo
+                        cambio = True
+            self._vivas = (entrada, salida)
+        return self._vivas
+
+    def vivas_por_cuadruplo(self) -> List[int]:
+        """Bitset de nombres globales vivos justo después de cada cuádruplo."""
+        _, salida = self.vivas()
+        despues = [0] * len(self.grafo.cuadruplos)
+        for bloque in self.grafo.bloques:
+            vivas = salida[bloque.id]
+            for i in range(bloque.fin - 1, bloque.inicio - 1, -1):
+                despues[i] = vivas
+                b = self.bit.get(self.definicion[i])
+                if b is not None:
+                    vivas &= ~(1 << b)
+                for nombre in self.usos[i]:
+                    b = self.bit.get(nombre)
+                    if b is not None:
+                        vivas |= 1 << b
+        return despues
+
+    # =========================
+    # Definiciones alcanzantes (hacia adelante, unión)
+    # =========================
+    def definiciones_alcanzantes(self) -> Tuple[List[int], List[int], List[Optional[int]]]:
+        """
+        (entrada, salida, cuadruplo_de): bitsets por bloque sobre las
+        definiciones de nombres globales. Las posiciones 0..G-1 son las
+        definiciones "indefinidas" de cada nombre global (G = len(globales));
+        cuadruplo_de[p] es el índice del cuádruplo de la definición p (None
+        para las indefinidas).
+        """
+        if self._alcanzantes is None:
+            n_globales = len(self.globales)
+            cuadruplo_de: List[Optional[int]] = [None] * n_globales
+            posicion_de = {}  # índice de cuádruplo -> posición de su definición
+            posiciones = [[g] for g in range(n_globales)]
+            for i, definido in enumerate(self.definicion):
+                b = self.bit.get(definido)
+                if b is not None:
+                    posicion_de[i] = len(cuadruplo_de)
+                    posiciones[b].append(len(cuadruplo_de))
+                    cuadruplo_de.append(i)
+            de_nombre = [sum(1 << p for p in lista) for lista in posiciones]
+
+            genera, mata = [], []
+            for bloque in self.grafo.bloques:
+                g = k = 0
+                for i in range(bloque.inicio, bloque.fin):
+                    if i in posicion_de:
+                        b = self.bit[self.definicion[i]]
+                        g = (g & ~de_nombre[b]) | 1 << posicion_de[i]
+                        k |= de_nombre[b]
+                genera.append(g)
+                mata.append(k)
+
+            n = len(self.grafo.bloques)
+            entrada, salida = [0] * n, [0] * n
+            indefinidas = (1 << n_globales) - 1
+            cambio = True
+            while cambio:
+                cambio = False
+                for b in self.orden:
+                    nuevo_in = indefinidas if b == 0 else 0
+                    for predecesor in self.grafo.bloques[b].predecesores:
+                        nuevo_in |= salida[predecesor]
+                    entrada[b] = nuevo_in
+                    nuevo = genera[b] | (nuevo_in & ~mata[b])
+                    if nuevo != salida[b]:
+                        salida[b] = nuevo
+                        cambio = True
+            self._alcanzantes = (entrada, salida, cuadruplo_de)
+        return self._alcanzantes
+
+    def usos_sin_definir(self) -> List[Tuple[int, str]]:
+        """
+        (índice del cuádruplo, nombre) de cada uso al que llega, por algún
+        camino desde la entrada, sin ninguna asignación previa del nombre.
+        Sólo se consideran nombres que el IR asigna en algún lado.
+
+        Es la proyección por nombre de las definiciones "indefinidas"
+        alcanzantes: basta un bitset de nombres globales por bloque.
+        """
+        _, define = self._usa_define()
+        n = len(self.grafo.bloques)
+        entrada, salida = [0] * n, [0] * n
+        todas = (1 << len(self.globales)) - 1
+        cambio = True
+        while cambio:
+            cambio = False
+            for b in self.orden:
+                nuevo_in = todas if b == 0 else 0
+                for predecesor in self.grafo.bloques[b].predecesores:
+                    nuevo_in |= salida[predecesor]
+                entrada[b] = nuevo_in
+                nuevo = nuevo_in & ~define[b]
+                if nuevo != salida[b]:
+                    salida[b] = nuevo
+                    cambio = True
+
+        asignados = 0
+        for definido in self.definicion:
+            b = self.bit.get(definido)
+            if b is not None:
+                asignados |= 1 << b
+
+        hallados = []
+        for b in self.grafo.alcanzables():
+            bloque = self.grafo.bloques[b]
+            indefinidas = entrada[b] & asignados
+            for i in range(bloque.inicio, bloque.fin):
+                if not indefinidas:
+                    break
+                for nombre in self.usos[i]:
+                    posicion = self.bit.get(nombre)
+                    if posicion is not None and indefinidas >> posicion & 1:
+                        hallados.append((i, self.nombres[nombre]))
+                posicion = self.bit.get(self.definicion[i])
+                if posicion is not None:
+                    indefinidas &= ~(1 << posicion)
+        return hallados
+
+    # =========================
+    # Expresiones disponibles (hacia adelante, intersección)
+    # =========================
+    def expresiones_disponibles(self) -> Tuple[List[int], List[int], List[Tuple[str, str, str]]]:
+        """
+        (entrada, salida, expresiones): bitsets por bloque sobre la lista de
+        expresiones (op, arg1, arg2) cuyos operandos son nombres globales o
+        constantes.
+        """
+        if self._disponibles is None:
+            expresiones: List[Tuple[str, str, str]] = []
+            id_expresion: Dict[Tuple[str, str, str], int] = {}
+            de_cuadruplo: Dict[int, int] = {}
+            usan = [0] * len(self.globales)  # expresiones que caen al reasignar cada nombre
+            for i, cuadruplo in enumerate(self.grafo.cuadruplos):
+                if cuadruplo.operador in _NO_EXPRESION:
+                    continue
+                operandos = [self.bit.get(self.ids[a]) for a in (cuadruplo.arg1, cuadruplo.arg2)
+                             if a in self.ids]
+                if None in operandos:
+                    continue  # usa un nombre local
+                clave = (cuadruplo.operador, cuadruplo.arg1, cuadruplo.arg2)
+                e = id_expresion.get(clave)
+                if e is None:
+                    e = id_expresion[clave] = len(expresiones)
+                    expresiones.append(clave)
+                    for b in operandos:
+                        usan[b] |= 1 << e
+                de_cuadruplo[i] = e
+
+            genera, mata = [], []
+            for bloque in self.grafo.bloques:
+                g = k = 0
+                for i in range(bloque.inicio, bloque.fin):
+                    if i in de_cuadruplo:
+                        g |= 1 << de_cuadruplo[i]
+                    b = self.bit.get(self.definicion[i])
+                    if b is not None:
+                        g &= ~usan[b]
+                        k |= usan[b]
+                genera.append(g)
+                mata.append(k)
+
+            n = len(self.grafo.bloques)
+            todas = (1 << len(expresiones)) - 1
+            entrada, salida = [0] * n, [todas] * n
+            cambio = True
+            while cambio:
+                cambio = False
+                for b in self.orden:
+                    bloque = self.grafo.bloques[b]
+                    if b == 0 or not bloque.predecesores:
+                        nuevo_in = 0
+                    else:
+                        nuevo_in = todas
+                        for predecesor in bloque.predecesores:
+                            nuevo_in &= salida[predecesor]
+                    entrada[b] = nuevo_in
+                    nuevo = genera[b] | (nuevo_in & ~mata[b])
+                    if nuevo != salida[b]:
+                        salida[b] = nuevo
+                        cambio = True
+            self._disponibles = (entrada, salida, expresiones)
+        return self._disponibles
@@ -2,8 +2,83 @@
 # intermediate_code/generador_cuadruplos.py
 
 from dataclasses import dataclass
-from typing import List, Optional, Union
-from lexer.analizador_lexico import construir_lexer
+from typing import Dict, List, Optional, Union
+from lexer.token_stream import obtener_token_stream
+from intermediate_code.cfg import GrafoFlujo
+from intermediate_code.flujo_datos import AnalisisFlujoDatos
+from intermediate_code.optimizador import OptimizadorCuadruplos
+from tracing import trazas
+
+_traza = trazas.canal('ir')
+
+# Niveles de precedencia de las expresiones (de menor a mayor); un token es
+# operador de un nivel si su tipo o su valor está en el grupo
+NIVELES_OPERADOR = (
+    ('OR', '||'),
+    ('AND', '&&'),
+    ('IGUAL', 'DISTINTO', '==', '!='),
+    ('MENORQUE', 'MAYORQUE', 'MENORIGUAL', 'MAYORIGUAL', '<', '>', '<=', '>='),
+    ('SUMA', 'RESTA', '+', '-'),
+    ('MULT', 'DIV', 'MODULO', '*', '/', '%'),
+)
+_NIVEL = {}
+
+# Tipos de las declaraciones que se registran en la tabla de símbolos
+TIPOS_DECLARACION = ('INT', 'DOUBLE', 'FLOAT', 'BOOLEAN', 'STRING', 'LONG', 'SHORT', 'BYTE', 'CHAR')
+
+# Tokens de construcciones que la traducción a cuádruplos no cubre
+_NO_SOPORTADAS = {
+    'DO': 'do-while', 'SWITCH': 'switch', 'CASE': 'switch', 'DEFAULT': 'switch',
+    'BREAK': 'break', 'CONTINUE': 'continue', 'RETURN': 'return', 'NEW': 'new',
+    'TRY': 'try/catch', 'THROW': 'throw', 'CORIZQ': 'arreglos',
+    'COMA': "listas separadas por ','", 'INTERROGACION': "operador '?:'",
+    'MODULOASIGNAR': "operador '%='",
+    'BITAND': 'operadores de bits', 'BITOR': 'operadores de bits', 'BITXOR': 'operadores de bits',
+    'BITNOT': 'operadores de bits', 'BITSHIFTIZQ': 'operadores de bits',
+    'BITSHIFTDER': 'operadores de bits', 'BITSHIFTDERU': 'operadores de bits',
+}
+
+# Literales de texto: van entre comillas en el IR y su valor nunca es un operador
+_COMILLAS = {'CADENA': '"', 'CARACTER': "'"}
+for _nivel, _grupo in enumerate(NIVELES_OPERADOR):
+    for _clave in _grupo:
+        _NIVEL.setdefault(_clave, _nivel)
+
+
+def nivel_operador(token) -> Optional[int]:
+    """Nivel de precedencia de 'token' como operador binario (None si no lo es)."""
+    nivel = _NIVEL.get(token.type)
+    valor = token.value
+    if isinstance(valor, str) and token.type not in _COMILLAS:
+        por_valor = _NIVEL.get(valor)
+        if por_valor is not None and (nivel is None or por_valor < nivel):
+            nivel = por_valor
+    return nivel
+
+
+def operando(token) -> str:
+    """
+    Texto del IR para un token operando. Los literales String y char van
+    entre comillas ("7", 'c') para no confundirlos con números o nombres.
+    """
+    comilla = _COMILLAS.get(token.type)
+    if comilla is not None:
+        return f"{comilla}{token.value}{comilla}"
+    return str(token.value)
+
+
+def emparejar_parentesis(tokens) -> Optional[Dict[int, int]]:
+    """Índice del ')' que cierra cada '(' de 'tokens'; None si no están balanceados."""
+    cierre = {}
+    abiertos = []
+    for i, token in enumerate(tokens):
+        if token.type == 'PARIZQ':
+            abiertos.append(i)
+        elif token.type == 'PARDER':
+            if not abiertos:
+                return None
+            cierre[abiertos.pop()] = i
+    return None if abiertos else cierre
 
 
 @dataclass
@@ -30,26 +105,93 @@ class Cuadruplo:
         return [str(self.indice), self.operador, fmt(self.arg1), fmt(self.arg2), fmt(self.resultado)]
 
 
+def construcciones_no_soportadas(tokens) -> List[str]:
+    """
+    'línea N: construcción' por cada clase de construcción del fuente que
+    generar_desde_codigo no sabe traducir (se saltea o se traduce mal), con la
+    primera línea donde aparece.
+    """
+    halladas: Dict[str, str] = {}
+    n = len(tokens)
+    i = 0
+    while i < n:
+        token = tokens[i]
+        tipo = token.type
+        if tipo == 'MAIN':
+            # Cabecera de main: 'String[] args' no es un arreglo del programa
+            while i < n and tokens[i].type != 'LLAIZQ':
+                i += 1
+            continue
+        siguiente = tokens[i + 1].type if i + 1 < n else None
+        descripcion = _NO_SOPORTADAS.get(tipo)
+        if descripcion is None:
+            if tipo == 'PRINT':
+                descripcion = 'System.out.print (sólo System.out.println)'
+            elif tipo == 'IDENTIFICADOR' and siguiente == 'PARIZQ':
+                descripcion = f"métodos y llamadas salvo main y System.out.println ('{token.value}')"
+            elif tipo == 'ELSE' and siguiente != 'LLAIZQ':
+                descripcion = 'else sin llaves (else if)'
+            elif tipo in ('IF', 'FOR', 'WHILE') and siguiente == 'PARIZQ':
+                cierre = _cierre_parentesis(tokens, i + 1)
+                cola_do = (tipo == 'WHILE' and i > 0 and tokens[i - 1].type == 'LLADER'  # '} while (...);'
+                           and cierre + 1 < n and tokens[cierre + 1].type in ['PUNTOCOMA', 'PUNTOYCOMA'])
+                if (cierre + 1 >= n or tokens[cierre + 1].type != 'LLAIZQ') and not cola_do:
+                    descripcion = f'{token.value} sin llaves'
+        if descripcion is not None:
+            clave = descripcion.split(' (')[0]
+            halladas.setdefault(clave, f"línea {token.lineno}: {descripcion}")
+        i += 1
+    return list(halladas.values())
+
+
+def _cierre_parentesis(tokens, abre: int) -> int:
+    """Índice del ')' que cierra el '(' en 'abre' (len(tokens) si no se cierra)."""
+    nivel = 0
+    for k in range(abre, len(tokens)):
+        if tokens[k].type == 'PARIZQ':
+            nivel += 1
+        elif tokens[k].type == 'PARDER':
+            nivel -= 1
+            if nivel == 0:
+                return k
+    return len(tokens)
+
+
 class GeneradorCuadruplos:
     """Clase especializada para generar cuádruplos desde código Java"""
 
-    def __init__(self):
+    def __init__(self, optimizaciones: Optional[Dict[str, bool]] = None):
+        """
+        optimizaciones: pase -> activo (ver intermediate_code/optimizador.py);
+        los pases no mencionados quedan activos.
+        """
         self.cuadruplos: List[Cuadruplo] = []
+        self.cuadruplos_sin_optimizar: List[Cuadruplo] = []
+        self.optimizador = OptimizadorCuadruplos(optimizaciones)
         self.contador_temp = 0
         self.contador_if = 0
         self.contador_for = 0
         self.contador_while = 0
         self.contador_etiqueta_general = 0
         self.tabla_simbolos = {}  # Para rastrear variables declaradas
+        self.no_soportadas: List[str] = []  # construcciones_no_soportadas() del último fuente
+
+    @property
+    def optimizaciones(self) -> Dict[str, bool]:
+        """Pases de optimización (pase -> activo); se pueden cambiar antes de generar."""
+        return self.optimizador.pases
 
     def limpiar(self):
         self.cuadruplos.clear()
+        self.cuadruplos_sin_optimizar = []
+        self.optimizador.estadisticas = {}
         self.contador_temp = 0
         self.contador_if = 0
         self.contador_for = 0
         self.contador_while = 0
         self.contador_etiqueta_general = 0
         self.tabla_simbolos.clear()
+        self.no_soportadas = []
 
     def nuevo_temporal(self) -> str:
         self.contador_temp += 1
@@ -93,29 +235,28 @@ class GeneradorCuadruplos:
         arg2_norm = str(arg2) if arg2 is not None else ""
         resultado_norm = str(resultado) if resultado is not None else ""
 
-        print(f"Agregando cuádruplo {indice}: {operador} | '{arg1_norm}' | '{arg2_norm}' | '{resultado_norm}'")
+        if _traza.activo:
+            _traza("cuádruplo agregado", indice=indice, op=operador,
+                   arg1=arg1_norm, arg2=arg2_norm, resultado=resultado_norm)
 
         cuadruplo = Cuadruplo(indice, operador, arg1_norm, arg2_norm, resultado_norm)
         self.cuadruplos.append(cuadruplo)
 
-    def generar_desde_codigo(self, codigo: str) -> List[Cuadruplo]:
+    def generar_desde_codigo(self, codigo: str, tokens=None) -> List[Cuadruplo]:
         self.limpiar()
 
         if not codigo.strip():
             return self.cuadruplos
 
         try:
-            lexer = construir_lexer()
-            lexer.input(codigo)
-            tokens = []
-            while True:
-                tok = lexer.token()
-                if not tok:
-                    break
-                tokens.append(tok)
+            if tokens is None:
+                tokens = obtener_token_stream(codigo).tokens
+            self.no_soportadas = construcciones_no_soportadas(tokens)
 
-            print(f"Total de tokens encontrados: {len(tokens)}")
+            if _traza.activo:
+                _traza("generando cuádruplos", tokens=len(tokens))
             self._procesar_tokens_cuadruplos(tokens)
+            self._optimizar()
 
         except Exception as e:
             print(f"Error generando cuádruplos: {e}")
@@ -124,6 +265,15 @@ class GeneradorCuadruplos:
 
         return self.cuadruplos
 
+    def _optimizar(self):
+        """Aplica los pases activos; los cuádruplos originales quedan en cuadruplos_sin_optimizar."""
+        self.cuadruplos_sin_optimizar = list(self.cuadruplos)
+        self.optimizador.variables = self.tabla_simbolos
+        self.cuadruplos[:] = self.optimizador.optimizar(self.cuadruplos_sin_optimizar)
+        if _traza.activo:
+            _traza("optimización", antes=len(self.cuadruplos_sin_optimizar), despues=len(self.cuadruplos),
+                   pases={nombre: e['cambios'] for nombre, e in self.optimizador.estadisticas.items()})
+
     def _procesar_tokens_cuadruplos(self, tokens):
         """Procesa todos los tokens de forma secuencial"""
         i = 0
@@ -138,6 +288,11 @@ class GeneradorCuadruplos:
                 elif self._es_declaracion_con_inicializacion(tokens, i):
                     i = self._procesar_declaracion_con_inicializacion(tokens, i)
 
+                # Declaraciones sin inicialización: sólo registran el tipo
+                elif self._es_declaracion_sin_inicializacion(tokens, i):
+                    self.tabla_simbolos[tokens[i + 1].value] = tokens[i].value
+                    i += 3
+
                 # Procesar asignaciones simples
                 elif self._es_asignacion_simple(tokens, i):
                     i = self._procesar_asignacion_simple(tokens, i)
@@ -205,17 +360,25 @@ class GeneradorCuadruplos:
     def _es_declaracion_con_inicializacion(self, tokens, i):
         """Detecta: tipo variable = expresión;"""
         return (i + 3 < len(tokens) and
-                tokens[i].type in ['INT', 'DOUBLE', 'FLOAT', 'BOOLEAN', 'STRING'] and
+                tokens[i].type in TIPOS_DECLARACION and
                 tokens[i + 1].type == 'IDENTIFICADOR' and
                 tokens[i + 2].type == 'ASIGNAR')
 
+    def _es_declaracion_sin_inicializacion(self, tokens, i):
+        """Detecta: tipo variable;"""
+        return (i + 2 < len(tokens) and
+                tokens[i].type in TIPOS_DECLARACION and
+                tokens[i + 1].type == 'IDENTIFICADOR' and
+                tokens[i + 2].type in ['PUNTOCOMA', 'PUNTOYCOMA'])
+
     def _procesar_declaracion_con_inicializacion(self, tokens, i):
         """Procesa: int variable = expresión;"""
         tipo = tokens[i].value
         variable = tokens[i + 1].value
         self.tabla_simbolos[variable] = tipo
 
-        print(f"Procesando declaración: {tipo} {variable} = ...")
+        if _traza.activo:
+            _traza("declaración", tipo=tipo, variable=variable)
 
         i += 3  # Saltar tipo, variable y '='
 
@@ -251,7 +414,8 @@ class GeneradorCuadruplos:
     def _procesar_asignacion_simple(self, tokens, i):
         """Procesa: variable = expresión;"""
         variable = tokens[i].value
-        print(f"Procesando asignación simple: {variable} = ...")
+        if _traza.activo:
+            _traza("asignación simple", variable=variable)
 
         i += 2  # Saltar variable y '='
 
@@ -289,7 +453,8 @@ class GeneradorCuadruplos:
         variable = tokens[i].value
         operador_compound = tokens[i + 1].type
 
-        print(f"Procesando asignación compuesta: {variable} {tokens[i + 1].value} ...")
+        if _traza.activo:
+            _traza("asignación compuesta", variable=variable, op=tokens[i + 1].value)
 
         i += 2  # Saltar variable y operador
 
@@ -330,7 +495,8 @@ class GeneradorCuadruplos:
 
     def _procesar_for_completo(self, tokens, i):
         """Procesa un bucle FOR completo: for(init; cond; incr) { cuerpo }"""
-        print("Procesando bucle FOR completo...")
+        if _traza.activo:
+            _traza("for")
 
         i += 1  # Saltar 'for'
 
@@ -345,9 +511,10 @@ class GeneradorCuadruplos:
             i += 1
 
         if init_tokens:
-            print(f"Procesando inicialización FOR: {[t.value for t in init_tokens]}")
+            if _traza.activo:
+                _traza("for: inicialización", tokens=[t.value for t in init_tokens])
             if (len(init_tokens) >= 4 and
-                    init_tokens[0].type in ['INT', 'DOUBLE'] and
+                    init_tokens[0].type in TIPOS_DECLARACION and
                     init_tokens[1].type == 'IDENTIFICADOR' and
                     init_tokens[2].type == 'ASIGNAR'):
 
@@ -376,7 +543,8 @@ class GeneradorCuadruplos:
             i += 1
 
         if cond_tokens:
-            print(f"Procesando condición FOR: {[t.value for t in cond_tokens]}")
+            if _traza.activo:
+                _traza("for: condición", tokens=[t.value for t in cond_tokens])
             resultado_cond = self._procesar_expresion_completa(cond_tokens)
             self.agregar_cuadruplo("IF_FALSE", resultado_cond, "", etiqueta_fin)
 
@@ -419,12 +587,14 @@ class GeneradorCuadruplos:
                 i += 1
 
             if cuerpo_tokens:
-                print(f"Procesando cuerpo FOR: {len(cuerpo_tokens)} tokens")
+                if _traza.activo:
+                    _traza("for: cuerpo", tokens=len(cuerpo_tokens))
                 self._procesar_tokens_cuadruplos(cuerpo_tokens)
 
         # 6. Procesar incremento
         if incr_tokens:
-            print(f"Procesando incremento FOR: {[t.value for t in incr_tokens]}")
+            if _traza.activo:
+                _traza("for: incremento", tokens=[t.value for t in incr_tokens])
             if len(incr_tokens) == 2 and incr_tokens[1].type == 'INCREMENTO':
                 variable_incr = incr_tokens[0].value
                 temp_inc = self.nuevo_temporal()
@@ -444,7 +614,8 @@ class GeneradorCuadruplos:
 
     def _procesar_if_completo(self, tokens, i):
         """Procesa una estructura IF completa"""
-        print("Procesando estructura IF completa...")
+        if _traza.activo:
+            _traza("if")
 
         i += 1  # Saltar 'if'
 
@@ -522,7 +693,8 @@ class GeneradorCuadruplos:
 
     def _procesar_while_completo(self, tokens, i):
         """Procesa un bucle WHILE completo"""
-        print("Procesando bucle WHILE completo...")
+        if _traza.activo:
+            _traza("while")
 
         i += 1  # Saltar 'while'
 
@@ -591,7 +763,8 @@ class GeneradorCuadruplos:
 
     def _procesar_system_out_println(self, tokens, i):
         """Procesa System.out.println(argumentos)"""
-        print("Procesando System.out.println...")
+        if _traza.activo:
+            _traza("System.out.println")
 
         i += 5  # Saltar System.out.println
 
@@ -656,26 +829,119 @@ class GeneradorCuadruplos:
         return i
 
     def _procesar_expresion_completa(self, tokens) -> str:
-        """Procesa una expresión completa respetando precedencia de operadores"""
+        """
+        Procesa una expresión completa respetando precedencia de operadores.
+
+        Una sola pasada con pila de operadores (precedence climbing): produce los
+        mismos cuádruplos, en el mismo orden y con los mismos temporales, que
+        partir recursivamente en el operador de menor precedencia más a la
+        derecha (_procesar_expresion_recursiva), sin re-escanear la lista por
+        nivel ni copiar sublistas. Con paréntesis desbalanceados se usa la
+        versión recursiva.
+        """
+        if not tokens:
+            return ""
+
+        # Caso simple: un solo token
+        if len(tokens) == 1:
+            return operando(tokens[0])
+
+        cierre = emparejar_parentesis(tokens)
+        if cierre is None:
+            return self._procesar_expresion_recursiva(tokens)
+        return self._expresion_lineal(tokens, 0, len(tokens), cierre)
+
+    def _expresion_lineal(self, tokens, inicio: int, fin: int, cierre: Dict[int, int]) -> str:
+        """
+        tokens[inicio:fin] (paréntesis balanceados). Los operadores fuera de
+        paréntesis separan "tramos" (operandos, posiblemente vacíos); los
+        tramos se resuelven al leerlos y cada operador al desapilarlo, o sea en
+        postorden, igual que la versión recursiva.
+        """
+        if fin - inicio == 1:
+            return operando(tokens[inicio])
+
+        operandos = []    # (valor, tramo_vacío)
+        operadores = []   # (nivel, token)
+        tramo = inicio
+        i = inicio
+        while i < fin:
+            token = tokens[i]
+            if token.type == 'PARIZQ':
+                i = cierre[i] + 1  # lo de adentro pertenece al tramo
+                continue
+            nivel = nivel_operador(token)
+            if nivel is not None:
+                operandos.append(self._tramo(tokens, tramo, i, cierre))
+                # Asociatividad izquierda: se reduce todo lo de nivel >= al actual
+                while operadores and operadores[-1][0] >= nivel:
+                    self._reducir(operandos, operadores.pop()[1])
+                operadores.append((nivel, token))
+                tramo = i + 1
+            i += 1
+
+        if not operadores:
+            return self._tramo(tokens, inicio, fin, cierre)[0]
+
+        operandos.append(self._tramo(tokens, tramo, fin, cierre))
+        while operadores:
+            self._reducir(operandos, operadores.pop()[1])
+        return operandos[0][0]
+
+    def _reducir(self, operandos, token):
+        """Aplica el operador 'token' a los dos últimos operandos de la pila."""
+        operando_der, der_vacio = operandos.pop()
+        operando_izq, izq_vacio = operandos.pop()
+        if izq_vacio and der_vacio:
+            # La subexpresión es el operador solo: se toma como valor
+            operandos.append((str(token.value), False))
+            return
+        operador = self._obtener_simbolo_operador(token)
+        temp_resultado = self.nuevo_temporal()
+        self.agregar_cuadruplo(operador, operando_izq, operando_der, temp_resultado)
+        operandos.append((temp_resultado, False))
+
+    def _tramo(self, tokens, inicio: int, fin: int, cierre: Dict[int, int]):
+        """(valor, vacío) de un tramo sin operadores fuera de paréntesis."""
+        largo = fin - inicio
+        if largo == 0:
+            return "", True
+        if largo == 1:
+            return operando(tokens[inicio]), False
+
+        # Negación lógica: '! "" x'
+        if tokens[inicio].type == 'NOT':
+            return self._negar(self._tramo(tokens, inicio + 1, fin, cierre)[0]), False
+
+        # Paréntesis externos
+        if largo >= 3 and tokens[inicio].type == 'PARIZQ' and tokens[fin - 1].type == 'PARDER':
+            if cierre[inicio] == fin - 1:
+                return self._expresion_lineal(tokens, inicio + 1, fin - 1, cierre), False
+            # '(a)(b)': sin los externos queda desbalanceado
+            return self._procesar_expresion_recursiva(list(tokens[inicio + 1:fin - 1])), False
+
+        # Concatenación de strings
+        temp_actual = operando(tokens[inicio])
+        for i in range(inicio + 1, fin, 2):
+            if i + 1 < fin:
+                operador = tokens[i]
+                if operador.type == 'SUMA' or operador.value == '+':
+                    temp_resultado = self.nuevo_temporal()
+                    self.agregar_cuadruplo("+", temp_actual, operando(tokens[i + 1]), temp_resultado)
+                    temp_actual = temp_resultado
+        return temp_actual, False
+
+    def _procesar_expresion_recursiva(self, tokens) -> str:
+        """Parte la expresión en su operador principal y procesa cada lado (ver _procesar_expresion_completa)"""
         if not tokens:
             return ""
 
         # Caso simple: un solo token
         if len(tokens) == 1:
-            return str(tokens[0].value)
-
-        # Precedencia de operadores (de menor a mayor)
-        operadores_precedencia = [
-            ['OR', '||'],
-            ['AND', '&&'],
-            ['IGUAL', 'DISTINTO', '==', '!='],
-            ['MENORQUE', 'MAYORQUE', 'MENORIGUAL', 'MAYORIGUAL', '<', '>', '<=', '>='],
-            ['SUMA', 'RESTA', '+', '-'],
-            ['MULT', 'DIV', 'MODULO', '*', '/', '%']
-        ]
+            return operando(tokens[0])
 
         # Procesar por niveles de precedencia (menor a mayor)
-        for grupo_ops in operadores_precedencia:
+        for grupo_ops in NIVELES_OPERADOR:
             pos_operador = self._encontrar_operador_principal(tokens, grupo_ops)
 
             if pos_operador != -1:
@@ -684,8 +950,8 @@ class GeneradorCuadruplos:
                 der_tokens = tokens[pos_operador + 1:]
 
                 # Procesar operandos recursivamente
-                operando_izq = self._procesar_expresion_completa(izq_tokens) if izq_tokens else ""
-                operando_der = self._procesar_expresion_completa(der_tokens) if der_tokens else ""
+                operando_izq = self._procesar_expresion_recursiva(izq_tokens) if izq_tokens else ""
+                operando_der = self._procesar_expresion_recursiva(der_tokens) if der_tokens else ""
 
                 # Obtener símbolo del operador
                 operador = self._obtener_simbolo_operador(tokens[pos_operador])
@@ -695,29 +961,37 @@ class GeneradorCuadruplos:
                 self.agregar_cuadruplo(operador, operando_izq, operando_der, temp_resultado)
                 return temp_resultado
 
+        # Negación lógica
+        if tokens[0].type == 'NOT':
+            return self._negar(self._procesar_expresion_recursiva(tokens[1:]))
+
         # Manejar paréntesis
         if (len(tokens) >= 3 and
                 tokens[0].type == 'PARIZQ' and
                 tokens[-1].type == 'PARDER' and
                 self._parentesis_balanceados(tokens)):
             # Remover paréntesis externos y procesar
-            return self._procesar_expresion_completa(tokens[1:-1])
+            return self._procesar_expresion_recursiva(tokens[1:-1])
 
         # Manejar concatenación de strings
         if len(tokens) > 1:
-            temp_actual = str(tokens[0].value)
+            temp_actual = operando(tokens[0])
             for i in range(1, len(tokens), 2):
                 if i + 1 < len(tokens):
                     operador = tokens[i]
-                    operando = tokens[i + 1]
                     if operador.type == 'SUMA' or operador.value == '+':
                         temp_resultado = self.nuevo_temporal()
-                        self.agregar_cuadruplo("+", temp_actual, str(operando.value), temp_resultado)
+                        self.agregar_cuadruplo("+", temp_actual, operando(tokens[i + 1]), temp_resultado)
                         temp_actual = temp_resultado
             return temp_actual
 
         # Caso por defecto: primer token
-        return str(tokens[0].value) if tokens else ""
+        return operando(tokens[0]) if tokens else ""
+
+    def _negar(self, valor: str) -> str:
+        temp_resultado = self.nuevo_temporal()
+        self.agregar_cuadruplo("!", "", valor, temp_resultado)
+        return temp_resultado
 
     def _encontrar_operador_principal(self, tokens, grupo_operadores):
         """Encuentra la posición del operador principal (más a la derecha fuera de paréntesis)"""
@@ -729,7 +1003,7 @@ class GeneradorCuadruplos:
                 nivel_parentesis += 1
             elif token.type == 'PARIZQ':
                 nivel_parentesis -= 1
-            elif nivel_parentesis == 0:  # Solo operadores fuera de paréntesis
+            elif nivel_parentesis == 0 and token.type not in _COMILLAS:  # Solo operadores fuera de paréntesis
                 if token.type in grupo_operadores or (hasattr(token, 'value') and token.value in grupo_operadores):
                     return i
 
@@ -785,9 +1059,24 @@ class GeneradorCuadruplos:
             'etiquetas_for_generadas': etiquetas_for,
             'etiquetas_while_generadas': etiquetas_while,
             'etiquetas_generales_generadas': etiquetas_generales,
-            'variables_declaradas': len(self.tabla_simbolos)
+            'variables_declaradas': len(self.tabla_simbolos),
+            'optimizacion': {
+                'cuadruplos_antes': len(self.cuadruplos_sin_optimizar),
+                'cuadruplos_despues': total,
+                'temporales_antes': self.optimizador.temporales(self.cuadruplos_sin_optimizar),
+                'temporales_despues': self.optimizador.temporales(self.cuadruplos),
+                'pases': {nombre: dict(e) for nombre, e in self.optimizador.estadisticas.items()},
+            }
         }
 
+    def grafo_flujo(self) -> GrafoFlujo:
+        """CFG (bloques básicos, sucesores/predecesores, dominadores) de los cuádruplos actuales."""
+        return GrafoFlujo(self.cuadruplos)
+
+    def analisis_flujo_datos(self) -> AnalisisFlujoDatos:
+        """Vivas, definiciones alcanzantes y expresiones disponibles sobre grafo_flujo()."""
+        return AnalisisFlujoDatos(self.grafo_flujo(), self.tabla_simbolos)
+
     def generar_codigo_objeto(self):
         """Genera código objeto a partir de los cuádruplos"""
         codigo_objeto = []
@@ -816,6 +1105,10 @@ class GeneradorCuadruplos:
                     codigo_objeto.append(f"JE {cuad.resultado}")
                 elif cuad.operador == "!=":
                     codigo_objeto.append(f"JNE {cuad.resultado}")
+            elif cuad.operador == "!":
+                codigo_objeto.append(f"LOAD {cuad.arg2}")
+                codigo_objeto.append("NOT")
+                codigo_objeto.append(f"STORE {cuad.resultado}")
             elif cuad.operador == "IF_FALSE":
                 codigo_objeto.append(f"LOAD {cuad.arg1}")
                 codigo_objeto.append(f"JZ {cuad.resultado}")
@@ -853,7 +1146,8 @@ class GeneradorCuadruplos:
     def validar_cuadruplos(self):
         """Valida la consistencia de los cuádruplos generados"""
         errores = []
-        variables_definidas = set(self.tabla_simbolos.keys())
+        # Los literales booleanos (p. ej. de condiciones plegadas) no son variables
+        variables_definidas = set(self.tabla_simbolos.keys()) | {'true', 'false'}
 
         for i, cuad in enumerate(self.cuadruplos):
             # Verificar que las variables usadas estén definidas
@@ -869,4 +1163,9 @@ class GeneradorCuadruplos:
             if cuad.operador == "=" and cuad.resultado and cuad.resultado.startswith('t') == False:
                 variables_definidas.add(cuad.resultado)
 
+        # Usos a los que algún camino del CFG llega sin asignación previa
+        for i, nombre in self.analisis_flujo_datos().usos_sin_definir():
+            if f"Cuádruplo {i}: Variable '{nombre}' no definida" not in errores:
+                errores.append(f"Cuádruplo {i}: Variable '{nombre}' puede usarse antes de ser asignada")
+
         return errores
\ No newline at end of file
@@ -3,7 +3,19 @@
 
 from dataclasses import dataclass
 from typing import List, Optional, Dict
-from lexer.analizador_lexico import construir_lexer
+from lexer.token_stream import obtener_token_stream
+from intermediate_code.generador_cuadruplos import emparejar_parentesis
+
+# Precedencia de los operadores binarios por tipo de token (mayor = liga más)
+PRECEDENCIA = {
+    '||': 1, 'OR': 1,
+    '&&': 2, 'AND': 2,
+    '==': 3, '!=': 3, 'IGUAL': 3, 'DISTINTO': 3,
+    '<': 4, '>': 4, '<=': 4, '>=': 4,
+    'MENORQUE': 4, 'MAYORQUE': 4, 'MENORIGUAL': 4, 'MAYORIGUAL': 4,
+    '+': 5, '-': 5, 'SUMA': 5, 'RESTA': 5,
+    '*': 6, '/': 6, '%': 6, 'MULT': 6, 'DIV': 6, 'MODULO': 6
+}
 
 
 @dataclass
@@ -106,23 +118,16 @@ class GeneradorTriplos:
             return f"({self.variables[nombre_variable]})"
         return nombre_variable
 
-    def generar_desde_codigo(self, codigo: str) -> List[Triplo]:
-        """Genera triplos desde código Java"""
+    def generar_desde_codigo(self, codigo: str, tokens=None) -> List[Triplo]:
+        """Genera triplos desde código Java (reutiliza 'tokens' si se pasan)"""
         self.limpiar()
 
         if not codigo.strip():
             return self.triplos
 
         try:
-            lexer = construir_lexer()
-            lexer.input(codigo)
-
-            tokens = []
-            while True:
-                tok = lexer.token()
-                if not tok:
-                    break
-                tokens.append(tok)
+            if tokens is None:
+                tokens = obtener_token_stream(codigo).tokens
 
             self._procesar_tokens_optimizado(tokens)
 
@@ -451,7 +456,89 @@ class GeneradorTriplos:
         self.agregar_triplo("PRINT", expresion_str, "∅")
 
     def _procesar_expresion_optimizada(self, tokens):
-        """Procesa expresiones con referencias optimizadas"""
+        """
+        Procesa expresiones con referencias optimizadas.
+
+        Una sola pasada con pila de operandos y de operadores: mismos triplos,
+        en el mismo orden, que partir recursivamente en el operador de menor
+        precedencia más a la derecha (_procesar_expresion_recursiva), sin
+        re-escanear la lista por nivel ni copiar sublistas. Con paréntesis
+        desbalanceados se usa la versión recursiva.
+        """
+        if not tokens:
+            return ""
+
+        if len(tokens) == 1:
+            return self._procesar_valor(tokens[0])
+
+        cierre = emparejar_parentesis(tokens)
+        if cierre is None:
+            return self._procesar_expresion_recursiva(tokens)
+        return self._expresion_lineal(tokens, 0, len(tokens), cierre, False)
+
+    def _expresion_lineal(self, tokens, inicio, fin, cierre, entre_parentesis):
+        """
+        tokens[inicio:fin] (paréntesis balanceados). Los operadores fuera de
+        paréntesis separan tramos (operandos, posiblemente vacíos); cada tramo
+        se resuelve al leerlo y cada operador al desapilarlo (postorden).
+        entre_parentesis: el segmento es el interior de un par '(' ')'.
+        """
+        if fin - inicio == 1:
+            token = tokens[inicio]
+            if entre_parentesis and PRECEDENCIA.get(token.type or str(token.value)):
+                # '(+)': el operador solo, sin operandos
+                return f"({self.agregar_triplo(self._obtener_simbolo_operador(token), '', '')})"
+            return self._procesar_valor(token)
+
+        operandos = []    # (resultado, tramo_vacío)
+        operadores = []   # (nivel, token)
+        tramo = inicio
+        i = inicio
+        while i < fin:
+            token = tokens[i]
+            if token.type == 'PARIZQ':
+                i = cierre[i] + 1  # lo de adentro pertenece al tramo
+                continue
+            nivel = PRECEDENCIA.get(token.type or str(token.value))
+            if nivel:
+                operandos.append(self._tramo(tokens, tramo, i, cierre))
+                # Asociatividad izquierda: se reduce todo lo de nivel >= al actual
+                while operadores and operadores[-1][0] >= nivel:
+                    self._reducir(operandos, operadores.pop()[1])
+                operadores.append((nivel, token))
+                tramo = i + 1
+            i += 1
+
+        if not operadores:
+            return self._tramo(tokens, inicio, fin, cierre)[0]
+
+        operandos.append(self._tramo(tokens, tramo, fin, cierre))
+        while operadores:
+            self._reducir(operandos, operadores.pop()[1])
+        return operandos[0][0]
+
+    def _reducir(self, operandos, token):
+        """Aplica el operador 'token' a los dos últimos operandos de la pila."""
+        der, der_vacio = operandos.pop()
+        izq, izq_vacio = operandos.pop()
+        if izq_vacio and der_vacio:
+            # La subexpresión es el operador solo: se toma como valor
+            operandos.append((self._procesar_valor(token), False))
+            return
+        indice = self.agregar_triplo(self._obtener_simbolo_operador(token), izq, der)
+        operandos.append((f"({indice})", False))
+
+    def _tramo(self, tokens, inicio, fin, cierre):
+        """(resultado, vacío) de un tramo sin operadores fuera de paréntesis."""
+        if inicio == fin:
+            return "", True
+        if (fin - inicio >= 3 and tokens[inicio].type == 'PARIZQ'
+                and cierre[inicio] == fin - 1):
+            return self._expresion_lineal(tokens, inicio + 1, fin - 1, cierre, True), False
+        return self._procesar_valor(tokens[inicio]), False
+
+    def _procesar_expresion_recursiva(self, tokens):
+        """Quita paréntesis externos y parte en el operador principal (ver _procesar_expresion_optimizada)"""
         if not tokens:
             return ""
 
@@ -469,25 +556,15 @@ class GeneradorTriplos:
 
     def _procesar_expresion_con_precedencia_optimizada(self, tokens):
         """Procesa expresiones respetando precedencia con referencias optimizadas"""
-        precedencia = {
-            '||': 1, 'OR': 1,
-            '&&': 2, 'AND': 2,
-            '==': 3, '!=': 3, 'IGUAL': 3, 'DISTINTO': 3,
-            '<': 4, '>': 4, '<=': 4, '>=': 4,
-            'MENORQUE': 4, 'MAYORQUE': 4, 'MENORIGUAL': 4, 'MAYORIGUAL': 4,
-            '+': 5, '-': 5, 'SUMA': 5, 'RESTA': 5,
-            '*': 6, '/': 6, '%': 6, 'MULT': 6, 'DIV': 6, 'MODULO': 6
-        }
-
         for nivel in range(1, 7):
-            pos_op = self._encontrar_operador_fuera_parentesis_optimizado(tokens, precedencia, nivel)
+            pos_op = self._encontrar_operador_fuera_parentesis_optimizado(tokens, PRECEDENCIA, nivel)
 
             if pos_op != -1:
                 izq = tokens[:pos_op]
                 der = tokens[pos_op + 1:]
 
-                izq_resultado = self._procesar_expresion_optimizada(izq) if izq else ""
-                der_resultado = self._procesar_expresion_optimizada(der) if der else ""
+                izq_resultado = self._procesar_expresion_recursiva(izq) if izq else ""
+                der_resultado = self._procesar_expresion_recursiva(der) if der else ""
 
                 simbolo = self._obtener_simbolo_operador(tokens[pos_op])
                 indice = self.agregar_triplo(simbolo, izq_resultado, der_resultado)
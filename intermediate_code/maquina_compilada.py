@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+# intermediate_code/maquina_compilada.py
+"""
+Camino rápido de la máquina virtual del IR: el programa se traduce una vez a
+una función de Python (código fuente generado y compilado con compile()), y
+así no se decodifica el operador de cada cuádruplo en cada ejecución.
+
+  - cada bloque es una rama de un árbol de 'if' sobre el número de bloque
+    (búsqueda binaria) dentro de un único 'while True'. Son los bloques
+    básicos del CFG, salvo que cada LABEL empieza uno nuevo: así todo salto
+    cae al inicio de un bloque y las instrucciones se cuentan igual que en
+    el intérprete
+  - los slots son variables locales (v0, v1, ...) y las constantes van
+    como literales en el código
+  - con los tipos inferidos (int, double, boolean, String) las operaciones
+    de int se escriben en línea con el chequeo de desborde de 32 bits; lo que
+    no se puede tipar llama a las mismas funciones que el intérprete
+  - el chequeo de "valor sin asignar" sólo se genera en los usos a los que
+    algún camino llega sin asignación (usos_sin_definir de flujo_datos)
+
+La semántica, la salida y los mensajes de error son los de MaquinaVirtual.
+El límite de instrucciones se controla por bloque: si el bloque siguiente lo
+superaría, la ejecución sigue en el intérprete desde el inicio del bloque,
+que corta en la misma instrucción que cortaría él.
+"""
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+from intermediate_code.cfg import SALTOS, GrafoFlujo
+from intermediate_code.flujo_datos import AnalisisFlujoDatos
+from intermediate_code.maquina_virtual import (MAX_PASOS, OPERACIONES, ErrorEjecucion, MaquinaVirtual,
+                                               error_de, int32, no_es_cadena, sin_valor, texto_java, unario,
+                                               unir_lineas)
+from intermediate_code.optimizador import LOGICOS, RELACIONALES
+
+_NUMERICOS = ('int', 'double')
+
+_TIPO_VALOR = {int: 'int', float: 'double', bool: 'boolean', str: 'String'}
+
+# Entorno global de las funciones generadas
+_ENTORNO = {
+    'sumar': OPERACIONES['+'],
+    'restar': OPERACIONES['-'],
+    'multiplicar': OPERACIONES['*'],
+    'dividir': OPERACIONES['/'],
+    'modulo': OPERACIONES['%'],
+    'unario': unario,
+    'int32': int32,
+    'texto_java': texto_java,
+    'sin_valor': sin_valor,
+    'no_es_cadena': no_es_cadena,
+}
+_GENERICA = {'+': 'sumar', '-': 'restar', '*': 'multiplicar', '/': 'dividir', '%': 'modulo'}
+
+
+class MaquinaCompilada(MaquinaVirtual):
+    """MaquinaVirtual que ejecuta el programa traducido a Python; self.fuente es el código generado."""
+
+    def __init__(self, cuadruplos, variables: Optional[Dict[str, str]] = None, no_soportadas=()):
+        super().__init__(cuadruplos, variables, no_soportadas)
+        self.bloques: List[Tuple[int, int]] = self._particionar()  # (inicio, fin) de cada bloque
+        self._inicios = [inicio for inicio, _ in self.bloques]
+        self.tipos: List[Optional[str]] = self._inferir_tipos()
+        self._lineas: List[Optional[int]] = []  # línea del código generado - 1 -> índice del cuádruplo
+        self.fuente = self._generar()
+        self._archivo = f"<ir {id(self):x}>"
+        entorno = dict(_ENTORNO)
+        exec(compile(self.fuente, self._archivo, 'exec'), entorno)
+        self._funcion = entorno['programa']
+
+    def _particionar(self) -> List[Tuple[int, int]]:
+        n = len(self.cuadruplos)
+        lideres = {0} if n else set()
+        for i, cuadruplo in enumerate(self.cuadruplos):
+            if cuadruplo.operador == 'LABEL':
+                lideres.add(i)
+            elif cuadruplo.operador in SALTOS and i + 1 < n:
+                lideres.add(i + 1)
+        inicios = sorted(lideres)
+        return list(zip(inicios, inicios[1:] + [n]))
+
+    def _bloque_de(self, indice: int) -> int:
+        return bisect.bisect_right(self._inicios, indice) - 1
+
+    # =========================
+    # Tipos
+    # =========================
+    def _tipo(self, slot: Optional[int], tipos) -> Optional[str]:
+        if slot is None:
+            return None
+        if slot < len(self.nombres):
+            return tipos[slot]
+        return _TIPO_VALOR.get(type(self.iniciales[slot]))
+
+    def _inferir_tipos(self) -> List[Optional[str]]:
+        """
+        Tipo de cada slot de nombre (None: varía o no se sabe). Es la unión
+        de los tipos de todo lo que se le asigna, sin mirar el flujo: un
+        temporal reutilizado para un int y para un String queda sin tipo.
+        """
+        n = len(self.nombres)
+        tipos: List[Optional[str]] = [None] * n
+        conocido = [False] * n  # False: todavía nada asignado con tipo conocido
+        cambio = True
+        while cambio:
+            cambio = False
+            for op, a, b, r in self.programa:
+                if op in ('LABEL', 'GOTO', 'IF_FALSE', 'PRINT'):
+                    continue
+                if any(s is not None and s < n and not conocido[s] for s in (a, b)):
+                    continue  # depende de algo que todavía no tiene tipo
+                tipo = self._tipo_resultado(op, self._tipo(a, tipos), self._tipo(b, tipos), a is None)
+                if self.reales[r] and tipo in _NUMERICOS:
+                    tipo = 'double'
+                elif self.cadenas[r]:
+                    tipo = 'String'  # cualquier otra cosa es un error al asignar
+                if not conocido[r]:
+                    conocido[r], tipos[r] = True, tipo
+                    cambio = True
+                elif tipos[r] is not None and tipos[r] != tipo:
+                    tipos[r] = None
+                    cambio = True
+        return tipos
+
+    @staticmethod
+    def _tipo_resultado(op: str, ta: Optional[str], tb: Optional[str], es_unario: bool) -> Optional[str]:
+        if op == '=':
+            return ta
+        if op in RELACIONALES or op in LOGICOS:
+            return 'boolean'
+        if op == '!':
+            return 'boolean'
+        if es_unario:
+            return tb if op == '+' or (op == '-' and tb in _NUMERICOS) else None
+        if op == '+' and 'String' in (ta, tb):
+            return 'String'
+        if ta in _NUMERICOS and tb in _NUMERICOS:
+            return 'int' if ta == tb == 'int' else 'double'
+        return None
+
+    # =========================
+    # Generación de código
+    # =========================
+    def _generar(self) -> str:
+        analisis = AnalisisFlujoDatos(GrafoFlujo(self.cuadruplos), self.variables)
+        # Usos que hay que chequear: los que pueden llegar sin asignación y
+        # los de nombres que el análisis no ve como nombres
+        inseguros = set()
+        for i, nombre in analisis.usos_sin_definir():
+            if nombre in self.slot:
+                inseguros.add((i, self.slot[nombre]))
+        vistos = [{analisis.nombres[u] for u in usos} for usos in analisis.usos]
+        asignados = {r for op, _, _, r in self.programa
+                     if op not in ('LABEL', 'GOTO', 'IF_FALSE', 'PRINT')}
+
+        lineas: List[str] = []
+
+        def emitir(nivel: int, texto: str, indice: Optional[int] = None):
+            lineas.append('    ' * nivel + texto)
+            self._lineas.append(indice)
+
+        n = len(self.nombres)
+        locales = ', '.join(f'v{s}' for s in range(n))
+        emitir(0, 'def programa(v, escribir, limite, estado):')
+        if n:
+            emitir(1, f'{locales}{"," if n == 1 else ""} = v[:{n}]')
+        emitir(1, 'pasos = 0')
+        emitir(1, 'b = 0')
+        emitir(1, 'try:')
+        if self.bloques:
+            emitir(2, 'while True:')
+            self._arbol(0, len(self.bloques), 3, emitir, inseguros, vistos, asignados)
+        else:
+            emitir(2, 'return None, 0')
+        emitir(1, 'except BaseException:')
+        emitir(2, 'estado[0] = pasos')
+        emitir(2, 'raise')
+        if n:
+            emitir(1, 'finally:')
+            emitir(2, f'v[:{n}] = ({locales}{"," if n == 1 else ""})')
+        return '\n'.join(lineas) + '\n'
+
+    def _arbol(self, desde: int, hasta: int, nivel: int, emitir, *contexto):
+        """Ramas de los bloques [desde, hasta) como árbol de 'if b < medio'."""
+        if hasta - desde == 1:
+            self._bloque(desde, nivel, emitir, *contexto)
+            return
+        medio = (desde + hasta) // 2
+        emitir(nivel, f'if b < {medio}:')
+        self._arbol(desde, medio, nivel + 1, emitir, *contexto)
+        emitir(nivel, 'else:')
+        self._arbol(medio, hasta, nivel + 1, emitir, *contexto)
+
+    def _bloque(self, numero: int, nivel: int, emitir, inseguros, vistos, asignados):
+        inicio, fin = self.bloques[numero]
+        emitir(nivel, f'pasos += {fin - inicio}')
+        emitir(nivel, 'if pasos > limite:')
+        emitir(nivel + 1, f'return {numero}, pasos - {fin - inicio}')
+
+        siguiente = numero + 1 if numero + 1 < len(self.bloques) else None
+        for i in range(inicio, fin):
+            op, a, b, r = self.programa[i]
+            for s in _leidos(op, a, b):
+                if s is None:
+                    emitir(nivel, f"sin_valor({i}, '')", i)  # argumento vacío: siempre falla
+                    return
+                if s < len(self.nombres) and ((i, s) in inseguros or s not in asignados
+                                              or self.nombres[s] not in vistos[i]):
+                    emitir(nivel, f'if v{s} is None: sin_valor({i}, {self.nombres[s]!r})', i)
+            if op == 'LABEL':
+                continue
+            if op == 'GOTO':
+                emitir(nivel, _saltar(self._bloque_de(r)), i)
+                return
+            if op == 'IF_FALSE':
+                emitir(nivel, f'if {self._expr(a)}:', i)
+                emitir(nivel + 1, _saltar(siguiente), i)
+                emitir(nivel, 'else:', i)
+                emitir(nivel + 1, _saltar(self._bloque_de(r)), i)
+                return
+            if op == 'PRINT':
+                emitir(nivel, f'escribir({self._texto(a)})', i)
+                continue
+            for linea in self._asignacion(op, a, b, r):
+                emitir(nivel, linea, i)
+        emitir(nivel, _saltar(siguiente))
+
+    def _expr(self, slot: int) -> str:
+        return f'v{slot}' if slot < len(self.nombres) else repr(self.iniciales[slot])
+
+    def _texto(self, slot: Optional[int]) -> str:
+        if slot is None:
+            return "''"
+        tipo, expr = self._tipo(slot, self.tipos), self._expr(slot)
+        if tipo == 'String':
+            return expr
+        if tipo == 'int':
+            return f'str({expr})'
+        if tipo == 'boolean':
+            return f"('true' if {expr} else 'false')"
+        return f'texto_java({expr})'
+
+    def _asignacion(self, op: str, a: Optional[int], b: Optional[int], r: int) -> List[str]:
+        destino = f'v{r}'
+        ta, tb = self._tipo(a, self.tipos), self._tipo(b, self.tipos)
+        entero = False  # el resultado es un int que puede desbordar
+        if op == '=':
+            valor = self._expr(a)
+        elif a is None:
+            if op == '+':
+                valor = self._expr(b)
+            elif op == '-' and tb in _NUMERICOS:
+                valor, entero = f'-{self._expr(b)}', tb == 'int'
+            elif op == '!' and tb == 'boolean':
+                valor = f'not {self._expr(b)}'
+            else:
+                valor = f'unario({op!r}, {self._expr(b)})'
+        elif op in RELACIONALES:
+            valor = f'{self._expr(a)} {op} {self._expr(b)}'
+        elif op in LOGICOS:
+            conector = 'and' if op == '&&' else 'or'
+            if ta == tb == 'boolean':
+                valor = f'{self._expr(a)} {conector} {self._expr(b)}'
+            else:
+                valor = f'bool({self._expr(a)}) {conector} bool({self._expr(b)})'
+        elif op in ('+', '-', '*') and ta in _NUMERICOS and tb in _NUMERICOS:
+            valor, entero = f'{self._expr(a)} {op} {self._expr(b)}', ta == tb == 'int'
+        else:
+            valor = f'{_GENERICA[op]}({self._expr(a)}, {self._expr(b)})'
+
+        lineas = [f'{destino} = {valor}']
+        if entero:
+            lineas.append(f'if not -2147483648 <= {destino} <= 2147483647: {destino} = int32({destino})')
+        if self.reales[r]:
+            tipo = self._tipo_resultado(op, ta, tb, a is None)
+            if tipo == 'int':
+                lineas.append(f'{destino} = float({destino})')
+            elif tipo != 'double':
+                lineas.append(f'if type({destino}) is int: {destino} = float({destino})')
+        elif self.cadenas[r] and self._tipo_resultado(op, ta, tb, a is None) != 'String':
+            lineas.append(f'if type({destino}) is not str: no_es_cadena({destino}, {self.nombres[r]!r})')
+        return lineas
+
+    # =========================
+    # Ejecución
+    # =========================
+    def ejecutar(self, max_pasos: Optional[int] = MAX_PASOS) -> str:
+        self.valores = list(self.iniciales)
+        salida: List[str] = []
+        estado = [0]
+        limite = max_pasos if max_pasos is not None else float('inf')
+        try:
+            bloque, pasos = self._funcion(self.valores, salida.append, limite, estado)
+        except (ZeroDivisionError, TypeError, ErrorEjecucion) as e:
+            indice = self._cuadruplo_de(e)
+            inicio, fin = self.bloques[self._bloque_de(indice)]
+            self.pasos = estado[0] - (fin - inicio) + (indice - inicio + 1)
+            raise error_de(e, indice, unir_lineas(salida)) from None
+        self.pasos = pasos
+        if bloque is not None:
+            # El límite cae dentro de este bloque: el intérprete corta en la instrucción exacta
+            self._interpretar(self.bloques[bloque][0], pasos, salida, max_pasos)
+        return unir_lineas(salida)
+
+    def _cuadruplo_de(self, excepcion: Exception) -> int:
+        """Índice del cuádruplo que lanzó 'excepcion' (por la línea del código generado)."""
+        linea = None
+        rastro = excepcion.__traceback__
+        while rastro is not None:
+            if rastro.tb_frame.f_code.co_filename == self._archivo:
+                linea = rastro.tb_lineno
+            rastro = rastro.tb_next
+        return self._lineas[linea - 1]
+
+
+def _leidos(op: str, a: Optional[int], b: Optional[int]) -> Tuple:
+    """Slots que lee el intérprete al ejecutar la instrucción, en orden (None: argumento vacío)."""
+    if op in ('LABEL', 'GOTO') or (op == 'PRINT' and a is None):
+        return ()
+    if op in ('IF_FALSE', 'PRINT', '='):
+        return (a,)
+    return (b,) if a is None else (a, b)
+
+
+def _saltar(bloque: Optional[int]) -> str:
+    return f'b = {bloque}' if bloque is not None else 'return None, pasos'
@@ -0,0 +1,356 @@
+# -*- coding: utf-8 -*-
+# intermediate_code/maquina_virtual.py
+"""
+Máquina virtual que ejecuta directamente los cuádruplos de
+GeneradorCuadruplos, sin pasar por javac/java.
+
+Al cargar el programa:
+  - las etiquetas se resuelven a índices (GOTO/IF_FALSE saltan sin buscar)
+  - cada nombre (variable o temporal: todo argumento que no es un literal)
+    recibe un slot de un arreglo; las constantes también ocupan slots, ya
+    cargados con su valor, así que todo operando es un índice del arreglo.
+    Un nombre que nada asigna queda sin valor y leerlo es un error
+  - los literales son int, double, true/false y String/char (entre comillas
+    en el IR)
+
+Semántica de Java: int de 32 bits con desborde (los programas con variables
+long, short, byte o char no se cargan), división entera truncada,
+'/' y '%' enteros por cero lanzan ArithmeticException, '+' con un String
+concatena y PRINT escribe los valores como System.out.println (double con
+el formato de Double.toString). Las variables declaradas double/float
+guardan siempre un double y las String siempre un str (asignarles otra cosa
+es un error).
+"""
+import math
+import re
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from intermediate_code.optimizador import CONTROL, cadena, constante
+
+_ENTERO = re.compile(r'-?\d+$')
+
+# Tipos declarados cuyas variables guardan double
+_TIPOS_REALES = ('double', 'float')
+
+# Enteros que no son de 32 bits: la máquina no los modela y no ejecuta
+# programas que los declaran
+_TIPOS_NO_SOPORTADOS = ('long', 'short', 'byte', 'char')
+
+# Instrucciones ejecutadas como máximo por defecto (protege al IDE de bucles infinitos)
+MAX_PASOS = 5_000_000
+
+_MIN_INT = -2 ** 31
+
+
+class ErrorEjecucion(RuntimeError):
+    """Error en tiempo de ejecución del IR; 'salida' es lo impreso hasta el error."""
+
+    def __init__(self, mensaje: str, salida: str = '', indice: Optional[int] = None):
+        super().__init__(mensaje)
+        self.salida = salida
+        self.indice = indice
+
+
+# =========================
+# Valores de Java
+# =========================
+def texto_java(valor) -> str:
+    """Texto de 'valor' como lo imprime System.out.println / la concatenación."""
+    if isinstance(valor, bool):
+        return 'true' if valor else 'false'
+    if isinstance(valor, float):
+        return _double_a_texto(valor)
+    return str(valor)
+
+
+def _double_a_texto(valor: float) -> str:
+    """Double.toString: decimal entre 10^-3 y 10^7, notación 'd.dddE±n' fuera de ese rango."""
+    if math.isnan(valor):
+        return 'NaN'
+    if math.isinf(valor):
+        return 'Infinity' if valor > 0 else '-Infinity'
+    if valor == 0 or 1e-3 <= abs(valor) < 1e7:
+        texto = repr(valor)
+        return texto if 'e' not in texto else format(Decimal(texto), 'f')
+    signo, digitos, exponente = Decimal(repr(valor)).as_tuple()
+    cifras = ''.join(map(str, digitos)).rstrip('0') or '0'
+    potencia = exponente + len(digitos) - 1
+    return f"{'-' if signo else ''}{cifras[0]}.{cifras[1:] or '0'}E{potencia}"
+
+
+def int32(valor: int) -> int:
+    return (valor - _MIN_INT) % 2 ** 32 + _MIN_INT
+
+
+def _es_entero(valor) -> bool:
+    return type(valor) is int
+
+
+def _real(valor) -> float:
+    if isinstance(valor, str):
+        raise TypeError(f"operación aritmética sobre el String {valor!r}")
+    return float(valor)
+
+
+def _sumar(a, b):
+    if isinstance(a, str) or isinstance(b, str):
+        return texto_java(a) + texto_java(b)
+    return int32(a + b) if _es_entero(a) and _es_entero(b) else _real(a) + _real(b)
+
+
+def _restar(a, b):
+    return int32(a - b) if _es_entero(a) and _es_entero(b) else _real(a) - _real(b)
+
+
+def _multiplicar(a, b):
+    return int32(a * b) if _es_entero(a) and _es_entero(b) else _real(a) * _real(b)
+
+
+def _dividir(a, b):
+    if _es_entero(a) and _es_entero(b):
+        if b == 0:
+            raise ZeroDivisionError
+        cociente = abs(a) // abs(b)
+        return int32(-cociente if (a < 0) != (b < 0) else cociente)
+    a, b = _real(a), _real(b)
+    if b == 0:
+        return math.nan if a == 0 or math.isnan(a) else math.copysign(math.inf, a) * math.copysign(1, b)
+    return a / b
+
+
+def _modulo(a, b):
+    if _es_entero(a) and _es_entero(b):
+        if b == 0:
+            raise ZeroDivisionError
+        return int(math.fmod(a, b))
+    a, b = _real(a), _real(b)
+    return math.nan if b == 0 or math.isinf(a) else math.fmod(a, b)
+
+
+def unario(operador: str, valor):
+    """Operador con arg1 vacío: '- x' es -x, '+ x' es +x y '! x' es !x."""
+    if operador == '!':
+        return not valor
+    if operador == '-':
+        return int32(-valor) if _es_entero(valor) else -_real(valor)
+    if operador == '+':
+        return valor
+    return OPERACIONES[operador](0, valor)
+
+
+# Operador -> función (a, b) con la semántica de Java
+OPERACIONES = {
+    '+': _sumar,
+    '-': _restar,
+    '*': _multiplicar,
+    '/': _dividir,
+    '%': _modulo,
+    '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b,
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '&&': lambda a, b: bool(a) and bool(b),
+    '||': lambda a, b: bool(a) or bool(b),
+    '!': lambda a, b: not b,  # sólo unario: '! "" x'
+}
+
+
+def valor_literal(texto: str):
+    """Valor de un literal (int, double, boolean, String o char); None si 'texto' es un nombre."""
+    valor = cadena(texto)
+    if valor is not None:
+        return valor
+    valor = constante(texto)
+    if valor is not None:
+        return valor
+    if _ENTERO.match(texto):
+        return int(texto)  # fuera del rango de int (literales long)
+    return None
+
+
+def no_es_cadena(valor, nombre: str):
+    raise TypeError(f"la variable String '{nombre}' no puede guardar {texto_java(valor)!r}")
+
+
+# =========================
+# Máquina virtual
+# =========================
+class MaquinaVirtual:
+    """
+    Programa cargado a partir de 'cuadruplos'. variables: variable -> tipo
+    declarado (tabla_simbolos del generador); no_soportadas: construcciones
+    del fuente que el generador no supo traducir (no_soportadas del
+    generador). Si hay alguna, el programa no se carga: los cuádruplos no
+    dicen lo mismo que el fuente.
+
+    self.programa: una tupla (operador, a, b, r) por cuádruplo; a y b son
+    índices de slot (None si el argumento está vacío) y r es el slot
+    destino o, en GOTO/IF_FALSE, el índice del cuádruplo de destino.
+    """
+
+    def __init__(self, cuadruplos, variables: Optional[Dict[str, str]] = None, no_soportadas=()):
+        self.cuadruplos = list(cuadruplos)
+        self.variables = variables or {}
+        self.no_soportadas = list(no_soportadas)
+        self.nombres: List[str] = []           # slot -> nombre (sólo los primeros len(nombres) slots)
+        self.slot: Dict[str, int] = {}
+        self.iniciales: List = []              # valores iniciales del arreglo de slots
+        self.reales: List[bool] = []           # slot de nombre -> guarda double
+        self.cadenas: List[bool] = []          # slot de nombre -> guarda String
+        self.programa: List[Tuple] = []
+        self.pasos = 0
+        self.valores: List = []
+        self._cargar()
+
+    # =========================
+    # Carga
+    # =========================
+    def _cargar(self):
+        if self.no_soportadas:
+            raise ErrorEjecucion("La máquina virtual no puede ejecutar este programa; la traducción a "
+                                 "cuádruplos no soporta: " + '; '.join(self.no_soportadas))
+        for nombre, tipo in self.variables.items():
+            if tipo in _TIPOS_NO_SOPORTADOS:
+                raise ErrorEjecucion(f"La máquina virtual no soporta el tipo {tipo} (variable '{nombre}')")
+            self._slot_de_nombre(nombre)
+        for cuadruplo in self.cuadruplos:
+            if cuadruplo.operador not in CONTROL and cuadruplo.resultado:
+                self._slot_de_nombre(cuadruplo.resultado)
+        for cuadruplo in self.cuadruplos:
+            for argumento in (cuadruplo.arg1, cuadruplo.arg2):
+                if argumento and argumento not in self.slot and valor_literal(argumento) is None:
+                    self._slot_de_nombre(argumento)
+
+        etiquetas = {c.resultado: i for i, c in enumerate(self.cuadruplos) if c.operador == 'LABEL'}
+        constantes: Dict[str, int] = {}  # por texto: 0.0 y -0.0 son iguales pero no intercambiables
+        n_nombres = len(self.nombres)
+
+        def operando(texto: str) -> Optional[int]:
+            if not texto:
+                return None
+            slot = self.slot.get(texto)
+            if slot is not None:
+                return slot
+            slot = constantes.get(texto)
+            if slot is None:
+                slot = constantes[texto] = n_nombres + len(constantes)
+                self.iniciales.append(valor_literal(texto))  # no es None: los nombres ya tienen slot
+            return slot
+
+        for i, c in enumerate(self.cuadruplos):
+            op = c.operador
+            if op in ('GOTO', 'IF_FALSE'):
+                if c.resultado not in etiquetas:
+                    raise ErrorEjecucion(f"Cuádruplo {i}: etiqueta '{c.resultado}' no definida", indice=i)
+                instruccion = (op, operando(c.arg1) if op == 'IF_FALSE' else None, None, etiquetas[c.resultado])
+            elif op == 'LABEL':
+                instruccion = (op, None, None, None)
+            elif op == 'PRINT':
+                instruccion = (op, operando(c.arg1), None, None)
+            elif op == '=' or op in OPERACIONES:
+                instruccion = (op, operando(c.arg1), operando(c.arg2), self.slot[c.resultado])
+            else:
+                raise ErrorEjecucion(f"Cuádruplo {i}: operador '{op}' no soportado", indice=i)
+            self.programa.append(instruccion)
+
+    def _slot_de_nombre(self, nombre: str) -> int:
+        slot = self.slot.get(nombre)
+        if slot is None:
+            slot = self.slot[nombre] = len(self.nombres)
+            self.nombres.append(nombre)
+            self.iniciales.append(None)
+            self.reales.append(self.variables.get(nombre) in _TIPOS_REALES)
+            self.cadenas.append(self.variables.get(nombre) == 'String')
+        return slot
+
+    # =========================
+    # Ejecución
+    # =========================
+    def ejecutar(self, max_pasos: Optional[int] = MAX_PASOS) -> str:
+        """
+        Ejecuta el programa desde el primer cuádruplo y devuelve lo impreso.
+        Lanza ErrorEjecucion (con la salida parcial) ante una excepción de
+        Java, un valor sin asignar o más de 'max_pasos' instrucciones (None:
+        sin límite).
+        """
+        self.valores = list(self.iniciales)
+        salida: List[str] = []
+        self._interpretar(0, 0, salida, max_pasos)
+        return unir_lineas(salida)
+
+    def _interpretar(self, pc: int, pasos: int, salida: List[str], max_pasos: Optional[int]):
+        """Bucle de despacho desde el cuádruplo 'pc' sobre self.valores, con 'pasos' ya ejecutados."""
+        programa = self.programa
+        valores = self.valores
+        reales = self.reales
+        cadenas = self.cadenas
+        leer = self._leer
+        fin = len(programa)
+        limite = max_pasos if max_pasos is not None else math.inf
+        try:
+            while pc < fin:
+                if pasos >= limite:
+                    raise ErrorEjecucion(f"Se superó el límite de {max_pasos} instrucciones", indice=pc)
+                pasos += 1
+                op, a, b, r = programa[pc]
+                pc += 1
+                if op == 'LABEL':
+                    continue
+                if op == 'GOTO':
+                    pc = r
+                    continue
+                if op == 'IF_FALSE':
+                    if not leer(valores, a, pc - 1):
+                        pc = r
+                    continue
+                if op == 'PRINT':
+                    salida.append(texto_java(leer(valores, a, pc - 1)) if a is not None else '')
+                    continue
+                if op == '=':
+                    valor = leer(valores, a, pc - 1)
+                elif a is None:
+                    valor = unario(op, leer(valores, b, pc - 1))
+                else:
+                    valor = OPERACIONES[op](leer(valores, a, pc - 1), leer(valores, b, pc - 1))
+                if reales[r] and _es_entero(valor):
+                    valor = float(valor)
+                elif cadenas[r] and type(valor) is not str:
+                    no_es_cadena(valor, self.nombres[r])
+                valores[r] = valor
+        except (ZeroDivisionError, TypeError, ErrorEjecucion) as e:
+            raise error_de(e, pc - 1, unir_lineas(salida)) from None
+        finally:
+            self.pasos = pasos
+
+    def _leer(self, valores, slot: Optional[int], indice: int):
+        valor = valores[slot] if slot is not None else None
+        if valor is None:
+            sin_valor(indice, self.nombres[slot] if slot is not None else '')
+        return valor
+
+    def valor(self, nombre: str):
+        """Valor de 'nombre' al terminar la última ejecución (None si nunca se asignó)."""
+        slot = self.slot.get(nombre)
+        return self.valores[slot] if slot is not None and self.valores else None
+
+
+def sin_valor(indice: int, nombre: str):
+    raise ErrorEjecucion(f"Cuádruplo {indice}: '{nombre}' se usa sin valor asignado", indice=indice)
+
+
+def error_de(excepcion: Exception, indice: int, salida: str) -> ErrorEjecucion:
+    """ErrorEjecucion que corresponde a 'excepcion', lanzada al ejecutar el cuádruplo 'indice'."""
+    if isinstance(excepcion, ZeroDivisionError):
+        return ErrorEjecucion('Exception in thread "main" java.lang.ArithmeticException: / by zero',
+                              salida, indice)
+    if isinstance(excepcion, TypeError):
+        return ErrorEjecucion(f"Cuádruplo {indice}: operandos incompatibles ({excepcion})", salida, indice)
+    excepcion.salida = salida
+    return excepcion
+
+
+def unir_lineas(lineas: List[str]) -> str:
+    return ''.join(linea + '\n' for linea in lineas)
@@ -0,0 +1,411 @@
+# -*- coding: utf-8 -*-
+# intermediate_code/optimizador.py
+"""
+Pases de optimización sobre los cuádruplos de GeneradorCuadruplos.
+
+  - plegado_constantes: 'op c1 c2 t' con constantes -> '= c t' (aritmética de
+    int de Java: 32 bits, división truncada; sin plegar divisiones por cero)
+  - simplificacion_algebraica: x+0 y x*0 (x int), x-0, x*1, x/1, true&&x, ...
+  - propagacion_copias: tras 'x = y' los usos de x dentro del bloque básico
+    pasan a y (salvo x long/short/byte/char; si x es double, y convertido);
+    't = a op b' seguido de 'x = t' (t usado una sola vez) se funde en
+    'x = a op b'
+  - eliminacion_temporales: se quitan las definiciones de temporales que
+    nadie usa, salvo '/' y '%' enteros que pueden lanzar ArithmeticException
+    (divisor que no es una constante distinta de 0)
+  - reutilizacion_temporales: los temporales que nunca están vivos a la vez
+    comparten nombre (ver intermediate_code/reutilizacion_temporales.py)
+
+Los pases se repiten hasta que ninguno cambia nada; los de PASES_FINALES se
+aplican una sola vez al terminar. Los bloques básicos
+empiezan en cada LABEL (los saltos sólo van a etiquetas), así que la
+propagación no cruza etiquetas. Los cuádruplos de entrada no se modifican.
+"""
+import math
+import re
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+# Nombres de los pases, en el orden en que se aplican
+PASES = ('plegado_constantes', 'simplificacion_algebraica', 'propagacion_copias', 'eliminacion_temporales')
+PASES_FINALES = ('reutilizacion_temporales',)
+
+# Operadores cuyo 'resultado' no es una variable definida
+CONTROL = ('LABEL', 'GOTO', 'IF_FALSE', 'PRINT')
+ARITMETICOS = ('+', '-', '*', '/', '%')
+RELACIONALES = ('<', '>', '<=', '>=', '==', '!=')
+LOGICOS = ('&&', '||')
+
+# Tipos declarados -> clase numérica ('int': entero de cualquier ancho; las
+# identidades de simplificacion_algebraica valen para todos)
+_CLASE_TIPO = {'int': 'int', 'long': 'int', 'short': 'int', 'byte': 'int', 'char': 'int',
+               'double': 'real', 'float': 'real'}
+
+# Enteros que no son de 32 bits: el plegado usa la aritmética de int, así
+# que el valor de estas variables no se propaga a las operaciones
+_ENTEROS_NO_INT = ('long', 'short', 'byte', 'char')
+
+_ENTERO = re.compile(r'-?(0|[1-9]\d*)$')
+_REAL = re.compile(r'-?\d+\.\d+$')
+_TEMPORAL = re.compile(r't\d+$')
+
+_MIN_INT = -2 ** 31
+_MAX_INT = 2 ** 31 - 1
+
+# Número máximo de vueltas sobre todos los pases
+MAX_VUELTAS = 10
+
+
+# =========================
+# Constantes
+# =========================
+def constante(texto: str):
+    """
+    Valor Python de un literal int/double/boolean del IR; None si no lo es.
+    Los literales String y char (entre comillas, ver cadena()) no son
+    constantes: no se pliegan ni se operan como números.
+    """
+    if texto == 'true':
+        return True
+    if texto == 'false':
+        return False
+    if _ENTERO.match(texto):
+        valor = int(texto)
+        return valor if _MIN_INT <= valor <= _MAX_INT else None
+    if _REAL.match(texto):
+        return float(texto)
+    return None
+
+
+def cadena(texto: str) -> Optional[str]:
+    """Contenido de un literal String o char del IR ("hola", 'c'); None si no lo es."""
+    if len(texto) >= 2 and texto[0] == texto[-1] and texto[0] in '"\'':
+        return texto[1:-1]
+    return None
+
+
+def literal(valor) -> Optional[str]:
+    """Texto del IR para 'valor'; None si no tiene una forma simple (inf, nan, exponentes)."""
+    if isinstance(valor, bool):
+        return 'true' if valor else 'false'
+    if isinstance(valor, int):
+        return str(valor)
+    if math.isinf(valor) or math.isnan(valor):
+        return None
+    texto = repr(valor)
+    return texto if _REAL.match(texto) else None
+
+
+def _int32(valor: int) -> int:
+    return (valor - _MIN_INT) % 2 ** 32 + _MIN_INT
+
+
+def _dividir_truncado(a: int, b: int) -> int:
+    cociente = abs(a) // abs(b)
+    return -cociente if (a < 0) != (b < 0) else cociente
+
+
+def plegar(operador: str, a, b):
+    """Resultado de 'a operador b' con semántica de Java; None si no se puede plegar."""
+    booleanos = isinstance(a, bool), isinstance(b, bool)
+    if operador in LOGICOS:
+        if not all(booleanos):
+            return None
+        return (a and b) if operador == '&&' else (a or b)
+    if any(booleanos):
+        if all(booleanos) and operador in ('==', '!='):
+            return (a == b) if operador == '==' else (a != b)
+        return None
+
+    if operador in RELACIONALES:
+        return {'<': a < b, '>': a > b, '<=': a <= b, '>=': a >= b, '==': a == b, '!=': a != b}[operador]
+    if operador not in ARITMETICOS:
+        return None
+
+    if isinstance(a, int) and isinstance(b, int):
+        if operador in ('/', '%') and b == 0:
+            return None
+        if operador == '+':
+            return _int32(a + b)
+        if operador == '-':
+            return _int32(a - b)
+        if operador == '*':
+            return _int32(a * b)
+        cociente = _dividir_truncado(a, b)
+        return _int32(cociente) if operador == '/' else a - b * cociente
+
+    a, b = float(a), float(b)
+    if operador in ('/', '%') and b == 0:
+        return None
+    if operador == '+':
+        return a + b
+    if operador == '-':
+        return a - b
+    if operador == '*':
+        return a * b
+    return a / b if operador == '/' else math.fmod(a, b)
+
+
+# =========================
+# Optimizador
+# =========================
+class OptimizadorCuadruplos:
+    """
+    Aplica los pases activos a una lista de cuádruplos.
+    variables: variable -> tipo declarado (tabla_simbolos del generador); se
+    usa para distinguir temporales de variables y para saber qué es numérico.
+    """
+
+    def __init__(self, pases: Optional[Dict[str, bool]] = None, variables: Optional[Dict[str, str]] = None):
+        self.pases = dict.fromkeys(PASES + PASES_FINALES, True)
+        for nombre, activo in (pases or {}).items():
+            if nombre not in self.pases:
+                raise ValueError(f"Pase de optimización desconocido: {nombre}")
+            self.pases[nombre] = bool(activo)
+        self.variables = variables or {}
+        self.estadisticas: Dict[str, Dict] = {}
+
+    def es_temporal(self, nombre: str) -> bool:
+        return bool(_TEMPORAL.match(nombre)) and nombre not in self.variables
+
+    def optimizar(self, cuadruplos) -> List:
+        """Cuádruplos optimizados (copias reindexadas); llena self.estadisticas."""
+        self.estadisticas = {nombre: {'activo': activo, 'cambios': 0, 'eliminados': 0}
+                             for nombre, activo in self.pases.items()}
+        actuales = [replace(c) for c in cuadruplos]
+        activos = [nombre for nombre in PASES if self.pases[nombre]]
+
+        for _ in range(MAX_VUELTAS):
+            hubo_cambios = False
+            for nombre in activos:
+                antes = len(actuales)
+                actuales, cambios = getattr(self, '_' + nombre)(actuales)
+                self.estadisticas[nombre]['cambios'] += cambios
+                self.estadisticas[nombre]['eliminados'] += antes - len(actuales)
+                hubo_cambios = hubo_cambios or cambios > 0
+            if not hubo_cambios:
+                break
+
+        for nombre in PASES_FINALES:
+            if self.pases[nombre]:
+                actuales, cambios = getattr(self, '_' + nombre)(actuales)
+                self.estadisticas[nombre]['cambios'] += cambios
+
+        for indice, cuadruplo in enumerate(actuales):
+            cuadruplo.indice = indice
+        return actuales
+
+    # =========================
+    # Pases
+    # =========================
+    def _plegado_constantes(self, cuadruplos):
+        cambios = 0
+        for cuadruplo in cuadruplos:
+            if cuadruplo.operador in CONTROL or cuadruplo.operador == '=':
+                continue
+            a, b = constante(cuadruplo.arg1), constante(cuadruplo.arg2)
+            if a is None or b is None:
+                continue
+            resultado = plegar(cuadruplo.operador, a, b)
+            texto = literal(resultado) if resultado is not None else None
+            if texto is not None:
+                cuadruplo.operador, cuadruplo.arg1, cuadruplo.arg2 = '=', texto, ''
+                cambios += 1
+        return cuadruplos, cambios
+
+    def _clase(self, nombre: str, clases: Dict[str, str]) -> Optional[str]:
+        """'int', 'real' o None (desconocida o no numérica)."""
+        valor = constante(nombre)
+        if isinstance(valor, bool):
+            return None
+        if isinstance(valor, int):
+            return 'int'
+        if isinstance(valor, float):
+            return 'real'
+        if nombre in self.variables:
+            return _CLASE_TIPO.get(self.variables[nombre])
+        return clases.get(nombre)
+
+    def _simplificacion_algebraica(self, cuadruplos):
+        cambios = 0
+        clases = {}  # temporal -> clase numérica de su valor
+        for cuadruplo in cuadruplos:
+            op, a, b = cuadruplo.operador, cuadruplo.arg1, cuadruplo.arg2
+            if op in CONTROL:
+                continue
+            clase_a, clase_b = self._clase(a, clases), self._clase(b, clases)
+
+            valor = None
+            if op == '+':
+                # Sólo int: con double, -0.0 + 0 es 0.0
+                if b == '0' and clase_a == 'int':
+                    valor = a
+                elif a == '0' and clase_b == 'int':
+                    valor = b
+            elif op == '-' and b == '0' and clase_a:
+                valor = a
+            elif op == '*':
+                if b == '1' and clase_a:
+                    valor = a
+                elif a == '1' and clase_b:
+                    valor = b
+                elif (b == '0' and clase_a == 'int') or (a == '0' and clase_b == 'int'):
+                    valor = '0'
+            elif op == '/' and b == '1' and clase_a:
+                valor = a
+            elif op == '&&':
+                if a == 'true':
+                    valor = b
+                elif b == 'true' or a == 'false':
+                    valor = a
+            elif op == '||':
+                if a == 'false':
+                    valor = b
+                elif b == 'false' or a == 'true':
+                    valor = a
+
+            if valor is not None:
+                cuadruplo.operador, cuadruplo.arg1, cuadruplo.arg2 = '=', valor, ''
+                cambios += 1
+            self._anotar_clase(cuadruplo, clase_a, clase_b, clases)
+        return cuadruplos, cambios
+
+    def _anotar_clase(self, cuadruplo, clase_a, clase_b, clases: Dict[str, str]):
+        """Actualiza en 'clases' la clase numérica del temporal que define 'cuadruplo'."""
+        if not self.es_temporal(cuadruplo.resultado):
+            return
+        if cuadruplo.operador == '=':
+            clases[cuadruplo.resultado] = self._clase(cuadruplo.arg1, clases)
+        elif cuadruplo.operador in ARITMETICOS and clase_a and clase_b:
+            clases[cuadruplo.resultado] = 'int' if clase_a == clase_b == 'int' else 'real'
+        else:
+            clases.pop(cuadruplo.resultado, None)
+
+    def _puede_lanzar(self, cuadruplo, clase_a, clase_b) -> bool:
+        """'/' o '%' que puede ser entero con divisor 0 (ArithmeticException): no se puede quitar."""
+        if cuadruplo.operador not in ('/', '%'):
+            return False
+        divisor = constante(cuadruplo.arg2)
+        if divisor is not None and not isinstance(divisor, bool) and divisor != 0:
+            return False
+        # Con un operando double la división no lanza (da Infinity o NaN)
+        return 'real' not in (clase_a, clase_b)
+
+    def _propagacion_copias(self, cuadruplos):
+        cambios = 0
+
+        # 1) Hacia adelante dentro de cada bloque básico
+        copias = {}    # variable -> valor copiado
+        copiados = {}  # valor -> variables que lo copian
+        for cuadruplo in cuadruplos:
+            if cuadruplo.operador == 'LABEL':
+                copias.clear()
+                copiados.clear()
+                continue
+            for campo in ('arg1', 'arg2'):
+                valor = copias.get(getattr(cuadruplo, campo))
+                if valor is not None:
+                    setattr(cuadruplo, campo, valor)
+                    cambios += 1
+            destino = cuadruplo.resultado
+            if cuadruplo.operador in CONTROL or not destino:
+                continue
+            # 'destino' cambia: caen su copia y las copias de su valor
+            anterior = copias.pop(destino, None)
+            if anterior is not None:
+                copiados[anterior].discard(destino)
+            for variable in copiados.pop(destino, ()):
+                del copias[variable]
+            if cuadruplo.operador == '=' and cuadruplo.arg1 and cuadruplo.arg1 != destino:
+                valor = self._valor_copiado(destino, cuadruplo.arg1)
+                if valor is not None:
+                    copias[destino] = valor
+                    copiados.setdefault(valor, set()).add(destino)
+
+        # 2) 't = a op b' + 'x = t' -> 'x = a op b'
+        usos = self._contar_usos(cuadruplos)
+        salida = []
+        i = 0
+        while i < len(cuadruplos):
+            cuadruplo = cuadruplos[i]
+            salida.append(cuadruplo)
+            if (i + 1 < len(cuadruplos) and cuadruplo.operador not in CONTROL
+                    and self.es_temporal(cuadruplo.resultado) and usos.get(cuadruplo.resultado) == 1):
+                siguiente = cuadruplos[i + 1]
+                if siguiente.operador == '=' and siguiente.arg1 == cuadruplo.resultado and siguiente.resultado:
+                    cuadruplo.resultado = siguiente.resultado
+                    cambios += 1
+                    i += 1
+            i += 1
+        return salida, cambios
+
+    def _valor_copiado(self, destino: str, valor: str) -> Optional[str]:
+        """
+        Lo que se propaga a los usos de 'destino' tras 'destino = valor' (None:
+        nada). Una variable double/float guarda el valor convertido: un int
+        constante se propaga como double y un valor que no se sabe real, no.
+        """
+        tipo = self.variables.get(destino)
+        if tipo in _ENTEROS_NO_INT:
+            return None
+        if _CLASE_TIPO.get(tipo) == 'real' and self._clase(valor, {}) != 'real':
+            numero = constante(valor)
+            if isinstance(numero, int) and not isinstance(numero, bool):
+                return literal(float(numero))
+            return None
+        return valor
+
+    def _eliminacion_temporales(self, cuadruplos):
+        usos = self._contar_usos(cuadruplos)
+        vivos = [True] * len(cuadruplos)
+        definiciones = {}
+        clases = {}
+        for i, cuadruplo in enumerate(cuadruplos):
+            if cuadruplo.operador in CONTROL:
+                continue
+            clase_a, clase_b = self._clase(cuadruplo.arg1, clases), self._clase(cuadruplo.arg2, clases)
+            if self.es_temporal(cuadruplo.resultado) and not self._puede_lanzar(cuadruplo, clase_a, clase_b):
+                definiciones.setdefault(cuadruplo.resultado, []).append(i)
+            self._anotar_clase(cuadruplo, clase_a, clase_b, clases)
+
+        pendientes = [t for t in definiciones if not usos.get(t)]
+        while pendientes:
+            temporal = pendientes.pop()
+            for i in definiciones.pop(temporal, ()):
+                vivos[i] = False
+                # Sus argumentos pierden un uso
+                for argumento in (cuadruplos[i].arg1, cuadruplos[i].arg2):
+                    if argumento in usos:
+                        usos[argumento] -= 1
+                        if usos[argumento] == 0 and argumento in definiciones:
+                            pendientes.append(argumento)
+
+        salida = [c for c, vivo in zip(cuadruplos, vivos) if vivo]
+        return salida, len(cuadruplos) - len(salida)
+
+    def _reutilizacion_temporales(self, cuadruplos):
+        # Import local: reutilizacion_temporales usa flujo_datos, que importa este módulo
+        from intermediate_code.reutilizacion_temporales import reutilizar_temporales
+
+        cuadruplos, renombres = reutilizar_temporales(cuadruplos, self.es_temporal, self.variables)
+        return cuadruplos, sum(1 for temporal, nuevo in renombres.items() if temporal != nuevo)
+
+    def temporales(self, cuadruplos) -> int:
+        """Cantidad de temporales distintos que aparecen en 'cuadruplos'."""
+        nombres = set()
+        for cuadruplo in cuadruplos:
+            if cuadruplo.operador in ('LABEL', 'GOTO'):
+                continue
+            nombres.update((cuadruplo.arg1, cuadruplo.arg2))
+            if cuadruplo.operador not in CONTROL:
+                nombres.add(cuadruplo.resultado)
+        return sum(1 for nombre in nombres if nombre and self.es_temporal(nombre))
+
+    @staticmethod
+    def _contar_usos(cuadruplos) -> Dict[str, int]:
+        usos = {}
+        for cuadruplo in cuadruplos:
+            for argumento in (cuadruplo.arg1, cuadruplo.arg2):
+                if argumento:
+                    usos[argumento] = usos.get(argumento, 0) + 1
+        return usos
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+# intermediate_code/reutilizacion_temporales.py
+"""
+Reutilización de temporales: renombra los temporales de los cuádruplos para
+que dos temporales que nunca están vivos a la vez compartan el mismo nombre
+(el mismo "slot" en el frame).
+
+Cada temporal recibe un intervalo sobre el orden lineal de los cuádruplos que
+cubre todas sus definiciones, sus usos y los bloques donde está vivo a la
+entrada o a la salida (vivas() de AnalisisFlujoDatos; los temporales locales
+a un bloque van de su definición a su último uso). Los puntos se duplican
+para separar lectura y escritura de un mismo cuádruplo:
+  - uso en el cuádruplo i:         2i
+  - definición en el cuádruplo i:  2i + 1
+  - vivo a la entrada del bloque:  2 * inicio
+  - vivo a la salida del bloque:   2 * fin
+Así 't2 = t1 + 1' con último uso de t1 puede reutilizar el slot de t1, pero
+un temporal vivo a la salida de un bloque choca con lo que se define en su
+último cuádruplo.
+
+Los intervalos se colorean con el algoritmo voraz por inicio (linear scan),
+que sobre un grafo de intervalos usa la mínima cantidad de slots: la máxima
+cantidad de intervalos superpuestos.
+"""
+import heapq
+from typing import Callable, Dict, List, Tuple
+
+from intermediate_code.cfg import GrafoFlujo
+from intermediate_code.flujo_datos import AnalisisFlujoDatos, bits
+
+
+def intervalos_temporales(analisis: AnalisisFlujoDatos,
+                          es_temporal: Callable[[str], bool]) -> Dict[str, Tuple[int, int]]:
+    """Temporal -> (inicio, fin), intervalo cerrado en puntos duplicados (ver el módulo)."""
+    intervalos: Dict[int, List[int]] = {}
+
+    def extender(nombre: int, punto: int):
+        intervalo = intervalos.get(nombre)
+        if intervalo is None:
+            intervalos[nombre] = [punto, punto]
+        elif punto < intervalo[0]:
+            intervalo[0] = punto
+        elif punto > intervalo[1]:
+            intervalo[1] = punto
+
+    temporales = [es_temporal(nombre) for nombre in analisis.nombres]
+    for i, (usos, definido) in enumerate(zip(analisis.usos, analisis.definicion)):
+        for nombre in usos:
+            if temporales[nombre]:
+                extender(nombre, 2 * i)
+        if definido is not None and temporales[definido]:
+            extender(definido, 2 * i + 1)
+
+    # Temporales vivos entre bloques (sólo los globales tienen bit)
+    if any(temporales[nombre] for nombre in analisis.globales):
+        entrada, salida = analisis.vivas()
+        for bloque in analisis.grafo.bloques:
+            for b in bits(entrada[bloque.id]):
+                nombre = analisis.globales[b]
+                if temporales[nombre]:
+                    extender(nombre, 2 * bloque.inicio)
+            for b in bits(salida[bloque.id]):
+                nombre = analisis.globales[b]
+                if temporales[nombre]:
+                    extender(nombre, 2 * bloque.fin)
+
+    return {analisis.nombres[nombre]: (inicio, fin) for nombre, (inicio, fin) in intervalos.items()}
+
+
+def asignar_slots(intervalos: Dict[str, Tuple[int, int]]) -> Dict[str, int]:
+    """Temporal -> slot (0, 1, ...); los intervalos superpuestos reciben slots distintos."""
+    slots: Dict[str, int] = {}
+    activos = []  # heap de (fin, slot)
+    libres = []   # heap de slots liberados
+    cantidad = 0
+    for nombre, (inicio, fin) in sorted(intervalos.items(), key=lambda par: par[1][0]):
+        while activos and activos[0][0] < inicio:
+            heapq.heappush(libres, heapq.heappop(activos)[1])
+        if libres:
+            slot = heapq.heappop(libres)
+        else:
+            slot = cantidad
+            cantidad += 1
+        slots[nombre] = slot
+        heapq.heappush(activos, (fin, slot))
+    return slots
+
+
+def reutilizar_temporales(cuadruplos, es_temporal: Callable[[str], bool],
+                          variables=None) -> Tuple[List, Dict[str, str]]:
+    """
+    (cuadruplos, renombres): los mismos cuádruplos con los temporales
+    renombrados a t1..tk (k = slots necesarios) y el mapa temporal -> nuevo
+    nombre. Modifica los cuádruplos recibidos. variables: nombres que no se
+    pueden usar para los slots (tabla de símbolos).
+    """
+    variables = variables or {}
+    analisis = AnalisisFlujoDatos(GrafoFlujo(cuadruplos), variables)
+    slots = asignar_slots(intervalos_temporales(analisis, es_temporal))
+
+    nombres_slot = []
+    numero = 0
+    for _ in range(len(set(slots.values()))):
+        numero += 1
+        while f"t{numero}" in variables:
+            numero += 1
+        nombres_slot.append(f"t{numero}")
+    renombres = {temporal: nombres_slot[slot] for temporal, slot in slots.items()}
+
+    for i, cuadruplo in enumerate(cuadruplos):
+        if analisis.usos[i]:
+            cuadruplo.arg1 = renombres.get(cuadruplo.arg1, cuadruplo.arg1)
+            cuadruplo.arg2 = renombres.get(cuadruplo.arg2, cuadruplo.arg2)
+        if analisis.definicion[i] is not None:
+            cuadruplo.resultado = renombres.get(cuadruplo.resultado, cuadruplo.resultado)
+    return cuadruplos, renombres
@@ -1,6 +1,14 @@
 # -*- coding: utf-8 -*-
+import os
+import tempfile
+import threading
+
 import ply.lex as lex
 
+from tracing import trazas
+
+_traza = trazas.canal('lexer')
+
 # resultado del analisis
 resultado_lexema = []
 
@@ -190,307 +198,274 @@ tokens = [
          ] + list(reservadas.values())
 
 # =========================
-# Reglas simples
+# Reglas del lexer (reentrantes)
 # =========================
-t_SUMA = r'\+'
-t_RESTA = r'-'
-t_MULT = r'\*'
-t_DIV = r'/'
-t_MODULO = r'%'
-t_INCREMENTO = r'\+\+'
-t_DECREMENTO = r'--'
-
-t_SUMAASIGNAR = r'\+='
-t_RESTAASIGNAR = r'-='
-t_MULTASIGNAR = r'\*='
-t_DIVASIGNAR = r'/='
-t_MODULOASIGNAR = r'%='
-
-t_MENORQUE = r'<'
-t_MAYORQUE = r'>'
-t_MENORIGUAL = r'<='
-t_MAYORIGUAL = r'>='
-t_IGUAL = r'=='
-t_DISTINTO = r'!='
-
-t_AND = r'&&'
-t_OR = r'\|\|'
-t_NOT = r'!'
-
-t_BITAND = r'&'
-t_BITOR = r'\|'
-t_BITXOR = r'\^'
-t_BITNOT = r'~'
-t_BITSHIFTIZQ = r'<<'
-t_BITSHIFTDER = r'>>'
-t_BITSHIFTDERU = r'>>>'
-
-t_PARIZQ = r'\('
-t_PARDER = r'\)'
-t_CORIZQ = r'\['
-t_CORDER = r'\]'
-t_DOSPUNTOS = r':'
-t_INTERROGACION = r'\?'
-t_ARROBA = r'@'
-t_PUNTO = r'\.'
-t_COMA = r','
-
-t_ignore = ' \t'
+def nuevos_estados():
+    """Estado de contexto inicial de la recolección de símbolos (lexer/recolector_simbolos.py)"""
+    return {
+        'ultimo_tipo': None,
+        'modo_declaracion': False,
+        'clase_actual': None,
+        'metodo_actual': None,
+        'en_for': False,
+        'variable_reciente': None,  # NUEVO: Variable recién declarada
+        'esperando_valor': False,  # NUEVO: Si estamos esperando un valor después de =
+        'ultimo_identificador': None,  # NUEVO: Último identificador visto
+    }
+
+
+class ReglasLexicas:
+    """
+    Reglas PLY como métodos. Son puras: sólo producen tokens y anotan los
+    errores léxicos en 'resultado'; la tabla de símbolos se llena aparte
+    (lexer/recolector_simbolos.py). 'tabla' es la tabla en la que se vuelcan
+    los símbolos de lo que analiza esta instancia (TokenStream.restaurar_tabla).
+    Cada instancia tiene su propia lista de errores, así varios lexers pueden
+    trabajar a la vez (hilos, análisis en segundo plano) sin pisarse.
+    """
+    tokens = tokens
+
+    def __init__(self, tabla=None, resultado=None):
+        self.tabla = tabla if tabla is not None else TablaSimbolos()
+        self.resultado = resultado if resultado is not None else []
+
+    def reiniciar(self):
+        """Reset de tabla de símbolos y errores."""
+        self.tabla.limpiar()
+        self.resultado.clear()
+
+    def construir(self):
+        """Lexer PLY ligado a esta instancia: clon del prototipo ya construido."""
+        lexer = lexer_prototipo().clone(self)
+        # clone() sólo reasigna las tablas por estado; begin() activa las del estado actual
+        lexer.begin(lexer.lexstate)
+        return lexer
+
+    # =========================
+    # Reglas simples
+    # =========================
+    t_SUMA = r'\+'
+    t_RESTA = r'-'
+    t_MULT = r'\*'
+    t_DIV = r'/'
+    t_MODULO = r'%'
+    t_INCREMENTO = r'\+\+'
+    t_DECREMENTO = r'--'
+
+    t_SUMAASIGNAR = r'\+='
+    t_RESTAASIGNAR = r'-='
+    t_MULTASIGNAR = r'\*='
+    t_DIVASIGNAR = r'/='
+    t_MODULOASIGNAR = r'%='
+
+    t_MENORQUE = r'<'
+    t_MAYORQUE = r'>'
+    t_MENORIGUAL = r'<='
+    t_MAYORIGUAL = r'>='
+    t_IGUAL = r'=='
+    t_DISTINTO = r'!='
+
+    t_AND = r'&&'
+    t_OR = r'\|\|'
+    t_NOT = r'!'
+
+    t_BITAND = r'&'
+    t_BITOR = r'\|'
+    t_BITXOR = r'\^'
+    t_BITNOT = r'~'
+    t_BITSHIFTIZQ = r'<<'
+    t_BITSHIFTDER = r'>>'
+    t_BITSHIFTDERU = r'>>>'
+
+    t_PARIZQ = r'\('
+    t_PARDER = r'\)'
+    t_CORIZQ = r'\['
+    t_CORDER = r'\]'
+    t_DOSPUNTOS = r':'
+    t_INTERROGACION = r'\?'
+    t_ARROBA = r'@'
+    t_PUNTO = r'\.'
+    t_COMA = r','
+
+    t_ignore = ' \t'
+
+    # =========================
+    # Tokens con conversión de valor
+    # =========================
+    # Siguen siendo funciones (y en este orden): PLY prueba las reglas-función
+    # antes que las reglas-cadena y en el orden en que están definidas.
+    def t_LLAIZQ(self, t):
+        r'{'
+        return t
+
+    def t_LLADER(self, t):
+        r'}'
+        return t
+
+    def t_ASIGNAR(self, t):
+        r'=(?!=)'  # '=' que NO está seguido de '='  -> no choca con '=='
+        return t
+
+    def t_DECIMAL(self, t):
+        r'\d+\.\d+'
+        t.value = float(t.value)
+        return t
+
+    def t_ENTERO(self, t):
+        r'\d+'
+        t.value = int(t.value)
+        return t
+
+    def t_IDENTIFICADOR(self, t):
+        r'[a-zA-Z_][a-zA-Z_0-9]*'
+        t.type = reservadas.get(t.value, 'IDENTIFICADOR')
+        return t
+
+    def t_CADENA(self, t):
+        r'"[^"]*"'
+        t.value = t.value[1:-1]  # Sin comillas para el valor interno
+        return t
+
+    def t_CARACTER(self, t):
+        r"'[^']'"
+        t.value = t.value[1:-1]  # Sin comillas para el valor interno
+        return t
+
+    def t_COMENTARIO_LINEA(self, t):
+        r'//.*\n'
+        t.lexer.lineno += 1
+
+    def t_COMENTARIO_BLOQUE(self, t):
+        r'/\*[\s\S]*?\*/'
+        t.lexer.lineno += t.value.count('\n')
+
+    def t_newline(self, t):
+        r'\n+'
+        t.lexer.lineno += len(t.value)
+
+    def t_PUNTOCOMA(self, t):
+        r';'
+        return t
+
+    def t_error(self, t):
+        estado = {
+            "tipo": "ERROR",
+            "valor": t.value[0],
+            "linea": t.lineno,
+            "posicion": t.lexpos
+        }
+        self.resultado.append(estado)
+        t.lexer.skip(1)
+
 
 # =========================
-# Estado para contexto - AMPLIADO PARA CAPTURAR ASIGNACIONES
+# Instancia por defecto (compatibilidad con los globales)
 # =========================
-estados = {
-    'ultimo_tipo': None,
-    'modo_declaracion': False,
-    'clase_actual': None,
-    'metodo_actual': None,
-    'en_for': False,
-    'variable_reciente': None,  # NUEVO: Variable recién declarada
-    'esperando_valor': False,  # NUEVO: Si estamos esperando un valor después de =
-    'ultimo_identificador': None,  # NUEVO: Último identificador visto
-}
+reglas_por_defecto = ReglasLexicas(tabla_simbolos, resultado_lexema)
 
 
 # =========================
-# Tokens con acción
+# Lexer prototipo (optimize + lextab en caché)
 # =========================
-def t_LLAIZQ(t):
-    r'{'
-    tabla_simbolos.abrir_bloque()
-    return t
-
-
-def t_LLADER(t):
-    r'}'
-    tabla_simbolos.cerrar_bloque()
-    return t
-
-
-# NUEVO: Manejo especial del operador de asignación
-def t_ASIGNAR(t):
-    r'=(?!=)'  # '=' que NO está seguido de '='  -> no choca con '=='
-    # Si acabamos de ver un identificador, preparamos para capturar su valor
-    if estados.get('ultimo_identificador') and not estados.get('esperando_valor'):
-        estados['esperando_valor'] = True
-        estados['variable_reciente'] = estados['ultimo_identificador']
-    return t
-
-
-def t_DECIMAL(t):
-    r'\d+\.\d+'
-    t.value = float(t.value)
-
-    # NUEVO: Si estamos esperando un valor, lo asignamos
-    if estados.get('esperando_valor') and estados.get('variable_reciente'):
-        if tabla_simbolos.actualizar_valor(estados['variable_reciente'], t.value):
-            print(f"[DEBUG] Asignado valor {t.value} a variable {estados['variable_reciente']}")
-        # Limpiar estado
-        estados['esperando_valor'] = False
-        estados['variable_reciente'] = None
-
-    return t
-
-
-def t_ENTERO(t):
-    r'\d+'
-    t.value = int(t.value)
-
-    # NUEVO: Si estamos esperando un valor, lo asignamos
-    if estados.get('esperando_valor') and estados.get('variable_reciente'):
-        if tabla_simbolos.actualizar_valor(estados['variable_reciente'], t.value):
-            print(f"[DEBUG] Asignado valor {t.value} a variable {estados['variable_reciente']}")
-        # Limpiar estado
-        estados['esperando_valor'] = False
-        estados['variable_reciente'] = None
-
-    return t
-
-
-def t_IDENTIFICADOR(t):
-    r'[a-zA-Z_][a-zA-Z_0-9]*'
-    t.type = reservadas.get(t.value, 'IDENTIFICADOR')
-
-    # NUEVO: Manejo de valores literales booleanos y null
-    if t.type in ('TRUE', 'FALSE', 'NULL'):
-        if estados.get('esperando_valor') and estados.get('variable_reciente'):
-            valor = None
-            if t.type == 'TRUE':
-                valor = True
-            elif t.type == 'FALSE':
-                valor = False
-            else:  # NULL
-                valor = None
-
-            if tabla_simbolos.actualizar_valor(estados['variable_reciente'], valor):
-                print(f"[DEBUG] Asignado valor {valor} a variable {estados['variable_reciente']}")
-            # Limpiar estado
-            estados['esperando_valor'] = False
-            estados['variable_reciente'] = None
-
-    if t.type == 'FOR':
-        estados['en_for'] = True
-
-    # Si es tipo → entra modo declaración
-    if t.type in ('INT', 'FLOAT', 'DOUBLE', 'CHAR', 'BOOLEAN', 'STRING', 'BYTE', 'SHORT', 'LONG'):
-        estados['ultimo_tipo'] = t.type
-        estados['modo_declaracion'] = True
-    elif estados['modo_declaracion'] and t.type == 'IDENTIFICADOR':
-        # CORRECCIÓN: Usar el alcance determinado por la tabla de símbolos
-        alcance_actual = tabla_simbolos.determinar_alcance()
-        if estados['en_for']:
-            alcance_actual = 'local'
-
-        tabla_simbolos.agregar(t.value, estados['ultimo_tipo'], t.lineno)
-
-        # CORRECCIÓN: Ajustar el alcance después de agregar
-        nombre_completo = f"{alcance_actual}.{t.value}" if alcance_actual != 'global' else t.value
-        if nombre_completo in tabla_simbolos.simbolos:
-            tabla_simbolos.simbolos[nombre_completo]['alcance'] = alcance_actual
-
-        print(
-            f"[DEBUG] Variable '{t.value}' declarada en alcance '{alcance_actual}' (en_metodo: {tabla_simbolos.en_metodo}, nivel_llaves: {tabla_simbolos.nivel_llaves})")
-
-        estados['modo_declaracion'] = False
-        # NUEVO: Guardar como último identificador para posibles asignaciones
-        estados['ultimo_identificador'] = t.value
-    elif t.type == 'IDENTIFICADOR':
-        # NUEVO: Siempre guardar el último identificador
-        estados['ultimo_identificador'] = t.value
-        if tabla_simbolos.existe(t.value):
-            tabla_simbolos.marcar_como_usado(t.value)
-
-    # Seguimiento clase/método
-    if t.type == 'CLASS':
-        estados['clase_actual'] = 'esperando_nombre'
-    elif estados['clase_actual'] == 'esperando_nombre' and t.type == 'IDENTIFICADOR':
-        estados['clase_actual'] = t.value
-        tabla_simbolos.agregar(t.value, 'CLASS', t.lineno)
-    elif t.type == 'MAIN':
-        estados['metodo_actual'] = 'main'
-        tabla_simbolos.abrir_alcance('main')
-        tabla_simbolos.agregar('main', 'METHOD', t.lineno)
-        print(f"[DEBUG] Entrando al método main (en_metodo: {tabla_simbolos.en_metodo})")
-
-    return t
-
-
-def t_CADENA(t):
-    r'"[^"]*"'
-    valor_original = t.value[1:-1]  # Sin comillas para el valor interno
-    t.value = valor_original
-
-    # NUEVO: Si estamos esperando un valor, lo asignamos
-    if estados.get('esperando_valor') and estados.get('variable_reciente'):
-        # Guardamos con comillas para mostrar que es una cadena
-        valor_mostrar = f'"{valor_original}"'
-        if tabla_simbolos.actualizar_valor(estados['variable_reciente'], valor_mostrar):
-            print(f"[DEBUG] Asignado valor {valor_mostrar} a variable {estados['variable_reciente']}")
-        # Limpiar estado
-        estados['esperando_valor'] = False
-        estados['variable_reciente'] = None
-
-    return t
-
-
-def t_CARACTER(t):
-    r"'[^']'"
-    valor_original = t.value[1:-1]  # Sin comillas para el valor interno
-    t.value = valor_original
-
-    # NUEVO: Si estamos esperando un valor, lo asignamos
-    if estados.get('esperando_valor') and estados.get('variable_reciente'):
-        # Guardamos con comillas simples para mostrar que es un carácter
-        valor_mostrar = f"'{valor_original}'"
-        if tabla_simbolos.actualizar_valor(estados['variable_reciente'], valor_mostrar):
-            print(f"[DEBUG] Asignado valor {valor_mostrar} a variable {estados['variable_reciente']}")
-        # Limpiar estado
-        estados['esperando_valor'] = False
-        estados['variable_reciente'] = None
-
-    return t
-
-
-def t_COMENTARIO_LINEA(t):
-    r'//.*\n'
-    t.lexer.lineno += 1
-
-
-def t_COMENTARIO_BLOQUE(t):
-    r'/\*[\s\S]*?\*/'
-    t.lexer.lineno += t.value.count('\n')
-
-
-def t_newline(t):
-    r'\n+'
-    t.lexer.lineno += len(t.value)
-
-
-def t_PUNTOCOMA(t):
-    r';'
-    estados['modo_declaracion'] = False
-    estados['en_for'] = False
-    # NUEVO: Limpiar estado de asignación al final de la declaración
-    estados['esperando_valor'] = False
-    estados['variable_reciente'] = None
-    return t
-
-
-def t_error(t):
-    global resultado_lexema
-    estado = {
-        "tipo": "ERROR",
-        "valor": t.value[0],
-        "linea": t.lineno,
-        "posicion": t.lexpos
-    }
-    resultado_lexema.append(estado)
-    t.lexer.skip(1)
+_prototipo = None
+_lock_prototipo = threading.Lock()
+
+
+def _construir_optimizado(reglas):
+    """
+    lex.lex en modo optimize con la lextab cacheada en disco. El nombre de la
+    lextab lleva el hash de las reglas: si cambian, se genera una nueva.
+    """
+    from lexer.cache_tablas import directorio_cache, firma_reglas_lexicas, cargar_modulo, publicar, borrar
+
+    directorio = directorio_cache()
+    nombre = f"lextab_{firma_reglas_lexicas(reglas)}"
+    ruta = os.path.join(directorio, nombre + '.py')
+
+    if os.path.exists(ruta):
+        try:
+            return lex.lex(module=reglas, optimize=1, lextab=cargar_modulo(ruta, nombre))
+        except Exception:
+            # lextab corrupta o de otra versión de PLY: se regenera
+            borrar(ruta)
+
+    # Se escribe en un temporal y se publica de golpe (varios procesos pueden arrancar a la vez)
+    temporal = tempfile.mkdtemp(dir=directorio)
+    try:
+        lexer = lex.lex(module=reglas, optimize=1, lextab=nombre, outputdir=temporal)
+        generado = os.path.join(temporal, nombre + '.py')
+        if os.path.exists(generado):
+            publicar(generado, ruta)
+        return lexer
+    finally:
+        for archivo in os.listdir(temporal):
+            borrar(os.path.join(temporal, archivo))
+        os.rmdir(temporal)
+
+
+def lexer_prototipo():
+    """Lexer construido UNA vez por proceso; cada análisis usa un clone()."""
+    global _prototipo
+    if _prototipo is None:
+        with _lock_prototipo:
+            if _prototipo is None:
+                try:
+                    _prototipo = _construir_optimizado(ReglasLexicas())
+                except OSError:
+                    # Sin caché en disco: construcción normal
+                    _prototipo = lex.lex(module=ReglasLexicas())
+    return _prototipo
 
 
 # =========================
 # API
 # =========================
+def reiniciar_estado():
+    """Reset de tabla de símbolos y resultado."""
+    reglas_por_defecto.reiniciar()
+
+
 def prueba(data):
-    global resultado_lexema, estados
-    analizador = lex.lex()
-    analizador.lineno = 1
-    analizador.input(data)
-
-    # Reset estados/tabla/resultado - AMPLIADO
-    estados['ultimo_tipo'] = None
-    estados['modo_declaracion'] = False
-    estados['clase_actual'] = None
-    estados['metodo_actual'] = None
-    estados['en_for'] = False
-    estados['variable_reciente'] = None
-    estados['esperando_valor'] = False
-    estados['ultimo_identificador'] = None
-    tabla_simbolos.limpiar()
-    resultado_lexema.clear()
+    # Import local para evitar ciclos (token_stream usa este módulo)
+    from lexer.token_stream import obtener_token_stream
 
-    print(f"[DEBUG] Iniciando análisis del código...")
-    while True:
-        tok = analizador.token()
-        if not tok:
-            break
-        estado = {
-            "tipo": tok.type,
-            "valor": tok.value,
-            "linea": tok.lineno,
-            "posicion": tok.lexpos
-        }
-        resultado_lexema.append(estado)
+    if _traza.activo:
+        _traza("análisis léxico", caracteres=len(data))
+    stream = obtener_token_stream(data)
+    stream.restaurar_tabla(tabla_simbolos)
+
+    resultado_lexema.clear()
+    resultado_lexema.extend(stream.como_lexemas())
 
-    print(f"[DEBUG] Análisis completado. Símbolos en tabla:")
-    for nombre, info in tabla_simbolos.obtener_todos().items():
-        print(f"  {nombre}: {info}")
+    if _traza.activo:
+        _traza("análisis léxico completado", lexemas=len(resultado_lexema),
+               simbolos={nombre: dict(info) for nombre, info in tabla_simbolos.obtener_todos().items()})
 
     return resultado_lexema
 
 
-def construir_lexer():
-    return lex.lex()
+def lexemas(data):
+    """
+    Como prueba(), pero devuelve un TokenStore (vistas de solo lectura con la
+    misma interfaz de dict) en lugar de copiar cada token a un dict nuevo.
+    No toca la tabla de símbolos: ver llenar_tabla().
+    """
+    from lexer.token_stream import obtener_token_stream
+
+    return obtener_token_stream(data).almacen()
+
+
+def llenar_tabla(data):
+    """Vuelca en tabla_simbolos los símbolos de 'data' (recolectándolos si hace falta)."""
+    from lexer.token_stream import obtener_token_stream
+
+    obtener_token_stream(data).restaurar_tabla(tabla_simbolos)
+    return tabla_simbolos
+
+
+def construir_lexer(reglas=None):
+    """Lexer PLY sobre 'reglas' (por defecto, las que usan los globales del módulo)."""
+    return (reglas or reglas_por_defecto).construir()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# lexer/cache_tablas.py
+"""
+Caché en disco de tablas generadas por PLY (lextab del lexer y, más adelante,
+tablas LALR del parser). Los archivos se nombran con un hash de las reglas,
+así que un cambio en la gramática/tokens produce otro archivo y el viejo
+simplemente deja de usarse.
+
+Directorio: $COMPILADOR_CACHE_DIR, o $XDG_CACHE_HOME/compiladorstart,
+o ~/.cache/compiladorstart. Lo que se lee de la caché se ejecuta (lextab) o
+se deserializa (tablas LALR), así que sólo se usa un directorio privado:
+del usuario actual y sin permisos para el grupo ni para otros. Si no hay
+ninguno, directorio_cache() lanza OSError y las tablas se construyen en
+memoria (nunca se cae al temporal compartido del sistema).
+"""
+import hashlib
+import importlib.util
+import os
+import shutil
+import stat
+
+import ply
+
+NOMBRE_APP = 'compiladorstart'
+
+
+def directorio_cache() -> str:
+    """
+    Directorio privado de caché (se crea con permisos 0700 si no existe).
+    Lanza OSError si ningún candidato es privado y escribible.
+    """
+    candidatos = []
+    if os.environ.get('COMPILADOR_CACHE_DIR'):
+        candidatos.append(os.environ['COMPILADOR_CACHE_DIR'])
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    candidatos.append(os.path.join(base, NOMBRE_APP))
+
+    for ruta in candidatos:
+        try:
+            os.makedirs(ruta, mode=0o700, exist_ok=True)
+        except OSError:
+            continue
+        if directorio_privado(ruta):
+            return ruta
+    raise OSError(f"Sin directorio de caché privado (probados: {', '.join(candidatos)})")
+
+
+def directorio_privado(ruta: str) -> bool:
+    """
+    True si 'ruta' es un directorio (no un enlace) del usuario actual sin
+    permisos para nadie más. Uno propio pero abierto se cierra a 0700.
+    """
+    try:
+        info = os.lstat(ruta)
+        if not stat.S_ISDIR(info.st_mode):
+            return False
+        if hasattr(os, 'getuid') and info.st_uid == os.getuid() and info.st_mode & 0o077:
+            os.chmod(ruta, 0o700)
+            info = os.lstat(ruta)
+    except OSError:
+        return False
+    if hasattr(os, 'getuid') and (info.st_uid != os.getuid() or info.st_mode & 0o077):
+        return False
+    return os.access(ruta, os.W_OK)
+
+
+def archivo_privado(ruta: str) -> bool:
+    """True si 'ruta' es un archivo regular (no un enlace) del usuario actual que nadie más puede escribir."""
+    try:
+        info = os.lstat(ruta)
+    except OSError:
+        return False
+    if not stat.S_ISREG(info.st_mode):
+        return False
+    if not hasattr(os, 'getuid'):
+        return True
+    return info.st_uid == os.getuid() and not info.st_mode & 0o022
+
+
+def firma(*partes) -> str:
+    """Hash corto y estable de las partes (incluye la versión de PLY)."""
+    h = hashlib.sha1(ply.__version__.encode())
+    for parte in partes:
+        h.update(b'\0')
+        h.update(repr(parte).encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def firma_reglas_lexicas(reglas) -> str:
+    """
+    Firma de las reglas léxicas de 'reglas' (clase o instancia):
+    tokens, regex de cada t_* y el orden de las reglas-función
+    (PLY las prueba por número de línea).
+    """
+    simples = []
+    funciones = []
+    for nombre in sorted(dir(reglas)):
+        if not nombre.startswith('t_'):
+            continue
+        valor = getattr(reglas, nombre)
+        if isinstance(valor, str):
+            simples.append((nombre, valor))
+        elif callable(valor):
+            codigo = getattr(valor, '__code__', None)
+            linea = codigo.co_firstlineno if codigo else 0
+            funciones.append((linea, nombre, valor.__doc__))
+    funciones.sort()
+    orden = [(nombre, doc) for _, nombre, doc in funciones]
+    return firma(list(getattr(reglas, 'tokens', [])), simples, orden,
+                 getattr(reglas, 'literals', ''))
+
+
+def cargar_modulo(ruta: str, nombre: str):
+    """
+    Carga un .py de la caché como módulo (sin tocar sys.path). Lanza
+    PermissionError si el archivo no es privado (ver archivo_privado()).
+    """
+    if not archivo_privado(ruta):
+        raise PermissionError(f"{ruta}: archivo de caché ajeno o escribible por otros")
+    spec = importlib.util.spec_from_file_location(nombre, ruta)
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def publicar(origen: str, destino: str):
+    """Mueve 'origen' a 'destino' de forma atómica (lectores concurrentes nunca ven medio archivo)."""
+    try:
+        os.replace(origen, destino)
+    except OSError:
+        shutil.copyfile(origen, destino)
+
+
+def borrar(ruta: str):
+    try:
+        os.remove(ruta)
+    except OSError:
+        pass
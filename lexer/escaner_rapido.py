@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+# lexer/escaner_rapido.py
+"""
+Escáner escrito a mano: alternativa rápida al lexer PLY.
+
+Un único patrón maestro (una alternativa con nombre por regla) se aplica con
+match() en un solo recorrido; el tipo sale de m.lastgroup y las palabras
+reservadas de una búsqueda en la tabla 'reservadas'. No hay una función de
+Python por token: el escáner sólo produce tokens y errores léxicos (la tabla
+de símbolos se recolecta aparte, lexer/recolector_simbolos.py).
+
+Produce exactamente los mismos tokens (tipo, valor, línea, posición) y
+errores que ReglasLexicas con PLY, incluidas sus particularidades:
+  - '//' sin salto de línea final no es comentario (DIV DIV ...)
+  - una CADENA con saltos de línea no avanza el número de línea
+  - '\\r' y cualquier carácter sin regla es un error de un carácter
+"""
+import re
+from typing import Dict, List, Tuple
+
+from ply.lex import LexToken
+
+from lexer.analizador_lexico import reservadas
+
+# =========================
+# Patrón maestro
+# =========================
+# PLY prueba primero las reglas-función en el orden en que están definidas y
+# luego las reglas-cadena de la más larga a la más corta (empates por nombre),
+# y se queda con la PRIMERA que coincide. Aquí las reglas se agrupan por el
+# carácter con que empiezan; dentro de cada grupo se respeta ese orden, así
+# re elige la misma regla que PLY probando muchas menos alternativas.
+
+# Reglas de texto fijo en el orden de PLY: '{', '}', '=', ';' son
+# reglas-función (van antes), el resto reglas-cadena.
+SIMBOLOS = (
+    ('LLAIZQ', '{'), ('LLADER', '}'), ('ASIGNAR', '='), ('PUNTOCOMA', ';'),
+    ('INCREMENTO', '++'), ('OR', '||'), ('BITSHIFTDERU', '>>>'), ('MULTASIGNAR', '*='),
+    ('SUMAASIGNAR', '+='), ('AND', '&&'), ('BITOR', '|'), ('BITSHIFTDER', '>>'),
+    ('BITSHIFTIZQ', '<<'), ('BITXOR', '^'), ('CORDER', ']'), ('CORIZQ', '['),
+    ('DECREMENTO', '--'), ('DISTINTO', '!='), ('DIVASIGNAR', '/='), ('IGUAL', '=='),
+    ('INTERROGACION', '?'), ('MAYORIGUAL', '>='), ('MENORIGUAL', '<='), ('MODULOASIGNAR', '%='),
+    ('MULT', '*'), ('PARDER', ')'), ('PARIZQ', '('), ('PUNTO', '.'),
+    ('RESTAASIGNAR', '-='), ('SUMA', '+'), ('ARROBA', '@'), ('BITAND', '&'),
+    ('BITNOT', '~'), ('COMA', ','), ('DIV', '/'), ('DOSPUNTOS', ':'),
+    ('MAYORQUE', '>'), ('MENORQUE', '<'), ('MODULO', '%'), ('NOT', '!'),
+    ('RESTA', '-'),
+)
+_TIPO_SIMBOLO = {texto: tipo for tipo, texto in SIMBOLOS}
+
+
+def _regex_simbolo(texto: str) -> str:
+    # t_ASIGNAR es r'=(?!=)': no debe comerse el primer '=' de '=='
+    return r'=(?!=)' if texto == '=' else re.escape(texto)
+
+
+def _regex_simbolos() -> str:
+    """
+    Alternativa de todos los SIMBOLOS agrupada por primer carácter: sólo
+    compiten entre sí los que empiezan igual, y entre ellos se conserva el
+    orden de PLY. Los de un solo carácter sin competencia van en una clase.
+    """
+    grupos: Dict[str, List[str]] = {}
+    for _, texto in SIMBOLOS:
+        grupos.setdefault(texto[0], []).append(texto)
+    sueltos = ''.join(re.escape(c) for c, textos in grupos.items() if textos == [c] and c != '=')
+    alternativas = ['|'.join(_regex_simbolo(t) for t in textos)
+                    for c, textos in grupos.items() if not (textos == [c] and c != '=')]
+    return '|'.join([f'[{sueltos}]'] + alternativas)
+
+
+# Los nombres con '_' no producen token. t_ignore (' \t') se salta como
+# prefijo de cada coincidencia.
+_PATRON = re.compile(
+    r'[ \t]*(?:'
+    r'(?P<IDENTIFICADOR>[a-zA-Z_][a-zA-Z_0-9]*)'
+    r'|(?P<NUMERO>\d+(?:\.\d+)?)'            # t_DECIMAL antes que t_ENTERO
+    r'|(?P<CADENA>"[^"]*")'
+    r"|(?P<CARACTER>'[^']')"
+    r'|(?P<_COMENTARIO_LINEA>//.*\n)'
+    r'|(?P<_COMENTARIO_BLOQUE>/\*[\s\S]*?\*/)'
+    r'|(?P<_SALTOS>\n(?:[ \t]*\n)*)'
+    r'|(?P<SIMBOLO>' + _regex_simbolos() + ')'
+    r'|(?P<_ERROR>[^ \t])'                     # sin regla: error de un carácter
+    r')'
+)
+
+
+def escanear(codigo: str) -> Tuple[List[LexToken], List[Dict]]:
+    """
+    Tokens (LexToken, como los de PLY) y errores léxicos
+    {tipo: 'ERROR', valor, linea, posicion} de 'codigo'.
+    """
+    tokens: List[LexToken] = []
+    errores: List[Dict] = []
+    agregar = tokens.append
+    palabra = reservadas.get
+    simbolo = _TIPO_SIMBOLO.__getitem__
+    linea = 1
+
+    for m in _PATRON.finditer(codigo):
+        grupo = m.lastgroup
+        if grupo == 'SIMBOLO':
+            texto = m[grupo]
+            tipo = simbolo(texto)
+            valor = texto
+        elif grupo == 'IDENTIFICADOR':
+            texto = m[grupo]
+            tipo = palabra(texto, 'IDENTIFICADOR')
+            valor = texto
+        elif grupo == 'NUMERO':
+            texto = m[grupo]
+            if '.' in texto:
+                tipo, valor = 'DECIMAL', float(texto)
+            else:
+                tipo, valor = 'ENTERO', int(texto)
+        elif grupo == 'CADENA' or grupo == 'CARACTER':
+            tipo = grupo
+            valor = m[grupo][1:-1]
+        else:
+            if grupo == '_SALTOS':
+                linea += m[grupo].count('\n')
+            elif grupo == '_COMENTARIO_LINEA':
+                linea += 1
+            elif grupo == '_COMENTARIO_BLOQUE':
+                linea += m[grupo].count('\n')
+            elif grupo == '_ERROR':
+                errores.append({"tipo": "ERROR", "valor": m[grupo], "linea": linea, "posicion": m.start(grupo)})
+            continue
+
+        tok = LexToken()
+        tok.type = tipo
+        tok.value = valor
+        tok.lineno = linea
+        tok.lexpos = m.start(grupo)
+        agregar(tok)
+    return tokens, errores
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+# lexer/flujo_archivo.py
+"""
+Tokenización en flujo de archivos muy grandes (cientos de MB).
+
+El archivo se mapea en memoria (mmap) y se decodifica por bloques; cada
+bloque se escanea con el patrón de escaner_rapido y los tokens se entregan con
+un generador, sin armar la lista completa ni el str del fuente entero. La
+memoria queda acotada por el tamaño del bloque (más el literal de cadena más
+largo, que el token contiene entero).
+
+Los tokens son los mismos que daría escanear() sobre el archivo completo
+(tipo, valor, línea y posición en CARACTERES, como lexpos de PLY):
+  - un token que termina cerca del final del bloque puede depender de lo que
+    sigue ('12' + '.5', '>' + '>=', un identificador cortado): se deja para el
+    bloque siguiente;
+  - '"', '//' y '/*' sin cierre dentro del bloque se resuelven buscando el
+    cierre directamente en los bytes del mmap (UTF-8 no confunde esos bytes
+    ASCII con parte de otro carácter); los comentarios se saltan sin
+    decodificarlos.
+"""
+import codecs
+import mmap
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ply.lex import LexToken
+
+from lexer.analizador_lexico import reservadas
+from lexer.escaner_rapido import _PATRON, _TIPO_SIMBOLO
+
+# Bytes por bloque decodificado
+TAM_BLOQUE = 1 << 20
+
+# Caracteres que un token "corto" (identificador, número, símbolo, saltos)
+# puede necesitar ver después de su fin para quedar decidido ('12.5', '>>>')
+_MARGEN = 3
+
+# Cierre que se busca en los bytes para cada apertura sin cerrar en el bloque
+_CIERRES = {'"': b'"', '//': b'\n', '/*': b'*/'}
+
+
+def _token(tipo: str, valor, linea: int, pos: int) -> LexToken:
+    tok = LexToken()
+    tok.type = tipo
+    tok.value = valor
+    tok.lineno = linea
+    tok.lexpos = pos
+    return tok
+
+
+def _escanear_bloque(texto: str, base: int, linea: int, final: bool,
+                     salida: List[LexToken], errores: bool) -> Tuple[int, int, Optional[str]]:
+    """
+    Escanea 'texto' (que empieza en el carácter 'base' del archivo) agregando
+    a 'salida' los tokens ya decididos. Devuelve (caracteres consumidos,
+    línea, apertura pendiente: '"', '//', '/*' o None).
+    """
+    largo = len(texto)
+    palabra = reservadas.get
+    simbolo = _TIPO_SIMBOLO.__getitem__
+    consumido = 0
+
+    for m in _PATRON.finditer(texto):
+        grupo = m.lastgroup
+        if not final and m.end() + _MARGEN > largo:
+            return m.start(), linea, None
+        inicio = m.start(grupo)
+
+        if grupo == 'SIMBOLO':
+            valor = m[grupo]
+            if not final and valor == '/' and texto[inicio + 1] in '/*':
+                # El comentario no cierra dentro del bloque
+                return inicio, linea, texto[inicio:inicio + 2]
+            salida.append(_token(simbolo(valor), valor, linea, base + inicio))
+        elif grupo == 'IDENTIFICADOR':
+            valor = m[grupo]
+            salida.append(_token(palabra(valor, 'IDENTIFICADOR'), valor, linea, base + inicio))
+        elif grupo == 'NUMERO':
+            valor = m[grupo]
+            if '.' in valor:
+                salida.append(_token('DECIMAL', float(valor), linea, base + inicio))
+            else:
+                salida.append(_token('ENTERO', int(valor), linea, base + inicio))
+        elif grupo == 'CADENA' or grupo == 'CARACTER':
+            salida.append(_token(grupo, m[grupo][1:-1], linea, base + inicio))
+        elif grupo == '_SALTOS':
+            linea += m[grupo].count('\n')
+        elif grupo == '_COMENTARIO_LINEA':
+            linea += 1
+        elif grupo == '_COMENTARIO_BLOQUE':
+            linea += m[grupo].count('\n')
+        elif grupo == '_ERROR':
+            valor = m[grupo]
+            if not final and valor == '"':
+                # La cadena no cierra dentro del bloque
+                return inicio, linea, '"'
+            if errores:
+                salida.append(_token('ERROR', valor, linea, base + inicio))
+        consumido = m.end()
+
+    # Sólo queda espacio/tabulación: se consume (en el último bloque) o se
+    # deja como prefijo del siguiente
+    return (largo if final else consumido), linea, None
+
+
+def _contar(datos, desde: int, hasta: int, tam: int) -> Tuple[int, int]:
+    """(caracteres, saltos de línea) de datos[desde:hasta], leyendo de a 'tam' bytes."""
+    decodificador = codecs.getincrementaldecoder('utf-8')()
+    caracteres = saltos = 0
+    for a in range(desde, hasta, tam):
+        trozo = datos[a:min(a + tam, hasta)]
+        saltos += trozo.count(b'\n')
+        caracteres += len(decodificador.decode(trozo))
+    caracteres += len(decodificador.decode(b'', final=True))
+    return caracteres, saltos
+
+
+def tokens_datos(datos, tam_bloque: int = TAM_BLOQUE, errores: bool = True) -> Iterator[LexToken]:
+    """
+    Tokens de 'datos' (mmap o bytes en UTF-8), en orden. Con errores=True los
+    errores léxicos se entregan intercalados como tokens de tipo 'ERROR'
+    (valor = el carácter), igual que en prueba().
+    """
+    largo = len(datos)
+    tam_bloque = max(tam_bloque, 16)
+    tam = tam_bloque
+    pos_byte = 0   # byte donde empieza lo que falta escanear
+    pos = 0        # el mismo punto en caracteres (lexpos)
+    linea = 1
+    sin_cierre: Dict[bytes, int] = {}  # cierre -> byte desde el que ya se sabe que no aparece
+
+    while pos_byte < largo:
+        fin = min(largo, pos_byte + tam)
+        while fin < largo and 0x80 <= datos[fin] < 0xC0:
+            fin -= 1  # no cortar un carácter UTF-8 a la mitad
+        final = fin == largo
+        texto = datos[pos_byte:fin].decode('utf-8')
+
+        salida: List[LexToken] = []
+        consumido, linea, apertura = _escanear_bloque(texto, pos, linea, final, salida, errores)
+        yield from salida
+
+        if len(texto) == fin - pos_byte:
+            pos_byte += consumido  # bloque ASCII: bytes == caracteres
+        else:
+            pos_byte += len(texto[:consumido].encode('utf-8'))
+        pos += consumido
+
+        if apertura is None:
+            # Sin avance: un único token más largo que el bloque; se agranda
+            tam = tam * 2 if consumido == 0 and not final else tam_bloque
+            continue
+        tam = tam_bloque
+
+        # Apertura sin cierre en el bloque: se busca el cierre en los bytes
+        cierre = _CIERRES[apertura]
+        k = -1
+        if sin_cierre.get(cierre, largo) > pos_byte:
+            k = datos.find(cierre, pos_byte + len(apertura))
+            if k < 0:
+                sin_cierre[cierre] = pos_byte
+
+        if k < 0:
+            # No cierra en todo el archivo: '"' es error, '/' es DIV
+            if apertura == '"':
+                if errores:
+                    yield _token('ERROR', '"', linea, pos)
+            else:
+                yield _token('DIV', '/', linea, pos)
+            pos_byte += 1
+            pos += 1
+        elif apertura == '"':
+            valor = datos[pos_byte + 1:k].decode('utf-8')
+            yield _token('CADENA', valor, linea, pos)  # una cadena no avanza la línea
+            pos_byte = k + 1
+            pos += len(valor) + 2
+        else:
+            hasta = k + len(cierre)
+            caracteres, saltos = _contar(datos, pos_byte, hasta, tam_bloque)
+            linea += saltos
+            pos_byte = hasta
+            pos += caracteres
+
+
+def tokens_archivo(ruta: str, tam_bloque: int = TAM_BLOQUE, errores: bool = True) -> Iterator[LexToken]:
+    """tokens_datos() sobre el archivo 'ruta' mapeado en memoria."""
+    with open(ruta, 'rb') as archivo:
+        if os.fstat(archivo.fileno()).st_size == 0:
+            return  # mmap no acepta archivos vacíos
+        with mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+            yield from tokens_datos(datos, tam_bloque, errores)
+
+
+def lexemas_archivo(ruta: str, tam_bloque: int = TAM_BLOQUE) -> Iterator[Dict]:
+    """Como prueba(), en flujo: dicts {tipo, valor, linea, posicion} con los errores intercalados."""
+    for tok in tokens_archivo(ruta, tam_bloque):
+        yield {"tipo": tok.type, "valor": tok.value, "linea": tok.lineno, "posicion": tok.lexpos}
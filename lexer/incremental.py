@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+# lexer/incremental.py
+"""
+Lexer incremental para el análisis en vivo del editor.
+
+Guarda por línea un estado de entrada: si el inicio de la línea queda
+DENTRO de un token multilínea (comentario de bloque, cadena con salto de
+línea) la línea no es "limpia". Al editar:
+  1. se localiza la zona cambiada comparando el texto nuevo con el anterior
+     (prefijo/sufijo comunes, comparaciones en C),
+  2. se retrocede hasta una línea limpia (o hasta la primera apertura sin
+     cerrar, p.ej. '/*' o '"' sueltos, que un cambio posterior puede cerrar),
+  3. se re-tokeniza con el lexer PLY desde ahí hasta que, pasada la zona
+     editada, se llega a una línea limpia que también lo era antes,
+  4. se reemplazan en la lista de tokens sólo los de la zona re-tokenizada.
+
+El lexer corre sobre una instancia propia de reglas (que sólo producen
+tokens y errores; la tabla de símbolos no interviene).
+
+Los tokens se agrupan en tramos contiguos de hasta _TAM_TRAMO; cada token
+guarda su posición y línea relativas al desplazamiento de su tramo. Tras
+una edición los tokens posteriores no se recorren: se suma el corrimiento a
+cada tramo siguiente (y se parten a lo sumo dos tramos en los bordes), así
+el costo depende del tamaño de la edición y no del largo del archivo. La
+lista devuelta se modifica en el lugar: sólo es válida hasta la siguiente
+actualizar().
+"""
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from ply.lex import LexToken
+
+from lexer.analizador_lexico import ReglasLexicas
+
+# Tokens cuyo lexema puede contener '\n' (el lexer NO cuenta esas líneas)
+_MULTILINEA = ('CADENA', 'CARACTER')
+
+# Tokens por tramo (ver _Tramo)
+_TAM_TRAMO = 256
+
+
+def _prefijo_comun(a: str, b: str) -> int:
+    """Largo del prefijo común de 'a' y 'b' (por bloques crecientes, comparando en C)."""
+    n = min(len(a), len(b))
+    i, paso = 0, 256
+    while i < n:
+        k = min(paso, n - i)
+        if a[i:i + k] != b[i:i + k]:
+            bajo, alto = i, i + k
+            while alto - bajo > 1:
+                medio = (bajo + alto) // 2
+                if a[bajo:medio] == b[bajo:medio]:
+                    bajo = medio
+                else:
+                    alto = medio
+            return bajo
+        i += k
+        paso *= 2
+    return n
+
+
+def _sufijo_comun(a: str, b: str, maximo: int) -> int:
+    """Largo del sufijo común de 'a' y 'b', como mucho 'maximo'."""
+    fa, fb = len(a), len(b)
+    i, paso = 0, 256
+    while i < maximo:
+        k = min(paso, maximo - i)
+        if a[fa - i - k:fa - i] != b[fb - i - k:fb - i]:
+            bajo, alto = i, i + k
+            while alto - bajo > 1:
+                medio = (bajo + alto) // 2
+                if a[fa - medio:fa - bajo] == b[fb - medio:fb - bajo]:
+                    bajo = medio
+                else:
+                    alto = medio
+            return bajo
+        i += k
+        paso *= 2
+    return maximo
+
+
+def _fin_de_linea(texto: str, inicio: int) -> int:
+    """Posición siguiente al '\n' de la línea que empieza en 'inicio' (largo + 1 en la última)."""
+    salto = texto.find('\n', inicio)
+    return (salto if salto >= 0 else len(texto)) + 1
+
+
+def _empalmar_lineas(lineas: List[int], primera: int, cola: int, nuevas: List[int], corrimiento: int):
+    """En la lista ordenada 'lineas', reemplaza las de [primera, cola) por 'nuevas' y corre las siguientes."""
+    desde, hasta = bisect_left(lineas, primera), bisect_left(lineas, cola)
+    siguientes = lineas[hasta:]
+    if corrimiento:
+        siguientes = [linea + corrimiento for linea in siguientes]
+    lineas[desde:] = nuevas + siguientes
+
+
+class _Tramo:
+    """
+    Tokens contiguos que comparten el desplazamiento de posición, de lineno
+    y de fila (índice de la línea en el texto; difiere de lineno - 1 cuando
+    una cadena tiene saltos de línea).
+    """
+    __slots__ = ('pos', 'linea', 'fila', 'n')
+
+    def __init__(self, pos: int = 0, linea: int = 0, fila: int = 0, n: int = 0):
+        self.pos = pos
+        self.linea = linea
+        self.fila = fila
+        self.n = n
+
+
+class _TokenEnVivo(LexToken):
+    """LexToken con lexpos/lineno relativos a su tramo."""
+
+    def __init__(self, tok, fila: int, tramo: _Tramo):
+        self.type = tok.type
+        self.value = tok.value
+        self._tramo = tramo
+        self._pos = tok.lexpos - tramo.pos
+        self._linea = tok.lineno - tramo.linea
+        self._fila = fila - tramo.fila
+
+    @property
+    def fila(self) -> int:
+        return self._fila + self._tramo.fila
+
+    @property
+    def lexpos(self) -> int:
+        return self._pos + self._tramo.pos
+
+    @lexpos.setter
+    def lexpos(self, valor: int):
+        self._pos = valor - self._tramo.pos
+
+    @property
+    def lineno(self) -> int:
+        return self._linea + self._tramo.linea
+
+    @lineno.setter
+    def lineno(self, valor: int):
+        self._linea = valor - self._tramo.linea
+
+
+class _ReglasEnVivo(ReglasLexicas):
+    """Reglas del lexer en vivo: además anota los comentarios de bloque descartados."""
+
+    def __init__(self):
+        super().__init__()
+        self.comentarios = []
+
+    def t_COMENTARIO_BLOQUE(self, t):
+        r'/\*[\s\S]*?\*/'
+        self.comentarios.append((t.lexpos, t.lexpos + len(t.value)))
+        return super().t_COMENTARIO_BLOQUE(t)
+
+
+class LexerIncremental:
+    def __init__(self):
+        self._reglas = _ReglasEnVivo()
+        self._lexer = self._reglas.construir()
+
+        # Estado por línea
+        self._limpia: List[bool] = []       # el inicio de la línea no cae dentro de un token
+        # Líneas que abren algo sin cerrar ('/*', '"', "'"), ordenadas
+        self._pendientes: List[int] = []
+        # Líneas cuyo '\n' final no cuenta para lineno (está dentro de una cadena), ordenadas
+        self._no_cuentan: List[int] = []
+
+        self._texto: Optional[str] = None
+        self._tokens: List = []             # _TokenEnVivo de todo el texto
+        self._tramos: List[_Tramo] = []     # tramos de self._tokens, en orden
+        self._errores: List[Dict] = []      # errores léxicos (dicts de t_error), por posición
+        self.lineas_relexadas = 0  # estadística de la última actualización
+
+    # =========================
+    # API
+    # =========================
+    def actualizar(self, texto: str) -> List:
+        """Tokens (LexToken) de 'texto', re-tokenizando sólo lo que cambió."""
+        viejo = self._texto
+        if viejo is None:
+            n = texto.count('\n') + 1
+            self._relexar(texto, 0, 0, n, n, n)
+            return self._tokens
+        if texto == viejo:
+            self.lineas_relexadas = 0
+            return self._tokens
+
+        prefijo = _prefijo_comun(texto, viejo)
+        sufijo = _sufijo_comun(texto, viejo, min(len(texto), len(viejo)) - prefijo)
+        # Primera línea con cambios (su '\n' final también cuenta como cambio),
+        # contando los saltos desde el último token anterior
+        anterior = self._primer_token(prefijo) - 1
+        if anterior >= 0:
+            tok = self._tokens[anterior]
+            p = tok.fila + texto.count('\n', tok.lexpos, prefijo)
+        else:
+            p = texto.count('\n', 0, prefijo)
+        inicio_p = texto.rfind('\n', 0, prefijo) + 1
+        # Primera línea cuyo inicio y todo lo que sigue está en el sufijo común
+        fin_nuevo = p + texto.count('\n', prefijo, len(texto) - sufijo) + 1
+        fin_viejo = p + viejo.count('\n', prefijo, len(viejo) - sufijo) + 1
+        n_nuevo = len(self._limpia) + fin_nuevo - fin_viejo
+
+        self._relexar(texto, p, inicio_p, fin_nuevo, fin_viejo, n_nuevo)
+        return self._tokens
+
+    def tokens(self) -> List:
+        return self._tokens
+
+    def errores(self) -> List[Dict]:
+        """Errores léxicos en el formato de prueba(): {tipo, valor, linea, posicion}."""
+        return [dict(err) for err in self._errores]
+
+    def limpiar(self):
+        self.__init__()
+
+    # =========================
+    # Re-tokenización
+    # =========================
+    def _linea_inicial(self, p: int) -> int:
+        """Primera línea desde la que hay que re-tokenizar para cubrir la línea 'p'."""
+        inicio = p
+        if self._pendientes and self._pendientes[0] < inicio:
+            # Una apertura sin cerrar antes del cambio puede cerrarse con lo editado
+            inicio = self._pendientes[0]
+        while inicio > 0 and not self._limpia[inicio]:
+            inicio -= 1
+        return inicio
+
+    def _lineno(self, linea: int) -> int:
+        """lineno (de PLY) del inicio de la línea 'linea'."""
+        return linea + 1 - bisect_left(self._no_cuentan, linea)
+
+    def _primer_token(self, pos: int) -> int:
+        """Índice del primer token con lexpos >= 'pos'."""
+        tokens = self._tokens
+        bajo, alto = 0, len(tokens)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if tokens[medio].lexpos < pos:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    def _primer_error(self, pos: int) -> int:
+        """Índice del primer error con posicion >= 'pos'."""
+        return bisect_left([err['posicion'] for err in self._errores], pos)
+
+    def _relexar(self, texto: str, p: int, inicio_p: int, fin_nuevo: int, fin_viejo: int, n_nuevo: int):
+        primera = self._linea_inicial(p) if self._texto is not None else 0
+        offset = inicio_p
+        for _ in range(p - primera):
+            offset = texto.rfind('\n', 0, offset - 1) + 1
+        delta = fin_nuevo - fin_viejo
+        lineno_primera = self._lineno(primera)
+
+        reglas = self._reglas
+        lexer = self._lexer
+        reglas.reiniciar()
+        reglas.comentarios.clear()
+
+        lexer.input(texto)
+        lexer.lexpos = offset
+        lexer.lineno = lineno_primera
+
+        limpia, cuenta = [True], [True]
+        pendientes = set()
+        nuevos, filas, errores = [], [], []
+        j = primera
+        inicio_j = offset
+        siguiente = _fin_de_linea(texto, inicio_j)
+        alcance = offset          # fin del token/comentario más largo visto
+        cadena = (0, 0)           # último token multilínea (cadena/carácter)
+        previo = None             # (tipo, lexpos, línea) del último token
+        reanudar: Optional[int] = None
+
+        n_comentarios = 0
+        n_errores = 0
+        while True:
+            tok = lexer.token()
+
+            # Eventos de esta llamada en orden: comentarios, errores y el token
+            eventos = []
+            for s, e in reglas.comentarios[n_comentarios:]:
+                eventos.append((s, e, None))
+            n_comentarios = len(reglas.comentarios)
+            for err in reglas.resultado[n_errores:]:
+                eventos.append((err['posicion'], err['posicion'] + 1, err))
+            n_errores = len(reglas.resultado)
+            if len(eventos) > 1:
+                eventos.sort(key=lambda ev: ev[0])
+            if tok is not None:
+                eventos.append((tok.lexpos, lexer.lexpos, tok))
+
+            for pos, fin, item in eventos:
+                # Avanzar de línea hasta la que contiene 'pos'
+                while pos >= siguiente:
+                    cuenta[-1] = not (cadena[0] < siguiente - 1 < cadena[1])
+                    j += 1
+                    inicio_j = siguiente
+                    siguiente = _fin_de_linea(texto, inicio_j)
+                    es_limpia = alcance <= inicio_j
+                    if (j >= fin_nuevo and es_limpia and j - delta < len(self._limpia)
+                            and self._limpia[j - delta]):
+                        reanudar = j
+                        break
+                    limpia.append(es_limpia)
+                    cuenta.append(True)
+                if reanudar is not None:
+                    break
+
+                alcance = max(alcance, fin)
+                if item is None:
+                    continue  # comentario de bloque: sólo ocupa espacio
+                if isinstance(item, dict):
+                    errores.append(item)
+                    if item['valor'] in ('"', "'"):
+                        pendientes.add(j)
+                    continue
+
+                nuevos.append(item)
+                filas.append(j)
+                if item.type in _MULTILINEA:
+                    cadena = (pos, fin)
+                if previo is not None and previo[0] == 'DIV' and previo[1] + 1 == pos \
+                        and item.type in ('MULT', 'MULTASIGNAR'):
+                    # '/*' sin '*/': el lexer lo parte en DIV + MULT
+                    pendientes.add(previo[2])
+                previo = (item.type, pos, j)
+
+            if reanudar is not None or tok is None:
+                break
+
+        primer_token = self._primer_token(offset)
+        primer_error = self._primer_error(offset)
+        d_pos = d_linea = 0
+        if reanudar is None:
+            # Sin resincronizar: se cierran las líneas restantes hasta el final
+            while j < n_nuevo - 1:
+                cuenta[-1] = not (cadena[0] < siguiente - 1 < cadena[1])
+                j += 1
+                inicio_j = siguiente
+                siguiente = _fin_de_linea(texto, inicio_j)
+                limpia.append(alcance <= inicio_j)
+                cuenta.append(True)
+            cola = len(self._limpia)
+            fin_tokens = len(self._tokens)
+            fin_errores = len(self._errores)
+        else:
+            cola = reanudar - delta
+            # La cola es un sufijo idéntico del texto: sólo cambian lexpos y lineno
+            d_pos = len(texto) - len(self._texto)
+            desde = inicio_j - d_pos  # inicio de la línea 'cola' en el texto anterior
+            fin_tokens = self._primer_token(desde)
+            fin_errores = self._primer_error(desde)
+            d_linea = lineno_primera + cuenta.count(True) - self._lineno(cola)
+
+        # Empalme: [0, primera) viejo + relexado + [cola, fin) viejo
+        corrimiento = primera + len(limpia) - cola
+        self._empalmar_tokens(primer_token, fin_tokens, nuevos, filas, d_pos, d_linea, corrimiento)
+        if d_pos or d_linea:
+            for err in self._errores[fin_errores:]:
+                err['posicion'] += d_pos
+                err['linea'] += d_linea
+        self._errores[primer_error:fin_errores] = errores
+        self._limpia[primera:cola] = limpia
+        _empalmar_lineas(self._pendientes, primera, cola, sorted(pendientes), corrimiento)
+        _empalmar_lineas(self._no_cuentan, primera, cola,
+                         [primera + k for k, c in enumerate(cuenta) if not c], corrimiento)
+
+        self._texto = texto
+        self.lineas_relexadas = len(limpia)
+        reglas.reiniciar()
+
+    # =========================
+    # Tramos
+    # =========================
+    def _empalmar_tokens(self, inicio: int, fin: int, nuevos: List, filas: List[int],
+                         d_pos: int, d_linea: int, d_fila: int):
+        """
+        Reemplaza self._tokens[inicio:fin] por 'nuevos' (LexToken con
+        posiciones absolutas; 'filas' es la línea de cada uno) y corre
+        d_pos/d_linea/d_fila los tokens siguientes.
+        """
+        tramos = self._tramos
+        desde = self._cortar(inicio)
+        hasta = self._cortar(fin)
+        if d_pos or d_linea or d_fila:
+            for tramo in tramos[hasta:]:
+                tramo.pos += d_pos
+                tramo.linea += d_linea
+                tramo.fila += d_fila
+
+        agregados, vivos = [], []
+        for k in range(0, len(nuevos), _TAM_TRAMO):
+            parte = nuevos[k:k + _TAM_TRAMO]
+            tramo = _Tramo(n=len(parte))
+            agregados.append(tramo)
+            vivos.extend(_TokenEnVivo(tok, fila, tramo) for tok, fila in zip(parte, filas[k:k + _TAM_TRAMO]))
+        tramos[desde:hasta] = agregados
+        self._tokens[inicio:fin] = vivos
+
+        # Cada edición agrega a lo sumo tres tramos: al duplicarse se fusionan los vecinos chicos
+        if len(tramos) > 2 * (len(self._tokens) // _TAM_TRAMO) + 16:
+            self._fusionar_tramos()
+
+    def _cortar(self, indice: int) -> int:
+        """Índice del tramo que empieza en el token 'indice' (parte el tramo que lo contiene)."""
+        tramos = self._tramos
+        inicio = 0
+        for k, tramo in enumerate(tramos):
+            if inicio == indice:
+                return k
+            fin = inicio + tramo.n
+            if indice < fin:
+                # Se mueve al tramo nuevo la mitad más corta
+                nuevo = _Tramo(tramo.pos, tramo.linea, tramo.fila)
+                if indice - inicio <= fin - indice:
+                    movidos, k_nuevo = self._tokens[inicio:indice], k
+                else:
+                    movidos, k_nuevo = self._tokens[indice:fin], k + 1
+                for tok in movidos:
+                    tok._tramo = nuevo
+                nuevo.n = len(movidos)
+                tramo.n -= nuevo.n
+                tramos.insert(k_nuevo, nuevo)
+                return k + 1
+            inicio = fin
+        return len(tramos)
+
+    def _fusionar_tramos(self):
+        tokens = self._tokens
+        fusionados: List[_Tramo] = []
+        inicio = 0
+        for tramo in self._tramos:
+            previo = fusionados[-1] if fusionados else None
+            if previo is not None and previo.n + tramo.n <= _TAM_TRAMO:
+                d_pos, d_linea, d_fila = tramo.pos - previo.pos, tramo.linea - previo.linea, tramo.fila - previo.fila
+                for tok in tokens[inicio:inicio + tramo.n]:
+                    tok._tramo = previo
+                    tok._pos += d_pos
+                    tok._linea += d_linea
+                    tok._fila += d_fila
+                previo.n += tramo.n
+            elif tramo.n:
+                fusionados.append(tramo)
+            inicio += tramo.n
+        self._tramos = fusionados
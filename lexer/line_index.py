@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# lexer/line_index.py
+"""
+LineIndex: conversión offset <-> (línea, columna) de un fuente.
+
+Se construye UNA vez por fuente (arreglo con el offset donde empieza cada
+línea) y cada conversión es una búsqueda binaria: O(log n) en lugar de
+recorrer el texto con rfind/count por cada error.
+
+Líneas y columnas son 1-based, como en los diagnósticos y el gutter.
+"""
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Tuple
+
+
+class LineIndex:
+    __slots__ = ('largo', 'inicios')
+
+    def __init__(self, fuente: str):
+        self.largo = len(fuente)
+        # inicios[k] = offset del primer carácter de la línea k+1
+        self.inicios = array('l', accumulate((len(l) + 1 for l in fuente.split('\n')), initial=0))
+        self.inicios.pop()  # el último acumulado es el fin del texto, no una línea
+
+    @property
+    def lineas(self) -> int:
+        return len(self.inicios)
+
+    def linea(self, offset: int) -> int:
+        """Línea que contiene 'offset' (un '\\n' pertenece a la línea que termina)."""
+        return bisect_right(self.inicios, offset)
+
+    def col(self, offset: int) -> int:
+        return offset - self.inicios[self.linea(offset) - 1] + 1
+
+    def linea_col(self, offset: int) -> Tuple[int, int]:
+        linea = bisect_right(self.inicios, offset)
+        return linea, offset - self.inicios[linea - 1] + 1
+
+    def offset(self, linea: int, col: int = 1) -> int:
+        """Offset de (línea, columna); la línea se acota al rango del fuente."""
+        linea = min(max(linea, 1), len(self.inicios))
+        return min(self.inicios[linea - 1] + col - 1, self.largo)
+
+    def inicio_linea(self, linea: int) -> int:
+        return self.offset(linea, 1)
+
+
+# Último índice construido: los productores de diagnósticos de un mismo
+# fuente (estructura, semántico, gutter) lo comparten. Se reemplaza la tupla
+# entera de una vez, así que leerla desde otro hilo es seguro.
+_ultimo: Tuple[str, LineIndex] = ('', LineIndex(''))
+
+
+def line_index(fuente: str) -> LineIndex:
+    """LineIndex de 'fuente', reutilizando el último si el texto es el mismo."""
+    global _ultimo
+    texto, indice = _ultimo
+    if texto is fuente or texto == fuente:
+        return indice
+    indice = LineIndex(fuente)
+    _ultimo = (fuente, indice)
+    return indice
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+# lexer/recolector_simbolos.py
+"""
+Recolección de la tabla de símbolos en una pasada aparte sobre los tokens.
+
+El lexer (PLY o escaner_rapido) sólo produce tokens; las declaraciones, los
+valores asignados con literales, los alcances y las marcas de "usado" que
+antes se registraban como efecto de t_IDENTIFICADOR, t_ENTERO, t_ASIGNAR,
+etc. se calculan aquí recorriendo los mismos tokens en el mismo orden, así la
+TablaSimbolos resultante es igual a la que dejaba el lexer.
+
+TokenStream la ejecuta sólo cuando alguien pide la tabla (restaurar_tabla,
+el parser) y la memoriza con el stream.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from lexer.analizador_lexico import TablaSimbolos, nuevos_estados
+from tracing import trazas
+
+_traza = trazas.canal('lexer')
+
+_TIPOS_DATO = ('INT', 'FLOAT', 'DOUBLE', 'CHAR', 'BOOLEAN', 'STRING', 'BYTE', 'SHORT', 'LONG')
+_LITERALES = {'TRUE': True, 'FALSE': False, 'NULL': None}
+
+
+class RecolectorSimbolos:
+    """
+    Máquina de estados que, token a token, llena 'tabla' (ver nuevos_estados()
+    para el contexto que mantiene entre tokens).
+    """
+
+    def __init__(self, tabla: Optional[TablaSimbolos] = None):
+        self.tabla = tabla if tabla is not None else TablaSimbolos()
+        self.estados = nuevos_estados()
+        self._indice = 0
+        self._altas: List[List] = []     # [índice_token, nombre, info o None (la final)]
+        self._ultima_alta: Dict[str, int] = {}
+        self._acciones = {
+            'LLAIZQ': self._llave_abre,
+            'LLADER': self._llave_cierra,
+            'ASIGNAR': self._asignar,
+            'ENTERO': self._literal,
+            'DECIMAL': self._literal,
+            'CADENA': self._cadena,
+            'CARACTER': self._caracter,
+            'PUNTOCOMA': self._punto_coma,
+            'IDENTIFICADOR': self._identificador,
+            'CLASS': self._clase,
+            'MAIN': self._main,
+            'FOR': self._for,
+        }
+        for tipo in _TIPOS_DATO:
+            self._acciones[tipo] = self._tipo_dato
+        for tipo in _LITERALES:
+            self._acciones[tipo] = self._literal_palabra
+
+    def reiniciar(self):
+        self.estados = nuevos_estados()
+        self.tabla.limpiar()
+        self._indice = 0
+        self._altas = []
+        self._ultima_alta = {}
+
+    # =========================
+    # API
+    # =========================
+    def procesar(self, tok):
+        """Aplica a la tabla los efectos de 'tok' (LexToken ya convertido)."""
+        accion = self._acciones.get(tok.type)
+        if accion is not None:
+            accion(tok)
+
+    def recolectar(self, tokens: Iterable) -> Tuple[Dict[str, Dict], List[Tuple], Tuple]:
+        """
+        Recorre 'tokens' desde una tabla vacía. Devuelve:
+          - simbolos: copia de la tabla final
+          - altas: (índice_token, nombre, info) por cada declaración, en orden
+            (un nombre redeclarado aparece una vez por declaración)
+          - estado: (alcance_actual, nivel_llaves, en_metodo) al terminar
+        """
+        self.reiniciar()
+        tabla = self.tabla
+        acciones = self._acciones
+        for i, tok in enumerate(tokens):
+            accion = acciones.get(tok.type)
+            if accion is not None:
+                self._indice = i
+                accion(tok)
+
+        simbolos = {nombre: dict(info) for nombre, info in tabla.simbolos.items()}
+        # Una redeclaración reemplaza la entrada (y reinicia 'usado') como lo
+        # hacía el lexer; cada alta lleva la entrada tal como quedó hasta ser
+        # reemplazada, y la última, la final
+        altas = [(i, nombre, info if info is not None else simbolos[nombre])
+                 for i, nombre, info in self._altas]
+        estado = (tuple(tabla.alcance_actual), tabla.nivel_llaves, tabla.en_metodo)
+        return simbolos, altas, estado
+
+    def _agregar(self, nombre, tipo, linea):
+        """tabla.agregar() registrando el alta (también las redeclaraciones)."""
+        tabla = self.tabla
+        alcance = tabla.determinar_alcance()
+        nombre_completo = f"{alcance}.{nombre}" if alcance != 'global' else nombre
+        previa = self._ultima_alta.get(nombre_completo)
+        if previa is not None:
+            self._altas[previa][2] = dict(tabla.simbolos[nombre_completo])
+        self._ultima_alta[nombre_completo] = len(self._altas)
+        self._altas.append([self._indice, nombre_completo, None])
+        tabla.agregar(nombre, tipo, linea)
+
+    # =========================
+    # Acciones por tipo de token
+    # =========================
+    def _llave_abre(self, tok):
+        self.tabla.abrir_bloque()
+
+    def _llave_cierra(self, tok):
+        self.tabla.cerrar_bloque()
+
+    def _asignar(self, tok):
+        # Si acabamos de ver un identificador, preparamos para capturar su valor
+        estados = self.estados
+        if estados['ultimo_identificador'] and not estados['esperando_valor']:
+            estados['esperando_valor'] = True
+            estados['variable_reciente'] = estados['ultimo_identificador']
+
+    def _asignar_valor(self, valor):
+        """Valor literal para la variable que espera uno tras '='."""
+        estados = self.estados
+        if estados['esperando_valor'] and estados['variable_reciente']:
+            if self.tabla.actualizar_valor(estados['variable_reciente'], valor) and _traza.activo:
+                _traza("valor asignado", variable=estados['variable_reciente'], valor=valor)
+            estados['esperando_valor'] = False
+            estados['variable_reciente'] = None
+
+    def _literal(self, tok):
+        self._asignar_valor(tok.value)
+
+    def _cadena(self, tok):
+        # Con comillas, para mostrar que es una cadena
+        self._asignar_valor(f'"{tok.value}"')
+
+    def _caracter(self, tok):
+        self._asignar_valor(f"'{tok.value}'")
+
+    def _literal_palabra(self, tok):
+        self._asignar_valor(_LITERALES[tok.type])
+
+    def _punto_coma(self, tok):
+        estados = self.estados
+        estados['modo_declaracion'] = False
+        estados['en_for'] = False
+        estados['esperando_valor'] = False
+        estados['variable_reciente'] = None
+
+    def _for(self, tok):
+        self.estados['en_for'] = True
+
+    def _tipo_dato(self, tok):
+        # Un tipo abre el modo declaración
+        self.estados['ultimo_tipo'] = tok.type
+        self.estados['modo_declaracion'] = True
+
+    def _clase(self, tok):
+        self.estados['clase_actual'] = 'esperando_nombre'
+
+    def _main(self, tok):
+        self.estados['metodo_actual'] = 'main'
+        self.tabla.abrir_alcance('main')
+        self._agregar('main', 'METHOD', tok.lineno)
+        if _traza.activo:
+            _traza("entrando al método main", en_metodo=self.tabla.en_metodo)
+
+    def _identificador(self, tok):
+        estados = self.estados
+        tabla = self.tabla
+        nombre = tok.value
+        if estados['modo_declaracion']:
+            alcance = tabla.determinar_alcance()
+            if estados['en_for']:
+                alcance = 'local'
+
+            self._agregar(nombre, estados['ultimo_tipo'], tok.lineno)
+
+            # El alcance registrado es el calculado aquí (en un for es 'local')
+            nombre_completo = f"{alcance}.{nombre}" if alcance != 'global' else nombre
+            if nombre_completo in tabla.simbolos:
+                tabla.simbolos[nombre_completo]['alcance'] = alcance
+
+            if _traza.activo:
+                _traza("variable declarada", nombre=nombre, alcance=alcance,
+                       en_metodo=tabla.en_metodo, nivel_llaves=tabla.nivel_llaves)
+
+            estados['modo_declaracion'] = False
+        elif tabla.existe(nombre):
+            tabla.marcar_como_usado(nombre)
+        estados['ultimo_identificador'] = nombre
+
+        # Nombre de la clase
+        if estados['clase_actual'] == 'esperando_nombre':
+            estados['clase_actual'] = nombre
+            self._agregar(nombre, 'CLASS', tok.lineno)
+
+
+def recolectar_simbolos(tokens: Iterable, tabla: Optional[TablaSimbolos] = None):
+    """(simbolos, altas, estado) de 'tokens'; ver RecolectorSimbolos.recolectar()."""
+    return RecolectorSimbolos(tabla).recolectar(tokens)
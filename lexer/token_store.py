@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# lexer/token_store.py
+"""
+TokenStore: tokens en columnas (struct-of-arrays) en lugar de un LexToken o
+un dict por token.
+
+  tipos       array('H')  código del tipo (índice en TIPOS)
+  valores     array('I')  índice en 'tabla_valores' (lexemas internados)
+  lineas      array('i')
+  posiciones  array('i')  offset en el fuente (lexpos)
+
+Cada token ocupa 14 bytes en los arreglos; un lexema repetido (nombres de
+variables, palabras reservadas, ';') se guarda una sola vez.
+
+Para los consumidores existentes, store[i] devuelve una TokenView liviana que
+se lee como un LexToken (type, value, lineno, lexpos) y como los dicts de
+prueba() (['tipo'], .get('valor'), ...), sin materializar nada más.
+"""
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from lexer.analizador_lexico import tokens as _tokens
+
+# Tipos de token: los del lexer + ERROR (errores léxicos en el formato de prueba())
+TIPOS: Tuple[str, ...] = tuple(_tokens) + ('ERROR',)
+CODIGOS: Dict[str, int] = {tipo: i for i, tipo in enumerate(TIPOS)}
+
+# Claves de los dicts de prueba() -> atributo de la vista
+_CLAVES = {'tipo': 'type', 'valor': 'value', 'linea': 'lineno', 'posicion': 'lexpos'}
+
+
+class TokenStore:
+    __slots__ = ('tipos', 'valores', 'lineas', 'posiciones', 'tabla_valores', '_internados')
+
+    def __init__(self):
+        self.tipos = array('H')
+        self.valores = array('I')
+        self.lineas = array('i')
+        self.posiciones = array('i')
+        self.tabla_valores: List = []
+        self._internados: Dict = {}
+
+    # =========================
+    # Construcción
+    # =========================
+    def agregar(self, tipo: str, valor, linea: int, posicion: int):
+        # (clase, valor): 1, 1.0 y True son lexemas distintos
+        clave = (valor.__class__, valor)
+        indice = self._internados.get(clave)
+        if indice is None:
+            indice = self._internados[clave] = len(self.tabla_valores)
+            self.tabla_valores.append(valor)
+        self.tipos.append(CODIGOS[tipo])
+        self.valores.append(indice)
+        self.lineas.append(linea)
+        self.posiciones.append(posicion)
+
+    def cerrar(self) -> 'TokenStore':
+        """Suelta el índice de internado (sólo hace falta mientras se agregan tokens)."""
+        self._internados = None
+        return self
+
+    @classmethod
+    def desde_tokens(cls, toks: Iterable, errores: Iterable[Dict] = ()) -> 'TokenStore':
+        """
+        Store con los LexToken 'toks' y los errores léxicos intercalados por
+        posición (mismo orden que TokenStream.como_lexemas()).
+        """
+        store = cls()
+        agregar = store.agregar
+        errores = list(errores)
+        j = 0
+        for tok in toks:
+            while j < len(errores) and errores[j]['posicion'] < tok.lexpos:
+                e = errores[j]
+                agregar('ERROR', e['valor'], e['linea'], e['posicion'])
+                j += 1
+            agregar(tok.type, tok.value, tok.lineno, tok.lexpos)
+        for e in errores[j:]:
+            agregar('ERROR', e['valor'], e['linea'], e['posicion'])
+        return store.cerrar()
+
+    # =========================
+    # Acceso
+    # =========================
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, i) -> 'TokenView':
+        if i < 0:
+            i += len(self.tipos)
+        if not 0 <= i < len(self.tipos):
+            raise IndexError(i)
+        return TokenView(self, i)
+
+    def __iter__(self) -> Iterator['TokenView']:
+        for i in range(len(self.tipos)):
+            yield TokenView(self, i)
+
+    def tipo(self, i: int) -> str:
+        return TIPOS[self.tipos[i]]
+
+    def valor(self, i: int):
+        return self.tabla_valores[self.valores[i]]
+
+    def como_dicts(self) -> List[Dict]:
+        """Lista de dicts {tipo, valor, linea, posicion} (formato de prueba())."""
+        valores = self.tabla_valores
+        return [
+            {"tipo": TIPOS[t], "valor": valores[v], "linea": l, "posicion": p}
+            for t, v, l, p in zip(self.tipos, self.valores, self.lineas, self.posiciones)
+        ]
+
+    def bytes_arreglos(self) -> int:
+        """Bytes ocupados por las cuatro columnas (sin la tabla de lexemas)."""
+        return sum(a.itemsize * len(a) for a in (self.tipos, self.valores, self.lineas, self.posiciones))
+
+
+class TokenView:
+    """Vista de un token del store: atributos de LexToken y acceso de dict de prueba()."""
+    __slots__ = ('_store', '_i')
+
+    def __init__(self, store: TokenStore, i: int):
+        self._store = store
+        self._i = i
+
+    # --- interfaz LexToken ---
+    @property
+    def type(self) -> str:
+        return TIPOS[self._store.tipos[self._i]]
+
+    @property
+    def value(self):
+        store = self._store
+        return store.tabla_valores[store.valores[self._i]]
+
+    @property
+    def lineno(self) -> int:
+        return self._store.lineas[self._i]
+
+    @property
+    def lexpos(self) -> int:
+        return self._store.posiciones[self._i]
+
+    # --- interfaz dict de prueba() ---
+    def __getitem__(self, clave):
+        try:
+            return getattr(self, _CLAVES[clave])
+        except KeyError:
+            raise KeyError(clave) from None
+
+    def get(self, clave, defecto=None):
+        atributo = _CLAVES.get(clave)
+        return getattr(self, atributo) if atributo else defecto
+
+    def keys(self):
+        return _CLAVES.keys()
+
+    def como_dict(self) -> Dict:
+        return {clave: getattr(self, atributo) for clave, atributo in _CLAVES.items()}
+
+    def __repr__(self):
+        return f"TokenView({self.type},{self.value!r},{self.lineno},{self.lexpos})"
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+# lexer/token_stream.py
+"""
+Flujo de tokens compartido: el código se tokeniza UNA vez por versión del
+fuente y la misma lista inmutable se entrega al parser, al semántico, a los
+diagnósticos, a los generadores de código intermedio y a los árboles.
+
+La tokenización es pura (no toca la tabla de símbolos); los símbolos se
+recolectan aparte (lexer/recolector_simbolos.py) la primera vez que alguien
+los pide y quedan memorizados con el stream.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from ply.lex import LexToken
+
+from lexer import analizador_lexico as _lx
+from lexer.escaner_rapido import escanear
+from lexer.recolector_simbolos import recolectar_simbolos
+
+# Escáneres disponibles para CacheTokenStreams / Analyzer
+ESCANERES = ('ply', 'rapido')
+
+# Número de versiones del fuente que se mantienen en memoria
+TAM_CACHE = 8
+
+# Serializa la recolección de símbolos (que un stream no la calcule dos veces)
+_lock_recoleccion = threading.Lock()
+
+
+def hash_fuente(codigo: str) -> str:
+    """Hash estable del código fuente (clave de la caché)."""
+    return hashlib.sha1(codigo.encode('utf-8', 'surrogatepass')).hexdigest()
+
+
+class TokenStream:
+    """
+    Resultado inmutable de tokenizar un fuente:
+      - tokens: tupla de LexToken (sin los errores léxicos)
+      - errores: tupla de dicts {tipo: 'ERROR', valor, linea, posicion}
+    y, calculados al primer acceso con la pasada de recolección de símbolos:
+      - simbolos: tabla de símbolos del fuente
+      - altas: (índice_token, nombre, info) en el orden en que se fueron
+        declarando símbolos; permite reproducir la tabla progresivamente
+      - estado_tabla: (alcance_actual, nivel_llaves, en_metodo) al final
+    """
+    __slots__ = ('fuente_hash', 'tokens', 'errores', '_recoleccion', '_almacen')
+
+    def __init__(self, fuente_hash, tokens, errores, simbolos=None, altas=None, estado_tabla=None):
+        self.fuente_hash = fuente_hash
+        self.tokens: Tuple = tuple(tokens)
+        self.errores: Tuple[Dict, ...] = tuple(errores)
+        # (simbolos, altas, estado_tabla); None hasta que se pidan
+        self._recoleccion = None if simbolos is None else (simbolos, tuple(altas or ()), estado_tabla)
+        self._almacen = None
+
+    def _recolectado(self):
+        recoleccion = self._recoleccion
+        if recoleccion is None:
+            with _lock_recoleccion:
+                recoleccion = self._recoleccion
+                if recoleccion is None:
+                    simbolos, altas, estado = recolectar_simbolos(self.tokens)
+                    recoleccion = self._recoleccion = (simbolos, tuple(altas), estado)
+        return recoleccion
+
+    @property
+    def simbolos(self) -> Dict[str, Dict]:
+        return self._recolectado()[0]
+
+    @property
+    def altas(self) -> Tuple:
+        return self._recolectado()[1]
+
+    @property
+    def estado_tabla(self):
+        return self._recolectado()[2]
+
+    @property
+    def recolectado(self) -> bool:
+        """True si la tabla de símbolos de este stream ya se calculó."""
+        return self._recoleccion is not None
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+    def __getitem__(self, i):
+        return self.tokens[i]
+
+    def como_lexemas(self) -> List[Dict]:
+        """Lista de dicts {tipo, valor, linea, posicion} (formato de prueba())."""
+        salida = []
+        errores = self.errores
+        j = 0
+        for tok in self.tokens:
+            while j < len(errores) and errores[j]['posicion'] < tok.lexpos:
+                salida.append(dict(errores[j]))
+                j += 1
+            salida.append({
+                "tipo": tok.type,
+                "valor": tok.value,
+                "linea": tok.lineno,
+                "posicion": tok.lexpos
+            })
+        for e in errores[j:]:
+            salida.append(dict(e))
+        return salida
+
+    def almacen(self):
+        """
+        Los mismos lexemas que como_lexemas() en un TokenStore (columnas
+        compactas); se construye una vez por stream.
+        """
+        if self._almacen is None:
+            # Import local para evitar ciclos (token_store usa analizador_lexico)
+            from lexer.token_store import TokenStore
+            self._almacen = TokenStore.desde_tokens(self.tokens, self.errores)
+        return self._almacen
+
+    def restaurar_tabla(self, tabla):
+        """Vuelca en 'tabla' los símbolos que produjo el lexer."""
+        tabla.limpiar()
+        for nombre, info in self.simbolos.items():
+            tabla.simbolos[nombre] = dict(info)
+        self._restaurar_estado(tabla)
+
+    def _restaurar_estado(self, tabla):
+        alcance, nivel, en_metodo = self.estado_tabla
+        tabla.alcance_actual = list(alcance)
+        tabla.nivel_llaves = nivel
+        tabla.en_metodo = en_metodo
+
+    def lexer_para_parser(self, tabla):
+        """Lexer sustituto para yacc que recorre este flujo."""
+        return LexerDeStream(self, tabla)
+
+    # =========================
+    # Serialización (caché en disco)
+    # =========================
+    def como_estado(self) -> Tuple:
+        """Tuplas simples (tokens, errores, recolección) para guardar; recolecta los símbolos."""
+        tokens = tuple((t.type, t.value, t.lineno, t.lexpos) for t in self.tokens)
+        return tokens, self.errores, self._recolectado()
+
+    @classmethod
+    def desde_estado(cls, fuente_hash: str, estado: Tuple) -> 'TokenStream':
+        """Inversa de como_estado() (acepta listas donde había tuplas, como vuelven de JSON)."""
+        tuplas, errores, (simbolos, altas, (alcance, nivel, en_metodo)) = estado
+        tokens = []
+        for tipo, valor, linea, pos in tuplas:
+            tok = LexToken()
+            tok.type = tipo
+            tok.value = valor
+            tok.lineno = linea
+            tok.lexpos = pos
+            tokens.append(tok)
+        altas = [(i, nombre, info) for i, nombre, info in altas]
+        return cls(fuente_hash, tokens, errores, simbolos, altas, (tuple(alcance), nivel, en_metodo))
+
+
+class LexerDeStream:
+    """
+    Imita la interfaz del lexer PLY (input/token/lineno/lexpos) sobre un
+    TokenStream. Al entregar cada token inserta en 'tabla' los símbolos que el
+    lexer original habría declarado hasta ese punto, así las verificaciones del
+    parser ven la misma tabla que con el lexer en vivo.
+    """
+
+    def __init__(self, stream: TokenStream, tabla):
+        self._stream = stream
+        self._tabla = tabla
+        self._pos = 0
+        self._alta = 0
+        self.lineno = 1
+        self.lexpos = 0
+
+    def input(self, data):
+        pass
+
+    def _declarar_hasta(self, indice):
+        altas = self._stream.altas
+        simbolos = self._tabla.simbolos
+        while self._alta < len(altas) and altas[self._alta][0] <= indice:
+            _, nombre, info = altas[self._alta]
+            simbolos[nombre] = dict(info)
+            self._alta += 1
+
+    def token(self):
+        tokens = self._stream.tokens
+        if self._pos >= len(tokens):
+            self._declarar_hasta(len(tokens))
+            return None
+        tok = tokens[self._pos]
+        self._declarar_hasta(self._pos)
+        self._pos += 1
+        self.lineno = tok.lineno
+        self.lexpos = tok.lexpos
+        return tok
+
+    def terminar(self):
+        """Completa la tabla como la habría dejado el lexer al llegar al final."""
+        self._declarar_hasta(len(self._stream.tokens))
+        self._stream._restaurar_estado(self._tabla)
+
+
+# =========================
+# Tokenización + caché
+# =========================
+def tokenizar(codigo: str, fuente_hash: Optional[str] = None, reglas=None, lexer=None) -> TokenStream:
+    """
+    Tokeniza 'codigo' con el lexer PLY (sin caché).
+    'reglas' es una ReglasLexicas (por defecto la del módulo) y 'lexer' un
+    lexer ya construido sobre ellas, para no reconstruirlo en cada llamada.
+    """
+    reglas = reglas or _lx.reglas_por_defecto
+    if lexer is None:
+        lexer = _lx.construir_lexer(reglas)
+    lexer.lineno = 1
+    reglas.resultado.clear()
+    lexer.input(codigo)
+
+    tokens = list(iter(lexer.token, None))
+    errores = [dict(e) for e in reglas.resultado]
+    reglas.resultado.clear()
+
+    return TokenStream(fuente_hash or hash_fuente(codigo), tokens, errores)
+
+
+def tokenizar_rapido(codigo: str, fuente_hash: Optional[str] = None) -> TokenStream:
+    """Como tokenizar(), con el escáner escrito a mano (lexer/escaner_rapido.py)."""
+    tokens, errores = escanear(codigo)
+    return TokenStream(fuente_hash or hash_fuente(codigo), tokens, errores)
+
+
+class CacheTokenStreams:
+    """
+    Caché LRU hash-del-fuente -> TokenStream ligada a un juego de reglas.
+    El lock serializa la tokenización: el lexer PLY y la lista de errores de
+    las reglas son de la instancia y no pueden usarse desde dos hilos a la vez.
+
+    'disco' (opcional, p. ej. analysis.cache_disco.CacheAnalisis) es un
+    segundo nivel persistente con stream(hash) / guardar_stream(stream).
+    """
+
+    def __init__(self, reglas=None, tam: int = TAM_CACHE, escaner: str = 'ply', disco=None):
+        if escaner not in ESCANERES:
+            raise ValueError(f"Escáner desconocido: {escaner!r} (opciones: {', '.join(ESCANERES)})")
+        self.reglas = reglas or _lx.reglas_por_defecto
+        self.tam = tam
+        self.escaner = escaner
+        self.disco = disco
+        self._streams: "OrderedDict[str, TokenStream]" = OrderedDict()
+        self._lexer = None
+        self._lock = threading.RLock()
+
+    def obtener(self, codigo: str) -> TokenStream:
+        """Devuelve el TokenStream de 'codigo', tokenizando sólo si no está en caché."""
+        clave = hash_fuente(codigo)
+        with self._lock:
+            stream = self._streams.get(clave)
+            if stream is not None:
+                self._streams.move_to_end(clave)
+                return stream
+
+            stream = self.disco.stream(clave) if self.disco is not None else None
+            if stream is None:
+                if self.escaner == 'rapido':
+                    stream = tokenizar_rapido(codigo, clave)
+                else:
+                    if self._lexer is None:
+                        self._lexer = _lx.construir_lexer(self.reglas)
+                    stream = tokenizar(codigo, clave, self.reglas, self._lexer)
+                if self.disco is not None:
+                    self.disco.guardar_stream(stream)
+            self._streams[clave] = stream
+            while len(self._streams) > self.tam:
+                self._streams.popitem(last=False)
+            return stream
+
+    def limpiar(self):
+        with self._lock:
+            self._streams.clear()
+
+
+_cache = CacheTokenStreams()
+
+
+def obtener_token_stream(codigo: str) -> TokenStream:
+    """Devuelve el TokenStream de 'codigo' desde la caché compartida del módulo."""
+    return _cache.obtener(codigo)
+
+
+def limpiar_cache():
+    _cache.limpiar()
+
+
+def usar_cache_disco(disco):
+    """Segundo nivel persistente para la caché compartida (None lo quita)."""
+    _cache.disco = disco
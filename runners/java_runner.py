@@ -1,12 +1,15 @@
 # -*- coding: utf-8 -*-
 import os
-import re
-import sys
 import shutil
 import tempfile
 from pathlib import Path
 from PyQt5 import QtCore
 
+from runners.jdk import base_runtimes, clase_publica, localizar_jdk
+from tracing import trazas
+
+_traza = trazas.canal('runner')
+
 
 class JavaRunner(QtCore.QObject):
 
@@ -60,72 +63,23 @@ class JavaRunner(QtCore.QObject):
     # ===============================
     # Utilidades
     # ===============================
-    _re_public_class = re.compile(r'^\s*public\s+class\s+([A-Za-z_]\w*)', re.MULTILINE)
-
     def _extract_public_class(self, src: str):
-        m = self._re_public_class.search(src)
-        return m.group(1) if m else None
-
-    def _find_base_with_runtimes(self) -> Path:
-        """
-        Devuelve el primer directorio ascendente (o _MEIPASS/CWD) que contenga 'runtimes'.
-        """
-        # 1) PyInstaller
-        meipass = getattr(sys, "_MEIPASS", None)
-        if meipass:
-            p = Path(meipass)
-            if (p / "runtimes").exists():
-                return p
-
-        # 2) Ascender desde este archivo
-        here = Path(__file__).resolve()
-        for p in [here.parent, *here.parents]:
-            if (p / "runtimes").exists():
-                return p
-
-        # 3) CWD como último intento
-        cwd = Path.cwd()
-        if (cwd / "runtimes").exists():
-            return cwd
-
-        # Fallback: carpeta del archivo
-        return here.parent
+        return clase_publica(src)
 
     def _locate_embedded_java(self):
-        """
-        Busca un JDK embebido en runtimes/<os>/jdk y devuelve rutas.
-        Estructuras esperadas:
-          - Windows/Linux: runtimes/<os>/jdk/bin/{java,javac}
-          - macOS:         runtimes/mac/jdk/Contents/Home/bin/{java,javac}
-        """
-        base_dir = self._find_base_with_runtimes()
-
-        platform = "win" if os.name == "nt" else ("mac" if sys.platform == "darwin" else "linux")
-        if platform == "mac":
-            jdk_home = base_dir / "runtimes" / platform / "jdk" / "Contents" / "Home"
-        else:
-            jdk_home = base_dir / "runtimes" / platform / "jdk"
-
-        bin_dir = jdk_home / "bin"
-        java_exe = "java.exe" if os.name == "nt" else "java"
-        javac_exe = "javac.exe" if os.name == "nt" else "javac"
-
-        java_path = bin_dir / java_exe
-        javac_path = bin_dir / javac_exe
+        """Rutas del JDK embebido (ver runners/jdk.py)."""
+        base_dir = base_runtimes()
+        rutas = localizar_jdk(base_dir)
 
-        # Debug opcional para ver por dónde busca (te ayuda ahora)
+        # Debug opcional para ver por dónde busca
         try:
             self.output.emit(f"[DEBUG] runtimes base: {base_dir}")
-            self.output.emit(f"[DEBUG] JAVA_HOME: {jdk_home}")
-            self.output.emit(f"[DEBUG] java: {java_path} | javac: {javac_path}")
+            self.output.emit(f"[DEBUG] JAVA_HOME: {rutas['JAVA_HOME']}")
+            self.output.emit(f"[DEBUG] java: {rutas['java']} | javac: {rutas['javac']}")
         except Exception:
             pass
 
-        return {
-            "JAVA_HOME": str(jdk_home) if jdk_home.exists() else None,
-            "java": str(java_path) if java_path.exists() else None,
-            "javac": str(javac_path) if javac_path.exists() else None,
-        }
+        return rutas
 
     def _make_env_with_embedded_java(self):
         """
@@ -155,6 +109,8 @@ class JavaRunner(QtCore.QObject):
             return
 
         self.started.emit("compile")
+        if _traza.activo:
+            _traza("javac", archivo=java_path)
 
         self._proc = QtCore.QProcess(self)
         self._proc.setProgram(emb_javac)
@@ -173,6 +129,8 @@ class JavaRunner(QtCore.QObject):
             return
 
         self.started.emit("run")
+        if _traza.activo:
+            _traza("java", clase=self._class_name)
 
         self._proc = QtCore.QProcess(self)
         self._proc.setProgram(emb_java)
@@ -200,6 +158,8 @@ class JavaRunner(QtCore.QObject):
             self.output.emit(text)
 
     def _on_finished(self, step: str, code: int):
+        if _traza.activo:
+            _traza("proceso terminado", etapa=step, codigo=code)
         if step == "compile":
             if code == 0:
                 self._run()
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+# runners/jdk.py
+"""
+Localización del JDK embebido (runtimes/<os>/jdk) y compilación/ejecución
+sin Qt. JavaRunner (QProcess, IDE) y el modo headless (compilador) comparten
+estas rutas; sólo se usa el JDK embebido, nunca el del sistema.
+"""
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional
+
+_re_public_class = re.compile(r'^\s*public\s+class\s+([A-Za-z_]\w*)', re.MULTILINE)
+
+
+def clase_publica(src: str) -> Optional[str]:
+    """Nombre de la clase pública de 'src' (None si no hay)."""
+    m = _re_public_class.search(src)
+    return m.group(1) if m else None
+
+
+def base_runtimes() -> Path:
+    """
+    Devuelve el primer directorio ascendente (o _MEIPASS/CWD) que contenga 'runtimes'.
+    """
+    # 1) PyInstaller
+    meipass = getattr(sys, "_MEIPASS", None)
+    if meipass:
+        p = Path(meipass)
+        if (p / "runtimes").exists():
+            return p
+
+    # 2) Ascender desde este archivo
+    here = Path(__file__).resolve()
+    for p in [here.parent, *here.parents]:
+        if (p / "runtimes").exists():
+            return p
+
+    # 3) CWD como último intento
+    cwd = Path.cwd()
+    if (cwd / "runtimes").exists():
+        return cwd
+
+    # Fallback: carpeta del archivo
+    return here.parent
+
+
+def localizar_jdk(base_dir: Optional[Path] = None) -> Dict[str, Optional[str]]:
+    """
+    Busca un JDK embebido en runtimes/<os>/jdk y devuelve rutas.
+    Estructuras esperadas:
+      - Windows/Linux: runtimes/<os>/jdk/bin/{java,javac}
+      - macOS:         runtimes/mac/jdk/Contents/Home/bin/{java,javac}
+    """
+    base_dir = base_dir or base_runtimes()
+
+    platform = "win" if os.name == "nt" else ("mac" if sys.platform == "darwin" else "linux")
+    if platform == "mac":
+        jdk_home = base_dir / "runtimes" / platform / "jdk" / "Contents" / "Home"
+    else:
+        jdk_home = base_dir / "runtimes" / platform / "jdk"
+
+    bin_dir = jdk_home / "bin"
+    java_exe = "java.exe" if os.name == "nt" else "java"
+    javac_exe = "javac.exe" if os.name == "nt" else "javac"
+
+    java_path = bin_dir / java_exe
+    javac_path = bin_dir / javac_exe
+
+    return {
+        "JAVA_HOME": str(jdk_home) if jdk_home.exists() else None,
+        "java": str(java_path) if java_path.exists() else None,
+        "javac": str(javac_path) if javac_path.exists() else None,
+    }
+
+
+def entorno_jdk(rutas: Dict[str, Optional[str]], entorno: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Copia de 'entorno' (por defecto os.environ) con el JDK embebido antepuesto
+    al PATH y JAVA_HOME definido (si existe).
+    """
+    env = dict(os.environ if entorno is None else entorno)
+    java_home = rutas.get("JAVA_HOME")
+    if java_home:
+        env["JAVA_HOME"] = java_home
+        bin_dir = str(Path(java_home) / "bin")
+        current_path = env.get("PATH", "")
+        env["PATH"] = bin_dir + (os.pathsep + current_path if current_path else "")
+    return env
+
+
+def compilar_y_ejecutar(source_code: str, timeout: float = 30.0,
+                        rutas: Optional[Dict[str, Optional[str]]] = None) -> Dict:
+    """
+    Compila y ejecuta 'source_code' con el JDK embebido (subprocess, sin Qt).
+    Devuelve {clase, compilacion, ejecucion, error}; cada etapa como
+    {codigo, stdout, stderr} o None si no llegó a correr.
+    """
+    rutas = rutas or localizar_jdk()
+    clase = clase_publica(source_code) or "Main"
+    resultado = {"clase": clase, "compilacion": None, "ejecucion": None, "error": None}
+
+    javac, java = rutas.get("javac"), rutas.get("java")
+    if not (javac and java):
+        resultado["error"] = "No se encontró 'java'/'javac' en runtimes/<os>/jdk. No se usará el del sistema."
+        return resultado
+
+    env = entorno_jdk(rutas)
+    tmpdir = tempfile.mkdtemp(prefix="java_run_")
+    try:
+        java_path = os.path.join(tmpdir, f"{clase}.java")
+        with open(java_path, "w", encoding="utf-8") as f:
+            f.write(source_code)
+
+        for etapa, args in (("compilacion", [javac, "-d", tmpdir, java_path]),
+                            ("ejecucion", [java, "-cp", tmpdir, clase])):
+            try:
+                proc = subprocess.run(args, capture_output=True, env=env, timeout=timeout)
+            except subprocess.TimeoutExpired:
+                resultado["error"] = f"Tiempo agotado ({timeout:g} s) en {etapa}"
+                break
+            except OSError as e:
+                resultado["error"] = f"No se pudo ejecutar {args[0]}: {e}"
+                break
+            resultado[etapa] = {
+                "codigo": proc.returncode,
+                "stdout": proc.stdout.decode("utf-8", errors="ignore"),
+                "stderr": proc.stderr.decode("utf-8", errors="ignore"),
+            }
+            if proc.returncode != 0:
+                break
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return resultado
@@ -1,7 +1,11 @@
 # -*- coding: utf-8 -*-
 # semantics/java_semantics.py
 from typing import List, Dict, Tuple, Optional
-from lexer.analizador_lexico import construir_lexer
+from lexer.token_stream import obtener_token_stream
+from lexer.line_index import LineIndex, line_index
+from tracing import trazas
+
+_traza = trazas.canal('semantics')
 
 # Mapa de tokens de tipo -> nombre semántico
 PrimitiveMap = {
@@ -62,13 +66,9 @@ def _peek(buf, i, n=1):
     j = i + n
     return buf[j] if 0 <= j < len(buf) else None
 
-def _col_of(code: str, tok) -> int:
+def _col_of(index: LineIndex, tok) -> int:
     # columna 1-based
-    idx = tok.lexpos
-    prev_nl = code.rfind('\n', 0, idx)
-    if prev_nl < 0:
-        return idx + 1
-    return idx - prev_nl
+    return index.col(tok.lexpos)
 
 def _line_of(tok) -> int:
     return getattr(tok, 'lineno', 1)
@@ -263,14 +263,14 @@ def _parse_parameter_list(tokens, i) -> Tuple[List[Tuple[str, str, object]], int
     return params, idx
 
 
-def _check_assign_compat(errors, code, op_tok, target_ty: str, expr_ty: str):
+def _check_assign_compat(errors, index, op_tok, target_ty: str, expr_ty: str):
     """Valida compatibilidad en asignación (incluye compuestas)."""
     def is_numeric(ty): return ty == 'numeric' or ty in (
         'byte', 'short', 'int', 'long', 'float', 'double'
     )
 
     line = _line_of(op_tok)
-    col = _col_of(code, op_tok)
+    col = _col_of(index, op_tok)
 
     if target_ty.endswith('[]'):
         # aceptamos 'array' o 'object' (new T[...])
@@ -306,14 +306,14 @@ def _check_assign_compat(errors, code, op_tok, target_ty: str, expr_ty: str):
 
 
 
-def _check_compound_compat(errors, code, op_tok, target_ty: str, expr_ty: str):
+def _check_compound_compat(errors, index, op_tok, target_ty: str, expr_ty: str):
     """Validación para += -= *= /= %= (permite String += String/numeric)."""
     def is_numeric(ty): return ty == 'numeric' or ty in (
         'byte', 'short', 'int', 'long', 'float', 'double'
     )
 
     line = _line_of(op_tok)
-    col = _col_of(code, op_tok)
+    col = _col_of(index, op_tok)
 
     if target_ty == 'String' and op_tok.type == 'SUMAASIGNAR':
         if expr_ty in ('String', 'numeric'):
@@ -330,7 +330,7 @@ def _check_compound_compat(errors, code, op_tok, target_ty: str, expr_ty: str):
 
 
 
-def analyze_semantics(code: str) -> List[Dict]:
+def analyze_semantics(code: str, tokens=None, index: Optional[LineIndex] = None) -> List[Dict]:
     """
     Semántico ligero pero robusto:
       - Registra clases (CLASS IDENTIFICADOR)
@@ -342,17 +342,12 @@ def analyze_semantics(code: str) -> List[Dict]:
       - Ignora System.out.println y llamadas a método para "uso no declarado"
       - Tipado de expresiones con literales, identificadores declarados, new, operadores
     Devuelve lista de dicts {start,length,line,col,message}
+    'tokens' permite reutilizar un TokenStream/lista ya tokenizada del mismo 'code';
+    'index' un LineIndex ya construido para 'code'.
     """
     errors: List[Dict] = []
-    lx = construir_lexer()
-    lx.input(code)
-
-    toks = []
-    while True:
-        t = lx.token()
-        if not t:
-            break
-        toks.append(t)
+    toks = tokens if tokens is not None else obtener_token_stream(code).tokens
+    index = index or line_index(code)
 
     scopes: List[Dict[str, str]] = [ {} ]
     class_names: set = set()
@@ -364,7 +359,7 @@ def analyze_semantics(code: str) -> List[Dict]:
         name = tok_name.value if hasattr(tok_name, 'value') else str(tok_name)
         cur = scopes[-1]
         if name in cur:
-            errors.append(_mk(tok_name.lexpos, _tok_len(tok_name), _line_of(tok_name), _col_of(code, tok_name),
+            errors.append(_mk(tok_name.lexpos, _tok_len(tok_name), _line_of(tok_name), _col_of(index, tok_name),
                               f"❌ Redeclaración de variable '{name}' en el mismo alcance."))
         else:
             cur[name] = typ
@@ -453,9 +448,9 @@ def analyze_semantics(code: str) -> List[Dict]:
                     expr_ty, nxt = _expr_type(toks, expr_start, resolve)
 
                     if assign_tok.type == 'ASIGNAR':
-                        _check_assign_compat(errors, code, assign_tok, decl_ty, expr_ty)
+                        _check_assign_compat(errors, index, assign_tok, decl_ty, expr_ty)
                     else:
-                        _check_compound_compat(errors, code, assign_tok, decl_ty, expr_ty)
+                        _check_compound_compat(errors, index, assign_tok, decl_ty, expr_ty)
 
                     i = max(expr_start, nxt)
                     continue
@@ -482,25 +477,27 @@ def analyze_semantics(code: str) -> List[Dict]:
             if nxt and nxt.type in ASSIGN_OPS:
                 decl_ty = resolve(name)
                 if decl_ty is None and name != 'args':
-                    errors.append(_mk(t.lexpos, _tok_len(t), _line_of(t), _col_of(code, t),
+                    errors.append(_mk(t.lexpos, _tok_len(t), _line_of(t), _col_of(index, t),
                                       f"❌ Variable '{name}' no declarada en este alcance."))
 
                 expr_ty, stop = _expr_type(toks, i + 2, resolve)
                 if decl_ty:
                     if nxt.type == 'ASIGNAR':
-                        _check_assign_compat(errors, code, nxt, decl_ty, expr_ty)
+                        _check_assign_compat(errors, index, nxt, decl_ty, expr_ty)
                     else:
-                        _check_compound_compat(errors, code, nxt, decl_ty, expr_ty)
+                        _check_compound_compat(errors, index, nxt, decl_ty, expr_ty)
                 i = max(i + 2, stop)
                 continue
             else:
                 # uso simple: validar declaración (excepto args/System)
                 if resolve(name) is None and name not in BUILTIN_CHAIN and name != 'args':
-                    errors.append(_mk(t.lexpos, _tok_len(t), _line_of(t), _col_of(code, t),
+                    errors.append(_mk(t.lexpos, _tok_len(t), _line_of(t), _col_of(index, t),
                                       f"❌ Uso de variable '{name}' no declarada."))
                 i += 1
                 continue
 
         i += 1
 
+    if _traza.activo:
+        _traza("análisis semántico", tokens=len(toks), errores=len(errors))
     return errors
\ No newline at end of file
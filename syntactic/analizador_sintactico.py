@@ -1,12 +1,23 @@
 # -*- coding: utf-8 -*-
+import copy
+import os
+import sys
+import tempfile
+
 import ply.yacc as yacc
 from lexer.analizador_lexico import tokens
 from lexer.analizador_lexico import tabla_simbolos
-from lexer.analizador_lexico import construir_lexer
+from lexer.token_stream import obtener_token_stream
+from syntactic import ast_java as ast
+from tracing import trazas
+
+_traza = trazas.canal('parser')
 
 # Resultado del análisis
 resultado_gramatica = []
 
+MENSAJE_OK = "<span style='font-size:20px; color:lime;'>✅ Análisis sintáctico finalizado sin errores</span>"
+
 # -----------------------------
 # Precedencia de operadores
 # -----------------------------
@@ -32,30 +43,53 @@ alcance_actual = []
 variables_declaradas = {}
 
 
+# =========================
+#  Contexto de análisis
+# =========================
+class ContextoSintactico:
+    """Tabla de símbolos, lista de mensajes y AST de UN análisis (uno por parser)."""
+
+    def __init__(self, tabla, resultado=None):
+        self.tabla = tabla
+        self.resultado = resultado if resultado is not None else []
+        self.ast = None  # ast_java.Programa del último análisis (None si no se pudo construir)
+
+
+# Contexto del parser global (compatibilidad: comparte los globales de siempre)
+contexto_global = ContextoSintactico(tabla_simbolos, resultado_gramatica)
+
+
+def _contexto(p):
+    """Contexto del parser que está ejecutando la producción 'p'."""
+    return getattr(p.parser, 'contexto', contexto_global)
+
+
 # =========================
 #  Auxiliares de símbolos
 # =========================
-def verificar_variable_existe(nombre):
+def verificar_variable_existe(nombre, tabla=None):
     """Verifica si una variable existe en la tabla de símbolos considerando todos los alcances."""
-    if f"local.{nombre}" in tabla_simbolos.simbolos:
+    simbolos = (tabla or tabla_simbolos).simbolos
+    if f"local.{nombre}" in simbolos:
         return True
-    if f"main.{nombre}" in tabla_simbolos.simbolos:
+    if f"main.{nombre}" in simbolos:
         return True
-    if nombre in tabla_simbolos.simbolos:
+    if nombre in simbolos:
         return True
     return False
 
 
-def marcar_variable_usada(nombre):
+def marcar_variable_usada(nombre, tabla=None):
     """Marca una variable como usada buscando en todos los alcances."""
-    if f"local.{nombre}" in tabla_simbolos.simbolos:
-        tabla_simbolos.simbolos[f"local.{nombre}"]['usado'] = True
+    simbolos = (tabla or tabla_simbolos).simbolos
+    if f"local.{nombre}" in simbolos:
+        simbolos[f"local.{nombre}"]['usado'] = True
         return True
-    if f"main.{nombre}" in tabla_simbolos.simbolos:
-        tabla_simbolos.simbolos[f"main.{nombre}"]['usado'] = True
+    if f"main.{nombre}" in simbolos:
+        simbolos[f"main.{nombre}"]['usado'] = True
         return True
-    if nombre in tabla_simbolos.simbolos:
-        tabla_simbolos.simbolos[nombre]['usado'] = True
+    if nombre in simbolos:
+        simbolos[nombre]['usado'] = True
         return True
     return False
 
@@ -65,22 +99,24 @@ def marcar_variable_usada(nombre):
 # =========================
 def p_programa(p):
     'programa : codigo'
-    if len(resultado_gramatica) == 0:
-        resultado_gramatica.append(
-            "<span style='font-size:20px; color:lime;'>✅ Análisis sintáctico finalizado sin errores</span>"
-        )
+    if len(_contexto(p).resultado) == 0:
+        _contexto(p).resultado.append(MENSAJE_OK)
+    p[0] = ast.Programa(p[1], linea=p.lineno(1))
 
 
 def p_codigo(p):
     '''codigo : declaracion_clase
               | empty'''
-    p[0] = "Código Java válido"
+    p[0] = p[1]
 
 
 def p_declaracion_clase(p):
     '''declaracion_clase : PUBLIC CLASS IDENTIFICADOR LLAIZQ contenido_clase LLADER
                          | CLASS IDENTIFICADOR LLAIZQ contenido_clase LLADER'''
-    p[0] = "Declaración de clase válida"
+    if p.slice[1].type == 'PUBLIC':
+        p[0] = ast.Clase(p[3], True, p[5], linea=p.lineno(2))
+    else:
+        p[0] = ast.Clase(p[2], False, p[4], linea=p.lineno(1))
 
 
 def p_contenido_clase(p):
@@ -89,13 +125,14 @@ def p_contenido_clase(p):
                        | contenido_clase declaracion_metodo
                        | contenido_clase declaracion_atributo
                        | empty'''
-    p[0] = "Contenido de clase válido"
+    p[0] = _lista(p)
 
 
 def p_declaracion_atributo(p):
     '''declaracion_atributo : modificador tipo IDENTIFICADOR PUNTOCOMA
                             | modificador tipo IDENTIFICADOR ASIGNAR expresion PUNTOCOMA'''
-    p[0] = "Declaración de atributo válida"
+    valor = p[5] if len(p) == 7 else None
+    p[0] = ast.Atributo(p[1], p[2], p[3], valor, linea=p.lineno(3))
 
 
 def p_modificador(p):
@@ -107,7 +144,7 @@ def p_modificador(p):
                    | PROTECTED STATIC
                    | STATIC
                    | empty'''
-    p[0] = p[1] if len(p) > 1 else "default"
+    p[0] = ' '.join(p[1:]) if p[1] is not None else None
 
 
 def p_declaracion_metodo(p):
@@ -117,7 +154,13 @@ def p_declaracion_metodo(p):
                           | modificador VOID IDENTIFICADOR PARIZQ PARDER LLAIZQ sentencias LLADER
                           | modificador tipo MAIN PARIZQ STRING CORIZQ CORDER IDENTIFICADOR PARDER LLAIZQ sentencias LLADER
                           | modificador VOID MAIN PARIZQ STRING CORIZQ CORDER IDENTIFICADOR PARDER LLAIZQ sentencias LLADER'''
-    p[0] = "Declaración de método válida"
+    if p.slice[3].type == 'MAIN':
+        parametros = [ast.Parametro('String', p[8], True, linea=p.lineno(8))]
+    elif p.slice[5].type == 'parametros':
+        parametros = p[5]
+    else:
+        parametros = []
+    p[0] = ast.Metodo(p[1], p[2], p[3], parametros, p[len(p) - 2], linea=p.lineno(3))
 
 
 def p_parametros(p):
@@ -125,7 +168,15 @@ def p_parametros(p):
                   | parametros COMA tipo IDENTIFICADOR
                   | STRING CORIZQ CORDER IDENTIFICADOR
                   | empty'''
-    p[0] = "Parámetros válidos"
+    if len(p) == 5 and p.slice[1].type == 'parametros':
+        p[1].append(ast.Parametro(p[3], p[4], False, linea=p.lineno(4)))
+        p[0] = p[1]
+    elif len(p) == 5:
+        p[0] = [ast.Parametro('String', p[4], True, linea=p.lineno(4))]
+    elif len(p) == 3:
+        p[0] = [ast.Parametro(p[1], p[2], False, linea=p.lineno(2))]
+    else:
+        p[0] = []
 
 
 def p_tipo(p):
@@ -146,7 +197,7 @@ def p_sentencias(p):
     '''sentencias : sentencia
                   | sentencias sentencia
                   | empty'''
-    p[0] = "Sentencias válidas"
+    p[0] = _lista(p)
 
 
 def p_sentencia(p):
@@ -163,7 +214,12 @@ def p_sentencia(p):
                  | return_sentencia PUNTOCOMA
                  | PUNTOCOMA
                  | LLAIZQ sentencias LLADER'''
-    p[0] = "Sentencia válida"
+    if p.slice[1].type == 'PUNTOCOMA':
+        p[0] = ast.Vacia(linea=p.lineno(1))
+    elif p.slice[1].type == 'LLAIZQ':
+        p[0] = ast.Bloque(p[2], linea=p.lineno(1))
+    else:
+        p[0] = p[1]
 
 
 def p_declaracion_variable(p):
@@ -176,17 +232,27 @@ def p_declaracion_variable(p):
     # Validación de tipo legible (los tokens de tipo traen el lexema en minúsculas)
     tipos_validos = ['int', 'boolean', 'char', 'byte', 'short', 'long', 'float', 'double', 'String']
     if p[1] not in tipos_validos:
-        resultado_gramatica.append(
+        _contexto(p).resultado.append(
             f"<span style='color:red; font-size:20px; font-weight:bold;'>Error de sintaxis en línea {p.lineno(1)}: Tipo de variable no válido '{p[1]}'</span>"
         )
-    p[0] = "Declaración de variable válida"
+    declaracion = ast.DeclaracionVariable(p[1], p[2], len(p) > 3 and p.slice[3].type == 'CORIZQ',
+                                          linea=p.lineno(2))
+    if len(p) == 5 and p.slice[3].type == 'ASIGNAR':
+        declaracion.valor = p[4]
+    elif len(p) == 6:
+        declaracion.tamano = p[4]
+    elif len(p) == 11:
+        declaracion.valor = ast.NuevoArreglo(p[7], p[9], linea=p.lineno(6))
+    elif len(p) == 9:
+        declaracion.valor = ast.ArregloLiteral(p[7], linea=p.lineno(6))
+    p[0] = declaracion
 
 
 def p_lista_expresiones(p):
     '''lista_expresiones : expresion
                         | lista_expresiones COMA expresion
                         | empty'''
-    p[0] = "Lista de expresiones válida"
+    p[0] = _lista(p)
 
 
 def p_asignacion(p):
@@ -198,11 +264,14 @@ def p_asignacion(p):
                   | IDENTIFICADOR DIVASIGNAR expresion
                   | IDENTIFICADOR MODULOASIGNAR expresion'''
     nombre = p[1]
-    if not verificar_variable_existe(nombre):
-        resultado_gramatica.append(f"<span style='font-size:20px; color:#FF6B68;'>Error en línea {p.lineno(1)}: Variable '{nombre}' no declarada</span>")
+    if not verificar_variable_existe(nombre, _contexto(p).tabla):
+        _contexto(p).resultado.append(f"<span style='font-size:20px; color:#FF6B68;'>Error en línea {p.lineno(1)}: Variable '{nombre}' no declarada</span>")
     else:
-        marcar_variable_usada(nombre)
-    p[0] = f"Asignación válida a {nombre}"
+        marcar_variable_usada(nombre, _contexto(p).tabla)
+    if len(p) == 7:
+        p[0] = ast.Asignacion(nombre, p[5], p[6], p[3], linea=p.lineno(1))
+    else:
+        p[0] = ast.Asignacion(nombre, p[2], p[3], linea=p.lineno(1))
 
 
 def p_incremento_decremento(p):
@@ -211,11 +280,12 @@ def p_incremento_decremento(p):
                              | INCREMENTO IDENTIFICADOR
                              | DECREMENTO IDENTIFICADOR'''
     nombre = p[2] if p[1] in ('++', '--') else p[1]
-    if not verificar_variable_existe(nombre):
-        resultado_gramatica.append(f"<span style='font-size:20px; color:#FF6B68;'>Error en línea {p.lineno(1)}: Variable '{nombre}' no declarada</span>")
+    if not verificar_variable_existe(nombre, _contexto(p).tabla):
+        _contexto(p).resultado.append(f"<span style='font-size:20px; color:#FF6B68;'>Error en línea {p.lineno(1)}: Variable '{nombre}' no declarada</span>")
     else:
-        marcar_variable_usada(nombre)
-    p[0] = f"Incremento/decremento válido de {nombre}"
+        marcar_variable_usada(nombre, _contexto(p).tabla)
+    prefijo = p[1] in ('++', '--')
+    p[0] = ast.IncrementoDecremento(nombre, p[1] if prefijo else p[2], prefijo, linea=p.lineno(1))
 
 
 def p_if_sentencia(p):
@@ -224,7 +294,9 @@ def p_if_sentencia(p):
                     | IF PARIZQ expresion PARDER LLAIZQ sentencias LLADER
                     | IF PARIZQ expresion PARDER LLAIZQ sentencias LLADER ELSE LLAIZQ sentencias LLADER
                     | IF PARIZQ expresion PARDER LLAIZQ sentencias LLADER ELSE sentencia'''
-    p[0] = "Sentencia if válida"
+    entonces, k = _cuerpo(p, 5)
+    sino = _cuerpo(p, k + 1)[0] if len(p) > k and p.slice[k].type == 'ELSE' else None
+    p[0] = ast.If(p[3], entonces, sino, linea=p.lineno(1))
 
 
 def p_for_sentencia(p):
@@ -238,54 +310,68 @@ def p_for_sentencia(p):
                      | FOR PARIZQ PUNTOCOMA expresion PUNTOCOMA expresion PARDER LLAIZQ sentencias LLADER
                      | FOR PARIZQ PUNTOCOMA PUNTOCOMA PARDER sentencia
                      | FOR PARIZQ PUNTOCOMA PUNTOCOMA PARDER LLAIZQ sentencias LLADER'''
-    p[0] = "Sentencia for válida"
+    # Las tres partes del encabezado son opcionales en algunas formas
+    k = 3
+    partes = []
+    for separador in ('PUNTOCOMA', 'PUNTOCOMA', 'PARDER'):
+        if p.slice[k].type == separador:
+            partes.append(None)
+            k += 1
+        else:
+            partes.append(p[k])
+            k += 2
+    cuerpo, _ = _cuerpo(p, k)
+    p[0] = ast.For(*partes, cuerpo, linea=p.lineno(1))
 
 
 def p_while_sentencia(p):
     '''while_sentencia : WHILE PARIZQ expresion PARDER sentencia
                        | WHILE PARIZQ expresion PARDER LLAIZQ sentencias LLADER'''
-    p[0] = "Sentencia while válida"
+    p[0] = ast.While(p[3], _cuerpo(p, 5)[0], linea=p.lineno(1))
 
 
 def p_do_while_sentencia(p):
     '''do_while_sentencia : DO LLAIZQ sentencias LLADER WHILE PARIZQ expresion PARDER'''
-    p[0] = "Sentencia do-while válida"
+    p[0] = ast.DoWhile(ast.Bloque(p[3], linea=p.lineno(2)), p[7], linea=p.lineno(1))
 
 
 def p_switch_sentencia(p):
     '''switch_sentencia : SWITCH PARIZQ expresion PARDER LLAIZQ casos_switch LLADER'''
-    p[0] = "Sentencia switch válida"
+    p[0] = ast.Switch(p[3], p[6], linea=p.lineno(1))
 
 
 def p_casos_switch(p):
     '''casos_switch : caso_switch
                     | casos_switch caso_switch
                     | empty'''
-    p[0] = "Casos switch válidos"
+    p[0] = _lista(p)
 
 
 def p_caso_switch(p):
     '''caso_switch : CASE expresion DOSPUNTOS sentencias
                    | DEFAULT DOSPUNTOS sentencias'''
-    p[0] = "Caso switch válido"
+    if len(p) == 5:
+        p[0] = ast.Caso(p[2], p[4], linea=p.lineno(1))
+    else:
+        p[0] = ast.Caso(None, p[3], linea=p.lineno(1))
 
 
 def p_llamada_metodo(p):
     '''llamada_metodo : IDENTIFICADOR PARIZQ argumentos PARDER
                       | IDENTIFICADOR PARIZQ PARDER'''
     nombre = p[1]
-    if not verificar_variable_existe(nombre):
-        resultado_gramatica.append(f"<span style='font-size:20px; color:#FF6B68;'>Error en línea {p.lineno(1)}: Método '{nombre}' no declarado</span>")
+    if not verificar_variable_existe(nombre, _contexto(p).tabla):
+        _contexto(p).resultado.append(f"<span style='font-size:20px; color:#FF6B68;'>Error en línea {p.lineno(1)}: Método '{nombre}' no declarado</span>")
     else:
-        marcar_variable_usada(nombre)
-    p[0] = f"Llamada válida al método {nombre}"
+        marcar_variable_usada(nombre, _contexto(p).tabla)
+    p[0] = ast.LlamadaMetodo(nombre, p[3] if len(p) == 5 else [], linea=p.lineno(1))
 
 
 def p_argumentos(p):
     '''argumentos : expresion
                   | argumentos COMA expresion
                   | empty'''
-    p[0] = "Argumentos válidos"
+    p[0] = _lista(p)
 
 
 def p_llamada_system(p):
@@ -293,13 +379,13 @@ def p_llamada_system(p):
                       | SYSTEM PUNTO OUT PUNTO PRINT PARIZQ expresion PARDER
                       | SYSTEM PUNTO OUT PUNTO PRINTLN PARIZQ PARDER
                       | SYSTEM PUNTO OUT PUNTO PRINT PARIZQ PARDER'''
-    p[0] = "Llamada a System.out válida"
+    p[0] = ast.Imprimir(p[7] if len(p) == 9 else None, p.slice[5].type == 'PRINTLN', linea=p.lineno(1))
 
 
 def p_return_sentencia(p):
     '''return_sentencia : RETURN
                         | RETURN expresion'''
-    p[0] = "Sentencia return válida"
+    p[0] = ast.Return(p[2] if len(p) == 3 else None, linea=p.lineno(1))
 
 
 def p_expresion(p):
@@ -333,7 +419,23 @@ def p_expresion(p):
                  | NEW tipo PARIZQ PARDER
                  | NEW tipo CORIZQ expresion CORDER
                  | incremento_decremento'''
-    p[0] = "Expresión válida"
+    primero = p.slice[1].type
+    if len(p) == 2:
+        p[0] = p[1]
+    elif len(p) == 3:
+        p[0] = ast.Unaria(p[1], p[2], linea=p.lineno(1))
+    elif primero == 'expresion':
+        p[0] = ast.Binaria(p[2], p[1], p[3], linea=p.lineno(2))
+    elif primero == 'PARIZQ' and len(p) == 4:
+        p[0] = p[2]
+    elif primero == 'PARIZQ':
+        p[0] = ast.Conversion(p[2], p[4], linea=p.lineno(1))
+    elif primero == 'IDENTIFICADOR':
+        p[0] = ast.AccesoArreglo(p[1], p[3], linea=p.lineno(1))
+    elif p.slice[3].type == 'CORIZQ':
+        p[0] = ast.NuevoArreglo(p[2], p[4], linea=p.lineno(1))
+    else:
+        p[0] = ast.NuevoObjeto(p[2], p[4] if len(p) == 6 else [], linea=p.lineno(1))
 
 
 def p_expresion_primaria(p):
@@ -350,11 +452,20 @@ def p_expresion_primaria(p):
     if p.slice[1].type == 'IDENTIFICADOR':
         nombre = p[1]
         if nombre not in ['true', 'false', 'null']:
-            if not verificar_variable_existe(nombre):
-                resultado_gramatica.append(f"<span style='font-size:20px; color:#FF6B68;'>Error en línea {p.lineno(1)}: Variable '{nombre}' no declarada</span>")
+            if not verificar_variable_existe(nombre, _contexto(p).tabla):
+                _contexto(p).resultado.append(f"<span style='font-size:20px; color:#FF6B68;'>Error en línea {p.lineno(1)}: Variable '{nombre}' no declarada</span>")
             else:
-                marcar_variable_usada(nombre)
-    p[0] = p[1]
+                marcar_variable_usada(nombre, _contexto(p).tabla)
+
+    tipo = p.slice[1].type
+    if tipo == 'llamada_metodo':
+        p[0] = p[1]
+    elif len(p) == 4:
+        p[0] = ast.AccesoCampo(p[1], p[3], linea=p.lineno(1))
+    elif tipo == 'IDENTIFICADOR':
+        p[0] = ast.Identificador(p[1], linea=p.lineno(1))
+    else:
+        p[0] = ast.Literal(tipo, p[1], linea=p.lineno(1))
 
 
 def p_empty(p):
@@ -362,6 +473,24 @@ def p_empty(p):
     pass
 
 
+def _lista(p):
+    """Valor de una regla  lista : elem | lista [COMA] elem | empty  (lista de nodos)."""
+    if p.slice[1].type == p.slice[0].type:
+        p[1].append(p[len(p) - 1])
+        return p[1]
+    return [p[1]] if p[1] is not None else []
+
+
+def _cuerpo(p, k):
+    """
+    Cuerpo que empieza en el símbolo k: 'LLAIZQ sentencias LLADER' o una sentencia.
+    Devuelve (nodo, índice del símbolo siguiente).
+    """
+    if p.slice[k].type == 'LLAIZQ':
+        return ast.Bloque(p[k + 1], linea=p.lineno(k)), k + 3
+    return p[k], k + 1
+
+
 # =========================
 # Manejo de errores (PANIC MODE)
 # =========================
@@ -372,8 +501,14 @@ def p_error(p):
     - Entra en 'panic mode' y descarta tokens hasta un sincronizador ( ; ) } )
     - Llama a parser.errok() para poder continuar
     """
+    _manejar_error(parser, p)
+
+
+def _manejar_error(prs, p):
+    """Cuerpo de p_error contra un parser concreto (el global o uno de un Analyzer)."""
+    resultado = getattr(prs, 'contexto', contexto_global).resultado
     if not p:
-        resultado_gramatica.append(
+        resultado.append(
             "<span style='font-size:20px; color:#FF6B68;'>Error de sintaxis: fin de archivo inesperado</span>"
         )
         return
@@ -392,16 +527,18 @@ def p_error(p):
     else:
         msg = f"Token inesperado '{p.value}' de tipo {p.type}"
 
-    resultado_gramatica.append(
+    resultado.append(
         f"<span style='font-size:20px; color:#FF6B68;'>Error de sintaxis en línea {p.lineno}: {msg}</span>"
     )
+    if _traza.activo:
+        _traza("error de sintaxis", linea=p.lineno, tipo=p.type, valor=p.value, mensaje=msg)
 
     # --- Panic mode: descartar hasta token seguro ---
     # Importante: esto permite seguir acumulando más errores
-    parser.errok()  # limpia el estado de error
+    prs.errok()  # limpia el estado de error
     # Consumir tokens hasta un sincronizador; si no hay más, salimos
     while True:
-        tok = parser.token()
+        tok = prs.token()
         if not tok:
             break
         if tok.type in ('PUNTOCOMA', 'PARDER', 'LLADER'):
@@ -409,69 +546,151 @@ def p_error(p):
             break
 
 
-
-
-
 # =========================
 # Construcción del parser (UNA VEZ)
 # =========================
-# Usamos NullLogger para evitar spam en consola; write_tables=False para no crear archivos .py
-parser = yacc.yacc(errorlog=yacc.NullLogger(), write_tables=False, debug=False)
+def _construir_parser():
+    """
+    Tablas LALR persistidas en la caché (lexer/cache_tablas.py) con un pickle
+    cuyo nombre lleva el hash de la firma de la gramática: si la gramática
+    cambia se regenera; si no, se cargan sin recalcular el autómata.
+    Sólo se deserializa un pickle propio de un directorio privado; sin
+    directorio privado las tablas se construyen en memoria.
+    """
+    from lexer.cache_tablas import directorio_cache, firma, publicar, borrar, archivo_privado
+
+    modulo = sys.modules[__name__]
+    # Usamos NullLogger para evitar spam en consola; nunca se escribe parsetab.py
+    opciones = dict(module=modulo, errorlog=yacc.NullLogger(), write_tables=False, debug=False)
+
+    try:
+        directorio = directorio_cache()
+        reflect = yacc.ParserReflect(vars(modulo), log=yacc.NullLogger())
+        reflect.get_all()
+        ruta = os.path.join(directorio, f"parsetab_{firma(reflect.signature())}.pickle")
+    except OSError:
+        return yacc.yacc(**opciones)
+
+    if os.path.exists(ruta) and not archivo_privado(ruta):
+        # Ajeno o escribible por otros: no se deserializa
+        borrar(ruta)
+    if os.path.exists(ruta):
+        try:
+            return yacc.yacc(picklefile=ruta, **opciones)
+        except Exception:
+            # pickle truncado/corrupto: se regenera
+            borrar(ruta)
+
+    # Se genera en un temporal y se publica de golpe (varios procesos pueden arrancar a la vez)
+    fd, temporal = tempfile.mkstemp(suffix='.pickle', dir=directorio)
+    os.close(fd)
+    borrar(temporal)
+    try:
+        prs = yacc.yacc(picklefile=temporal, **opciones)
+        if os.path.exists(temporal):
+            publicar(temporal, ruta)
+        return prs
+    finally:
+        borrar(temporal)
+
+
+parser = _construir_parser()
+
+
+def nuevo_parser(contexto: ContextoSintactico):
+    """
+    Copia del parser global con su propio contexto y manejador de errores.
+    Las tablas LALR se comparten (sólo lectura); la pila de parseo vive en
+    cada copia, así que dos copias pueden parsear a la vez.
+    """
+    prs = copy.copy(parser)
+    prs.contexto = contexto
+    prs.errorfunc = lambda p: _manejar_error(prs, p)
+    return prs
 
 
 # =========================
 # API de análisis
 # =========================
-def prueba_sintactica(data):
+def analizar_con(prs, data, stream=None):
     """
-    Analiza el código y retorna la lista de mensajes (errores/advertencias/ok).
-    NOTA: ya NO reconstruimos el parser aquí; reutilizamos el global.
+    Analiza 'data' con el parser 'prs' y deja los mensajes en su contexto.
+    Si se pasa 'stream' (TokenStream) se usan esos tokens en lugar de re-tokenizar.
     """
-    global resultado_gramatica
+    contexto = getattr(prs, 'contexto', contexto_global)
+    resultado = contexto.resultado
+    tabla = contexto.tabla
 
-    lexer = construir_lexer()
-    lexer.lineno = 1
+    resultado.clear()
+    tabla.limpiar()
+    contexto.ast = None
 
-    resultado_gramatica.clear()
-    tabla_simbolos.limpiar()
-
-    if not data.strip():
-        resultado_gramatica.append("No hay código para analizar")
-        return resultado_gramatica
+    if rechazar_fuente(data, resultado):
+        return resultado
 
     try:
-        # chequeo mínimo de "class"
-        if "class" not in data and "Class" not in data:
-            resultado_gramatica.append(
-                "<span style='font-size:20px; color:#FF6B68;'>Error: El código no parece ser un programa Java válido. Debe contener una clase.</span>"
-            )
-            return resultado_gramatica
+        # Tokens compartidos: el lexer ya corrió una vez para este fuente
+        if stream is None:
+            stream = obtener_token_stream(data)
+        # Tokenizar pudo llenar la tabla; el parser la recibe vacía y el
+        # stream la va reproduciendo token a token
+        tabla.limpiar()
+        lexer = stream.lexer_para_parser(tabla)
 
         # Ejecutar el parser (tracking para líneas/cols más precisas si amplías)
-        result = parser.parse(data, lexer=lexer, tracking=True)
-        if result:
-            resultado_gramatica.append(result)
-
-        # Advertencias: variables sin usar
-        variables_sin_usar = []
-        for nombre_completo, info in tabla_simbolos.simbolos.items():
-            if (info['tipo'] not in ['CLASS', 'METHOD'] and
-                not info.get('usado', False) and
-                'args' not in nombre_completo):
-                nombre_simple = nombre_completo.split('.')[-1] if '.' in nombre_completo else nombre_completo
-                variables_sin_usar.append((nombre_simple, info))
-
-        for nombre, info in variables_sin_usar:
-            resultado_gramatica.append(
-                f"<span style='font-size:20px; color:#FFA500;'>Advertencia: Variable '{nombre}' declarada en línea {info['linea']} pero no utilizada</span>"
-            )
+        if _traza.activo:
+            _traza("parseo", tokens=len(stream))
+        contexto.ast = prs.parse(lexer=lexer, tracking=True)
+        lexer.terminar()
+
+        agregar_advertencias(tabla, resultado)
 
     except Exception as e:
-        resultado_gramatica.append(
+        resultado.append(
             f"<span style='font-size:20px; color:#FF6B68;'>Error durante el análisis: {str(e)}</span>"
         )
 
-    return resultado_gramatica
+    return resultado
+
+
+def rechazar_fuente(data, resultado):
+    """Chequeos previos al parseo; si el fuente no se analiza deja el motivo en 'resultado'."""
+    if not data.strip():
+        resultado.append("No hay código para analizar")
+        return True
+
+    # chequeo mínimo de "class"
+    if "class" not in data and "Class" not in data:
+        resultado.append(
+            "<span style='font-size:20px; color:#FF6B68;'>Error: El código no parece ser un programa Java válido. Debe contener una clase.</span>"
+        )
+        return True
+    return False
+
+
+def agregar_advertencias(tabla, resultado):
+    """Advertencias: variables sin usar."""
+    variables_sin_usar = []
+    for nombre_completo, info in tabla.simbolos.items():
+        if (info['tipo'] not in ['CLASS', 'METHOD'] and
+            not info.get('usado', False) and
+            'args' not in nombre_completo):
+            nombre_simple = nombre_completo.split('.')[-1] if '.' in nombre_completo else nombre_completo
+            variables_sin_usar.append((nombre_simple, info))
+
+    for nombre, info in variables_sin_usar:
+        resultado.append(
+            f"<span style='font-size:20px; color:#FFA500;'>Advertencia: Variable '{nombre}' declarada en línea {info['linea']} pero no utilizada</span>"
+        )
+
+
+def prueba_sintactica(data, stream=None):
+    """
+    Analiza el código y retorna la lista de mensajes (errores/advertencias/ok).
+    NOTA: ya NO reconstruimos el parser aquí; reutilizamos el global.
+    Para análisis concurrentes usar analysis.Analyzer (parser propio).
+    """
+    return analizar_con(parser, data, stream)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+# syntactic/ast_java.py
+"""
+AST tipado del subconjunto de Java que acepta la gramática.
+
+Lo construyen las acciones p_* de analizador_sintactico y lo devuelve
+parser.parse(); el último queda en ContextoSintactico.ast.
+
+Cada nodo usa __slots__ (sin __dict__) y declara:
+  - sus atributos en __slots__ (el orden es el del constructor),
+  - en 'campos' los atributos que son hijos (un nodo o una lista de nodos).
+Los tipos (int, String, ...) y los nombres se guardan como str.
+"""
+from typing import ClassVar, Iterator, List, Optional, Tuple
+
+
+class Nodo:
+    __slots__ = ('linea',)
+    campos: ClassVar[Tuple[str, ...]] = ()
+
+    def __init__(self, *valores, linea: Optional[int] = None):
+        atributos = type(self).__slots__
+        if len(valores) > len(atributos):
+            raise TypeError(f"{type(self).__name__} recibe a lo sumo {len(atributos)} valores")
+        for nombre, valor in zip(atributos, valores):
+            setattr(self, nombre, valor)
+        for nombre in atributos[len(valores):]:
+            setattr(self, nombre, None)
+        self.linea = linea
+
+    # =========================
+    # Recorrido
+    # =========================
+    def hijos(self) -> Iterator['Nodo']:
+        """Hijos directos en orden de aparición en el fuente."""
+        for campo in self.campos:
+            valor = getattr(self, campo)
+            if isinstance(valor, Nodo):
+                yield valor
+            elif isinstance(valor, list):
+                for item in valor:
+                    if isinstance(item, Nodo):
+                        yield item
+
+    def recorrer(self) -> Iterator['Nodo']:
+        """Pre-orden: el nodo y luego sus descendientes."""
+        pila = [self]
+        while pila:
+            nodo = pila.pop()
+            yield nodo
+            pila.extend(reversed(list(nodo.hijos())))
+
+    def desplazar_lineas(self, delta: int):
+        """Suma 'delta' a la línea de todo el subárbol (en el lugar)."""
+        if not delta:
+            return
+        for nodo in self.recorrer():
+            if nodo.linea is not None:
+                nodo.linea += delta
+
+    # =========================
+    # Utilidades
+    # =========================
+    def atributos(self) -> List[Tuple[str, object]]:
+        """(nombre, valor) de los atributos que NO son hijos."""
+        return [(nombre, getattr(self, nombre)) for nombre in type(self).__slots__
+                if nombre not in self.campos]
+
+    def __eq__(self, otro):
+        if type(self) is not type(otro):
+            return NotImplemented
+        return self.linea == otro.linea and all(
+            getattr(self, n) == getattr(otro, n) for n in type(self).__slots__
+        )
+
+    __hash__ = None
+
+    def __repr__(self):
+        valores = ', '.join(f"{n}={getattr(self, n)!r}" for n in type(self).__slots__)
+        return f"{type(self).__name__}({valores})"
+
+
+# =========================
+#  Estructura
+# =========================
+class Programa(Nodo):
+    __slots__ = ('clase',)
+    campos = ('clase',)
+    clase: Optional['Clase']
+
+
+class Clase(Nodo):
+    __slots__ = ('nombre', 'publica', 'miembros')
+    campos = ('miembros',)
+    nombre: str
+    publica: bool
+    miembros: List[Nodo]  # Atributo | Metodo
+
+
+class Atributo(Nodo):
+    __slots__ = ('modificador', 'tipo', 'nombre', 'valor')
+    campos = ('valor',)
+    modificador: Optional[str]
+    tipo: str
+    nombre: str
+    valor: Optional[Nodo]
+
+
+class Metodo(Nodo):
+    __slots__ = ('modificador', 'tipo', 'nombre', 'parametros', 'cuerpo')
+    campos = ('parametros', 'cuerpo')
+    modificador: Optional[str]
+    tipo: str  # 'void' o el tipo de retorno
+    nombre: str
+    parametros: List['Parametro']
+    cuerpo: List[Nodo]
+
+
+class Parametro(Nodo):
+    __slots__ = ('tipo', 'nombre', 'arreglo')
+    tipo: str
+    nombre: str
+    arreglo: bool
+
+
+# =========================
+#  Sentencias
+# =========================
+class Bloque(Nodo):
+    __slots__ = ('sentencias',)
+    campos = ('sentencias',)
+    sentencias: List[Nodo]
+
+
+class DeclaracionVariable(Nodo):
+    __slots__ = ('tipo', 'nombre', 'arreglo', 'valor', 'tamano')
+    campos = ('valor', 'tamano')
+    tipo: str
+    nombre: str
+    arreglo: bool
+    valor: Optional[Nodo]
+    tamano: Optional[Nodo]  # int a[n];
+
+
+class Asignacion(Nodo):
+    __slots__ = ('nombre', 'operador', 'valor', 'indice')
+    campos = ('indice', 'valor')
+    nombre: str
+    operador: str  # '=', '+=', ...
+    valor: Nodo
+    indice: Optional[Nodo]  # a[i] = ...
+
+
+class IncrementoDecremento(Nodo):
+    __slots__ = ('nombre', 'operador', 'prefijo')
+    nombre: str
+    operador: str  # '++' o '--'
+    prefijo: bool
+
+
+class If(Nodo):
+    __slots__ = ('condicion', 'entonces', 'sino')
+    campos = ('condicion', 'entonces', 'sino')
+    condicion: Nodo
+    entonces: Nodo
+    sino: Optional[Nodo]
+
+
+class For(Nodo):
+    __slots__ = ('inicio', 'condicion', 'paso', 'cuerpo')
+    campos = ('inicio', 'condicion', 'paso', 'cuerpo')
+    inicio: Optional[Nodo]
+    condicion: Optional[Nodo]
+    paso: Optional[Nodo]
+    cuerpo: Nodo
+
+
+class While(Nodo):
+    __slots__ = ('condicion', 'cuerpo')
+    campos = ('condicion', 'cuerpo')
+    condicion: Nodo
+    cuerpo: Nodo
+
+
+class DoWhile(Nodo):
+    __slots__ = ('cuerpo', 'condicion')
+    campos = ('cuerpo', 'condicion')
+    cuerpo: Nodo
+    condicion: Nodo
+
+
+class Switch(Nodo):
+    __slots__ = ('expresion', 'casos')
+    campos = ('expresion', 'casos')
+    expresion: Nodo
+    casos: List['Caso']
+
+
+class Caso(Nodo):
+    __slots__ = ('valor', 'sentencias')
+    campos = ('valor', 'sentencias')
+    valor: Optional[Nodo]  # None en 'default'
+    sentencias: List[Nodo]
+
+
+class Imprimir(Nodo):
+    __slots__ = ('argumento', 'salto')
+    campos = ('argumento',)
+    argumento: Optional[Nodo]
+    salto: bool  # println
+
+
+class Return(Nodo):
+    __slots__ = ('valor',)
+    campos = ('valor',)
+    valor: Optional[Nodo]
+
+
+class Vacia(Nodo):
+    __slots__ = ()
+
+
+# =========================
+#  Expresiones
+# =========================
+class Binaria(Nodo):
+    __slots__ = ('operador', 'izquierda', 'derecha')
+    campos = ('izquierda', 'derecha')
+    operador: str
+    izquierda: Nodo
+    derecha: Nodo
+
+
+class Unaria(Nodo):
+    __slots__ = ('operador', 'operando')
+    campos = ('operando',)
+    operador: str  # '!', '~', '-'
+    operando: Nodo
+
+
+class Conversion(Nodo):
+    __slots__ = ('tipo', 'expresion')
+    campos = ('expresion',)
+    tipo: str
+    expresion: Nodo
+
+
+class LlamadaMetodo(Nodo):
+    __slots__ = ('nombre', 'argumentos')
+    campos = ('argumentos',)
+    nombre: str
+    argumentos: List[Nodo]
+
+
+class AccesoArreglo(Nodo):
+    __slots__ = ('nombre', 'indice')
+    campos = ('indice',)
+    nombre: str
+    indice: Nodo
+
+
+class AccesoCampo(Nodo):
+    __slots__ = ('objeto', 'campo')
+    objeto: str
+    campo: str
+
+
+class NuevoObjeto(Nodo):
+    __slots__ = ('tipo', 'argumentos')
+    campos = ('argumentos',)
+    tipo: str
+    argumentos: List[Nodo]
+
+
+class NuevoArreglo(Nodo):
+    __slots__ = ('tipo', 'tamano')
+    campos = ('tamano',)
+    tipo: str
+    tamano: Nodo
+
+
+class ArregloLiteral(Nodo):
+    __slots__ = ('elementos',)
+    campos = ('elementos',)
+    elementos: List[Nodo]
+
+
+class Literal(Nodo):
+    __slots__ = ('tipo', 'valor')
+    tipo: str  # tipo de token: ENTERO, DECIMAL, CADENA, CARACTER, TRUE, FALSE, NULL
+    valor: object
+
+
+class Identificador(Nodo):
+    __slots__ = ('nombre',)
+    nombre: str
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+# syntactic/incremental.py
+"""
+Parseo incremental por método.
+
+La clase se parte en:
+  - un "esqueleto": la clase con los cuerpos de los métodos vacíos
+    (atributos, cabeceras de métodos, llaves de la clase),
+  - cada método, parseado envuelto como  CLASS X { <método> }.
+
+Cada parte se cachea por la firma de sus tokens (tipo, valor, línea relativa)
+más los símbolos visibles al empezar (los que el lexer declaró antes). Tras una
+edición sólo se re-parsean las partes cuya firma cambió; los mensajes y el
+subárbol (ast_java.Metodo) del resto se reutilizan corrigiendo el número de
+línea, y los métodos se empalman en la clase del esqueleto.
+
+Los nodos de las partes reutilizadas se comparten con el AST anterior: el AST
+devuelto sólo es válido hasta el siguiente analizar().
+
+Si la estructura no es la esperada (llaves desbalanceadas, '{' suelto a nivel
+de clase, tokens fuera de la clase) se hace el parseo completo de siempre. Lo
+mismo si alguna parte tiene errores de sintaxis: la recuperación (panic mode)
+depende de lo que viene después, y parseando por partes las cascadas de errores
+no coinciden con las del parseo completo. Las partes ya quedan cacheadas, así
+que al corregir el error se vuelve a reutilizar el resto.
+"""
+import hashlib
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import ply.lex as lex
+
+from lexer.token_stream import TokenStream, obtener_token_stream
+from syntactic import ast_java as ast
+from syntactic.analizador_sintactico import (
+    parser as parser_global, contexto_global, analizar_con, rechazar_fuente,
+    agregar_advertencias, MENSAJE_OK,
+)
+
+_RE_LINEA = re.compile(r'línea (\d+)')
+_ERROR_SINTAXIS = 'Error de sintaxis'  # prefijo de los mensajes de _manejar_error
+
+
+class _MensajesConPosicion(list):
+    """Lista de mensajes que anota cuántos tokens había consumido el parser al agregar cada uno."""
+
+    def __init__(self, lexer):
+        super().__init__()
+        self._lexer = lexer
+
+    def append(self, mensaje):
+        super().append((self._lexer._pos, mensaje))
+
+
+class _Parte:
+    """Resultado cacheado de parsear una parte (esqueleto o método)."""
+    __slots__ = ('mensajes', 'linea_base', 'usados', 'ast', 'sintaxis')
+
+    def __init__(self, mensajes, linea_base, usados, arbol=None):
+        self.mensajes: List[Tuple[int, str]] = mensajes  # (índice relativo de token, mensaje)
+        self.linea_base: int = linea_base
+        self.usados: frozenset = usados
+        self.ast: Optional[ast.Clase] = arbol  # la clase (esqueleto) o la envoltura del método
+        self.sintaxis: bool = any(_ERROR_SINTAXIS in msg for _, msg in mensajes)
+
+
+def _estructura(tokens) -> Optional[Tuple[int, List[Tuple[int, int, int]]]]:
+    """
+    (índice de CLASS, [(inicio, llave_abre, llave_cierra), ...] por método)
+    o None si la clase no tiene la forma  [PUBLIC] CLASS X { miembros }.
+    """
+    n = len(tokens)
+    i = 1 if n and tokens[0].type == 'PUBLIC' else 0
+    if n < i + 4 or tokens[i].type != 'CLASS' or tokens[i + 1].type != 'IDENTIFICADOR' \
+            or tokens[i + 2].type != 'LLAIZQ':
+        return None
+
+    metodos = []
+    profundidad = 1
+    inicio_miembro = i + 3
+    abre = None
+    for k in range(i + 3, n):
+        tipo = tokens[k].type
+        if tipo == 'LLAIZQ':
+            if profundidad == 1:
+                if tokens[k - 1].type != 'PARDER':
+                    return None
+                abre = k
+            profundidad += 1
+        elif tipo == 'LLADER':
+            profundidad -= 1
+            if profundidad == 1:
+                metodos.append((inicio_miembro, abre, k))
+                inicio_miembro = k + 1
+            elif profundidad == 0:
+                return (i, metodos) if k == n - 1 else None
+        elif tipo == 'PUNTOCOMA' and profundidad == 1:
+            inicio_miembro = k + 1
+    return None
+
+
+class ParserIncremental:
+    def __init__(self, prs=None):
+        self.parser = prs or parser_global
+        self._cache: Dict[tuple, _Parte] = {}
+        self.partes_reparseadas = 0  # estadística del último análisis
+        self.partes_totales = 0
+
+    @property
+    def contexto(self):
+        return getattr(self.parser, 'contexto', contexto_global)
+
+    def limpiar(self):
+        self._cache.clear()
+
+    # =========================
+    # API
+    # =========================
+    def analizar(self, data: str, stream: Optional[TokenStream] = None) -> List[str]:
+        """Mismo resultado que prueba_sintactica(), re-parseando sólo los métodos que cambiaron."""
+        contexto = self.contexto
+        resultado = contexto.resultado
+        tabla = contexto.tabla
+
+        resultado.clear()
+        tabla.limpiar()
+        contexto.ast = None
+        if rechazar_fuente(data, resultado):
+            return resultado
+
+        if stream is None:
+            stream = obtener_token_stream(data)
+        estructura = _estructura(stream.tokens)
+        if estructura is None:
+            self._cache.clear()
+            return analizar_con(self.parser, data, stream)
+
+        try:
+            mensajes, usados, arbol, sintaxis = self._analizar_partes(stream, *estructura)
+        except Exception as e:
+            resultado.clear()
+            resultado.append(
+                f"<span style='font-size:20px; color:#FF6B68;'>Error durante el análisis: {str(e)}</span>"
+            )
+            return resultado
+        if sintaxis:
+            # Con errores de sintaxis los mensajes son los del parseo completo
+            return analizar_con(self.parser, data, stream)
+
+        # Tabla final: la del lexer + lo que marcó el parser
+        stream.restaurar_tabla(tabla)
+        for nombre in usados:
+            if nombre in tabla.simbolos:
+                tabla.simbolos[nombre]['usado'] = True
+
+        contexto.ast = arbol
+        resultado.clear()
+        resultado.extend(mensajes)
+        if not resultado:
+            resultado.append(MENSAJE_OK)
+        agregar_advertencias(tabla, resultado)
+        return resultado
+
+    # =========================
+    # Partes
+    # =========================
+    def _analizar_partes(self, stream: TokenStream, clase: int, metodos):
+        tokens = stream.tokens
+        altas = stream.altas
+        cabecera = tokens[clase:clase + 3]  # CLASS X {
+        cierre = tokens[-1]
+
+        # Firma acumulada de los símbolos declarados antes de cada índice
+        firmas_previas = self._firmas_previas(altas, [m[0] for m in metodos])
+
+        nuevo_cache = {}
+        reparseadas = 0
+        mensajes = []  # (índice absoluto, orden, mensaje)
+        usados = set()
+        sintaxis = False
+
+        # --- Esqueleto: la clase sin los cuerpos de los métodos ---
+        quitar = set()
+        for _, abre, cierra in metodos:
+            quitar.update(range(abre + 1, cierra))
+        indices = [k for k in range(len(tokens)) if k not in quitar]
+        posicion = {k: j for j, k in enumerate(indices)}
+        destino = {}
+        for _, abre, cierra in metodos:
+            for k in range(abre + 1, cierra):
+                destino[k] = posicion[cierra]
+        altas_esqueleto = [(posicion.get(k, destino.get(k)), nombre, info) for k, nombre, info in altas]
+        esqueleto = [tokens[k] for k in indices]
+        parte, nueva = self._parte(esqueleto, altas_esqueleto, '', nuevo_cache,
+                                   lambda: (esqueleto, altas_esqueleto))
+        reparseadas += nueva
+        usados |= parte.usados
+        sintaxis |= parte.sintaxis
+        for rel, msg in parte.mensajes:
+            mensajes.append((indices[min(max(rel - 1, 0), len(indices) - 1)], 1, msg))
+        del_esqueleto = Counter((k, msg) for k, _, msg in mensajes)
+        clase_esqueleto = parte.ast
+        metodos_ast = []
+
+        # --- Métodos ---
+        posiciones_altas = [k for k, _, _ in altas]
+        for m, (inicio, abre, cierra) in enumerate(metodos):
+            cuerpo = tokens[inicio:cierra + 1]
+            desde = bisect_left(posiciones_altas, inicio)
+            hasta = bisect_right(posiciones_altas, cierra)
+            propias = [(k - inicio + 3, nombre, info) for k, nombre, info in altas[desde:hasta]]
+
+            def envolver(cuerpo=cuerpo, desde=desde, propias=propias):
+                envoltura = ([_copiar(t, cuerpo[0].lineno) for t in cabecera] + list(cuerpo)
+                             + [_copiar(cierre, cuerpo[-1].lineno)])
+                visibles = [(0, nombre, info) for _, nombre, info in altas[:desde]]
+                return envoltura, visibles + propias
+
+            parte, nueva = self._parte(cuerpo, propias, firmas_previas[m], nuevo_cache, envolver)
+            largo_envoltura = len(cuerpo) + 4
+            metodos_ast.append(_metodo(parte.ast))
+            reparseadas += nueva
+            usados |= parte.usados
+            sintaxis |= parte.sintaxis
+            for rel, msg in parte.mensajes:
+                if rel >= largo_envoltura:
+                    # Error sobre la '}' de la envoltura o fin de archivo: es la llave final de la clase
+                    msg = _RE_LINEA.sub(f"línea {cierre.lineno}", msg, count=1)
+                    absoluto = len(tokens) - 1
+                else:
+                    absoluto = min(max(rel - 1 - 3, 0), len(cuerpo) - 1) + inicio
+                if del_esqueleto[(absoluto, msg)] > 0:
+                    # La cabecera también está en el esqueleto: no duplicar sus errores
+                    del_esqueleto[(absoluto, msg)] -= 1
+                    continue
+                mensajes.append((absoluto, 0, msg))
+
+        self._cache = nuevo_cache
+        self.partes_reparseadas = reparseadas
+        self.partes_totales = len(metodos) + 1
+
+        mensajes.sort(key=lambda m: (m[0], m[1]))
+        arbol = _empalmar(clase_esqueleto, metodos_ast)
+        return [msg for _, _, msg in mensajes], usados, arbol, sintaxis
+
+    @staticmethod
+    def _firmas_previas(altas, inicios) -> List[str]:
+        """Para cada inicio de método, hash de los nombres declarados antes."""
+        h = hashlib.sha1()
+        firmas = []
+        j = 0
+        for inicio in inicios:
+            while j < len(altas) and altas[j][0] < inicio:
+                h.update(altas[j][1].encode('utf-8'))
+                h.update(b'\0')
+                j += 1
+            firmas.append(h.hexdigest())
+        return firmas
+
+    def _parte(self, firmados, altas, previas: str, nuevo_cache, construir) -> Tuple[_Parte, int]:
+        """
+        Parte cacheada o recién parseada (segundo valor: 1 si hubo que parsear).
+        'firmados' son los tokens reales de la parte (sin la envoltura) y 'altas'
+        las declaraciones dentro de ella; construir() arma (tokens, altas) a parsear
+        sólo si la parte no está en caché.
+        """
+        base = firmados[0].lineno
+        clave = (
+            tuple((t.type, t.value, t.lineno - base) for t in firmados),
+            previas,
+            # Las altas en el índice 0 son las previas (ya resumidas en 'previas')
+            tuple((k, nombre) for k, nombre, _ in altas if k > 0),
+        )
+        # pop: cada subárbol cacheado lo usa UNA sola parte (dos métodos idénticos no lo comparten)
+        parte = self._cache.pop(clave, None)
+        nueva = 0
+        if parte is None:
+            parte = self._parsear(*construir(), base)
+            nueva = 1
+        elif parte.linea_base != base:
+            delta = base - parte.linea_base
+            if parte.ast is not None:
+                parte.ast.desplazar_lineas(delta)
+            parte = _Parte(_desplazar_lineas(parte.mensajes, delta), base, parte.usados, parte.ast)
+        nuevo_cache[clave] = parte
+        return parte, nueva
+
+    def _parsear(self, tokens, altas, base: int) -> _Parte:
+        contexto = self.contexto
+        tabla = contexto.tabla
+        tabla.limpiar()
+
+        iniciales = {nombre: info.get('usado', False) for _, nombre, info in altas}
+        sub = TokenStream(None, tokens, (), {}, altas, (('global',), 0, False))
+        lexer = sub.lexer_para_parser(tabla)
+
+        original = contexto.resultado
+        contexto.resultado = _MensajesConPosicion(lexer)
+        try:
+            programa = self.parser.parse(lexer=lexer, tracking=True)
+            mensajes = [(pos, msg) for pos, msg in contexto.resultado if msg != MENSAJE_OK]
+        finally:
+            contexto.resultado = original
+
+        usados = frozenset(
+            nombre for nombre, info in tabla.simbolos.items()
+            if info.get('usado') and not iniciales.get(nombre, False)
+        )
+        clase = programa.clase if isinstance(programa, ast.Programa) else None
+        return _Parte(mensajes, base, usados, clase)
+
+
+def _metodo(envoltura) -> Optional[ast.Metodo]:
+    """El método de la envoltura  CLASS X { <método> }  (None si no se pudo construir)."""
+    if envoltura is None or len(envoltura.miembros) != 1:
+        return None
+    metodo = envoltura.miembros[0]
+    return metodo if isinstance(metodo, ast.Metodo) else None
+
+
+def _empalmar(clase, metodos) -> Optional[ast.Programa]:
+    """Programa con la clase del esqueleto y, en lugar de cada método vacío, el método parseado."""
+    if not isinstance(clase, ast.Clase):
+        return None
+    parseados = iter(metodos)
+    miembros = []
+    for miembro in clase.miembros:
+        if isinstance(miembro, ast.Metodo):
+            metodo = next(parseados, None)
+            # Si la parte no dio un método (errores) queda la cabecera del esqueleto
+            miembro = metodo if isinstance(metodo, ast.Metodo) else miembro
+        miembros.append(miembro)
+    nueva = ast.Clase(clase.nombre, clase.publica, miembros, linea=clase.linea)
+    return ast.Programa(nueva, linea=clase.linea)
+
+
+def _copiar(tok, lineno: int):
+    """Copia de un token de la envoltura (CLASS X { ... }) con la línea del método."""
+    copia = lex.LexToken()
+    copia.type = tok.type
+    copia.value = tok.value
+    copia.lineno = lineno
+    copia.lexpos = tok.lexpos
+    return copia
+
+
+def _desplazar_lineas(mensajes, delta: int):
+    """Corrige 'línea N' en los mensajes reutilizados de una parte que se movió."""
+    def corregir(m):
+        return f"línea {int(m.group(1)) + delta}"
+    return [(pos, _RE_LINEA.sub(corregir, msg, count=1)) for pos, msg in mensajes]
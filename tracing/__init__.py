@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# tracing/__init__.py
+
+"""
+Trazas estructuradas por categoría (lexer, parser, semantics, ir, runner) en
+lugar de print(): las categorías apagadas no cuestan nada y las encendidas
+escriben en un buffer circular que se vuelca como JSON lines.
+"""
+
+from .trazas import (
+    CATEGORIAS, Canal, RegistroTrazas, activar, activas, canal, desactivar,
+    limpiar, registro, volcar_jsonl,
+)
+
+__all__ = [
+    'CATEGORIAS',
+    'Canal',
+    'RegistroTrazas',
+    'activar',
+    'activas',
+    'canal',
+    'desactivar',
+    'limpiar',
+    'registro',
+    'volcar_jsonl',
+]
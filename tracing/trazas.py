@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+# tracing/trazas.py
+"""
+Subsistema de trazas.
+
+Cada módulo pide una vez el Canal de su categoría y, en el punto de traza,
+pregunta primero si está activo:
+
+    _traza = trazas.canal('ir')
+    ...
+    if _traza.activo:
+        _traza("cuádruplo agregado", indice=i, op=operador)
+
+Con la categoría apagada el costo es leer un atributo: no se arma el mensaje
+ni los campos. Con la categoría encendida el evento (hora, categoría,
+mensaje, campos) se guarda tal cual en un buffer circular compartido; el
+JSON se arma recién al volcarlo.
+
+La variable de entorno COMPILADOR_TRAZAS ('lexer,ir' o 'todas') enciende
+categorías al importar el módulo (útil fuera del IDE).
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+CATEGORIAS = ('lexer', 'parser', 'semantics', 'ir', 'runner')
+
+# Eventos que conserva el buffer (los más viejos se descartan)
+CAPACIDAD = 10000
+
+
+class RegistroTrazas:
+    """
+    Buffer circular de eventos (hora, categoría, mensaje, campos).
+    deque.append con maxlen es atómico: los hilos del IDE (diagnósticos en
+    vivo, runner) pueden trazar sin tomar un lock.
+    """
+
+    def __init__(self, capacidad: int = CAPACIDAD):
+        self._eventos: deque = deque(maxlen=capacidad)
+        self._lock = threading.Lock()  # sólo para redimensionar/copiar
+
+    @property
+    def capacidad(self) -> int:
+        return self._eventos.maxlen
+
+    def redimensionar(self, capacidad: int):
+        """Cambia la capacidad conservando los eventos más recientes."""
+        with self._lock:
+            self._eventos = deque(self._eventos, maxlen=capacidad)
+
+    def agregar(self, categoria: str, mensaje: str, campos: Dict):
+        self._eventos.append((time.time(), categoria, mensaje, campos))
+
+    def __len__(self):
+        return len(self._eventos)
+
+    def limpiar(self):
+        self._eventos.clear()
+
+    def eventos(self, categorias: Optional[Iterable[str]] = None) -> List[Tuple]:
+        """Copia de los eventos (opcionalmente sólo de 'categorias'), del más viejo al más nuevo."""
+        with self._lock:
+            eventos = list(self._eventos)
+        if categorias is not None:
+            categorias = set(categorias)
+            eventos = [e for e in eventos if e[1] in categorias]
+        return eventos
+
+    def lineas_json(self, categorias: Optional[Iterable[str]] = None) -> List[str]:
+        """Un objeto JSON por evento: {t, cat, msg, ...campos}."""
+        lineas = []
+        for t, categoria, mensaje, campos in self.eventos(categorias):
+            evento = {'t': round(t, 6), 'cat': categoria, 'msg': mensaje}
+            evento.update(campos)
+            lineas.append(json.dumps(evento, ensure_ascii=False, default=str))
+        return lineas
+
+    def volcar_jsonl(self, destino: TextIO, categorias: Optional[Iterable[str]] = None) -> int:
+        """Escribe los eventos en 'destino' como JSON lines; devuelve cuántos escribió."""
+        lineas = self.lineas_json(categorias)
+        for linea in lineas:
+            destino.write(linea + '\n')
+        return len(lineas)
+
+
+class Canal:
+    """Punto de traza de una categoría; 'activo' se consulta antes de trazar."""
+    __slots__ = ('categoria', 'activo', '_registro')
+
+    def __init__(self, categoria: str, registro_: RegistroTrazas):
+        self.categoria = categoria
+        self.activo = False
+        self._registro = registro_
+
+    def __call__(self, mensaje: str, **campos):
+        self._registro.agregar(self.categoria, mensaje, campos)
+
+    def __repr__(self):
+        return f"Canal({self.categoria!r}, activo={self.activo})"
+
+
+# =========================
+# Registro y canales del proceso
+# =========================
+_registro = RegistroTrazas()
+_canales: Dict[str, Canal] = {categoria: Canal(categoria, _registro) for categoria in CATEGORIAS}
+
+
+def _validar(categorias) -> Tuple[str, ...]:
+    categorias = tuple(categorias) or CATEGORIAS
+    desconocidas = [c for c in categorias if c not in _canales]
+    if desconocidas:
+        raise ValueError(f"Categoría de traza desconocida: {', '.join(desconocidas)} "
+                         f"(opciones: {', '.join(CATEGORIAS)})")
+    return categorias
+
+
+def canal(categoria: str) -> Canal:
+    """Canal de 'categoria' (siempre el mismo objeto; se puede guardar en el módulo)."""
+    return _canales[_validar((categoria,))[0]]
+
+
+def activar(*categorias: str):
+    """Enciende 'categorias' (todas si no se indica ninguna)."""
+    for categoria in _validar(categorias):
+        _canales[categoria].activo = True
+
+
+def desactivar(*categorias: str):
+    """Apaga 'categorias' (todas si no se indica ninguna)."""
+    for categoria in _validar(categorias):
+        _canales[categoria].activo = False
+
+
+def activas() -> Tuple[str, ...]:
+    return tuple(c for c in CATEGORIAS if _canales[c].activo)
+
+
+def registro() -> RegistroTrazas:
+    return _registro
+
+
+def limpiar():
+    _registro.limpiar()
+
+
+def volcar_jsonl(destino: TextIO, categorias: Optional[Iterable[str]] = None) -> int:
+    return _registro.volcar_jsonl(destino, categorias)
+
+
+def _desde_entorno():
+    valor = os.environ.get('COMPILADOR_TRAZAS', '').strip()
+    if not valor:
+        return
+    if valor.lower() in ('todas', 'all', '1'):
+        activar()
+    else:
+        activar(*(c.strip() for c in valor.split(',') if c.strip()))
+
+
+_desde_entorno()
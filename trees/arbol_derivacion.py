@@ -20,9 +20,9 @@ class NodoArbol:
 # Extensión del analizador sintáctico para construir el árbol
 def construir_arbol_derivacion(codigo_fuente):
     """
-    Construye un árbol de derivación a partir del análisis sintáctico del código
+    Construye un árbol de derivación a partir del AST que deja el análisis sintáctico
     """
-    from syntactic.analizador_sintactico import prueba_sintactica
+    from syntactic.analizador_sintactico import prueba_sintactica, contexto_global
     from lexer.analizador_lexico import tabla_simbolos
 
     # Limpiar tabla de símbolos antes de análisis
@@ -36,132 +36,95 @@ def construir_arbol_derivacion(codigo_fuente):
     if errores:
         return None, errores
 
-    # Construir el árbol
-    raiz = NodoArbol("programa")
-
-    # Crear nodo para la clase principal
-    clase_encontrada = False
-    for linea in codigo_fuente.split('\n'):
-        linea = linea.strip()
-        if "class" in linea and "{" in linea:
-            clase_encontrada = True
-            partes = linea.split("class")
-            nombre_clase = partes[1].split("{")[0].strip()
-            nodo_clase = NodoArbol("declaracion_clase", nombre_clase)
-            raiz.agregar_hijo(nodo_clase)
-
-            # Ahora buscar métodos
-            agregar_metodos(codigo_fuente, nodo_clase)
-
-            # Buscar atributos
-            agregar_atributos(codigo_fuente, nodo_clase)
-
-            break
-
-    if not clase_encontrada:
+    programa = contexto_global.ast
+    if programa is None or programa.clase is None:
         # Si no hay una clase explícita, crear un nodo genérico
+        raiz = NodoArbol("programa")
         raiz.agregar_hijo(NodoArbol("código_fuente", "Código sin estructura de clase"))
-
-    return raiz, resultados
-
-
-def agregar_metodos(codigo_fuente, nodo_padre):
-    """Agrega los nodos de métodos encontrados en el código"""
-    import re
-
-    # Patrón para detectar métodos
-    patron_metodo = r'(public|private|protected)?\s+(static)?\s*(\w+)\s+(\w+)\s*\([^)]*\)\s*{'
-
-    # Buscar todos los métodos
-    for idx, linea in enumerate(codigo_fuente.split('\n'), 1):
-        match = re.search(patron_metodo, linea)
-        if match:
-            tipo_retorno = match.group(3)
-            nombre_metodo = match.group(4)
-
-            # Ignorar si es la declaración de clase
-            if nombre_metodo != "class":
-                nodo_metodo = NodoArbol("metodo", nombre_metodo, idx)
-                nodo_padre.agregar_hijo(nodo_metodo)
-
-                # Buscar el cuerpo del método y agregar sentencias
-                agregar_sentencias(codigo_fuente, idx, nodo_metodo)
-
-
-def agregar_atributos(codigo_fuente, nodo_padre):
-    """Agrega los nodos de atributos de clase"""
-    import re
-
-    # Patrón para detectar atributos
-    patron_atributo = r'(public|private|protected)?\s+(static)?\s*(\w+)\s+(\w+)\s*;'
-
-    # Buscar todos los atributos
-    for idx, linea in enumerate(codigo_fuente.split('\n'), 1):
-        linea = linea.strip()
-        match = re.search(patron_atributo, linea)
-        if match and "class" not in linea and "(" not in linea:
-            tipo = match.group(3)
-            nombre = match.group(4)
-            nodo_atributo = NodoArbol("atributo", f"{tipo} {nombre}", idx)
-            nodo_padre.agregar_hijo(nodo_atributo)
-
-
-def agregar_sentencias(codigo_fuente, linea_inicio, nodo_padre):
-    """Agrega sentencias dentro de un método"""
-    import re
-
-    lineas = codigo_fuente.split('\n')
-    contador_llaves = 0
-    dentro_metodo = False
-    buffer_lineas = []
-
-    # Buscar el cuerpo del método
-    for idx, linea in enumerate(lineas[linea_inicio - 1:], linea_inicio):
-        if '{' in linea and not dentro_metodo:
-            dentro_metodo = True
-            contador_llaves += linea.count('{')
-        elif dentro_metodo:
-            contador_llaves += linea.count('{')
-            contador_llaves -= linea.count('}')
-            buffer_lineas.append((idx, linea))
-
-            if contador_llaves == 0:
-                break
-
-    # Analizar cada línea dentro del método
-    for idx, linea in buffer_lineas:
-        linea = linea.strip()
-        if not linea or linea == "{" or linea == "}":
-            continue
-
-        # Detectar declaraciones
-        if re.search(r'(\w+)\s+(\w+)\s*=', linea) or re.search(r'(\w+)\s+(\w+);', linea):
-            nodo_sentencia = NodoArbol("declaracion", linea, idx)
-            nodo_padre.agregar_hijo(nodo_sentencia)
-        # Detectar asignaciones
-        elif "=" in linea and "==" not in linea:
-            nodo_sentencia = NodoArbol("asignacion", linea, idx)
-            nodo_padre.agregar_hijo(nodo_sentencia)
-        # Detectar if
-        elif linea.startswith("if"):
-            nodo_sentencia = NodoArbol("if", linea, idx)
-            nodo_padre.agregar_hijo(nodo_sentencia)
-        # Detectar for
-        elif linea.startswith("for"):
-            nodo_sentencia = NodoArbol("for", linea, idx)
-            nodo_padre.agregar_hijo(nodo_sentencia)
-        # Detectar while
-        elif linea.startswith("while"):
-            nodo_sentencia = NodoArbol("while", linea, idx)
-            nodo_padre.agregar_hijo(nodo_sentencia)
-        # Detectar llamadas a métodos
-        elif "(" in linea and ")" in linea and ";" in linea:
-            nodo_sentencia = NodoArbol("llamada", linea, idx)
-            nodo_padre.agregar_hijo(nodo_sentencia)
-        # Otras sentencias
-        else:
-            nodo_sentencia = NodoArbol("sentencia", linea, idx)
-            nodo_padre.agregar_hijo(nodo_sentencia)
+        return raiz, resultados
+
+    return desde_ast(programa), resultados
+
+
+# =========================
+#  AST -> nodos del árbol
+# =========================
+def _texto_expresion(nodo):
+    """Texto corto de una expresión del AST (para el valor de los nodos)."""
+    from syntactic import ast_java as ast
+
+    if isinstance(nodo, ast.Literal):
+        return f'"{nodo.valor}"' if nodo.tipo == 'CADENA' else str(nodo.valor)
+    if isinstance(nodo, ast.Identificador):
+        return nodo.nombre
+    if isinstance(nodo, ast.AccesoCampo):
+        return f"{nodo.objeto}.{nodo.campo}"
+    if isinstance(nodo, ast.Binaria):
+        return f"{_texto_expresion(nodo.izquierda)} {nodo.operador} {_texto_expresion(nodo.derecha)}"
+    if isinstance(nodo, ast.Unaria):
+        return f"{nodo.operador}{_texto_expresion(nodo.operando)}"
+    if isinstance(nodo, ast.LlamadaMetodo):
+        return f"{nodo.nombre}({', '.join(_texto_expresion(a) for a in nodo.argumentos)})"
+    if isinstance(nodo, ast.AccesoArreglo):
+        return f"{nodo.nombre}[{_texto_expresion(nodo.indice)}]"
+    if isinstance(nodo, ast.IncrementoDecremento):
+        return f"{nodo.operador}{nodo.nombre}" if nodo.prefijo else f"{nodo.nombre}{nodo.operador}"
+    return type(nodo).__name__
+
+
+def _tipo_y_valor(nodo):
+    """(tipo, valor) del nodo del árbol de derivación para un nodo del AST."""
+    from syntactic import ast_java as ast
+
+    if isinstance(nodo, ast.Programa):
+        return "programa", None
+    if isinstance(nodo, ast.Clase):
+        return "declaracion_clase", nodo.nombre
+    if isinstance(nodo, ast.Metodo):
+        return "metodo", nodo.nombre
+    if isinstance(nodo, ast.Atributo):
+        return "atributo", f"{nodo.tipo} {nodo.nombre}"
+    if isinstance(nodo, ast.Parametro):
+        return "parametro", f"{nodo.tipo}{'[]' if nodo.arreglo else ''} {nodo.nombre}"
+    if isinstance(nodo, ast.DeclaracionVariable):
+        return "declaracion", f"{nodo.tipo}{'[]' if nodo.arreglo else ''} {nodo.nombre}"
+    if isinstance(nodo, ast.Asignacion):
+        return "asignacion", f"{nodo.nombre} {nodo.operador}"
+    if isinstance(nodo, (ast.If, ast.For, ast.While, ast.Switch, ast.Return)):
+        return type(nodo).__name__.lower(), None
+    if isinstance(nodo, ast.DoWhile):
+        return "do-while", None
+    if isinstance(nodo, ast.Caso):
+        return ("case", None) if nodo.valor is not None else ("default", None)
+    if isinstance(nodo, ast.Bloque):
+        return "bloque", None
+    if isinstance(nodo, ast.Imprimir):
+        return "llamada", "System.out.println" if nodo.salto else "System.out.print"
+    if isinstance(nodo, ast.LlamadaMetodo):
+        return "llamada", nodo.nombre
+    if isinstance(nodo, (ast.Literal, ast.Identificador, ast.AccesoCampo)):
+        return "expresion", _texto_expresion(nodo)
+    if isinstance(nodo, (ast.Binaria, ast.Unaria)):
+        return "expresion", nodo.operador
+    return "sentencia", _texto_expresion(nodo)
+
+
+def desde_ast(nodo, fabrica=None):
+    """
+    Convierte un nodo del AST (syntactic.ast_java) y su subárbol en nodos
+    NodoArbol, o de la clase 'fabrica' (mismo constructor: tipo, valor, linea).
+    """
+    fabrica = fabrica or NodoArbol
+    tipo, valor = _tipo_y_valor(nodo)
+    raiz = fabrica(tipo, valor, nodo.linea)
+    pila = [(nodo, raiz)]
+    while pila:
+        actual, destino = pila.pop()
+        for hijo in actual.hijos():
+            tipo, valor = _tipo_y_valor(hijo)
+            nuevo = destino.agregar_hijo(fabrica(tipo, valor, hijo.linea))
+            pila.append((hijo, nuevo))
+    return raiz
 
 
 def generar_arbol_qt(nodo, parent_item=None, tree_widget=None):
@@ -205,7 +168,7 @@ def generar_arbol_qt(nodo, parent_item=None, tree_widget=None):
         item.setForeground(0, QBrush(QColor('#9CDCFE')))  # Azul claro
     elif nodo.tipo == "declaracion":
         item.setForeground(0, QBrush(QColor('#DCDCAA')))  # Amarillo
-    elif nodo.tipo == "if" or nodo.tipo == "for" or nodo.tipo == "while":
+    elif nodo.tipo in ("if", "for", "while", "do-while", "switch"):
         item.setForeground(0, QBrush(QColor('#C586C0')))  # Morado
     elif nodo.tipo == "llamada":
         item.setForeground(0, QBrush(QColor('#57A64A')))  # Verde
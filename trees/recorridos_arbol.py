@@ -26,7 +26,7 @@ class NodoRecorrido:
 
 def construir_arbol_recorridos(codigo_fuente):
     """
-    Construye un árbol y sus recorridos a partir del análisis del código
+    Construye un árbol y sus recorridos a partir del AST del análisis sintáctico
 
     Args:
         codigo_fuente: Código fuente Java a analizar
@@ -34,15 +34,13 @@ def construir_arbol_recorridos(codigo_fuente):
     Returns:
         NodoRecorrido: El nodo raíz del árbol con sus recorridos calculados
     """
-    from syntactic.analizador_sintactico import prueba_sintactica
-    from lexer.analizador_lexico import tabla_simbolos, prueba
+    from syntactic.analizador_sintactico import prueba_sintactica, contexto_global
+    from lexer.analizador_lexico import tabla_simbolos
+    from trees.arbol_derivacion import desde_ast
 
     # Limpiar tabla de símbolos antes de análisis
     tabla_simbolos.limpiar()
 
-    # Realizar análisis léxico primero
-    tokens = prueba(codigo_fuente)
-
     # Realizar análisis sintáctico
     resultados = prueba_sintactica(codigo_fuente)
 
@@ -51,182 +49,15 @@ def construir_arbol_recorridos(codigo_fuente):
     if errores:
         return None, errores
 
-    # Construir el árbol a partir de los tokens
-    return construir_arbol_desde_tokens(tokens), resultados
-
-
-def construir_arbol_desde_tokens(tokens):
-    """
-    Construye un árbol estructurado a partir de los tokens del análisis léxico
-
-    Args:
-        tokens: Lista de tokens del análisis léxico
-
-    Returns:
-        NodoRecorrido: Raíz del árbol construido
-    """
-    raiz = NodoRecorrido("programa", "Código Java")
-
-    # Agrupamos tokens por estructuras lógicas
-    estructuras = agrupar_tokens_por_estructura(tokens)
-
-    # Construir el árbol con los grupos de tokens
-    for tipo, grupo in estructuras.items():
-        nodo_estructura = NodoRecorrido(tipo, f"{tipo.capitalize()}")
-        raiz.agregar_hijo(nodo_estructura)
+    programa = contexto_global.ast
+    if programa is None:
+        return None, resultados
 
-        for token in grupo:
-            # Solo incluimos tokens significativos
-            if token.get("tipo") not in ["LLAIZQ", "LLADER", "PUNTOCOMA"]:
-                valor = str(token.get("valor", ""))
-                tipo = token.get("tipo", "")
-                linea = token.get("linea", 0)
-
-                nodo_token = NodoRecorrido(tipo.lower(), valor, linea)
-                nodo_estructura.agregar_hijo(nodo_token)
-
-    # Calcular los recorridos
+    # El árbol es el AST (sin re-agrupar tokens)
+    raiz = desde_ast(programa, NodoRecorrido)
+    raiz.valor = "Código Java"
     calcular_recorridos(raiz)
-
-    return raiz
-
-
-def agrupar_tokens_por_estructura(tokens):
-    """
-    Agrupa los tokens en estructuras lógicas del programa
-
-    Args:
-        tokens: Lista de tokens del análisis léxico
-
-    Returns:
-        dict: Diccionario con tokens agrupados por estructura
-    """
-    estructuras = {
-        "declaraciones": [],
-        "condicionales": [],
-        "bucles": [],
-        "asignaciones": [],
-        "llamadas": [],
-        "otros": []
-    }
-
-    i = 0
-    while i < len(tokens):
-        token = tokens[i]
-        tipo = token.get("tipo", "")
-
-        # Identificar declaraciones de variables
-        if tipo in ["INT", "FLOAT", "DOUBLE", "BOOLEAN", "CHAR", "STRING"]:
-            # Capturar toda la declaración hasta el punto y coma
-            declaracion = [token]
-            j = i + 1
-            while j < len(tokens) and tokens[j].get("tipo") != "PUNTOCOMA":
-                declaracion.append(tokens[j])
-                j += 1
-            if j < len(tokens):
-                declaracion.append(tokens[j])  # Incluir el punto y coma
-
-            estructuras["declaraciones"].extend(declaracion)
-            i = j + 1
-            continue
-
-        # Identificar condicionales (if, else, switch)
-        elif tipo in ["IF", "ELSE", "SWITCH", "CASE"]:
-            # Capturar la estructura condicional
-            condicional = [token]
-            j = i + 1
-            llaves_abiertas = 0
-
-            # Si hay un paréntesis abierto, capturar la condición
-            if j < len(tokens) and tokens[j].get("tipo") == "PARIZQ":
-                llaves_abiertas += 1
-                condicional.append(tokens[j])
-                j += 1
-
-                while j < len(tokens) and llaves_abiertas > 0:
-                    if tokens[j].get("tipo") == "PARIZQ":
-                        llaves_abiertas += 1
-                    elif tokens[j].get("tipo") == "PARDER":
-                        llaves_abiertas -= 1
-                    condicional.append(tokens[j])
-                    j += 1
-
-            estructuras["condicionales"].extend(condicional)
-            i = j
-            continue
-
-        # Identificar bucles (for, while, do)
-        elif tipo in ["FOR", "WHILE", "DO"]:
-            bucle = [token]
-            j = i + 1
-            llaves_abiertas = 0
-
-            # Si hay un paréntesis abierto, capturar la condición del bucle
-            if j < len(tokens) and tokens[j].get("tipo") == "PARIZQ":
-                llaves_abiertas += 1
-                bucle.append(tokens[j])
-                j += 1
-
-                while j < len(tokens) and llaves_abiertas > 0:
-                    if tokens[j].get("tipo") == "PARIZQ":
-                        llaves_abiertas += 1
-                    elif tokens[j].get("tipo") == "PARDER":
-                        llaves_abiertas -= 1
-                    bucle.append(tokens[j])
-                    j += 1
-
-            estructuras["bucles"].extend(bucle)
-            i = j
-            continue
-
-        # Identificar asignaciones (=)
-        elif tipo == "IDENTIFICADOR" and i + 1 < len(tokens) and tokens[i + 1].get("tipo") == "ASIGNAR":
-            asignacion = [token, tokens[i + 1]]  # Identificador y =
-            j = i + 2
-
-            # Capturar el valor hasta el punto y coma
-            while j < len(tokens) and tokens[j].get("tipo") != "PUNTOCOMA":
-                asignacion.append(tokens[j])
-                j += 1
-            if j < len(tokens):
-                asignacion.append(tokens[j])  # Incluir el punto y coma
-
-            estructuras["asignaciones"].extend(asignacion)
-            i = j + 1
-            continue
-
-        # Identificar llamadas a funciones
-        elif tipo == "IDENTIFICADOR" and i + 1 < len(tokens) and tokens[i + 1].get("tipo") == "PARIZQ":
-            llamada = [token, tokens[i + 1]]  # Nombre de función y (
-            j = i + 2
-            llaves_abiertas = 1
-
-            # Capturar los argumentos
-            while j < len(tokens) and llaves_abiertas > 0:
-                if tokens[j].get("tipo") == "PARIZQ":
-                    llaves_abiertas += 1
-                elif tokens[j].get("tipo") == "PARDER":
-                    llaves_abiertas -= 1
-                llamada.append(tokens[j])
-                j += 1
-
-            # Capturar hasta el punto y coma
-            while j < len(tokens) and tokens[j].get("tipo") != "PUNTOCOMA":
-                llamada.append(tokens[j])
-                j += 1
-            if j < len(tokens):
-                llamada.append(tokens[j])  # Incluir el punto y coma
-
-            estructuras["llamadas"].extend(llamada)
-            i = j + 1
-            continue
-
-        # Otros tokens
-        else:
-            estructuras["otros"].append(token)
-            i += 1
-
-    return estructuras
+    return raiz, resultados
 
 
 def calcular_recorridos(nodo):
@@ -365,29 +196,28 @@ def asignar_estilo_nodo(item, tipo):
     if tipo == "programa":
         item.setFont(0, QFont("Consolas", 10, QFont.Bold))
         item.setForeground(0, QBrush(QColor('#F89406')))  # Naranja
-    elif tipo == "declaraciones":
+    elif tipo in ("declaracion_clase", "metodo"):
+        item.setFont(0, QFont("Consolas", 10, QFont.Bold))
+        item.setForeground(0, QBrush(QColor('#4EC9B0')))  # Verde agua
+    elif tipo in ("declaracion", "atributo", "parametro"):
         item.setFont(0, QFont("Consolas", 10, QFont.Bold))
         item.setForeground(0, QBrush(QColor('#9CDCFE')))  # Azul claro
-    elif tipo == "condicionales":
+    elif tipo in ("if", "switch", "case", "default"):
         item.setFont(0, QFont("Consolas", 10, QFont.Bold))
         item.setForeground(0, QBrush(QColor('#C586C0')))  # Morado
-    elif tipo == "bucles":
+    elif tipo in ("for", "while", "do-while"):
         item.setFont(0, QFont("Consolas", 10, QFont.Bold))
         item.setForeground(0, QBrush(QColor('#D7BA7D')))  # Amarillo ocre
-    elif tipo == "asignaciones":
+    elif tipo == "asignacion":
         item.setFont(0, QFont("Consolas", 10))
         item.setForeground(0, QBrush(QColor('#DCDCAA')))  # Amarillo
-    elif tipo == "llamadas":
+    elif tipo == "llamada":
         item.setFont(0, QFont("Consolas", 10))
         item.setForeground(0, QBrush(QColor('#57A64A')))  # Verde
-    elif tipo == "identificador":
-        item.setForeground(0, QBrush(QColor('#9CDCFE')))  # Azul claro
-    elif tipo in ["int", "float", "double", "boolean", "char", "string"]:
-        item.setForeground(0, QBrush(QColor('#569CD6')))  # Azul
-    elif tipo == "entero" or tipo == "decimal":
+    elif tipo == "expresion":
         item.setForeground(0, QBrush(QColor('#B5CEA8')))  # Verde claro
-    elif tipo == "cadena":
-        item.setForeground(0, QBrush(QColor('#CE9178')))  # Rojo claro
+    elif tipo == "return":
+        item.setForeground(0, QBrush(QColor('#569CD6')))  # Azul
 
 
 def visualizar_recorridos_arbol(codigo_fuente, tree_widget):
@@ -4,6 +4,7 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 import re
 from widgets.error_table import ErrorTableView, ErrorItem
 from widgets.masm_view import MasmOutputView
+from widgets.trace_view import TraceView
 
 from .line_numbered_textedit import CodeEditor  # Import the new CodeEditor
 from intermediate_code.generador_triplos import GeneradorTriplos
@@ -263,6 +264,11 @@ class Ui_home(object):
         self.bt_run.setStyleSheet("QPushButton { background-color: #3279B7; border-color: #3C8DCC; }"
                                   "QPushButton:hover { background-color: #3C8DCC; }")
 
+        self.bt_run_ir = QtWidgets.QPushButton("Run (IR)")
+        self.bt_run_ir.setIcon(QtGui.QIcon.fromTheme("media-seek-forward"))
+        self.bt_run_ir.setStyleSheet("QPushButton { background-color: #3279B7; border-color: #3C8DCC; }"
+                                     "QPushButton:hover { background-color: #3C8DCC; }")
+
         self.bt_limpiar = QtWidgets.QPushButton("Limpiar")
         self.bt_limpiar.setIcon(QtGui.QIcon.fromTheme("edit-clear"))
         self.bt_limpiar.setToolTip("Limpiar todo")
@@ -277,6 +283,7 @@ class Ui_home(object):
         self.topControls.addWidget(self.bt_archivo)
         self.topControls.addWidget(self.bt_asm)
         self.topControls.addWidget(self.bt_run)
+        self.topControls.addWidget(self.bt_run_ir)
         self.topControls.addWidget(self.bt_limpiar)
         self.topControls.addStretch()
         self.topControls.addWidget(QtWidgets.QLabel("Zoom:"))
@@ -460,6 +467,10 @@ class Ui_home(object):
         self.outputLayout.addWidget(self.tx_output)
         self.analysisTabs.addTab(self.outputTab, "Salida del código")
 
+        # --- Trazas (categorías on/off + visor del buffer)
+        self.tracesTab = TraceView()
+        self.analysisTabs.addTab(self.tracesTab, "Trazas")
+
         # ---- Tabs al layout principal
         self.mainLayout.addWidget(self.analysisTabs)
 
@@ -553,6 +564,7 @@ class Ui_home(object):
         # ---- Conexiones
         # Salida
         self.bt_run.clicked.connect(lambda: self.analysisTabs.setCurrentWidget(self.outputTab))
+        self.bt_run_ir.clicked.connect(lambda: self.analysisTabs.setCurrentWidget(self.outputTab))
         self.shortcut_output.activated.connect(lambda: self.analysisTabs.setCurrentWidget(self.outputTab))
         self.bt_output_clear.clicked.connect(self.tx_output.clear)
 
@@ -643,7 +655,7 @@ class Ui_home(object):
 
     def analizar_lexico(self):
         # Import local para evitar ciclos
-        from lexer.analizador_lexico import prueba as prueba_lexica, tabla_simbolos
+        from lexer.analizador_lexico import lexemas, tabla_simbolos
         from PyQt5 import QtCore, QtWidgets
         from PyQt5.QtGui import QColor
 
@@ -658,7 +670,7 @@ class Ui_home(object):
             pass
 
         try:
-            resultados = prueba_lexica(codigo)
+            resultados = lexemas(codigo)
 
             self.tb_lexico.setUpdatesEnabled(False)
             self.tb_lexico.clearContents()
@@ -745,13 +757,17 @@ class Ui_home(object):
 
     def ver_tabla_simbolos(self):
         # Import local para evitar ciclos
-        from lexer.analizador_lexico import tabla_simbolos
+        from lexer.analizador_lexico import tabla_simbolos, llenar_tabla
         from PyQt5.QtGui import QColor
         from PyQt5 import QtWidgets, QtCore
 
         simbolos = {}
         try:
             simbolos = tabla_simbolos.obtener_todos()  # dict nombre -> info
+            codigo = self.tx_ingreso.toPlainText().strip()
+            if not simbolos and codigo:
+                # El análisis léxico ya no llena la tabla: se recolecta al mostrarla
+                simbolos = llenar_tabla(codigo).obtener_todos()
         except Exception:
             pass
 
@@ -946,7 +962,10 @@ class Ui_home(object):
             self.analysisTabs.setCurrentWidget(self.quadruplesTab)
             est = self.generador_cuadruplos.obtener_estadisticas()
             self.estado.showMessage(
-                f"Generados {est['total_cuadruplos']} cuádruplos, {est['temporales_generados']} temporales", 3000
+                f"Generados {est['total_cuadruplos']} cuádruplos "
+                f"({est['optimizacion']['cuadruplos_antes']} sin optimizar), {est['temporales_generados']} temporales "
+                f"en {est['optimizacion']['temporales_despues']} slots",
+                3000
             )
 
         except Exception as e:
@@ -977,16 +996,20 @@ class Ui_home(object):
         return ln, col
 
     def _collect_lex_errors(self, codigo: str):
-        from lexer.analizador_lexico import prueba as prueba_lexica
+        from lexer.analizador_lexico import lexemas
+
+        from lexer.line_index import line_index
 
-        tokens = prueba_lexica(codigo)  # lista de dicts
+        tokens = lexemas(codigo)  # TokenStore (vistas con interfaz de dict)
+        index = line_index(codigo)
         items = []
         idx = 1
         for t in tokens:
             if t.get("tipo") == "ERROR":
                 msg = f"Token inválido '{t.get('valor')}'"
                 linea = t.get("linea")
-                col = (t.get("posicion") or 0) + 1
+                # 'posicion' es el offset en el fuente, no la columna
+                col = index.col(t.get("posicion") or 0)
                 items.append(ErrorItem(idx, "Léxico", msg, linea, col, ""))
                 idx += 1
 
@@ -1135,6 +1158,7 @@ class Ui_home(object):
         self.analysisTabs.setTabText(8, _translate("home", "Ensamblador MASM"))
         self.analysisTabs.setTabText(9, _translate("home", "Código Ensamblador"))
         self.analysisTabs.setTabText(10, _translate("home", "Salida del código"))
+        self.analysisTabs.setTabText(11, _translate("home", "Trazas"))
 
         # Tooltips y textos de botones
         self.bt_lexico.setToolTip(_translate("home", "Realizar análisis léxico (F5)"))
@@ -1149,6 +1173,7 @@ class Ui_home(object):
         self.bt_archivo.setToolTip(_translate("home", "Abrir un archivo Java (Ctrl+O)"))
         self.bt_asm.setToolTip(_translate("home", "Generar/mostrar Ensamblador MASM (F10)"))
         self.bt_run.setToolTip(_translate("home", "Ejecutar el código y mostrar la salida"))
+        self.bt_run_ir.setToolTip(_translate("home", "Ejecutar los cuádruplos en la máquina virtual del IR (sin JDK)"))
         self.bt_limpiar.setToolTip(_translate("home", "Limpiar todos los campos (Ctrl+L)"))
         self.bt_zoom_in.setToolTip(_translate("home", "Zoom + (Shift + \"+\")"))
         self.bt_zoom_out.setToolTip(_translate("home", "Zoom - (Shift + \"-\")"))
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+# widgets/trace_view.py
+"""
+Pestaña de trazas: una casilla por categoría (enciende/apaga su Canal) y un
+visor de los eventos del buffer en JSON lines, con opción de guardarlos.
+"""
+from typing import Dict
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+from tracing import trazas
+
+
+class TraceView(QtWidgets.QWidget):
+
+    # Refresco del visor mientras la pestaña está visible
+    INTERVALO_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+
+        # --- Categorías + acciones
+        cabecera = QtWidgets.QHBoxLayout()
+        cabecera.addWidget(QtWidgets.QLabel("Trazas:"))
+        self.casillas: Dict[str, QtWidgets.QCheckBox] = {}
+        activas = set(trazas.activas())
+        for categoria in trazas.CATEGORIAS:
+            casilla = QtWidgets.QCheckBox(categoria)
+            casilla.setChecked(categoria in activas)
+            casilla.toggled.connect(lambda marcada, c=categoria: self._alternar(c, marcada))
+            self.casillas[categoria] = casilla
+            cabecera.addWidget(casilla)
+        cabecera.addStretch()
+
+        self.bt_actualizar = QtWidgets.QPushButton("Actualizar")
+        self.bt_limpiar = QtWidgets.QPushButton("Limpiar trazas")
+        self.bt_limpiar.setIcon(QtGui.QIcon.fromTheme("edit-clear"))
+        self.bt_guardar = QtWidgets.QPushButton("Guardar JSONL")
+        for boton in (self.bt_actualizar, self.bt_limpiar, self.bt_guardar):
+            cabecera.addWidget(boton)
+        layout.addLayout(cabecera)
+
+        self.tx_trazas = QtWidgets.QPlainTextEdit()
+        self.tx_trazas.setReadOnly(True)
+        self.tx_trazas.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.tx_trazas.setPlaceholderText("Active una categoría y ejecute un análisis para ver sus trazas...")
+        layout.addWidget(self.tx_trazas)
+
+        self.bt_actualizar.clicked.connect(self.actualizar)
+        self.bt_limpiar.clicked.connect(self.limpiar)
+        self.bt_guardar.clicked.connect(self.guardar)
+
+        # Sólo refresca si algo cambió y la pestaña se ve
+        self._mostrados = -1
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(self.INTERVALO_MS)
+        self._timer.timeout.connect(self._refrescar_si_visible)
+        self._timer.start()
+
+    def _alternar(self, categoria: str, marcada: bool):
+        if marcada:
+            trazas.activar(categoria)
+        else:
+            trazas.desactivar(categoria)
+
+    def _refrescar_si_visible(self):
+        if self.isVisible() and len(trazas.registro()) != self._mostrados:
+            self.actualizar()
+
+    def actualizar(self):
+        registro = trazas.registro()
+        self._mostrados = len(registro)
+        self.tx_trazas.setPlainText('\n'.join(registro.lineas_json()))
+        self.tx_trazas.moveCursor(QtGui.QTextCursor.End)
+
+    def limpiar(self):
+        trazas.limpiar()
+        self.actualizar()
+
+    def guardar(self):
+        ruta, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Guardar trazas", "trazas.jsonl", "JSON lines (*.jsonl);;Todos (*)")
+        if not ruta:
+            return
+        try:
+            with open(ruta, 'w', encoding='utf-8') as destino:
+                n = trazas.volcar_jsonl(destino)
+        except OSError as e:
+            QtWidgets.QMessageBox.warning(self, "Trazas", f"No se pudo guardar: {e}")
+            return
+        QtWidgets.QMessageBox.information(self, "Trazas", f"{n} evento(s) guardados en {ruta}")